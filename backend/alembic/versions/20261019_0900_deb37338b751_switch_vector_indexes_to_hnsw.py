@@ -0,0 +1,50 @@
+"""switch_vector_indexes_to_hnsw
+
+Revision ID: deb37338b751
+Revises: 66dea0994ff8
+Create Date: 2026-10-19 09:00:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'deb37338b751'
+down_revision = '66dea0994ff8'
+branch_labels = None
+depends_on = None
+
+# (table, column, old ivfflat index, new hnsw index)
+VECTOR_INDEXES = [
+    ('users', 'profile_embedding', 'users_profile_embedding_idx', 'users_profile_embedding_hnsw_idx'),
+    ('user_memory', 'learning_pattern_embedding', 'user_memory_learning_pattern_embedding_idx', 'user_memory_learning_pattern_embedding_hnsw_idx'),
+    ('interaction_logs', 'interaction_embedding', 'interaction_logs_embedding_idx', 'interaction_logs_embedding_hnsw_idx'),
+]
+
+# pgvector defaults; see scripts/tune_vector_indexes.py for size-based recommendations
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+def upgrade() -> None:
+    # The ivfflat indexes were built with lists = 100 on empty tables, so their
+    # centroids carry no information. HNSW needs no training data and keeps
+    # recall stable as rows are inserted. Build concurrently to avoid locking writes.
+    with op.get_context().autocommit_block():
+        for table, column, old_index, new_index in VECTOR_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {new_index} ON {table} '
+                f'USING hnsw ({column} vector_cosine_ops) '
+                f'WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})'
+            )
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {old_index}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column, old_index, new_index in VECTOR_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {old_index} ON {table} '
+                f'USING ivfflat ({column} vector_cosine_ops) WITH (lists = 100)'
+            )
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {new_index}')
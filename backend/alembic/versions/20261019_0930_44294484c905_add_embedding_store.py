@@ -0,0 +1,37 @@
+"""add_embedding_store
+
+Revision ID: 44294484c905
+Revises: deb37338b751
+Create Date: 2026-10-19 09:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '44294484c905'
+down_revision = 'deb37338b751'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Content-addressed embedding store: one row per (model, sha256(text))
+    op.create_table(
+        'embedding_store',
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('embedding', sa.LargeBinary(), nullable=False),  # Encoded with services/embedding_codec.py
+        sa.Column('dimension', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_accessed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('model', 'content_hash')
+    )
+    # Garbage collection deletes by last access time
+    op.create_index(op.f('ix_embedding_store_last_accessed_at'), 'embedding_store', ['last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_embedding_store_last_accessed_at'), table_name='embedding_store')
+    op.drop_table('embedding_store')
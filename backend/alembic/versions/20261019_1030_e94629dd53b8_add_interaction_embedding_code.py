@@ -0,0 +1,27 @@
+"""add_interaction_embedding_code
+
+Revision ID: e94629dd53b8
+Revises: 44294484c905
+Create Date: 2026-10-19 10:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e94629dd53b8'
+down_revision = '44294484c905'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # int8-quantized copy of interaction_embedding (4x smaller than vector(1536)).
+    # Filled by scripts/encode_embedding_codes.py; the vector column stays as the
+    # full-precision source used for re-ranking.
+    op.add_column('interaction_logs', sa.Column('embedding_code', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interaction_logs', 'embedding_code')
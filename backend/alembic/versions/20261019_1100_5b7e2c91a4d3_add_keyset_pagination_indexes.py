@@ -0,0 +1,36 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 5b7e2c91a4d3
+Revises: e94629dd53b8
+Create Date: 2026-10-19 11:00:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c91a4d3'
+down_revision = 'e94629dd53b8'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns) backing the keyset-paginated listings
+KEYSET_INDEXES = [
+    ('ix_conversations_user_updated_id', 'conversations', 'user_id, updated_at, id'),
+    ('ix_messages_conversation_created_id', 'messages', 'conversation_id, created_at, id'),
+    ('ix_user_exercises_user_updated_id', 'user_exercises', 'user_id, updated_at, id'),
+]
+
+
+def upgrade() -> None:
+    # Each listing page is a (parent, sort key) < cursor seek on one of these.
+    # Build concurrently to avoid locking writes on the large tables.
+    with op.get_context().autocommit_block():
+        for index, table, columns in KEYSET_INDEXES:
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} ({columns})')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index, table, columns in KEYSET_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index}')
@@ -0,0 +1,67 @@
+"""add_covering_indexes
+
+Revision ID: a3c8f1d2e6b9
+Revises: 5b7e2c91a4d3
+Create Date: 2026-10-19 11:30:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c8f1d2e6b9'
+down_revision = '5b7e2c91a4d3'
+branch_labels = None
+depends_on = None
+
+# (index, table, definition) for "this user's recent X (of type Y)" lookups;
+# see benchmarks/bench_composite_indexes.py for plans and latencies
+COMPOSITE_INDEXES = [
+    (
+        'ix_interaction_logs_user_created', 'interaction_logs',
+        '(user_id, created_at DESC) INCLUDE (interaction_type)',
+    ),
+    (
+        'ix_interaction_logs_user_type_created', 'interaction_logs',
+        '(user_id, interaction_type, created_at DESC)',
+    ),
+    (
+        'ix_user_exercises_user_status_completed', 'user_exercises',
+        '(user_id, status, completed_at DESC) INCLUDE (exercise_id)',
+    ),
+]
+
+# (index, table, column) single-column indexes made redundant by the
+# composites above or from 5b7e2c91a4d3 (keyset pagination). All but
+# interaction_logs_interaction_type_idx are prefixes of a composite. That one
+# is dropped because nothing filters on interaction_type alone: listings also
+# filter on user_id and use the composites, and the type filter on global
+# similarity searches is applied while scanning the HNSW index. A handful of
+# distinct types also makes it too unselective to beat a sequential scan.
+# ix_messages_created_at is kept: created_at does not lead any composite,
+# so time-range scans of messages still need it.
+REDUNDANT_INDEXES = [
+    ('interaction_logs_user_id_idx', 'interaction_logs', 'user_id'),
+    ('interaction_logs_interaction_type_idx', 'interaction_logs', 'interaction_type'),
+    ('ix_user_exercises_user_id', 'user_exercises', 'user_id'),
+    ('ix_conversations_user_id', 'conversations', 'user_id'),
+    ('ix_messages_conversation_id', 'messages', 'conversation_id'),
+]
+
+
+def upgrade() -> None:
+    # Build the replacements before dropping anything so no lookup ever
+    # falls back to a sequential scan. Concurrent builds do not lock writes.
+    with op.get_context().autocommit_block():
+        for index, table, definition in COMPOSITE_INDEXES:
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} {definition}')
+        for index, table, column in REDUNDANT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index, table, column in REDUNDANT_INDEXES:
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} ({column})')
+        for index, table, definition in COMPOSITE_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index}')
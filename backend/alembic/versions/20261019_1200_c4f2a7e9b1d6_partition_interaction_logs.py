@@ -0,0 +1,148 @@
+"""partition_interaction_logs
+
+Revision ID: c4f2a7e9b1d6
+Revises: a3c8f1d2e6b9
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f2a7e9b1d6'
+down_revision = 'a3c8f1d2e6b9'
+branch_labels = None
+depends_on = None
+
+# Must match src/services/interaction_partitions.py and its default of 3 months ahead
+PARTITION_NAME = 'interaction_logs_p{year:04d}_{month:02d}'
+MONTHS_AHEAD = 3
+
+# Must match 20261019_0900_deb37338b751_switch_vector_indexes_to_hnsw.py
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+COLUMNS = (
+    'id, user_id, interaction_type, context_type, context_id, '
+    'interaction_data, interaction_embedding, embedding_code, created_at'
+)
+
+TABLE_DEFINITION = '''
+    CREATE TABLE interaction_logs (
+        id integer NOT NULL DEFAULT nextval('interaction_logs_id_seq'),
+        user_id integer NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        interaction_type varchar(50) NOT NULL,
+        context_type varchar(50),
+        context_id integer,
+        interaction_data json,
+        interaction_embedding vector({dimension}),
+        embedding_code bytea,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        CONSTRAINT interaction_logs_pkey PRIMARY KEY ({primary_key})
+    ){partitioning}
+'''
+
+SHARED_INDEXES = [
+    'CREATE INDEX ix_interaction_logs_user_created ON interaction_logs '
+    '(user_id, created_at DESC) INCLUDE (interaction_type)',
+    'CREATE INDEX ix_interaction_logs_user_type_created ON interaction_logs '
+    '(user_id, interaction_type, created_at DESC)',
+    'CREATE INDEX interaction_logs_embedding_hnsw_idx ON interaction_logs '
+    'USING hnsw (interaction_embedding vector_cosine_ops) '
+    f'WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})',
+]
+
+
+def _month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _embedding_dimension() -> int:
+    # pgvector stores the declared dimension as the column's type modifier
+    return op.get_bind().execute(
+        sa.text(
+            'SELECT atttypmod FROM pg_attribute '
+            "WHERE attrelid = CAST('interaction_logs' AS regclass) AND attname = 'interaction_embedding'"
+        )
+    ).scalar_one()
+
+
+def _replace_table(old_name: str, primary_key: str, partitioning: str) -> None:
+    # The id sequence outlives the old table; constraint-backed index names must be freed first
+    dimension = _embedding_dimension()
+    op.execute(f'ALTER TABLE interaction_logs RENAME TO {old_name}')
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT interaction_logs_pkey TO {old_name}_pkey')
+    op.execute('ALTER SEQUENCE interaction_logs_id_seq OWNED BY NONE')
+    op.execute(TABLE_DEFINITION.format(dimension=dimension, primary_key=primary_key, partitioning=partitioning))
+    op.execute('ALTER SEQUENCE interaction_logs_id_seq OWNED BY interaction_logs.id')
+
+
+def _copy_rows_and_index(old_name: str, extra_indexes) -> None:
+    # Indexes are built once after the copy rather than maintained row by row
+    op.execute(f'INSERT INTO interaction_logs ({COLUMNS}) SELECT {COLUMNS} FROM {old_name}')
+    op.execute(f'DROP TABLE {old_name} CASCADE')
+    for statement in SHARED_INDEXES + extra_indexes:
+        op.execute(statement)
+    op.execute('ANALYZE interaction_logs')
+
+
+def upgrade() -> None:
+    # Rewrites interaction_logs, so writes to it must be stopped while this runs.
+    # Partitions cover every month with data up to MONTHS_AHEAD ahead; the
+    # partition manager keeps creating them from then on.
+    bind = op.get_bind()
+    oldest, newest = bind.execute(sa.text('SELECT min(created_at), max(created_at) FROM interaction_logs')).one()
+    current = _month_start(datetime.now(timezone.utc))
+    month = min(_month_start(oldest), current) if oldest is not None else current
+    last = _add_months(current, MONTHS_AHEAD)
+    if newest is not None:
+        last = max(last, _month_start(newest))
+
+    _replace_table('interaction_logs_unpartitioned', 'id, created_at', ' PARTITION BY RANGE (created_at)')
+
+    while month <= last:
+        op.execute(
+            f'CREATE TABLE {PARTITION_NAME.format(year=month.year, month=month.month)} '
+            f'PARTITION OF interaction_logs '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    # Indexes created on the parent are created on every partition, present and future
+    _copy_rows_and_index(
+        'interaction_logs_unpartitioned',
+        ['CREATE INDEX ix_interaction_logs_created_at ON interaction_logs USING brin (created_at)'],
+    )
+
+    op.create_table(
+        'interaction_daily_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('interaction_type', sa.String(50), nullable=False),
+        sa.Column('interaction_count', sa.Integer(), nullable=False),
+        sa.Column('first_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'interaction_type'),
+    )
+
+
+def downgrade() -> None:
+    # Only attached partitions are copied back; archived partitions are left
+    # in their schema, and rolled-up rows that were dropped are not restored.
+    op.drop_table('interaction_daily_rollups')
+
+    _replace_table('interaction_logs_partitioned', 'id', '')
+    _copy_rows_and_index(
+        'interaction_logs_partitioned',
+        ['CREATE INDEX interaction_logs_created_at_idx ON interaction_logs (created_at)'],
+    )
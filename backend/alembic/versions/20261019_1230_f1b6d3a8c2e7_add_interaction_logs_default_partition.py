@@ -0,0 +1,36 @@
+"""add_interaction_logs_default_partition
+
+Revision ID: f1b6d3a8c2e7
+Revises: c4f2a7e9b1d6
+Create Date: 2026-10-19 12:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b6d3a8c2e7'
+down_revision = 'c4f2a7e9b1d6'
+branch_labels = None
+depends_on = None
+
+# Must match src/services/interaction_partitions.py
+DEFAULT_PARTITION = 'interaction_logs_default'
+
+
+def upgrade() -> None:
+    # Catches rows for months without a partition, so inserts keep working
+    # if partition maintenance is disabled or falls behind; the partition
+    # manager moves them into their month's partition when it creates it
+    op.execute(f'CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF interaction_logs DEFAULT')
+
+
+def downgrade() -> None:
+    rows = op.get_bind().execute(sa.text(f'SELECT count(*) FROM {DEFAULT_PARTITION}')).scalar_one()
+    if rows:
+        raise RuntimeError(
+            f'{DEFAULT_PARTITION} holds {rows} rows; run scripts/maintain_interaction_partitions.py '
+            'to move them into monthly partitions first'
+        )
+    op.execute(f'DROP TABLE {DEFAULT_PARTITION}')
@@ -0,0 +1,84 @@
+"""
+Benchmark IVF approximate search against exact top_k on clustered embeddings.
+
+Reports recall@k and per-query latency for several n_probe settings, plus
+build, save and memory-mapped load times.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.bench_ann_index --rows 100000 --dimension 1536
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from src.services.ann_index import IVFIndex
+from src.services.embedding_service import EmbeddingService
+
+
+def clustered_embeddings(rows: int, dimension: int, clusters: int, seed: int) -> np.ndarray:
+    """Generate embeddings drawn around random topic centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    noise = rng.standard_normal((rows, dimension)).astype(np.float32)
+    return centers[labels] + noise
+
+
+def main() -> None:
+    """Run the benchmark and print recall/latency per n_probe."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-lists", type=int, default=None)
+    args = parser.parse_args()
+
+    vectors = clustered_embeddings(args.rows, args.dimension, args.clusters, seed=0)
+    queries = clustered_embeddings(args.queries, args.dimension, args.clusters, seed=0)[: args.queries]
+    queries += 0.1 * np.random.default_rng(1).standard_normal(queries.shape).astype(np.float32)
+    ids = np.arange(args.rows)
+
+    start = time.perf_counter()
+    index = IVFIndex.build(ids, vectors, n_lists=args.n_lists)
+    build_seconds = time.perf_counter() - start
+
+    matrix = EmbeddingService.normalize_embeddings(vectors)
+    start = time.perf_counter()
+    exact = [set(EmbeddingService.top_k(query, matrix, args.k)[0].tolist()) for query in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/index"
+        start = time.perf_counter()
+        index.save(path)
+        save_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = IVFIndex.load(path, mmap=True)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"rows={args.rows} dimension={args.dimension} n_lists={index.n_lists} "
+            f"build={build_seconds:.2f}s save={save_seconds:.2f}s mmap_load={load_ms:.1f}ms"
+        )
+        print(f"{'method':24s} {'recall@' + str(args.k):>10s} {'ms/query':>10s}")
+        print(f"{'exact top_k':24s} {1.0:10.3f} {exact_ms:10.3f}")
+
+        for n_probe in (1, 2, 4, 8, 16, 32):
+            if n_probe > loaded.n_lists:
+                break
+            start = time.perf_counter()
+            results = [loaded.search(query, args.k, n_probe=n_probe)[0] for query in queries]
+            elapsed_ms = (time.perf_counter() - start) * 1000 / args.queries
+            recall = np.mean([
+                len(set(found.tolist()) & truth) / args.k for found, truth in zip(results, exact)
+            ])
+            print(f"{'ivf n_probe=' + str(n_probe):24s} {recall:10.3f} {elapsed_ms:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
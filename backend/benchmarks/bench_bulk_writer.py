@@ -0,0 +1,106 @@
+"""
+Benchmark per-row INSERT transactions against the buffered BulkWriter.
+
+Writes the same interaction_logs rows for an existing user twice: once as
+one INSERT per transaction (what request handlers would do inline) and
+once through BulkWriter. Reports rows/s and the mean time a caller waits
+per write. Rows are tagged with their own interaction_type and deleted
+afterwards.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.bench_bulk_writer --user-id 1 --rows 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from sqlalchemy import delete
+
+from src.config import settings
+from src.models import InteractionLog
+from src.services.bulk_writer import BulkWriter
+from src.utils.database import init_database
+
+INTERACTION_TYPE = "bench_bulk_write"
+
+
+def make_record(user_id: int, index: int) -> InteractionLog:
+    """Build one transient interaction row."""
+    return InteractionLog(
+        user_id=user_id,
+        interaction_type=INTERACTION_TYPE,
+        context_type="benchmark",
+        context_id=index,
+        interaction_data={"index": index},
+    )
+
+
+async def drive(
+    write: Callable[[InteractionLog], Awaitable[None]], args: argparse.Namespace
+) -> Tuple[float, float]:
+    """Issue args.rows writes from args.concurrency workers; return (seconds, mean ms per write)."""
+    latencies: List[float] = []
+    counter = iter(range(args.rows))
+
+    async def worker() -> None:
+        for index in counter:
+            start = time.perf_counter()
+            await write(make_record(args.user_id, index))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return time.perf_counter() - start, 1000 * sum(latencies) / len(latencies)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run both write paths and print a comparison."""
+    db_manager = init_database(settings.database_url, pool_size=args.concurrency, max_overflow=0)
+
+    async def per_row(record: InteractionLog) -> None:
+        async with db_manager.get_async_session() as session:
+            session.add(record)
+
+    writer = BulkWriter(batch_size=args.batch_size, max_wait_ms=args.max_wait_ms)
+
+    try:
+        results = {"per-row": await drive(per_row, args)}
+
+        await writer.start()
+        start = time.perf_counter()
+        _, mean_ms = await drive(writer.write, args)
+        await writer.stop()
+        # Rows are only durable once flushed, so the drain counts towards throughput
+        results["bulk"] = (time.perf_counter() - start, mean_ms)
+        print(f"bulk writer: batches={writer.stats.batches} dropped={writer.stats.dropped}")
+
+        print()
+        print(f"{'path':10s} {'seconds':>8s} {'rows/s':>10s} {'ms/write':>9s}")
+        for label, (seconds, mean_ms) in results.items():
+            print(f"{label:10s} {seconds:8.2f} {args.rows / seconds:10.0f} {mean_ms:9.3f}")
+    finally:
+        async with db_manager.get_async_session() as session:
+            await session.execute(
+                delete(InteractionLog).where(
+                    InteractionLog.user_id == args.user_id,
+                    InteractionLog.interaction_type == INTERACTION_TYPE,
+                )
+            )
+        await db_manager.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--user-id", type=int, required=True, help="existing user the rows belong to")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=settings.bulk_write_batch_size)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.bulk_write_max_wait_ms)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Benchmark single-column against composite/covering indexes on per-user lookups.
+
+Seeds scratch copies of interaction_logs, user_exercises, conversations and
+messages in their own schema, then runs each "this user's recent X (of type
+Y)" query under the old single-column indexes and under the composite ones
+from migration a3c8f1d2e6b9. Reports the plan node, index used, buffers
+touched and mean latency for both.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.bench_composite_indexes --users 2000 --rows-per-user 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.utils.database import init_database
+from src.utils.query_stats import summarize_plan
+
+SCHEMA = "bench_indexes"
+
+TABLES = [
+    f"""CREATE TABLE {SCHEMA}.interaction_logs (
+        id bigserial PRIMARY KEY,
+        user_id integer NOT NULL,
+        interaction_type varchar(50) NOT NULL,
+        context_id integer,
+        interaction_data json,
+        created_at timestamptz NOT NULL
+    )""",
+    f"""CREATE TABLE {SCHEMA}.user_exercises (
+        id bigserial PRIMARY KEY,
+        user_id integer NOT NULL,
+        exercise_id integer NOT NULL,
+        status varchar(20) NOT NULL,
+        grade double precision,
+        completed_at timestamptz,
+        updated_at timestamptz NOT NULL
+    )""",
+    f"""CREATE TABLE {SCHEMA}.conversations (
+        id bigserial PRIMARY KEY,
+        user_id integer NOT NULL,
+        title varchar(255),
+        updated_at timestamptz NOT NULL
+    )""",
+    f"""CREATE TABLE {SCHEMA}.messages (
+        id bigserial PRIMARY KEY,
+        conversation_id integer NOT NULL,
+        content text NOT NULL,
+        created_at timestamptz NOT NULL
+    )""",
+]
+
+# Rows are spread over a year; user_id, type and conversation are uniform.
+# setseed() makes every run produce the same data. {users} and
+# {rows_per_user} are formatted in.
+SEED = [
+    """INSERT INTO {schema}.interaction_logs (user_id, interaction_type, context_id, interaction_data, created_at)
+        SELECT 1 + (random() * ({users} - 1))::int,
+               (ARRAY['chat_message', 'hint_request', 'code_submission', 'exercise_completion'])[1 + (random() * 3)::int],
+               (random() * 10000)::int,
+               '{{"source": "benchmark"}}'::json,
+               now() - random() * interval '365 days'
+        FROM generate_series(1, {users} * {rows_per_user})""",
+    """INSERT INTO {schema}.user_exercises (user_id, exercise_id, status, grade, completed_at, updated_at)
+        SELECT user_id, exercise_id, status,
+               CASE WHEN status = 'completed' THEN random() * 100 END,
+               CASE WHEN status = 'completed' THEN at END,
+               at
+        FROM (
+            SELECT 1 + (random() * ({users} - 1))::int AS user_id,
+                   (random() * 5000)::int AS exercise_id,
+                   (ARRAY['completed', 'completed', 'skipped', 'pending'])[1 + (random() * 3)::int] AS status,
+                   now() - random() * interval '365 days' AS at
+            FROM generate_series(1, {users} * {rows_per_user} / 4)
+        ) AS attempts""",
+    """INSERT INTO {schema}.conversations (user_id, title, updated_at)
+        SELECT 1 + (random() * ({users} - 1))::int, 'Conversation', now() - random() * interval '365 days'
+        FROM generate_series(1, {users} * 10)""",
+    """INSERT INTO {schema}.messages (conversation_id, content, created_at)
+        SELECT 1 + (random() * ({users} * 10 - 1))::int, repeat('x', 200), now() - random() * interval '365 days'
+        FROM generate_series(1, {users} * {rows_per_user})""",
+]
+
+# Indexes before migration a3c8f1d2e6b9 (and 5b7e2c91a4d3)
+SINGLE_COLUMN_INDEXES = [
+    "CREATE INDEX ON {schema}.interaction_logs (user_id)",
+    "CREATE INDEX ON {schema}.interaction_logs (interaction_type)",
+    "CREATE INDEX ON {schema}.interaction_logs (created_at)",
+    "CREATE INDEX ON {schema}.user_exercises (user_id)",
+    "CREATE INDEX ON {schema}.user_exercises (exercise_id)",
+    "CREATE INDEX ON {schema}.conversations (user_id)",
+    "CREATE INDEX ON {schema}.messages (conversation_id)",
+    "CREATE INDEX ON {schema}.messages (created_at)",
+]
+
+# Indexes after both migrations
+COMPOSITE_INDEXES = [
+    "CREATE INDEX ON {schema}.interaction_logs (user_id, created_at DESC) INCLUDE (interaction_type)",
+    "CREATE INDEX ON {schema}.interaction_logs (user_id, interaction_type, created_at DESC)",
+    "CREATE INDEX ON {schema}.interaction_logs (created_at)",
+    "CREATE INDEX ON {schema}.user_exercises (user_id, updated_at, id)",
+    "CREATE INDEX ON {schema}.user_exercises (user_id, status, completed_at DESC) INCLUDE (exercise_id)",
+    "CREATE INDEX ON {schema}.user_exercises (exercise_id)",
+    "CREATE INDEX ON {schema}.conversations (user_id, updated_at, id)",
+    "CREATE INDEX ON {schema}.messages (conversation_id, created_at, id)",
+    "CREATE INDEX ON {schema}.messages (created_at)",
+]
+
+# (name, statement, parameter name) of the per-user access patterns
+QUERIES = [
+    (
+        "recent interactions",
+        f"SELECT id, interaction_type, created_at FROM {SCHEMA}.interaction_logs "
+        "WHERE user_id = :key ORDER BY created_at DESC LIMIT 20",
+        "user",
+    ),
+    (
+        "recent interactions of type",
+        f"SELECT id, created_at FROM {SCHEMA}.interaction_logs "
+        "WHERE user_id = :key AND interaction_type = 'hint_request' ORDER BY created_at DESC LIMIT 20",
+        "user",
+    ),
+    (
+        "interaction type counts",
+        f"SELECT interaction_type, count(*) FROM {SCHEMA}.interaction_logs "
+        "WHERE user_id = :key AND created_at > now() - interval '30 days' GROUP BY interaction_type",
+        "user",
+    ),
+    (
+        "recently completed exercises",
+        f"SELECT exercise_id, completed_at FROM {SCHEMA}.user_exercises "
+        "WHERE user_id = :key AND status = 'completed' ORDER BY completed_at DESC LIMIT 20",
+        "user",
+    ),
+    (
+        "exercise history page",
+        f"SELECT * FROM {SCHEMA}.user_exercises "
+        "WHERE user_id = :key ORDER BY updated_at DESC, id DESC LIMIT 20",
+        "user",
+    ),
+    (
+        "conversation list page",
+        f"SELECT * FROM {SCHEMA}.conversations "
+        "WHERE user_id = :key ORDER BY updated_at DESC, id DESC LIMIT 20",
+        "user",
+    ),
+    (
+        "conversation messages page",
+        f"SELECT * FROM {SCHEMA}.messages "
+        "WHERE conversation_id = :key ORDER BY created_at DESC, id DESC LIMIT 20",
+        "conversation",
+    ),
+]
+
+
+def index_names(plan_document: Any) -> List[str]:
+    """Every index a plan scans."""
+    if isinstance(plan_document, str):
+        plan_document = json.loads(plan_document)
+    entry = plan_document[0] if isinstance(plan_document, list) else plan_document
+    names, nodes = [], [entry.get("Plan", {})]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Index Name"):
+            names.append(node["Index Name"])
+        nodes.extend(node.get("Plans", []))
+    return names
+
+
+async def build_indexes(session, indexes: List[str]) -> float:
+    """Drop the scratch indexes, build the given set and analyze; return build seconds."""
+    result = await session.execute(
+        text("SELECT indexname FROM pg_indexes WHERE schemaname = :schema AND indexname NOT LIKE '%_pkey'"),
+        {"schema": SCHEMA},
+    )
+    for name in result.scalars().all():
+        await session.execute(text(f'DROP INDEX {SCHEMA}."{name}"'))
+
+    start = time.perf_counter()
+    for statement in indexes:
+        await session.execute(text(statement.format(schema=SCHEMA)))
+    elapsed = time.perf_counter() - start
+
+    await session.execute(text(f"ANALYZE {SCHEMA}.interaction_logs, {SCHEMA}.user_exercises, "
+                               f"{SCHEMA}.conversations, {SCHEMA}.messages"))
+    return elapsed
+
+
+async def index_bytes(session) -> int:
+    """Total size of the scratch indexes."""
+    result = await session.execute(
+        text("SELECT coalesce(sum(pg_relation_size(indexrelid)), 0) FROM pg_stat_user_indexes "
+             "WHERE schemaname = :schema"),
+        {"schema": SCHEMA},
+    )
+    return int(result.scalar())
+
+
+async def measure(session, statement: str, keys: List[int]) -> Tuple[Dict[str, Any], List[str], float]:
+    """EXPLAIN ANALYZE once, then return (plan summary, indexes, mean ms) over keys."""
+    result = await session.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}"), {"key": keys[0]}
+    )
+    plan = result.scalar()
+
+    for key in keys[:10]:
+        await session.execute(text(statement), {"key": key})
+
+    start = time.perf_counter()
+    for key in keys:
+        await session.execute(text(statement), {"key": key})
+    mean_ms = (time.perf_counter() - start) * 1000 / len(keys)
+    return summarize_plan(plan), index_names(plan), mean_ms
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Seed, benchmark both index sets and print a comparison."""
+    db_manager = init_database(settings.database_url, pool_size=1, max_overflow=0)
+    rng = random.Random(args.seed)
+    keys = {
+        "user": [rng.randint(1, args.users) for _ in range(args.queries)],
+        "conversation": [rng.randint(1, args.users * 10) for _ in range(args.queries)],
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+
+    try:
+        async with db_manager.get_async_session() as session:
+            await session.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await session.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            for statement in TABLES:
+                await session.execute(text(statement))
+            await session.execute(text("SELECT setseed(:seed)"), {"seed": args.seed / 2 ** 31})
+            start = time.perf_counter()
+            for statement in SEED:
+                await session.execute(text(statement.format(
+                    schema=SCHEMA,
+                    users=args.users,
+                    rows_per_user=args.rows_per_user,
+                )))
+            print(f"seeded users={args.users} rows_per_user={args.rows_per_user} "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+        for label, indexes in (("single", SINGLE_COLUMN_INDEXES), ("composite", COMPOSITE_INDEXES)):
+            async with db_manager.get_async_session() as session:
+                build_seconds = await build_indexes(session, indexes)
+            async with db_manager.get_async_session() as session:
+                size_mb = await index_bytes(session) / 2 ** 20
+                print(f"{label}: build={build_seconds:.1f}s index_size={size_mb:.1f}MB")
+                for name, statement, key_kind in QUERIES:
+                    results.setdefault(name, {})[label] = await measure(session, statement, keys[key_kind])
+
+        print()
+        print(f"{'query':30s} {'indexes':10s} {'plan':22s} {'buffers':>8s} {'ms/query':>9s}  index")
+        for name, by_label in results.items():
+            for label, (summary, names, mean_ms) in by_label.items():
+                buffers = (summary.get("shared_hit_blocks") or 0) + (summary.get("shared_read_blocks") or 0)
+                print(f"{name:30s} {label:10s} {summary['node'] or '-':22s} {buffers:8d} {mean_ms:9.3f}  "
+                      f"{', '.join(names) or '-'}")
+    finally:
+        if not args.keep:
+            async with db_manager.get_async_session() as session:
+                await session.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await db_manager.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--rows-per-user", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help=f"keep the {SCHEMA} schema afterwards")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
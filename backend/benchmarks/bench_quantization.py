@@ -0,0 +1,80 @@
+"""
+Benchmark int8 and product-quantized search against exact float32 search.
+
+Reports memory per vector, recall@k and per-query latency with and without
+exact re-ranking of the top candidates.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.bench_quantization --rows 50000 --dimension 1536
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_ann_index import clustered_embeddings
+from src.services.embedding_quantization import (
+    Int8Quantizer,
+    ProductQuantizer,
+    QuantizedIndex,
+    rerank,
+)
+from src.services.embedding_service import EmbeddingService
+
+
+def main() -> None:
+    """Run the benchmark and print one line per method."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank-factor", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = clustered_embeddings(args.rows, args.dimension, args.clusters, seed=0)
+    queries = clustered_embeddings(args.queries, args.dimension, args.clusters, seed=0)
+    queries += 0.1 * np.random.default_rng(1).standard_normal(queries.shape).astype(np.float32)
+    matrix = EmbeddingService.normalize_embeddings(vectors)
+    ids = np.arange(args.rows)
+
+    start = time.perf_counter()
+    exact = [set(EmbeddingService.top_k(query, matrix, args.k)[0].tolist()) for query in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    float_bytes = matrix.nbytes / args.rows
+    print(f"rows={args.rows} dimension={args.dimension} k={args.k} rerank_factor={args.rerank_factor}")
+    print(f"{'method':28s} {'bytes/vec':>10s} {'ratio':>7s} {'recall':>8s} {'ms/query':>10s}")
+    print(f"{'float32 exact':28s} {float_bytes:10.0f} {1.0:7.1f} {1.0:8.3f} {exact_ms:10.3f}")
+
+    indexes = {"int8": QuantizedIndex.build(Int8Quantizer(args.dimension), ids, vectors)}
+    for n_subspaces in (args.dimension // 4, args.dimension // 8):
+        start = time.perf_counter()
+        quantizer = ProductQuantizer.train(vectors, n_subspaces=n_subspaces)
+        indexes[f"pq m={n_subspaces}"] = QuantizedIndex.build(quantizer, ids, vectors)
+        print(f"# pq m={n_subspaces} train+encode {time.perf_counter() - start:.1f}s")
+
+    for name, index in indexes.items():
+        bytes_per_vector = index.nbytes / args.rows
+        for rerank_factor in (1, args.rerank_factor):
+            start = time.perf_counter()
+            results = []
+            for query in queries:
+                found, _ = index.search(query, args.k * rerank_factor)
+                if rerank_factor > 1:
+                    found, _ = rerank(query, found, matrix[found], args.k)
+                results.append(found[: args.k])
+            elapsed_ms = (time.perf_counter() - start) * 1000 / args.queries
+            recall = np.mean([
+                len(set(found.tolist()) & truth) / args.k for found, truth in zip(results, exact)
+            ])
+            label = f"{name}" + (f" + rerank x{rerank_factor}" if rerank_factor > 1 else "")
+            print(
+                f"{label:28s} {bytes_per_vector:10.0f} {float_bytes / bytes_per_vector:7.1f} "
+                f"{recall:8.3f} {elapsed_ms:10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark RedisManager value serializers.
+
+Reports serialize and deserialize time per value and stored bytes per key for
+the value shapes the backend actually caches.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.bench_redis_serializers --iterations 100000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from src.utils import redis_serializers
+
+SAMPLE_VALUES: Dict[str, Any] = {
+    "session": {
+        "user_id": 123456,
+        "access_jti": "2f1c9b8e-6a4d-4c2e-9f3b-8d7a6e5c4b3a",
+        "refresh_jti": "7e6d5c4b-3a2f-4e1d-8c9b-0a1b2c3d4e5f",
+        "created_at": datetime(2024, 1, 1, 12, 0, 0).isoformat(),
+        "user_data": {"email": "student@example.com", "skill_level": "intermediate"},
+    },
+    "access_token": "123456",
+    "email_token": {"email": "student@example.com"},
+    "profile": {
+        "id": 123456,
+        "email": "student@example.com",
+        "programming_language": "python",
+        "skill_level": "intermediate",
+        "career_goals": "Become a backend engineer working on distributed systems",
+        "learning_style": "hands-on",
+        "topic_mastery": {f"topic_{i}": i / 20 for i in range(20)},
+        "onboarding_completed": True,
+    },
+}
+
+
+def time_per_call(function: Callable[[], Any], iterations: int) -> float:
+    """Return mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def main() -> None:
+    """Run the benchmark and print one line per value shape and serializer."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"iterations={args.iterations}")
+    print(f"{'value':14s} {'serializer':10s} {'bytes':>7s} {'dumps us':>10s} {'loads us':>10s}")
+
+    for shape, value in SAMPLE_VALUES.items():
+        legacy = json.dumps(value)
+        dumps_us = time_per_call(lambda: json.dumps(value), args.iterations)
+        loads_us = time_per_call(lambda: json.loads(legacy), args.iterations)
+        print(f"{shape:14s} {'legacy':10s} {len(legacy.encode()):7d} {dumps_us:10.3f} {loads_us:10.3f}")
+
+        for name, serializer in redis_serializers.SERIALIZERS.items():
+            data = serializer.dumps(value)
+            assert redis_serializers.loads(data) == value
+            dumps_us = time_per_call(lambda: serializer.dumps(value), args.iterations)
+            loads_us = time_per_call(lambda: redis_serializers.loads(data), args.iterations)
+            print(f"{shape:14s} {name:10s} {len(data):7d} {dumps_us:10.3f} {loads_us:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
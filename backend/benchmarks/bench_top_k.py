@@ -0,0 +1,75 @@
+"""
+Benchmark vectorized top-k similarity against the per-pair cosine_similarity loop.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.bench_top_k --rows 10000 --k 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.services.embedding_service import EmbeddingService
+
+
+def time_call(function, repeat: int) -> float:
+    """Return the best wall time of repeat runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.rows, args.dimension)).astype(np.float32)
+    vector_lists = vectors.tolist()
+    query = vector_lists[0]
+    queries = vectors[: args.queries]
+    service = EmbeddingService()
+
+    def per_pair():
+        scores = [service.cosine_similarity(query, row) for row in vector_lists]
+        return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[: args.k]
+
+    build_ms = time_call(lambda: EmbeddingService.normalize_embeddings(vectors), 1)
+    matrix = EmbeddingService.normalize_embeddings(vectors)
+    mask = np.zeros(args.rows, dtype=bool)
+    mask[:: max(1, args.rows // 500)] = True
+
+    results = [
+        ("per-pair cosine_similarity (1 query)", time_call(per_pair, 1)),
+        ("top_k (1 query)", time_call(lambda: EmbeddingService.top_k(query, matrix, args.k), args.repeat)),
+        (
+            f"top_k ({args.queries} queries, batched)",
+            time_call(lambda: EmbeddingService.top_k(queries, matrix, args.k), args.repeat),
+        ),
+        (
+            f"top_k (1 query, mask of {int(mask.sum())} rows)",
+            time_call(lambda: EmbeddingService.top_k(query, matrix, args.k, mask=mask), args.repeat),
+        ),
+    ]
+
+    print(f"rows={args.rows} dimension={args.dimension} k={args.k}")
+    print(f"{'normalize_embeddings (one-off)':45s} {build_ms:10.2f} ms")
+    for name, milliseconds in results:
+        print(f"{name:45s} {milliseconds:10.2f} ms")
+
+    reference = per_pair()
+    indices, _ = EmbeddingService.top_k(query, matrix, args.k)
+    assert set(indices.tolist()) == set(reference), "top_k disagrees with per-pair ranking"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Backfill NULL embedding columns in resumable, rate-limited batches.
+
+Usage (from backend/):
+    python -m scripts.backfill_embeddings --target interaction_logs --checkpoint /tmp/interaction_logs.json
+"""
+import argparse
+import asyncio
+import json
+from dataclasses import asdict
+
+import redis.asyncio as aioredis
+
+from src.config import settings
+from src.services.embedding_backfill import BACKFILL_TARGETS, EmbeddingBackfillJob
+from src.services.embedding_service import EmbeddingService
+from src.services.embedding_store import EmbeddingStore
+from src.utils.database import init_database
+
+
+async def main() -> None:
+    """Backfill each requested target and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=sorted(BACKFILL_TARGETS), action="append")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-rows-per-second", type=float, default=None)
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="Retries of a batch the embedding provider failed before giving up",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint file; with several targets, the target name is appended",
+    )
+    args = parser.parse_args()
+
+    targets = args.target or sorted(BACKFILL_TARGETS)
+    db_manager = init_database(settings.database_url, pool_size=2, max_overflow=0)
+    # Embeddings are cached as binary, so this client must not decode responses
+    redis_client = aioredis.from_url(settings.redis_url)
+    embedding_service = EmbeddingService(
+        redis_client=redis_client,
+        embedding_store=EmbeddingStore(db_manager.get_async_session),
+    )
+
+    reports = []
+    try:
+        for target in targets:
+            checkpoint_path = args.checkpoint
+            if checkpoint_path and len(targets) > 1:
+                checkpoint_path = f"{checkpoint_path}.{target}"
+
+            job = EmbeddingBackfillJob(
+                embedding_service,
+                db_manager.get_async_session,
+                target,
+                batch_size=args.batch_size,
+                max_rows_per_second=args.max_rows_per_second,
+                checkpoint_path=checkpoint_path,
+                max_retries=args.max_retries,
+            )
+            stats = await job.run(max_rows=args.max_rows)
+            reports.append({**asdict(stats), "rows_per_second": round(stats.rows_per_second, 1)})
+    finally:
+        await embedding_service.close()
+        await redis_client.aclose()
+        await db_manager.close()
+
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
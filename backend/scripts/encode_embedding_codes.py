@@ -0,0 +1,34 @@
+"""
+Fill interaction_logs.embedding_code with int8 codes for existing embeddings.
+
+Usage (from backend/):
+    python -m scripts.encode_embedding_codes --batch-size 1000
+"""
+import argparse
+import asyncio
+import json
+
+from src.config import settings
+from src.services.embedding_quantization import encode_missing_interaction_codes
+from src.utils.database import init_database
+
+
+async def main() -> None:
+    """Encode all missing codes and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db_manager = init_database(settings.database_url, pool_size=1, max_overflow=0)
+    try:
+        encoded = await encode_missing_interaction_codes(
+            db_manager.get_async_session, batch_size=args.batch_size
+        )
+    finally:
+        await db_manager.close()
+
+    print(json.dumps({"encoded": encoded}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
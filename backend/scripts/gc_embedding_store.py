@@ -0,0 +1,37 @@
+"""
+Delete persisted embeddings that have not been read recently.
+
+Usage (from backend/):
+    python -m scripts.gc_embedding_store --max-age-days 90
+"""
+import argparse
+import asyncio
+import json
+from datetime import timedelta
+
+from src.config import settings
+from src.services.embedding_store import EmbeddingStore
+from src.utils.database import init_database
+
+
+async def main() -> None:
+    """Run one garbage collection pass and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-age-days", type=float, default=90)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    db_manager = init_database(settings.database_url, pool_size=1, max_overflow=0)
+    try:
+        store = EmbeddingStore(db_manager.get_async_session)
+        deleted = await store.collect_garbage(
+            timedelta(days=args.max_age_days), batch_size=args.batch_size
+        )
+    finally:
+        await db_manager.close()
+
+    print(json.dumps({"deleted": deleted, "max_age_days": args.max_age_days}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""
+Create upcoming interaction_logs partitions and expire old ones.
+
+Runs the same pass as the in-app maintenance loop, for cron or one-off use.
+
+Usage (from backend/):
+    python -m scripts.maintain_interaction_partitions --retention-months 12
+"""
+import argparse
+import asyncio
+import json
+
+from src.config import settings
+from src.services.interaction_partitions import PartitionManager
+from src.utils.database import init_database
+
+
+async def main() -> None:
+    """Run one maintenance pass and print what changed as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--months-ahead", type=int, default=settings.interaction_log_partitions_ahead)
+    parser.add_argument("--retention-months", type=int, default=settings.interaction_log_retention_months)
+    parser.add_argument("--archive-schema", default=settings.interaction_log_archive_schema)
+    args = parser.parse_args()
+
+    db_manager = init_database(settings.database_url, pool_size=1, max_overflow=0)
+    manager = PartitionManager(
+        months_ahead=args.months_ahead,
+        retention_months=args.retention_months,
+        archive_schema=args.archive_schema,
+    )
+    try:
+        report = await manager.run()
+    finally:
+        await db_manager.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
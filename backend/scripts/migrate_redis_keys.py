@@ -0,0 +1,123 @@
+"""
+Move legacy session and access token keys to their hash-tagged names.
+
+Copies session:<user>:<jti> and access_token:<jti> keys, from the main
+database and the old session database, to session:{u:<user>}:<jti> and
+access_token:{u:<user>}:<jti> on the configured Redis (standalone, sentinel
+or cluster) with their remaining TTL, then deletes the originals. Keys that
+already exist under the new name are left alone.
+
+Usage (from backend/):
+    python -m scripts.migrate_redis_keys --dry-run
+    python -m scripts.migrate_redis_keys --source-url redis://old-host:6379/0
+"""
+import argparse
+import asyncio
+import json
+from collections import Counter
+from typing import List
+from urllib.parse import urlsplit, urlunsplit
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from src.config import settings
+from src.utils import redis_serializers
+from src.utils.redis_client import MODE_STANDALONE, init_redis
+from src.utils.redis_keys import migrated_key
+
+LEGACY_PATTERNS = ("session:*", "access_token:*")
+
+
+def with_database(url: str, database: int) -> str:
+    """Return url pointing at another numbered database."""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=f"/{database}"))
+
+
+async def migrate_source(source: aioredis.Redis, target, dry_run: bool, keep_source: bool) -> Counter:
+    """Migrate every legacy key found on one source database."""
+    counts: Counter = Counter()
+    for pattern in LEGACY_PATTERNS:
+        async for raw_key in source.scan_iter(match=pattern, count=1000):
+            key = raw_key.decode()
+            user_id = None
+            if key.startswith("access_token:"):
+                value = await source.get(key)
+                try:
+                    user_id = redis_serializers.loads(value)["user_id"] if value else None
+                except (ValueError, KeyError, TypeError):
+                    user_id = None
+
+            new_key = migrated_key(key, user_id)
+            if new_key is None:
+                counts["skipped"] += 1
+                continue
+
+            if dry_run:
+                counts["would_migrate"] += 1
+                continue
+
+            dump = await source.dump(key)
+            ttl = await source.pttl(key)
+            if dump is None or ttl == -2:
+                counts["expired"] += 1
+                continue
+
+            try:
+                # 0 restores without expiry, matching a PTTL of -1
+                await target.restore(new_key, max(ttl, 0), dump)
+                counts["migrated"] += 1
+            except ResponseError as error:
+                if "BUSYKEY" not in str(error):
+                    raise
+                counts["already_present"] += 1
+
+            if not keep_source:
+                await source.delete(key)
+    return counts
+
+
+async def main() -> None:
+    """Migrate legacy keys from each source and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--source-url",
+        action="append",
+        help="Redis holding legacy keys (repeatable). Defaults to REDIS_URL and its "
+             "REDIS_SESSION_DB database; required unless REDIS_MODE is standalone",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--keep-source", action="store_true", help="Do not delete migrated legacy keys")
+    args = parser.parse_args()
+
+    source_urls: List[str] = args.source_url or []
+    if not source_urls:
+        if settings.redis_mode != MODE_STANDALONE:
+            parser.error("--source-url is required unless REDIS_MODE is standalone")
+        source_urls = [settings.redis_url, with_database(settings.redis_url, settings.redis_session_db)]
+
+    redis_manager = init_redis(
+        settings.redis_url,
+        mode=settings.redis_mode,
+        sentinels=settings.redis_sentinels,
+        sentinel_master=settings.redis_sentinel_master,
+        sentinel_password=settings.redis_sentinel_password,
+    )
+    reports = []
+    try:
+        for url in source_urls:
+            source = aioredis.from_url(url)
+            try:
+                counts = await migrate_source(source, redis_manager.async_client, args.dry_run, args.keep_source)
+            finally:
+                await source.aclose()
+            reports.append({"source": url, **counts})
+    finally:
+        await redis_manager.close()
+
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Resize the embedding columns to a new dimension, clearing their values.
+
+Vectors from a different model or dimension are not comparable, so existing
+values and interaction_logs.embedding_code are set to NULL and the HNSW
+indexes are rebuilt. Each table is rewritten under an exclusive lock, so stop
+writers first. Afterwards set EMBEDDING_DIMENSION to the same value and rerun
+scripts/backfill_embeddings.py and scripts/encode_embedding_codes.py.
+
+Usage (from backend/):
+    python -m scripts.resize_embedding_columns --dimension 768
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.utils.database import init_database
+
+# (table, column, hnsw index, derived columns cleared with it)
+VECTOR_COLUMNS = [
+    ("users", "profile_embedding", "users_profile_embedding_hnsw_idx", ()),
+    ("user_memory", "learning_pattern_embedding", "user_memory_learning_pattern_embedding_hnsw_idx", ()),
+    ("interaction_logs", "interaction_embedding", "interaction_logs_embedding_hnsw_idx", ("embedding_code",)),
+]
+
+# Must match 20261019_0900_deb37338b751_switch_vector_indexes_to_hnsw.py
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+async def resize(session, table: str, column: str, index: str, derived, dimension: int) -> bool:
+    """Resize one column; returns False if it already has the dimension."""
+    # pgvector stores the declared dimension as the column's type modifier
+    current = (await session.execute(
+        text(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+        ),
+        {"table": table, "column": column},
+    )).scalar_one()
+    if current == dimension:
+        return False
+
+    # The index is rebuilt on an all-NULL column, which is cheap
+    await session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+    await session.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE vector({dimension}) USING NULL"))
+    for derived_column in derived:
+        await session.execute(text(f"UPDATE {table} SET {derived_column} = NULL WHERE {derived_column} IS NOT NULL"))
+    await session.execute(text(
+        f"CREATE INDEX {index} ON {table} "
+        f"USING hnsw ({column} vector_cosine_ops) "
+        f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+    ))
+    return True
+
+
+async def main() -> None:
+    """Resize every embedding column and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dimension", type=int, required=True)
+    args = parser.parse_args()
+    if args.dimension < 1:
+        parser.error("--dimension must be positive")
+
+    db_manager = init_database(settings.database_url, pool_size=1, max_overflow=0)
+    resized = []
+    try:
+        for table, column, index, derived in VECTOR_COLUMNS:
+            async with db_manager.get_async_session() as session:
+                if await resize(session, table, column, index, derived, args.dimension):
+                    resized.append(f"{table}.{column}")
+    finally:
+        await db_manager.close()
+
+    print(json.dumps({
+        "dimension": args.dimension,
+        "resized": resized,
+        "embedding_dimension_setting": settings.embedding_dimension,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
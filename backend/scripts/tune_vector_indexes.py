@@ -0,0 +1,46 @@
+"""
+Recommend pgvector index parameters and measure recall against exact scans.
+
+Usage (from backend/):
+    python -m scripts.tune_vector_indexes --table interaction_logs --target-recall 0.95
+"""
+import argparse
+import asyncio
+import json
+
+from src.config import settings
+from src.services.vector_index_tuning import VECTOR_TABLES, tune_vector_index
+from src.utils.database import init_database
+
+
+async def main() -> None:
+    """Tune each requested table and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--table", choices=sorted(VECTOR_TABLES), action="append")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--sample-size", type=int, default=50)
+    args = parser.parse_args()
+
+    db_manager = init_database(settings.database_url, pool_size=1, max_overflow=0)
+    reports = []
+    try:
+        for table_name in args.table or sorted(VECTOR_TABLES):
+            async with db_manager.get_async_session() as session:
+                reports.append(
+                    await tune_vector_index(
+                        session,
+                        table_name,
+                        target_recall=args.target_recall,
+                        k=args.k,
+                        sample_size=args.sample_size,
+                    )
+                )
+    finally:
+        await db_manager.close()
+
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,6 +13,7 @@ from src.middleware.auth_middleware import require_auth, get_current_user_id
 from src.services.auth_service import AuthService
 from src.services.email_service import get_email_service
 from src.services.oauth_service import OAuthService
+from src.services.profile_cache import invalidate_profile_snapshot
 from src.models.user import User, UserRole
 from src.utils.database import get_async_db_session as get_session
 
@@ -189,6 +190,7 @@ async def login() -> Dict[str, Any]:
         # Update last login timestamp
         user.last_login = datetime.utcnow()
         await session.flush()
+        await invalidate_profile_snapshot(user.id)
 
         logger.info("User logged in successfully", extra={"user_id": user.id, "email": email})
 
@@ -353,6 +355,7 @@ async def oauth_github_callback() -> Dict[str, Any]:
         # Update last login
         user.last_login = datetime.utcnow()
         await session.flush()
+        await invalidate_profile_snapshot(user.id)
 
         logger.info("GitHub OAuth successful", extra={"user_id": user.id})
 
@@ -480,6 +483,7 @@ async def oauth_google_callback() -> Dict[str, Any]:
         # Update last login
         user.last_login = datetime.utcnow()
         await session.flush()
+        await invalidate_profile_snapshot(user.id)
 
         logger.info("Google OAuth successful", extra={"user_id": user.id})
 
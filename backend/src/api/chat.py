@@ -6,6 +6,17 @@ from quart import Blueprint, request, jsonify
 from typing import Dict, Any
 from src.logging_config import get_logger
 from src.middleware.error_handler import APIError
+from src.middleware.auth_middleware import require_auth, get_current_user_id
+from src.services.conversation_service import ConversationService
+from src.schemas.conversation import (
+    ConversationDetailResponse,
+    ConversationListResponse,
+    ConversationSummary,
+    MessageResponse,
+)
+from src.utils.database import get_async_db_session as get_session
+from src.utils.db_routing import read_only
+from src.utils.pagination import parse_page_args
 
 logger = get_logger(__name__)
 chat_bp = Blueprint("chat", __name__)
@@ -40,31 +51,42 @@ async def send_message() -> Dict[str, Any]:
 
 
 @chat_bp.route("/conversations", methods=["GET"])
+@require_auth
+@read_only
 async def get_conversations() -> Dict[str, Any]:
     """
-    Get list of user's conversations.
+    Get list of user's conversations, most recently active first.
 
     Headers:
         Authorization: Bearer <access_token>
 
     Query Parameters:
-        limit: Number of conversations (default: 20)
-        offset: Pagination offset (default: 0)
+        limit: Number of conversations (default: 20, max: 100)
+        cursor: next_cursor from the previous page (omit for the first page)
 
     Returns:
-        JSON response with conversation list
+        JSON response with conversation list and next_cursor (null on the last page)
     """
-    # TODO: Fetch user's conversations from database
-    # TODO: Include last message and timestamp
-    # TODO: Apply pagination
+    user_id = get_current_user_id()
+    limit, cursor = parse_page_args(request.args)
 
-    raise APIError("Get conversations not yet implemented", status_code=501)
+    async with get_session() as session:
+        page = await ConversationService.list_conversations(session, user_id, limit, cursor)
 
+        response = ConversationListResponse(
+            conversations=[ConversationSummary.model_validate(item) for item in page.items],
+            next_cursor=page.next_cursor,
+        )
 
-@chat_bp.route("/conversations/<conversation_id>", methods=["GET"])
-async def get_conversation(conversation_id: str) -> Dict[str, Any]:
+    return jsonify(response.model_dump(mode='json')), 200
+
+
+@chat_bp.route("/conversations/<int:conversation_id>", methods=["GET"])
+@require_auth
+@read_only
+async def get_conversation(conversation_id: int) -> Dict[str, Any]:
     """
-    Get specific conversation history.
+    Get specific conversation history, newest messages first.
 
     Args:
         conversation_id: Conversation identifier
@@ -72,14 +94,32 @@ async def get_conversation(conversation_id: str) -> Dict[str, Any]:
     Headers:
         Authorization: Bearer <access_token>
 
+    Query Parameters:
+        limit: Number of messages (default: 20, max: 100)
+        cursor: next_cursor from the previous page (omit for the first page)
+
     Returns:
-        JSON response with conversation messages
+        JSON response with the conversation, one page of messages and next_cursor
     """
-    # TODO: Fetch conversation from database
-    # TODO: Verify user ownership
-    # TODO: Return all messages in conversation
-
-    raise APIError("Get conversation not yet implemented", status_code=501)
+    user_id = get_current_user_id()
+    limit, cursor = parse_page_args(request.args)
+
+    async with get_session() as session:
+        conversation, page = await ConversationService.get_conversation_messages(
+            session,
+            user_id,
+            conversation_id,
+            limit,
+            cursor
+        )
+
+        response = ConversationDetailResponse(
+            conversation=ConversationSummary.model_validate(conversation),
+            messages=[MessageResponse.model_validate(item) for item in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    return jsonify(response.model_dump(mode='json')), 200
 
 
 @chat_bp.route("/conversations/<conversation_id>", methods=["DELETE"])
@@ -6,6 +6,13 @@ from quart import Blueprint, request, jsonify
 from typing import Dict, Any
 from src.logging_config import get_logger
 from src.middleware.error_handler import APIError
+from src.middleware.auth_middleware import require_auth, get_current_user_id
+from src.models.exercise import ExerciseStatus
+from src.services.exercise_history_service import ExerciseHistoryService
+from src.schemas.exercise import ExerciseHistoryItem, ExerciseHistoryResponse
+from src.utils.database import get_async_db_session as get_session
+from src.utils.db_routing import read_only
+from src.utils.pagination import parse_page_args
 
 logger = get_logger(__name__)
 exercises_bp = Blueprint("exercises", __name__)
@@ -144,26 +151,45 @@ async def skip_exercise(exercise_id: str) -> Dict[str, Any]:
 
 
 @exercises_bp.route("/history", methods=["GET"])
+@require_auth
+@read_only
 async def get_exercise_history() -> Dict[str, Any]:
     """
-    Get user's exercise history.
+    Get user's exercise history, most recently updated first.
 
     Headers:
         Authorization: Bearer <access_token>
 
     Query Parameters:
-        limit: Number of exercises to return (default: 20)
-        offset: Pagination offset (default: 0)
-        status: Filter by status (completed, skipped, pending)
+        limit: Number of exercises to return (default: 20, max: 100)
+        cursor: next_cursor from the previous page (omit for the first page)
+        status: Filter by status (pending, in_progress, completed, skipped)
 
     Returns:
-        JSON response with exercise history
-    """
-    # TODO: Fetch exercise history from database
-    # TODO: Apply filters and pagination
-    # TODO: Include submission details
-
-    raise APIError("Get exercise history not yet implemented", status_code=501)
+        JSON response with exercise history and next_cursor (null on the last page)
+    """
+    user_id = get_current_user_id()
+    limit, cursor = parse_page_args(request.args)
+
+    status = None
+    if request.args.get("status"):
+        try:
+            status = ExerciseStatus(request.args["status"])
+        except ValueError:
+            raise APIError(
+                f"Invalid status: {request.args['status']}",
+                status_code=400
+            )
+
+    async with get_session() as session:
+        page = await ExerciseHistoryService.list_history(session, user_id, limit, cursor, status)
+
+        response = ExerciseHistoryResponse(
+            exercises=[ExerciseHistoryItem.model_validate(item) for item in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    return jsonify(response.model_dump(mode='json')), 200
 
 
 @exercises_bp.route("/generate", methods=["POST"])
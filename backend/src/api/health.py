@@ -1,10 +1,12 @@
 """
 Health check API endpoints.
 Provides health and readiness checks for monitoring and load balancing.
+Results come from the background health monitor, so polling does no I/O.
 """
 from quart import Blueprint, jsonify
 from typing import Dict, Any
 from src.logging_config import get_logger
+from src.services.health_monitor import get_health_monitor
 
 logger = get_logger(__name__)
 health_bp = Blueprint("health", __name__)
@@ -16,20 +18,12 @@ async def health_check() -> Dict[str, Any]:
     Health check endpoint.
 
     Returns:
-        JSON response with health status
+        JSON response with cached database, Redis and LLM provider probe results;
+        503 if a critical dependency is down
     """
-    # TODO: Add database connection check
-    # TODO: Add Redis connection check
-    # TODO: Add external service checks (LLM, GitHub, etc.)
-
-    return jsonify({
-        "status": "healthy",
-        "checks": {
-            "database": "not_implemented",
-            "redis": "not_implemented",
-            "llm_service": "not_implemented"
-        }
-    })
+    health = get_health_monitor().health()
+    status_code = 503 if health["status"] == "unhealthy" else 200
+    return jsonify(health), status_code
 
 
 @health_bp.route("/ready", methods=["GET"])
@@ -37,18 +31,16 @@ async def readiness_check() -> Dict[str, Any]:
     """
     Readiness check endpoint for load balancers.
 
+    Not ready while a critical dependency is down or unprobed, a connection
+    pool is exhausted, or event-loop lag is above the configured limit.
+
     Returns:
-        JSON response with readiness status
+        JSON response with readiness status and reasons; 503 if not ready
     """
-    # TODO: Verify all dependencies are ready
-
-    return jsonify({
-        "status": "ready",
-        "dependencies": {
-            "database": "not_checked",
-            "redis": "not_checked"
-        }
-    })
+    ready, report = get_health_monitor().readiness()
+    if not ready:
+        logger.warning("Readiness check failed", extra={"reasons": report["reasons"]})
+    return jsonify(report), 200 if ready else 503
 
 
 @health_bp.route("/live", methods=["GET"])
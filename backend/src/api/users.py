@@ -2,30 +2,37 @@
 User management API endpoints.
 Handles user profiles, preferences, and progress tracking.
 """
-from quart import Blueprint, request, jsonify
+from quart import Blueprint, Response, request, jsonify
 from typing import Dict, Any
 from pydantic import ValidationError
 from src.logging_config import get_logger
 from src.middleware.error_handler import APIError
 from src.middleware.auth_middleware import require_auth, get_current_user_id
+from src.services.profile_cache import get_profile_snapshot
 from src.services.profile_service import ProfileService
 from src.schemas.profile import (
     OnboardingRequest,
     OnboardingResponse,
     ProfileUpdateRequest,
     UserProfileResponse,
-    UserProgressResponse,
     OnboardingQuestionsResponse
 )
 from src.utils.database import get_async_db_session as get_session
+from src.utils.db_routing import read_only
 from quart import g
 
 logger = get_logger(__name__)
 users_bp = Blueprint("users", __name__)
 
 
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Return already-serialized JSON without re-encoding it."""
+    return Response(body, status=status, content_type="application/json")
+
+
 @users_bp.route("/me", methods=["GET"])
 @require_auth
+@read_only
 async def get_current_user() -> Dict[str, Any]:
     """
     Get current authenticated user's profile.
@@ -37,19 +44,14 @@ async def get_current_user() -> Dict[str, Any]:
         JSON response with user profile data
     """
     user_id = get_current_user_id()
+    snapshot = await get_profile_snapshot(user_id)
 
-    async with get_session() as session:
-        user = await ProfileService.get_user_profile(session, user_id)
-
-        # Convert to response schema
-        profile = UserProfileResponse.model_validate(user)
-
-        logger.info(
-            "User profile retrieved",
-            extra={"user_id": user_id}
-        )
+    logger.info(
+        "User profile retrieved",
+        extra={"user_id": user_id}
+    )
 
-        return jsonify(profile.model_dump(mode='json')), 200
+    return json_bytes_response(snapshot.profile)
 
 
 @users_bp.route("/me", methods=["PUT"])
@@ -130,6 +132,7 @@ async def get_user_profile() -> Dict[str, Any]:
 
 @users_bp.route("/me/progress", methods=["GET"])
 @require_auth
+@read_only
 async def get_user_progress() -> Dict[str, Any]:
     """
     Get user's learning progress and statistics.
@@ -141,19 +144,14 @@ async def get_user_progress() -> Dict[str, Any]:
         JSON response with progress data
     """
     user_id = get_current_user_id()
+    snapshot = await get_profile_snapshot(user_id)
 
-    async with get_session() as session:
-        progress_data = await ProfileService.get_user_progress(session, user_id)
-
-        # Convert to response schema
-        progress = UserProgressResponse.model_validate(progress_data)
-
-        logger.info(
-            "User progress retrieved",
-            extra={"user_id": user_id}
-        )
+    logger.info(
+        "User progress retrieved",
+        extra={"user_id": user_id}
+    )
 
-        return jsonify(progress.model_dump(mode='json')), 200
+    return json_bytes_response(snapshot.progress)
 
 
 @users_bp.route("/onboarding/questions", methods=["GET"])
@@ -186,6 +184,7 @@ async def get_onboarding_questions() -> Dict[str, Any]:
 
 @users_bp.route("/onboarding/status", methods=["GET"])
 @require_auth
+@read_only
 async def get_onboarding_status() -> Dict[str, Any]:
     """
     Check user's onboarding status.
@@ -197,16 +196,14 @@ async def get_onboarding_status() -> Dict[str, Any]:
         JSON response with onboarding status
     """
     user_id = get_current_user_id()
+    snapshot = await get_profile_snapshot(user_id)
 
-    async with get_session() as session:
-        status = await ProfileService.check_onboarding_status(session, user_id)
-
-        logger.info(
-            "Onboarding status checked",
-            extra={"user_id": user_id, "completed": status["onboarding_completed"]}
-        )
+    logger.info(
+        "Onboarding status checked",
+        extra={"user_id": user_id}
+    )
 
-        return jsonify(status), 200
+    return json_bytes_response(snapshot.onboarding_status)
 
 
 @users_bp.route("/onboarding", methods=["POST"])
@@ -280,6 +277,7 @@ async def complete_onboarding() -> Dict[str, Any]:
 
 @users_bp.route("/me/preferences", methods=["GET"])
 @require_auth
+@read_only
 async def get_user_preferences() -> Dict[str, Any]:
     """
     Get user preferences and settings.
@@ -291,25 +289,14 @@ async def get_user_preferences() -> Dict[str, Any]:
         JSON response with user preferences
     """
     user_id = get_current_user_id()
+    snapshot = await get_profile_snapshot(user_id)
 
-    async with get_session() as session:
-        user = await ProfileService.get_user_profile(session, user_id)
-
-        # Extract preferences
-        preferences = {
-            "programming_language": user.programming_language,
-            "skill_level": user.skill_level.value if user.skill_level else None,
-            "career_goals": user.career_goals,
-            "learning_style": user.learning_style,
-            "time_commitment": user.time_commitment,
-        }
-
-        logger.info(
-            "User preferences retrieved",
-            extra={"user_id": user_id}
-        )
+    logger.info(
+        "User preferences retrieved",
+        extra={"user_id": user_id}
+    )
 
-        return jsonify(preferences), 200
+    return json_bytes_response(snapshot.preferences)
 
 
 @users_bp.route("/me/preferences", methods=["PUT"])
@@ -348,13 +335,7 @@ async def update_user_preferences() -> Dict[str, Any]:
             await session.commit()
 
             # Extract updated preferences
-            preferences = {
-                "programming_language": user.programming_language,
-                "skill_level": user.skill_level.value if user.skill_level else None,
-                "career_goals": user.career_goals,
-                "learning_style": user.learning_style,
-                "time_commitment": user.time_commitment,
-            }
+            preferences = ProfileService.preferences(user)
 
             logger.info(
                 "User preferences updated",
@@ -9,8 +9,12 @@ import structlog
 
 from .config import settings
 from .utils.logger import setup_logging, get_logger, log_request
-from .utils.database import init_database, get_database
-from .utils.redis_client import init_redis, get_redis
+from .services.bulk_writer import get_bulk_writer, init_bulk_writer
+from .services.health_monitor import get_health_monitor, init_health_monitor
+from .services.interaction_partitions import get_partition_manager, init_partition_manager
+from .utils.connections import close_connections, get_pool_stats, init_connections
+from .utils.query_stats import get_query_stats
+from .utils.request_io import begin_request_io, current_request_io
 
 
 def create_app(config_override: Optional[dict] = None) -> Quart:
@@ -62,31 +66,59 @@ def create_app(config_override: Optional[dict] = None) -> Quart:
         allow_credentials=True,
     )
 
-    # Initialize database
-    init_database(
-        database_url=settings.database_url,
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
-    )
+    # Initialize the shared database engine and Redis pool
+    init_connections()
 
-    # Initialize Redis
-    init_redis(
-        redis_url=settings.redis_url,
-        session_db=settings.redis_session_db,
-    )
+    # Dependency probes run in the background once the server is up
+    init_health_monitor()
+
+    @app.before_serving
+    async def start_health_monitor():
+        """Start background dependency probes."""
+        await get_health_monitor().start()
+
+    # Interaction logs and messages are inserted in batches off the request path
+    init_bulk_writer()
+
+    @app.before_serving
+    async def start_bulk_writer():
+        """Start flushing buffered rows."""
+        await get_bulk_writer().start()
+
+    # interaction_logs partitions are created ahead and expired in the background
+    init_partition_manager()
+
+    if settings.interaction_log_maintenance_seconds > 0:
+        @app.before_serving
+        async def start_partition_manager():
+            """Start interaction log partition maintenance."""
+            await get_partition_manager().start()
 
     # Register request/response hooks
     @app.before_request
     async def before_request():
-        """Log incoming requests."""
+        """Log incoming requests and start accounting their I/O."""
         from quart import request
+        begin_request_io()
         log_request(request)
 
     @app.after_request
     async def after_request(response):
-        """Log outgoing responses."""
+        """Log outgoing responses with the I/O they performed."""
         from quart import request
-        log_request(request, response)
+        request_io = current_request_io()
+        context = None
+        if request_io is not None:
+            context = request_io.as_dict()
+            if settings.server_timing_header and request_io.counters:
+                response.headers["Server-Timing"] = request_io.server_timing()
+            repeated = request_io.repeated(settings.database_n_plus_one_threshold)
+            if repeated:
+                logger.warning(
+                    "Repeated query shape in one request (possible N+1)",
+                    extra={"path": request.path, "fingerprints": repeated},
+                )
+        log_request(request, response, context)
         return response
 
     # Register error handlers
@@ -142,41 +174,15 @@ def create_app(config_override: Optional[dict] = None) -> Quart:
         Returns:
             JSON response with system health status
         """
+        # Answered from the health monitor's cached probes: no I/O per request
         health_status = {
-            "status": "healthy",
             "app_name": settings.app_name,
             "environment": settings.app_env,
+            **get_health_monitor().health(),
+            "pools": get_pool_stats(),
         }
 
-        # Check database connectivity
-        try:
-            db_manager = get_database()
-            db_healthy = db_manager.sync_engine.connect().closed == False
-            health_status["database"] = "connected" if db_healthy else "disconnected"
-        except Exception as exception:
-            logger.error(
-                "Database health check failed",
-                exc_info=True,
-                extra={"exception": str(exception)},
-            )
-            health_status["database"] = "error"
-            health_status["status"] = "unhealthy"
-
-        # Check Redis connectivity
-        try:
-            redis_manager = get_redis()
-            redis_healthy = redis_manager.ping()
-            health_status["redis"] = "connected" if redis_healthy else "disconnected"
-        except Exception as exception:
-            logger.error(
-                "Redis health check failed",
-                exc_info=True,
-                extra={"exception": str(exception)},
-            )
-            health_status["redis"] = "error"
-            health_status["status"] = "unhealthy"
-
-        status_code = 200 if health_status["status"] == "healthy" else 503
+        status_code = 503 if health_status["status"] == "unhealthy" else 200
         return jsonify(health_status), status_code
 
     # Root endpoint
@@ -231,28 +237,41 @@ async def shutdown_app(app: Quart):
     logger = get_logger(__name__)
     logger.info("Shutting down application")
 
-    # Close database connections
+    # Stop dependency probes before their connections go away
+    try:
+        await get_health_monitor().stop()
+    except Exception as exception:
+        logger.error(
+            "Error stopping health monitor",
+            exc_info=True,
+            extra={"exception": str(exception)},
+        )
+
     try:
-        db_manager = get_database()
-        await db_manager.close()
-        logger.info("Database connections closed")
+        await get_partition_manager().stop()
     except Exception as exception:
         logger.error(
-            "Error closing database",
+            "Error stopping partition manager",
             exc_info=True,
             extra={"exception": str(exception)},
         )
 
-    # Close Redis connections
+    # Flush buffered rows while the database is still reachable
     try:
-        redis_manager = get_redis()
-        await redis_manager.close()
-        logger.info("Redis connections closed")
+        await get_bulk_writer().stop()
     except Exception as exception:
         logger.error(
-            "Error closing Redis",
+            "Error stopping bulk writer",
             exc_info=True,
             extra={"exception": str(exception)},
         )
 
+    # Record where database time went over this process's lifetime
+    query_stats = get_query_stats()
+    await query_stats.close()
+    logger.info("Query statistics", extra={"top_queries": query_stats.top(limit=10)})
+
+    # Close the shared database engine and Redis pool
+    await close_connections()
+
     logger.info("Application shutdown complete")
@@ -3,7 +3,7 @@ Configuration management for CodeMentor backend.
 Loads settings from environment variables and provides typed configuration objects.
 """
 import os
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from pydantic import validator, Field
 from pydantic_settings import BaseSettings
 
@@ -25,10 +25,71 @@ class Settings(BaseSettings):
     database_url: str = Field(..., env="DATABASE_URL")
     database_pool_size: int = Field(default=20, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=10, env="DATABASE_MAX_OVERFLOW")
+    # Read replicas for handlers marked read_only (comma-separated URLs; empty = primary only)
+    database_replica_urls: str = Field(default="", env="DATABASE_REPLICA_URLS")
+    database_replica_max_lag_seconds: float = Field(default=5.0, env="DATABASE_REPLICA_MAX_LAG_SECONDS")
+    database_replica_lag_check_seconds: float = Field(default=2.0, env="DATABASE_REPLICA_LAG_CHECK_SECONDS")
+    database_slow_query_ms: float = Field(default=200.0, env="DATABASE_SLOW_QUERY_MS")
+    # EXPLAIN ANALYZE re-executes the slow SELECT, so plan capture is opt-in
+    database_explain_slow_queries: bool = Field(default=False, env="DATABASE_EXPLAIN_SLOW_QUERIES")
+    database_explain_cooldown_seconds: float = Field(default=300.0, env="DATABASE_EXPLAIN_COOLDOWN_SECONDS")
+    # Warn when one request runs the same statement shape this many times (likely N+1)
+    database_n_plus_one_threshold: int = Field(default=10, env="DATABASE_N_PLUS_ONE_THRESHOLD")
+
+    # Interaction log partitions (monthly on created_at)
+    interaction_log_partitions_ahead: int = Field(default=3, env="INTERACTION_LOG_PARTITIONS_AHEAD")
+    interaction_log_retention_months: int = Field(default=12, env="INTERACTION_LOG_RETENTION_MONTHS")
+    # Expired partitions are rolled up, then moved to this schema (empty = dropped)
+    interaction_log_archive_schema: str = Field(default="", env="INTERACTION_LOG_ARCHIVE_SCHEMA")
+    interaction_log_maintenance_seconds: float = Field(default=3600.0, env="INTERACTION_LOG_MAINTENANCE_SECONDS")
+
+    # Bulk writes (buffered interaction log and message inserts)
+    bulk_write_batch_size: int = Field(default=500, env="BULK_WRITE_BATCH_SIZE")
+    bulk_write_max_wait_ms: float = Field(default=200.0, env="BULK_WRITE_MAX_WAIT_MS")
+    bulk_write_max_buffer: int = Field(default=10000, env="BULK_WRITE_MAX_BUFFER")
+    # Spill rows to Redis streams when the buffer is full or an insert fails, instead of waiting/dropping
+    bulk_write_spill: bool = Field(default=False, env="BULK_WRITE_SPILL")
+    bulk_write_spill_max_len: int = Field(default=1000000, env="BULK_WRITE_SPILL_MAX_LEN")
+    # Spilled rows still failing after this many deliveries move to a dead-letter stream
+    bulk_write_replay_max_attempts: int = Field(default=5, env="BULK_WRITE_REPLAY_MAX_ATTEMPTS")
+
+    # Vector search (pgvector)
+    vector_ivfflat_probes: int = Field(default=10, env="VECTOR_IVFFLAT_PROBES")
+    vector_hnsw_ef_search: int = Field(default=40, env="VECTOR_HNSW_EF_SEARCH")
+
+    # Embeddings
+    embedding_provider: str = Field(default="openai", env="EMBEDDING_PROVIDER")  # 'openai' or 'hashing'
+    embedding_model: str = Field(default="text-embedding-ada-002", env="EMBEDDING_MODEL")
+    embedding_dimension: int = Field(default=1536, env="EMBEDDING_DIMENSION")
+
+    # Learning pattern embeddings (incremental updates)
+    learning_pattern_decay: float = Field(default=0.95, env="LEARNING_PATTERN_DECAY")
+    learning_pattern_reanchor_every: int = Field(default=50, env="LEARNING_PATTERN_REANCHOR_EVERY")
+    learning_pattern_debounce_seconds: float = Field(default=30.0, env="LEARNING_PATTERN_DEBOUNCE_SECONDS")
 
     # Redis
     redis_url: str = Field(..., env="REDIS_URL")
+    redis_mode: str = Field(default="standalone", env="REDIS_MODE")  # 'standalone', 'sentinel' or 'cluster'
+    redis_sentinels: str = Field(default="", env="REDIS_SENTINELS")  # host:port,host:port
+    redis_sentinel_master: str = Field(default="mymaster", env="REDIS_SENTINEL_MASTER")
+    redis_sentinel_password: Optional[str] = Field(default=None, env="REDIS_SENTINEL_PASSWORD")
+    redis_legacy_key_fallback: bool = Field(default=True, env="REDIS_LEGACY_KEY_FALLBACK")
+    # Legacy: database sessions were once split into; only read by scripts.migrate_redis_keys
     redis_session_db: int = Field(default=1, env="REDIS_SESSION_DB")
+    redis_serializer: str = Field(default="orjson", env="REDIS_SERIALIZER")  # 'json', 'orjson' or 'msgpack'
+    redis_near_cache_prefixes: str = Field(default="", env="REDIS_NEAR_CACHE_PREFIXES")  # e.g. 'access_token:'
+
+    # Request I/O accounting (per-request DB/Redis/HTTP call counts and time)
+    server_timing_header: bool = Field(default=True, env="SERVER_TIMING_HEADER")
+
+    # Profile snapshots (serialized per-user profile views in Redis)
+    profile_snapshot_ttl_seconds: int = Field(default=300, env="PROFILE_SNAPSHOT_TTL_SECONDS")
+
+    # Health checks
+    health_probe_interval_seconds: float = Field(default=10.0, env="HEALTH_PROBE_INTERVAL_SECONDS")
+    health_probe_timeout_seconds: float = Field(default=2.0, env="HEALTH_PROBE_TIMEOUT_SECONDS")
+    health_max_loop_lag_ms: float = Field(default=500.0, env="HEALTH_MAX_LOOP_LAG_MS")
+    health_max_pool_utilization: float = Field(default=1.0, env="HEALTH_MAX_POOL_UTILIZATION")
 
     # JWT
     jwt_secret_key: str = Field(..., env="JWT_SECRET_KEY")
@@ -83,6 +144,32 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
     rate_limit_burst: int = Field(default=10, env="RATE_LIMIT_BURST")
 
+    @validator("database_replica_urls")
+    def parse_database_replica_urls(cls, value) -> List[str]:
+        """Parse comma-separated replica URLs into a list."""
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value
+
+    @validator("redis_sentinels")
+    def parse_redis_sentinels(cls, value) -> List[Tuple[str, int]]:
+        """Parse comma-separated host:port Sentinel addresses into (host, port) pairs."""
+        if isinstance(value, str):
+            sentinels = []
+            for address in value.split(","):
+                if address.strip():
+                    host, _, port = address.strip().rpartition(":")
+                    sentinels.append((host, int(port)))
+            return sentinels
+        return value
+
+    @validator("redis_near_cache_prefixes")
+    def parse_redis_near_cache_prefixes(cls, value) -> List[str]:
+        """Parse comma-separated near-cache key prefixes into a list."""
+        if isinstance(value, str):
+            return [prefix.strip() for prefix in value.split(",") if prefix.strip()]
+        return value
+
     @validator("cors_origins")
     def parse_cors_origins(cls, value) -> List[str]:
         """Parse comma-separated CORS origins into a list."""
@@ -9,6 +9,7 @@ from src.logging_config import get_logger
 from src.middleware.error_handler import APIError
 from src.services.auth_service import AuthService
 from src.models.user import UserRole
+from src.utils.db_routing import set_request_user
 
 logger = get_logger(__name__)
 
@@ -88,6 +89,7 @@ def require_auth(function: Callable) -> Callable:
             g.user_email = payload["email"]
             g.user_role = payload["role"]
             g.token_jti = payload["jti"]
+            set_request_user(g.user_id)
 
             logger.debug(
                 "Request authenticated",
@@ -255,6 +257,7 @@ def optional_auth(function: Callable) -> Callable:
                     g.user_email = payload["email"]
                     g.user_role = payload["role"]
                     g.token_jti = payload["jti"]
+                    set_request_user(g.user_id)
 
                     logger.debug(
                         "Optional auth: user authenticated",
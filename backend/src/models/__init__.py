@@ -10,7 +10,8 @@ from src.models.exercise import Exercise, UserExercise, ExerciseType, ExerciseDi
 from src.models.conversation import Conversation, Message, MessageRole
 from src.models.user_memory import UserMemory
 from src.models.achievement import Achievement, UserAchievement, AchievementCategory
-from src.models.interaction_log import InteractionLog
+from src.models.interaction_log import InteractionLog, InteractionDailyRollup
+from src.models.embedding_store import StoredEmbedding
 
 __all__ = [
     "Base",
@@ -33,4 +34,6 @@ __all__ = [
     "UserAchievement",
     "AchievementCategory",
     "InteractionLog",
+    "InteractionDailyRollup",
+    "StoredEmbedding",
 ]
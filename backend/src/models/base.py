@@ -1,19 +1,20 @@
 """
 Database base configuration and session management.
 Provides SQLAlchemy declarative base and database connection setup.
+The engine is the shared one owned by src.utils.connections.
 """
 from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
-    create_async_engine,
     async_sessionmaker,
 )
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
 from src.config import settings
 from src.logging_config import get_logger
+from src.utils.connections import init_connections
+from src.utils.database import get_database
 
 logger = get_logger(__name__)
 
@@ -40,32 +41,20 @@ def get_database_url() -> str:
 
 
 async def init_db() -> None:
-    """Initialize database connection and create engine."""
+    """Attach to the shared database engine, creating it if needed."""
     global _engine, _async_session_factory
 
     if _engine is not None:
         logger.warning("Database already initialized")
         return
 
-    database_url = get_database_url()
-
     logger.info("Initializing database connection")
 
-    # Create async engine
-    _engine = create_async_engine(
-        database_url,
-        echo=settings.debug,
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
-        pool_pre_ping=True,  # Verify connections before using
-    )
-
-    # Create session factory
-    _async_session_factory = async_sessionmaker(
-        _engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    # Reuse the registry's engine instead of opening a second pool
+    init_connections()
+    db_manager = get_database()
+    _engine = db_manager.async_engine
+    _async_session_factory = db_manager.async_session_factory
 
     logger.info(
         "Database initialized",
@@ -75,7 +64,7 @@ async def init_db() -> None:
 
 
 async def close_db() -> None:
-    """Close database connection and dispose engine."""
+    """Close database connection and dispose the shared engine."""
     global _engine, _async_session_factory
 
     if _engine is None:
@@ -84,7 +73,7 @@ async def close_db() -> None:
 
     logger.info("Closing database connection")
 
-    await _engine.dispose()
+    await get_database().close()
     _engine = None
     _async_session_factory = None
 
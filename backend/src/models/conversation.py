@@ -9,6 +9,7 @@ from sqlalchemy import (
     Text,
     DateTime,
     ForeignKey,
+    Index,
     JSON,
     Enum as SQLEnum,
 )
@@ -29,6 +30,10 @@ class Conversation(Base):
     """Conversation model for organizing chat sessions."""
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Keyset pagination of a user's conversations, newest activity first
+        Index("ix_conversations_user_updated_id", "user_id", "updated_at", "id"),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -37,8 +42,7 @@ class Conversation(Base):
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Conversation metadata
@@ -77,6 +81,10 @@ class Message(Base):
     """Message model for individual chat messages."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset pagination of a conversation's messages
+        Index("ix_messages_conversation_created_id", "conversation_id", "created_at", "id"),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -85,8 +93,7 @@ class Message(Base):
     conversation_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("conversations.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Message details
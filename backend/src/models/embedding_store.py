@@ -0,0 +1,48 @@
+"""
+StoredEmbedding model for the persistent embedding store.
+Holds content-addressed embedding vectors so stable text is embedded only once.
+"""
+from datetime import datetime
+from sqlalchemy import (
+    String,
+    Integer,
+    DateTime,
+    LargeBinary,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from src.models.base import Base
+
+
+class StoredEmbedding(Base):
+    """
+    StoredEmbedding model keyed by embedding model and SHA-256 of the input text.
+    Vectors are stored with the binary embedding codec used by the Redis cache.
+    """
+
+    __tablename__ = "embedding_store"
+
+    # Composite primary key: (model, content hash)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # Encoded vector (see services/embedding_codec.py)
+    embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    dimension: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    last_accessed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True
+    )  # Refreshed on reads; drives garbage collection
+
+    def __repr__(self) -> str:
+        """String representation of StoredEmbedding."""
+        return f"<StoredEmbedding(model='{self.model}', content_hash='{self.content_hash[:12]}')>"
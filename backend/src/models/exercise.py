@@ -12,6 +12,8 @@ from sqlalchemy import (
     Enum as SQLEnum,
     ForeignKey,
     Float,
+    Index,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -99,6 +101,18 @@ class UserExercise(Base):
     User Exercise model for tracking user progress on exercises.
     """
     __tablename__ = "user_exercises"
+    __table_args__ = (
+        # Keyset pagination of a user's exercise history
+        Index("ix_user_exercises_user_updated_id", "user_id", "updated_at", "id"),
+        # A user's recently completed (or skipped, ...) exercises
+        Index(
+            "ix_user_exercises_user_status_completed",
+            "user_id",
+            "status",
+            text("completed_at DESC"),
+            postgresql_include=["exercise_id"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -106,8 +120,7 @@ class UserExercise(Base):
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     exercise_id: Mapped[int] = mapped_column(
         Integer,
@@ -1,8 +1,11 @@
 """
 InteractionLog model for tracking user interactions.
 Stores all user interactions with embeddings for semantic similarity search.
+The table is range-partitioned by month on created_at (see
+services/interaction_partitions.py); expired months are kept as per-user
+daily rollups.
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from sqlalchemy import (
     String,
@@ -10,11 +13,16 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     JSON,
+    Date,
     Index,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
+from src.config import settings
 from src.models.base import Base
 
 
@@ -25,23 +33,34 @@ class InteractionLog(Base):
     """
 
     __tablename__ = "interaction_logs"
+    __table_args__ = (
+        # A user's recent interactions, optionally of one type
+        Index(
+            "ix_interaction_logs_user_created",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_include=["interaction_type"],
+        ),
+        Index("ix_interaction_logs_user_type_created", "user_id", "interaction_type", text("created_at DESC")),
+        # Rows arrive in created_at order, so a block-range index is enough for time scans
+        Index("ix_interaction_logs_created_at", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    # Primary key
+    # Primary key (a partitioned table's key must include the partition column)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
     # Foreign key
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Interaction details
     interaction_type: Mapped[str] = mapped_column(
         String(50),
-        nullable=False,
-        index=True
+        nullable=False
     )  # 'exercise_completion', 'chat_message', 'hint_request', 'code_submission', etc.
 
     context_type: Mapped[Optional[str]] = mapped_column(
@@ -61,18 +80,54 @@ class InteractionLog(Base):
 
     # Vector embedding for semantic search
     interaction_embedding: Mapped[Optional[List[float]]] = mapped_column(
-        Vector(1536),
+        Vector(settings.embedding_dimension),
         nullable=True
     )
 
-    # Timestamp
+    # Compact int8 copy of interaction_embedding (see services/embedding_quantization.py)
+    embedding_code: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary,
+        nullable=True
+    )
+
+    # Timestamp (partition key)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=func.now(),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     def __repr__(self) -> str:
         """String representation of InteractionLog."""
         return f"<InteractionLog(id={self.id}, user_id={self.user_id}, type='{self.interaction_type}')>"
+
+
+class InteractionDailyRollup(Base):
+    """
+    Per-user daily interaction counts, kept after raw interaction partitions expire.
+    """
+
+    __tablename__ = "interaction_daily_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "day", "interaction_type"),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)  # UTC
+    interaction_type: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    interaction_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of InteractionDailyRollup."""
+        return (
+            f"<InteractionDailyRollup(user_id={self.user_id}, day={self.day}, "
+            f"type='{self.interaction_type}', count={self.interaction_count})>"
+        )
@@ -2,7 +2,7 @@
 User model for authentication and profile management.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from sqlalchemy import (
     String,
     Boolean,
@@ -13,7 +13,9 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
 import enum
+from src.config import settings
 from src.models.base import Base
 
 
@@ -81,6 +83,12 @@ class User(Base):
     exercises_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     last_exercise_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Vector embedding of the profile for similar-learner matching
+    profile_embedding: Mapped[Optional[List[float]]] = mapped_column(
+        Vector(settings.embedding_dimension),
+        nullable=True
+    )
+
     # Onboarding
     onboarding_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
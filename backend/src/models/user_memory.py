@@ -3,7 +3,7 @@ User Memory model for personalization and learning history tracking.
 Stores individual user's learning patterns, strengths, weaknesses, and preferences.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from sqlalchemy import (
     String,
     Integer,
@@ -15,6 +15,8 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
+from src.config import settings
 from src.models.base import Base
 
 
@@ -119,6 +121,12 @@ class UserMemory(Base):
         nullable=True
     )  # Flexible field for additional personalization data
 
+    # Vector embedding of aggregated learning patterns
+    learning_pattern_embedding: Mapped[Optional[List[float]]] = mapped_column(
+        Vector(settings.embedding_dimension),
+        nullable=True
+    )
+
     # Last analysis timestamp
     last_analyzed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,52 @@
+"""
+Pydantic schemas for conversations and messages.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from src.models.conversation import MessageRole
+
+
+class ConversationSummary(BaseModel):
+    """Schema for a conversation in a listing."""
+    id: int
+    title: Optional[str]
+    context_type: Optional[str]
+    exercise_id: Optional[int]
+    message_count: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class MessageResponse(BaseModel):
+    """Schema for a chat message."""
+    id: int
+    role: MessageRole
+    content: str
+    tokens_used: Optional[int]
+    model_used: Optional[str]
+    created_at: datetime
+
+    model_config = {
+        "from_attributes": True,
+        "protected_namespaces": ()
+    }
+
+
+class ConversationListResponse(BaseModel):
+    """Schema for one page of conversations, most recently active first."""
+    conversations: List[ConversationSummary]
+    next_cursor: Optional[str]
+
+
+class ConversationDetailResponse(BaseModel):
+    """Schema for a conversation with one page of messages, newest first."""
+    conversation: ConversationSummary
+    messages: List[MessageResponse]
+    next_cursor: Optional[str]
@@ -0,0 +1,32 @@
+"""
+Pydantic schemas for exercise history.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from src.models.exercise import ExerciseStatus
+
+
+class ExerciseHistoryItem(BaseModel):
+    """Schema for one exercise attempt in a user's history."""
+    id: int
+    exercise_id: int
+    status: ExerciseStatus
+    grade: Optional[float]
+    hints_requested: int
+    time_spent_seconds: Optional[int]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ExerciseHistoryResponse(BaseModel):
+    """Schema for one page of exercise history, most recently updated first."""
+    exercises: List[ExerciseHistoryItem]
+    next_cursor: Optional[str]
@@ -0,0 +1,415 @@
+"""
+In-process approximate nearest neighbour index for embedding vectors.
+Implements an inverted-file (IVF-Flat) index in NumPy that can be built from
+interaction or profile embeddings, accepts incremental inserts, and persists
+to memory-mapped files so several workers share the same pages.
+"""
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.interaction_log import InteractionLog
+from ..models.user import User
+from ..models.user_memory import UserMemory
+from ..utils.logger import get_logger
+from .embedding_service import EmbeddingService
+
+logger = get_logger(__name__)
+
+# Embedding columns an index can be built from, keyed by source name
+EMBEDDING_SOURCES = {
+    "interaction_logs": (InteractionLog.id, InteractionLog.interaction_embedding),
+    "users": (User.id, User.profile_embedding),
+    "user_memory": (UserMemory.user_id, UserMemory.learning_pattern_embedding),
+}
+
+INDEX_FORMAT_VERSION = 1
+
+
+class IVFIndex:
+    """
+    Inverted-file index over cosine similarity.
+
+    Vectors are L2-normalized and grouped by their nearest k-means centroid.
+    A query scores the centroids, scans only the n_probe closest lists, and
+    ranks those candidates exactly, so cost grows with n / n_lists * n_probe
+    instead of n. Persisted vectors are stored list-contiguous, so each
+    probed list is a zero-copy slice of the memory-mapped file.
+    """
+
+    def __init__(self, centroids: np.ndarray, n_probe: int = 8):
+        """
+        Initialize an empty index around trained centroids.
+
+        Args:
+            centroids: Unit-length centroid matrix of shape (n_lists, dimension)
+            n_probe: Default number of lists scanned per query
+        """
+        self.centroids = EmbeddingService.normalize_embeddings(centroids)
+        self.n_lists, self.dimension = self.centroids.shape
+        self.n_probe = n_probe
+
+        # Persisted, list-contiguous storage (possibly memory-mapped)
+        self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._list_offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+
+        # Vectors added since the last save, kept in insertion order
+        self._delta_vectors: List[np.ndarray] = []
+        self._delta_ids: List[np.ndarray] = []
+        self._delta_lists: List[np.ndarray] = []
+
+    @classmethod
+    def train(
+        cls,
+        vectors: Union[np.ndarray, Sequence[Sequence[float]]],
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        iterations: int = 10,
+        sample_size: Optional[int] = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Train centroids with spherical k-means on a sample of vectors.
+
+        Args:
+            vectors: Training vectors of shape (n, dimension)
+            n_lists: Number of inverted lists (default: about sqrt(n))
+            n_probe: Default number of lists scanned per query
+            iterations: k-means iterations
+            sample_size: Vectors used for training (default: 64 per list)
+            seed: Random seed for reproducible training
+
+        Returns:
+            Empty index with trained centroids
+        """
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        count = matrix.shape[0]
+        if count == 0:
+            raise ValueError("Cannot train an index without vectors")
+
+        if n_lists is None:
+            n_lists = int(np.clip(np.sqrt(count), 1, 4096))
+        n_lists = min(n_lists, count)
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(count, sample_size or 64 * n_lists)
+        sample = matrix[rng.choice(count, size=sample_size, replace=False)]
+
+        centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+
+            # Re-seed empty lists from random sample points
+            empty = counts == 0
+            if np.any(empty):
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+
+            centroids = EmbeddingService.normalize_embeddings(sums)
+
+        logger.info(
+            "IVF index trained",
+            extra={"vectors": count, "n_lists": n_lists, "sample_size": sample_size},
+        )
+
+        return cls(centroids, n_probe=n_probe)
+
+    @classmethod
+    def build(
+        cls,
+        ids: Sequence[int],
+        vectors: Union[np.ndarray, Sequence[Sequence[float]]],
+        **train_kwargs: Any,
+    ) -> "IVFIndex":
+        """
+        Train an index and add all vectors to it.
+
+        Args:
+            ids: Row identifiers, one per vector
+            vectors: Vectors of shape (n, dimension)
+            **train_kwargs: Options forwarded to train
+
+        Returns:
+            Populated index
+        """
+        index = cls.train(vectors, **train_kwargs)
+        index.add(ids, vectors)
+        index.compact()
+        return index
+
+    def __len__(self) -> int:
+        """Total number of indexed vectors."""
+        return len(self._ids) + sum(len(ids) for ids in self._delta_ids)
+
+    def add(
+        self,
+        ids: Sequence[int],
+        vectors: Union[np.ndarray, Sequence[Sequence[float]]],
+    ) -> None:
+        """
+        Insert vectors incrementally.
+
+        New vectors are assigned to their nearest centroid and become
+        searchable immediately; they are merged into list-contiguous storage
+        by compact or save.
+
+        Args:
+            ids: Row identifiers, one per vector
+            vectors: Vectors of shape (n, dimension)
+        """
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        ids_array = np.asarray(ids, dtype=np.int64)
+        if matrix.shape[0] != ids_array.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional vectors, got {matrix.shape[1]}")
+
+        self._delta_vectors.append(matrix)
+        self._delta_ids.append(ids_array)
+        self._delta_lists.append(np.argmax(matrix @ self.centroids.T, axis=1))
+
+    def search(
+        self,
+        query: Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]],
+        k: int = 10,
+        n_probe: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find approximate nearest neighbours by cosine similarity.
+
+        Args:
+            query: One embedding of shape (dimension,) or a batch of shape (q, dimension)
+            k: Number of results per query
+            n_probe: Lists to scan (default: the index's n_probe); higher is
+                slower with better recall, n_lists gives exact search
+
+        Returns:
+            Tuple of (ids, similarity scores), best first. For a batch, rows
+            with fewer than k candidates are padded with id -1 and score -inf.
+        """
+        queries = np.asarray(query, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = EmbeddingService.normalize_embeddings(queries)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+
+        probed_lists, _ = EmbeddingService.top_k(queries, self.centroids, n_probe)
+        delta_vectors, delta_ids, delta_lists = self._delta_arrays()
+
+        result_ids = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        result_scores = np.full((queries.shape[0], k), -np.inf, dtype=np.float32)
+
+        for row, (vector, lists) in enumerate(zip(queries, probed_lists)):
+            # Score each probed list in place; slices of a memory-mapped file are not copied
+            score_parts = []
+            id_parts = []
+            for list_index in lists:
+                start, end = self._list_offsets[list_index], self._list_offsets[list_index + 1]
+                if end > start:
+                    score_parts.append(self._vectors[start:end] @ vector)
+                    id_parts.append(self._ids[start:end])
+            if delta_ids.size:
+                in_probed = np.isin(delta_lists, lists)
+                score_parts.append(delta_vectors[in_probed] @ vector)
+                id_parts.append(delta_ids[in_probed])
+
+            scores = np.concatenate(score_parts) if score_parts else np.empty(0, dtype=np.float32)
+            found = min(k, scores.shape[0])
+            if found == 0:
+                continue
+
+            best = np.argpartition(-scores, found - 1)[:found]
+            best = best[np.argsort(-scores[best])]
+            result_ids[row, :found] = np.concatenate(id_parts)[best]
+            result_scores[row, :found] = scores[best]
+
+        if single:
+            found = result_ids[0] >= 0
+            return result_ids[0][found], result_scores[0][found]
+        return result_ids, result_scores
+
+    def compact(self) -> None:
+        """Merge pending inserts into list-contiguous storage in memory."""
+        if not self._delta_ids:
+            return
+
+        delta_vectors, delta_ids, delta_lists = self._delta_arrays()
+        base_lists = np.repeat(np.arange(self.n_lists), np.diff(self._list_offsets))
+
+        vectors = np.concatenate([np.asarray(self._vectors), delta_vectors])
+        ids = np.concatenate([np.asarray(self._ids), delta_ids])
+        lists = np.concatenate([base_lists, delta_lists])
+
+        order = np.argsort(lists, kind="stable")
+        self._vectors = np.ascontiguousarray(vectors[order])
+        self._ids = ids[order]
+        self._list_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(lists, minlength=self.n_lists))]
+        ).astype(np.int64)
+
+        self._delta_vectors, self._delta_ids, self._delta_lists = [], [], []
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index to a directory of .npy files.
+
+        The directory is written next to the target and swapped in with a
+        rename, so readers never see a partially written index. Workers that
+        already mapped the previous files keep reading them until reloaded.
+
+        Args:
+            path: Target directory
+        """
+        self.compact()
+
+        temporary_path = f"{path}.tmp"
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+
+        np.save(os.path.join(temporary_path, "centroids.npy"), self.centroids)
+        np.save(os.path.join(temporary_path, "vectors.npy"), np.asarray(self._vectors))
+        np.save(os.path.join(temporary_path, "ids.npy"), np.asarray(self._ids))
+        np.save(os.path.join(temporary_path, "list_offsets.npy"), self._list_offsets)
+        with open(os.path.join(temporary_path, "meta.json"), "w") as meta_file:
+            json.dump(
+                {
+                    "version": INDEX_FORMAT_VERSION,
+                    "dimension": self.dimension,
+                    "n_lists": self.n_lists,
+                    "n_probe": self.n_probe,
+                    "count": len(self._ids),
+                },
+                meta_file,
+            )
+
+        previous_path = f"{path}.old"
+        shutil.rmtree(previous_path, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, previous_path)
+        os.rename(temporary_path, path)
+        shutil.rmtree(previous_path, ignore_errors=True)
+
+        logger.info("IVF index saved", extra={"path": path, "count": len(self._ids)})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFIndex":
+        """
+        Load a persisted index.
+
+        Args:
+            path: Directory written by save
+            mmap: Memory-map the vectors read-only instead of reading them
+                into private memory, so processes share the page cache
+
+        Returns:
+            Loaded index
+        """
+        with open(os.path.join(path, "meta.json")) as meta_file:
+            meta: Dict[str, Any] = json.load(meta_file)
+        if meta.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version: {meta.get('version')}")
+
+        index = cls(np.load(os.path.join(path, "centroids.npy")), n_probe=meta["n_probe"])
+        mmap_mode = "r" if mmap else None
+        index._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode=mmap_mode)
+        index._ids = np.load(os.path.join(path, "ids.npy"), mmap_mode=mmap_mode)
+        index._list_offsets = np.load(os.path.join(path, "list_offsets.npy"))
+
+        logger.info(
+            "IVF index loaded",
+            extra={"path": path, "count": meta["count"], "mmap": mmap},
+        )
+
+        return index
+
+    def _delta_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Concatenate pending inserts into flat arrays."""
+        if not self._delta_ids:
+            return (
+                np.empty((0, self.dimension), dtype=np.float32),
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.intp),
+            )
+        if len(self._delta_ids) > 1:
+            self._delta_vectors = [np.concatenate(self._delta_vectors)]
+            self._delta_ids = [np.concatenate(self._delta_ids)]
+            self._delta_lists = [np.concatenate(self._delta_lists)]
+        return self._delta_vectors[0], self._delta_ids[0], self._delta_lists[0]
+
+
+async def load_embeddings(
+    session: AsyncSession,
+    source: str,
+    batch_size: int = 5000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stream non-null embeddings for a source table.
+
+    Args:
+        session: Database session
+        source: One of 'interaction_logs', 'users' or 'user_memory'
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        Tuple of (ids, vectors) where vectors is a float32 matrix
+    """
+    if source not in EMBEDDING_SOURCES:
+        raise ValueError(f"Unknown embedding source: {source}")
+
+    id_column, embedding_column = EMBEDDING_SOURCES[source]
+    query = (
+        select(id_column, embedding_column)
+        .where(embedding_column.is_not(None))
+        .order_by(id_column)
+        .execution_options(yield_per=batch_size)
+    )
+
+    ids: List[int] = []
+    vectors: List[np.ndarray] = []
+    result = await session.stream(query)
+    async for row_id, embedding in result:
+        ids.append(row_id)
+        vectors.append(np.asarray(embedding, dtype=np.float32))
+
+    if not vectors:
+        return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+
+    return np.asarray(ids, dtype=np.int64), np.stack(vectors)
+
+
+async def build_index_from_database(
+    session: AsyncSession,
+    source: str,
+    **train_kwargs: Any,
+) -> IVFIndex:
+    """
+    Build an IVF index from the embeddings stored in a source table.
+
+    Args:
+        session: Database session
+        source: One of 'interaction_logs', 'users' or 'user_memory'
+        **train_kwargs: Options forwarded to IVFIndex.train
+
+    Returns:
+        Populated index keyed by the source table's id
+        (user_id for 'user_memory')
+    """
+    ids, vectors = await load_embeddings(session, source)
+    if len(ids) == 0:
+        raise ValueError(f"No embeddings found in {source}")
+
+    index = IVFIndex.build(ids, vectors, **train_kwargs)
+
+    logger.info(
+        "IVF index built from database",
+        extra={"source": source, "count": len(index), "n_lists": index.n_lists},
+    )
+
+    return index
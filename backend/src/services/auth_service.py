@@ -12,6 +12,12 @@ from src.config import settings
 from src.logging_config import get_logger
 from src.middleware.error_handler import APIError
 from src.utils.redis_client import get_redis
+from src.utils.redis_keys import (
+    access_token_key,
+    legacy_access_token_key,
+    legacy_session_key,
+    session_key as build_session_key,
+)
 
 logger = get_logger(__name__)
 
@@ -290,19 +296,23 @@ class AuthService:
                 "user_data": user_data or {},
             }
 
-            # Store session with refresh token expiration
-            session_key = f"session:{user_id}:{refresh_payload['jti']}"
-            expiration = settings.jwt_refresh_token_expire_days * 24 * 3600
-
-            await redis_manager.set_cache(session_key, session_data, expiration)
-
-            # Also store access token JTI for quick validation
-            access_key = f"access_token:{access_payload['jti']}"
-            await redis_manager.set_cache(
-                access_key,
-                {"user_id": user_id, "valid": True},
-                settings.jwt_access_token_expire_hours * 3600,
+            # Store session with refresh token expiration, and the access token
+            # JTI for quick validation, in one round trip
+            session_key = build_session_key(user_id, refresh_payload["jti"])
+            access_key = access_token_key(user_id, access_payload["jti"])
+
+            stored = await redis_manager.set_many(
+                {
+                    session_key: session_data,
+                    access_key: {"user_id": user_id, "valid": True},
+                },
+                expirations={
+                    session_key: settings.jwt_refresh_token_expire_days * 24 * 3600,
+                    access_key: settings.jwt_access_token_expire_hours * 3600,
+                },
             )
+            if not stored:
+                return False
 
             logger.info(
                 "Session created",
@@ -337,8 +347,10 @@ class AuthService:
             )
 
             # Check if token is valid in Redis
-            access_key = f"access_token:{payload['jti']}"
-            token_data = await redis_manager.get_cache(access_key)
+            token_data = await redis_manager.get_cache(access_token_key(payload["user_id"], payload["jti"]))
+            if token_data is None and settings.redis_legacy_key_fallback:
+                # Tokens issued before keys were hash-tagged
+                token_data = await redis_manager.get_cache(legacy_access_token_key(payload["jti"]))
 
             if not token_data or not token_data.get("valid"):
                 logger.warning(
@@ -375,14 +387,15 @@ class AuthService:
                 algorithms=[settings.jwt_algorithm],
             )
 
-            # Invalidate access token
-            access_key = f"access_token:{payload['jti']}"
-            await redis_manager.delete_cache(access_key)
-
-            # If it's a refresh token, delete the session
+            # Invalidate access token, and the session if it's a refresh token
+            keys = [access_token_key(user_id, payload["jti"])]
             if payload.get("type") == "refresh":
-                session_key = f"session:{user_id}:{payload['jti']}"
-                await redis_manager.delete_cache(session_key)
+                keys.append(build_session_key(user_id, payload["jti"]))
+            if settings.redis_legacy_key_fallback:
+                keys.append(legacy_access_token_key(payload["jti"]))
+                if payload.get("type") == "refresh":
+                    keys.append(legacy_session_key(user_id, payload["jti"]))
+            await redis_manager.delete_many(keys)
 
             logger.info(
                 "Session invalidated",
@@ -0,0 +1,529 @@
+"""
+Buffered bulk writer for append-only rows (interaction logs, chat messages).
+Request handlers hand rows to an in-process queue and return; a background
+task inserts them as multi-row INSERTs, one transaction per batch, so
+neither the write nor a per-row transaction is on the request path.
+Optionally, rows that cannot be buffered or inserted are spilled to a Redis
+stream and replayed later instead of being lost.
+"""
+import asyncio
+import enum
+import os
+import socket
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import msgpack
+from redis.exceptions import ResponseError
+from sqlalchemy import DateTime, Table, insert, inspect
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from ..config import settings
+from ..models.base import Base
+from ..models.conversation import Message
+from ..models.interaction_log import InteractionLog
+from ..utils.database import get_database
+from ..utils.logger import get_logger
+from ..utils.redis_client import get_redis
+from ..utils.redis_keys import bulk_write_dead_letter_key, bulk_write_spill_key
+
+logger = get_logger(__name__)
+
+Row = Dict[str, Any]
+
+# Postgres accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMETERS = 32767
+
+# Failures meaning the database is unreachable rather than a row being bad;
+# splitting a batch into single-row retries would not help
+CONNECTION_ERRORS = (OperationalError, InterfaceError, OSError)
+
+# Consumer group replaying spilled rows; entries a crashed consumer left
+# unacknowledged this long are claimed by another
+SPILL_GROUP = "bulk_writer"
+SPILL_CLAIM_IDLE_MS = 60_000
+
+
+@dataclass
+class BulkWriterStats:
+    """Counters since the writer was created."""
+
+    written: int = 0
+    batches: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    dead_lettered: int = 0
+    dropped: int = 0
+
+
+class BulkWriter:
+    """
+    Batches ORM rows into multi-row INSERTs off the request path.
+
+    A batch is flushed when it reaches batch_size rows or max_wait_ms after
+    its first row arrived, whichever comes first. write() waits while
+    max_buffer rows are queued (backpressure), unless spilling is enabled,
+    in which case the row goes to the Redis stream instead.
+    """
+
+    def __init__(
+        self,
+        models: Sequence[Type[Base]] = (InteractionLog, Message),
+        batch_size: int = 500,
+        max_wait_ms: float = 200.0,
+        max_buffer: int = 10000,
+        spill: bool = False,
+        spill_max_len: int = 1_000_000,
+        replay_interval: float = 30.0,
+        max_replay_attempts: int = 5,
+        consumer: Optional[str] = None,
+    ):
+        """
+        Initialize bulk writer.
+
+        Args:
+            models: ORM models whose rows may be written
+            batch_size: Maximum rows per flush
+            max_wait_ms: Maximum time a row waits for its batch to fill
+            max_buffer: Maximum rows queued before write() blocks or spills
+            spill: Spill rows to Redis streams when the buffer is full or an insert fails
+            spill_max_len: Approximate cap on each spill stream's length
+            replay_interval: Seconds between replays of spilled rows
+            max_replay_attempts: Deliveries of a spilled row before it is dead-lettered
+            consumer: Consumer name for replaying spilled rows (defaults to host and pid)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_buffer < batch_size:
+            raise ValueError("max_buffer must be at least batch_size")
+
+        self.tables: Dict[Type[Base], Table] = {model: model.__table__ for model in models}
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_buffer = max_buffer
+        self.spill = spill
+        self.spill_max_len = spill_max_len
+        self.replay_interval = replay_interval
+        self.max_replay_attempts = max_replay_attempts
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.stats = BulkWriterStats()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Rows taken off the queue for the next batch, and the batch being written;
+        # kept here so stop() can finish them instead of losing them to cancellation
+        self._collecting: List[Tuple[Table, Row]] = []
+        self._writing: Optional[asyncio.Future] = None
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        """Pending (table, row) pairs, created on the running loop."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_buffer)
+        return self._queue
+
+    def row(self, record: Base) -> Tuple[Table, Row]:
+        """
+        Turn a new ORM object into an insertable row.
+
+        The autoincrement id is left to the database. Unset timestamps with
+        a server default are filled in now, so a row keeps the time it was
+        written rather than the time it was flushed.
+
+        Args:
+            record: Transient InteractionLog, Message or other configured model
+
+        Returns:
+            Tuple of (table, column name -> value)
+
+        Raises:
+            TypeError: If the model is not configured for bulk writes
+        """
+        table = self.tables.get(type(record))
+        if table is None:
+            raise TypeError(f"{type(record).__name__} is not configured for bulk writes")
+
+        now = datetime.now(timezone.utc)
+        row: Row = {}
+        for attribute in inspect(type(record)).column_attrs:
+            column = attribute.columns[0]
+            value = getattr(record, attribute.key)
+            if value is None:
+                if column.primary_key and column.autoincrement is True:
+                    continue
+                if column.server_default is not None and isinstance(column.type, DateTime):
+                    value = now
+            row[column.name] = value
+        return table, row
+
+    async def write(self, record: Base) -> None:
+        """
+        Queue a record for insertion.
+
+        Returns as soon as the row is buffered (or spilled). Waits only
+        while the buffer is full and spilling is disabled.
+
+        Args:
+            record: Transient ORM object of a configured model
+        """
+        table, row = self.row(record)
+        if self.spill and self.queue.full():
+            await self._spill(table, [row])
+            return
+        await self.queue.put((table, row))
+
+    async def start(self) -> None:
+        """Flush in the background and, when spilling, replay spilled rows periodically."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.ensure_future(self._flush_loop())]
+        if self.spill:
+            self._tasks.append(asyncio.ensure_future(self._replay_loop()))
+        logger.info(
+            "Bulk writer started",
+            extra={"tables": [table.name for table in self.tables.values()], "spill": self.spill},
+        )
+
+    async def stop(self) -> None:
+        """Stop background work and flush everything still buffered."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+            self._writing = None
+        await self.flush()
+        logger.info("Bulk writer stopped", extra=asdict(self.stats))
+
+    async def flush(self) -> int:
+        """
+        Insert every buffered row now.
+
+        Returns:
+            Number of rows taken from the buffer
+        """
+        total = len(self._collecting)
+        if self._collecting:
+            batch, self._collecting = self._collecting, []
+            await self._write_batch(batch)
+        while not self.queue.empty():
+            batch = [self.queue.get_nowait() for _ in range(min(self.batch_size, self.queue.qsize()))]
+            await self._write_batch(batch)
+            total += len(batch)
+        return total
+
+    async def _flush_loop(self) -> None:
+        """Collect batches by size or age and write them."""
+        while True:
+            await self._collect_row(timeout=None)
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+            while len(self._collecting) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not await self._collect_row(timeout=remaining):
+                    break
+
+            batch, self._collecting = self._collecting, []
+            # Shielded so stopping waits for an in-flight insert rather than aborting it
+            self._writing = asyncio.ensure_future(self._write_batch(batch))
+            await asyncio.shield(self._writing)
+            self._writing = None
+
+    async def _collect_row(self, timeout: Optional[float]) -> bool:
+        """
+        Move the next queued row into the current batch, waiting up to timeout.
+
+        asyncio.wait_for is avoided: on Python 3.11 it can return a row it
+        took off the queue while swallowing the task's cancellation.
+        """
+        getter = asyncio.ensure_future(self.queue.get())
+        try:
+            await asyncio.wait({getter}, timeout=timeout)
+        finally:
+            if getter.done() and not getter.cancelled():
+                self._collecting.append(getter.result())
+            else:
+                getter.cancel()
+        return getter.done() and not getter.cancelled()
+
+    async def _replay_loop(self) -> None:
+        """Replay spilled rows now and then every replay_interval."""
+        while True:
+            try:
+                await self.replay_spilled()
+            except Exception:
+                logger.error("Replaying spilled rows failed", exc_info=True)
+            await asyncio.sleep(self.replay_interval)
+
+    async def _write_batch(self, batch: List[Tuple[Table, Row]]) -> None:
+        """Insert a batch in one transaction, falling back to one per row; spill or drop what fails."""
+        by_table: Dict[Table, List[Row]] = {}
+        for table, row in batch:
+            by_table.setdefault(table, []).append(row)
+
+        try:
+            async with get_database().get_async_session() as session:
+                for table, rows in by_table.items():
+                    await self._insert(session, table, rows)
+        except CONNECTION_ERRORS as exception:
+            logger.error(
+                "Bulk insert failed",
+                exc_info=True,
+                extra={"rows": len(batch), "spill": self.spill, "exception": str(exception)},
+            )
+            await self._write_failed(by_table)
+            return
+        except Exception as exception:
+            logger.warning(
+                "Bulk insert failed, retrying rows one by one",
+                extra={"rows": len(batch), "exception": str(exception)},
+            )
+            await self._write_rows(by_table)
+            return
+
+        self.stats.written += len(batch)
+        self.stats.batches += 1
+
+    async def _write_rows(self, by_table: Dict[Table, List[Row]]) -> None:
+        """Insert rows one transaction each so a bad row only loses itself."""
+        pending = [(table, row) for table, rows in by_table.items() for row in rows]
+        failed: Dict[Table, List[Row]] = {}
+        error = None
+        for index, (table, row) in enumerate(pending):
+            try:
+                async with get_database().get_async_session() as session:
+                    await self._insert(session, table, [row])
+            except CONNECTION_ERRORS as exception:
+                # The rest would fail the same way; keep them together
+                error = exception
+                for table, row in pending[index:]:
+                    failed.setdefault(table, []).append(row)
+                break
+            except Exception as exception:
+                error = exception
+                failed.setdefault(table, []).append(row)
+            else:
+                self.stats.written += 1
+
+        if failed:
+            logger.error(
+                "Rows failed to insert",
+                extra={
+                    "rows": sum(len(rows) for rows in failed.values()),
+                    "spill": self.spill,
+                    "exception": str(error),
+                },
+            )
+            await self._write_failed(failed)
+
+    async def _write_failed(self, by_table: Dict[Table, List[Row]]) -> None:
+        """Spill rows that could not be inserted, or count them as dropped."""
+        for table, rows in by_table.items():
+            if self.spill:
+                await self._spill(table, rows)
+            else:
+                self.stats.dropped += len(rows)
+
+    @staticmethod
+    async def _insert(session, table: Table, rows: List[Row]) -> None:
+        """Multi-row INSERT ... VALUES, chunked under the bind parameter limit."""
+        chunk_size = max(1, MAX_BIND_PARAMETERS // max(1, len(rows[0])))
+        for start in range(0, len(rows), chunk_size):
+            await session.execute(insert(table).values(rows[start:start + chunk_size]))
+
+    @staticmethod
+    def _pack(row: Row) -> bytes:
+        """Serialize a row for the spill stream (enums by name, as SQLAlchemy binds them)."""
+        return msgpack.packb(
+            {key: value.name if isinstance(value, enum.Enum) else value for key, value in row.items()},
+            datetime=True,
+            use_bin_type=True,
+        )
+
+    @staticmethod
+    def _unpack(data: bytes) -> Row:
+        """Deserialize a spilled row."""
+        return msgpack.unpackb(data, timestamp=3, raw=False)
+
+    async def _spill(self, table: Table, rows: List[Row]) -> None:
+        """Append rows to the table's spill stream; count them as dropped if Redis fails too."""
+        key = bulk_write_spill_key(table.name)
+        try:
+            pipeline = get_redis().async_client.pipeline(transaction=False)
+            for row in rows:
+                pipeline.xadd(key, {"row": self._pack(row)}, maxlen=self.spill_max_len, approximate=True)
+            await pipeline.execute()
+            self.stats.spilled += len(rows)
+        except Exception as exception:
+            self.stats.dropped += len(rows)
+            logger.error(
+                "Failed to spill rows",
+                exc_info=True,
+                extra={"table": table.name, "rows": len(rows), "exception": str(exception)},
+            )
+
+    async def replay_spilled(self) -> int:
+        """
+        Insert rows from the spill streams, acknowledging and deleting them once committed.
+
+        A batch that fails is retried row by row, so one bad row does not hold
+        back the rest. Rows that fail are left pending and claimed again later;
+        once delivered max_replay_attempts times they are moved to the table's
+        dead-letter stream. A lost database connection ends the pass instead.
+
+        Returns:
+            Number of rows replayed
+        """
+        client = get_redis().async_client
+        total = 0
+
+        for table in self.tables.values():
+            key = bulk_write_spill_key(table.name)
+            try:
+                await client.xgroup_create(key, SPILL_GROUP, id="0", mkstream=True)
+            except ResponseError as error:
+                if "BUSYGROUP" not in str(error):
+                    raise
+
+            while True:
+                claimed = await client.xautoclaim(
+                    key, SPILL_GROUP, self.consumer, min_idle_time=SPILL_CLAIM_IDLE_MS, count=self.batch_size
+                )
+                entries = [(entry_id, fields) for entry_id, fields in claimed[1] if fields]
+                if not entries:
+                    response = await client.xreadgroup(SPILL_GROUP, self.consumer, {key: ">"}, count=self.batch_size)
+                    entries = response[0][1] if response else []
+                if not entries:
+                    break
+
+                packed = {entry_id: fields[b"row"] for entry_id, fields in entries}
+                errors = await self._insert_spilled(table, packed)
+                attempts = await self._delivery_counts(client, key, list(errors)) if errors else {}
+                dead = {
+                    entry_id: (packed[entry_id], error, attempts.get(entry_id, 1))
+                    for entry_id, error in errors.items()
+                    if attempts.get(entry_id, 1) >= self.max_replay_attempts
+                }
+                if dead:
+                    await self._dead_letter(table, dead)
+
+                # Failed rows not yet dead-lettered stay pending for a later claim
+                finished = [entry_id for entry_id in packed if entry_id not in errors or entry_id in dead]
+                if finished:
+                    await client.xack(key, SPILL_GROUP, *finished)
+                    await client.xdel(key, *finished)
+                total += len(packed) - len(errors)
+
+        if total:
+            self.stats.replayed += total
+            logger.info("Replayed spilled rows", extra={"rows": total})
+        return total
+
+    async def _insert_spilled(self, table: Table, packed: Dict[bytes, bytes]) -> Dict[bytes, str]:
+        """
+        Insert spilled rows in one transaction, falling back to one per row.
+
+        Args:
+            table: Table the rows belong to
+            packed: Serialized rows by stream entry id
+
+        Returns:
+            Error message by entry id for rows that could not be inserted
+
+        Raises:
+            OperationalError, InterfaceError, OSError: If the database is unreachable
+        """
+        try:
+            async with get_database().get_async_session() as session:
+                await self._insert(session, table, [self._unpack(data) for data in packed.values()])
+            return {}
+        except CONNECTION_ERRORS:
+            raise
+        except Exception:
+            if len(packed) > 1:
+                logger.warning(
+                    "Replaying spilled batch failed, retrying rows one by one",
+                    extra={"table": table.name, "rows": len(packed)},
+                )
+
+        errors: Dict[bytes, str] = {}
+        for entry_id, data in packed.items():
+            try:
+                async with get_database().get_async_session() as session:
+                    await self._insert(session, table, [self._unpack(data)])
+            except CONNECTION_ERRORS:
+                raise
+            except Exception as exception:
+                errors[entry_id] = str(exception)
+        return errors
+
+    @staticmethod
+    async def _delivery_counts(client, key: str, entry_ids: List[bytes]) -> Dict[bytes, int]:
+        """Times each pending entry has been delivered to the consumer group."""
+        pipeline = client.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipeline.xpending_range(key, SPILL_GROUP, min=entry_id, max=entry_id, count=1)
+        return {
+            entry_id: pending[0]["times_delivered"]
+            for entry_id, pending in zip(entry_ids, await pipeline.execute())
+            if pending
+        }
+
+    async def _dead_letter(self, table: Table, entries: Dict[bytes, Tuple[bytes, str, int]]) -> None:
+        """Move rows that keep failing to the table's dead-letter stream, with the last error."""
+        key = bulk_write_dead_letter_key(table.name)
+        pipeline = get_redis().async_client.pipeline(transaction=False)
+        for entry_id, (data, error, attempts) in entries.items():
+            pipeline.xadd(
+                key,
+                {"row": data, "error": error, "attempts": attempts, "spill_id": entry_id},
+                maxlen=self.spill_max_len,
+                approximate=True,
+            )
+        await pipeline.execute()
+
+        self.stats.dead_lettered += len(entries)
+        logger.error(
+            "Dead-lettered spilled rows that kept failing to insert",
+            extra={"table": table.name, "rows": len(entries), "stream": key},
+        )
+
+
+# Global bulk writer instance
+_bulk_writer: Optional[BulkWriter] = None
+
+
+def init_bulk_writer() -> BulkWriter:
+    """
+    Initialize the global bulk writer from settings.
+
+    Returns:
+        BulkWriter instance (not yet started)
+    """
+    global _bulk_writer
+    _bulk_writer = BulkWriter(
+        batch_size=settings.bulk_write_batch_size,
+        max_wait_ms=settings.bulk_write_max_wait_ms,
+        max_buffer=settings.bulk_write_max_buffer,
+        spill=settings.bulk_write_spill,
+        spill_max_len=settings.bulk_write_spill_max_len,
+        max_replay_attempts=settings.bulk_write_replay_max_attempts,
+    )
+    return _bulk_writer
+
+
+def get_bulk_writer() -> BulkWriter:
+    """
+    Get the global bulk writer.
+
+    Returns:
+        BulkWriter instance
+
+    Raises:
+        RuntimeError: If the writer has not been initialized
+    """
+    if _bulk_writer is None:
+        raise RuntimeError("Bulk writer not initialized. Call init_bulk_writer() first.")
+    return _bulk_writer
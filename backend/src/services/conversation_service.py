@@ -0,0 +1,100 @@
+"""
+Conversation history service.
+Lists a user's conversations and their messages with keyset pagination.
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.logging_config import get_logger
+from src.middleware.error_handler import APIError
+from src.models.conversation import Conversation, Message
+from src.utils.pagination import Page, keyset_page
+
+logger = get_logger(__name__)
+
+
+class ConversationService:
+    """Service for reading conversation history."""
+
+    @staticmethod
+    async def list_conversations(
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """
+        List a user's conversations, most recently active first.
+
+        Served by ix_conversations_user_updated_id (user_id, updated_at, id).
+
+        Args:
+            session: Database session
+            user_id: User ID
+            limit: Page size
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Page of Conversation objects
+        """
+        return await keyset_page(
+            session,
+            select(Conversation).where(Conversation.user_id == user_id),
+            scope="conversations",
+            sort_columns=(Conversation.updated_at, Conversation.id),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    @staticmethod
+    async def get_conversation_messages(
+        session: AsyncSession,
+        user_id: int,
+        conversation_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[Conversation, Page]:
+        """
+        Get a conversation and one page of its messages, newest first.
+
+        Served by ix_messages_conversation_created_id (conversation_id, created_at, id).
+
+        Args:
+            session: Database session
+            user_id: User ID (must own the conversation)
+            conversation_id: Conversation ID
+            limit: Page size
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Tuple of (Conversation, page of Message objects)
+
+        Raises:
+            APIError: If the conversation does not exist or belongs to another user
+        """
+        result = await session.execute(
+            select(Conversation).where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user_id,
+            )
+        )
+        conversation = result.scalar_one_or_none()
+
+        if not conversation:
+            logger.warning(
+                "Conversation not found",
+                extra={"user_id": user_id, "conversation_id": conversation_id}
+            )
+            raise APIError("Conversation not found", status_code=404)
+
+        page = await keyset_page(
+            session,
+            select(Message).where(Message.conversation_id == conversation_id),
+            scope=f"messages:{conversation_id}",
+            sort_columns=(Message.created_at, Message.id),
+            limit=limit,
+            cursor=cursor,
+        )
+        return conversation, page
@@ -7,6 +7,7 @@ from abc import ABC, abstractmethod
 import aiohttp
 from src.config import settings
 from src.logging_config import get_logger
+from src.utils.request_io import http_trace_config
 
 logger = get_logger(__name__)
 
@@ -91,7 +92,7 @@ class SendGridProvider(EmailProvider):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[http_trace_config()]) as session:
                 async with session.post(
                     self.api_url,
                     json=payload,
@@ -0,0 +1,371 @@
+"""
+Embedding backfill job.
+Streams rows with NULL embeddings in keyset-paginated batches, embeds them
+with cache reuse, and writes them back with one bulk UPDATE per batch.
+Progress is checkpointed so an interrupted run restarts where it stopped.
+"""
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.interaction_log import InteractionLog
+from ..models.user import User
+from ..models.user_memory import UserMemory
+from ..utils.logger import get_logger
+from .embedding_service import EmbeddingService
+from .learning_pattern_service import learning_history_from_memory
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# Upper bound on the wait between retries of a batch the provider failed
+MAX_RETRY_BACKOFF_SECONDS = 60.0
+
+
+class EmbeddingBackfillError(Exception):
+    """Raised when the embedding provider keeps failing a backfill batch."""
+    pass
+
+
+def _interaction_row_to_text(service: EmbeddingService, row: Any) -> str:
+    """Build interaction text from an interaction_logs row."""
+    data = dict(row.interaction_data or {})
+    data["interaction_type"] = row.interaction_type
+    if row.context_type:
+        data["context_type"] = row.context_type
+    return service._interaction_data_to_text(data)
+
+
+def _user_row_to_text(service: EmbeddingService, row: Any) -> str:
+    """Build profile text from a users row."""
+    return service._user_data_to_text(
+        {
+            "programming_language": row.programming_language,
+            "skill_level": row.skill_level.value if row.skill_level else None,
+            "career_goals": row.career_goals,
+            "learning_style": row.learning_style,
+            "bio": row.bio,
+        }
+    )
+
+
+def _memory_row_to_text(service: EmbeddingService, row: Any) -> str:
+    """Build learning-pattern text from a user_memory row."""
+    return service._learning_history_to_text(learning_history_from_memory(row))
+
+
+@dataclass(frozen=True)
+class BackfillTarget:
+    """Table, columns and text builder for one backfillable embedding column."""
+
+    table: str
+    key_column: Any
+    embedding_column: Any
+    source_columns: Tuple[Any, ...]
+    to_text: Callable[[EmbeddingService, Any], str]
+
+
+BACKFILL_TARGETS: Dict[str, BackfillTarget] = {
+    "interaction_logs": BackfillTarget(
+        table="interaction_logs",
+        key_column=InteractionLog.id,
+        embedding_column=InteractionLog.interaction_embedding,
+        source_columns=(
+            InteractionLog.interaction_type,
+            InteractionLog.context_type,
+            InteractionLog.interaction_data,
+        ),
+        to_text=_interaction_row_to_text,
+    ),
+    "users": BackfillTarget(
+        table="users",
+        key_column=User.id,
+        embedding_column=User.profile_embedding,
+        source_columns=(
+            User.programming_language,
+            User.skill_level,
+            User.career_goals,
+            User.learning_style,
+            User.bio,
+        ),
+        to_text=_user_row_to_text,
+    ),
+    "user_memory": BackfillTarget(
+        table="user_memory",
+        key_column=UserMemory.id,
+        embedding_column=UserMemory.learning_pattern_embedding,
+        source_columns=(
+            UserMemory.topic_mastery,
+            UserMemory.identified_strengths,
+            UserMemory.identified_weaknesses,
+            UserMemory.learning_pace,
+            UserMemory.average_completion_time_minutes,
+            UserMemory.average_grade,
+        ),
+        to_text=_memory_row_to_text,
+    ),
+}
+
+
+@dataclass
+class BackfillStats:
+    """Progress counters for a backfill run."""
+
+    target: str
+    last_id: int = 0
+    rows_scanned: int = 0
+    rows_updated: int = 0
+    rows_skipped: int = 0
+    provider_failures: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Scanned rows per second over the run so far."""
+        return self.rows_scanned / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def vector_literal(embedding: Sequence[float]) -> str:
+    """Format an embedding as a pgvector text literal."""
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def build_bulk_update(target: BackfillTarget, updates: Sequence[Tuple[int, Sequence[float]]]):
+    """
+    Build one UPDATE ... FROM (VALUES ...) statement for a batch.
+
+    Args:
+        target: Backfill target
+        updates: (row key, embedding) pairs
+
+    Returns:
+        Tuple of (text statement, bind parameters)
+    """
+    key = target.key_column.key
+    column = target.embedding_column.key
+    values = ", ".join(
+        f"(CAST(:id_{i} AS integer), CAST(:embedding_{i} AS vector))" for i in range(len(updates))
+    )
+    statement = text(
+        f"UPDATE {target.table} AS t SET {column} = v.embedding "
+        f"FROM (VALUES {values}) AS v(id, embedding) "
+        f"WHERE t.{key} = v.id AND t.{column} IS NULL"
+    )
+    parameters: Dict[str, Any] = {}
+    for i, (row_id, embedding) in enumerate(updates):
+        parameters[f"id_{i}"] = row_id
+        parameters[f"embedding_{i}"] = vector_literal(embedding)
+    return statement, parameters
+
+
+class EmbeddingBackfillJob:
+    """
+    Resumable backfill of NULL embeddings for one target table.
+
+    Each batch reads the next page of NULL rows after the last processed key
+    through a server-side cursor, embeds the page outside any transaction,
+    then writes it back in a single statement. Memory is bounded by the batch
+    size regardless of table size.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        session_factory: SessionFactory,
+        target: str,
+        batch_size: int = 500,
+        max_rows_per_second: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        max_retries: int = 5,
+        retry_backoff_seconds: float = 1.0,
+    ):
+        """
+        Initialize backfill job.
+
+        Args:
+            embedding_service: Service used to embed batches (with its cache)
+            session_factory: Callable returning an async session context manager
+                that commits on exit (e.g. DatabaseManager.get_async_session)
+            target: Key of BACKFILL_TARGETS
+            batch_size: Rows per page, embedding call and UPDATE
+            max_rows_per_second: Optional throughput cap to protect the
+                embedding provider and database
+            checkpoint_path: Optional JSON file recording progress
+            max_retries: Consecutive retries of a batch the provider failed
+                before the run is aborted
+            retry_backoff_seconds: Wait before the first retry, doubled on each
+                further one
+        """
+        if target not in BACKFILL_TARGETS:
+            raise ValueError(f"Unknown backfill target: {target}")
+
+        self.embedding_service = embedding_service
+        self.session_factory = session_factory
+        self.target = BACKFILL_TARGETS[target]
+        self.batch_size = batch_size
+        self.max_rows_per_second = max_rows_per_second
+        self.checkpoint_path = checkpoint_path
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.stats = self._load_checkpoint() or BackfillStats(target=target)
+
+    async def run(self, max_rows: Optional[int] = None) -> BackfillStats:
+        """
+        Process batches until no NULL rows remain or max_rows is reached.
+
+        Rows with empty text are skipped. Progress never moves past a row the
+        provider failed to embed: the batch is cut there and retried with
+        backoff, so an outage cannot checkpoint over rows it never embedded.
+
+        Args:
+            max_rows: Optional cap on rows scanned in this run
+
+        Returns:
+            Final progress counters
+
+        Raises:
+            EmbeddingBackfillError: If a batch still fails after max_retries retries
+        """
+        run_start = time.monotonic()
+        elapsed_before = self.stats.elapsed_seconds
+        scanned_this_run = 0
+        consecutive_failures = 0
+
+        while max_rows is None or scanned_this_run < max_rows:
+            batch_start = time.monotonic()
+            limit = self.batch_size if max_rows is None else min(self.batch_size, max_rows - scanned_this_run)
+
+            rows = await self._fetch_page(self.stats.last_id, limit)
+            if not rows:
+                break
+
+            texts = [self.target.to_text(self.embedding_service, row) for row in rows]
+            embeddings = await self.embedding_service.batch_generate_embeddings(texts)
+
+            failed = [
+                index for index, (text, embedding) in enumerate(zip(texts, embeddings))
+                if embedding is None and text and text.strip()
+            ]
+            if failed:
+                self.stats.provider_failures += len(failed)
+                rows, embeddings = rows[:failed[0]], embeddings[:failed[0]]
+
+            if rows:
+                updates = [
+                    (row.key, embedding) for row, embedding in zip(rows, embeddings) if embedding is not None
+                ]
+                if updates:
+                    await self._write_batch(updates)
+
+                scanned_this_run += len(rows)
+                self.stats.last_id = rows[-1].key
+                self.stats.rows_scanned += len(rows)
+                self.stats.rows_updated += len(updates)
+                self.stats.rows_skipped += len(rows) - len(updates)
+                self.stats.batches += 1
+
+            self.stats.elapsed_seconds = elapsed_before + time.monotonic() - run_start
+            self._save_checkpoint()
+
+            if failed:
+                consecutive_failures += 1
+                if consecutive_failures > self.max_retries:
+                    raise EmbeddingBackfillError(
+                        f"Embedding provider failed {consecutive_failures} batches in a row "
+                        f"for {self.stats.target} after id {self.stats.last_id}"
+                    )
+                delay = min(self.retry_backoff_seconds * 2 ** (consecutive_failures - 1), MAX_RETRY_BACKOFF_SECONDS)
+                logger.warning(
+                    "Embedding provider failed during backfill, retrying batch",
+                    extra={
+                        "target": self.stats.target,
+                        "last_id": self.stats.last_id,
+                        "failed_rows": len(failed),
+                        "attempt": consecutive_failures,
+                        "retry_in_seconds": delay,
+                    },
+                )
+                await asyncio.sleep(delay)
+                continue
+            consecutive_failures = 0
+
+            logger.info(
+                "Embedding backfill batch complete",
+                extra={
+                    "target": self.stats.target,
+                    "last_id": self.stats.last_id,
+                    "batch_rows": len(rows),
+                    "batch_updated": len(updates),
+                    "rows_updated": self.stats.rows_updated,
+                    "rows_per_second": round(self.stats.rows_per_second, 1),
+                },
+            )
+
+            await self._throttle(len(rows), time.monotonic() - batch_start)
+
+        self.stats.elapsed_seconds = elapsed_before + time.monotonic() - run_start
+        self._save_checkpoint()
+
+        logger.info("Embedding backfill finished", extra=asdict(self.stats))
+        return self.stats
+
+    async def _fetch_page(self, after_id: int, limit: int) -> List[Any]:
+        """Stream the next page of rows with a NULL embedding after after_id."""
+        query = (
+            select(self.target.key_column.label("key"), *self.target.source_columns)
+            .where(self.target.embedding_column.is_(None), self.target.key_column > after_id)
+            .order_by(self.target.key_column)
+            .limit(limit)
+            .execution_options(yield_per=limit)
+        )
+        async with self.session_factory() as session:
+            result = await session.stream(query)
+            return [row async for row in result]
+
+    async def _write_batch(self, updates: Sequence[Tuple[int, Sequence[float]]]) -> None:
+        """Write a batch of embeddings with one statement."""
+        statement, parameters = build_bulk_update(self.target, updates)
+        async with self.session_factory() as session:
+            await session.execute(statement, parameters)
+
+    async def _throttle(self, rows: int, batch_seconds: float) -> None:
+        """Sleep long enough to keep throughput under max_rows_per_second."""
+        if not self.max_rows_per_second:
+            return
+        minimum_seconds = rows / self.max_rows_per_second
+        if batch_seconds < minimum_seconds:
+            await asyncio.sleep(minimum_seconds - batch_seconds)
+
+    def _load_checkpoint(self) -> Optional[BackfillStats]:
+        """Load saved progress for this target, if any."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            data = json.load(checkpoint_file)
+
+        if data.get("target") != self.target.table:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to target {data.get('target')}"
+            )
+
+        logger.info("Resuming embedding backfill from checkpoint", extra=data)
+        return BackfillStats(**data)
+
+    def _save_checkpoint(self) -> None:
+        """Atomically persist progress so a crash never leaves a torn file."""
+        if not self.checkpoint_path:
+            return
+
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(asdict(self.stats), checkpoint_file)
+        os.replace(temporary_path, self.checkpoint_path)
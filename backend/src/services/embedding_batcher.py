@@ -0,0 +1,141 @@
+"""
+Micro-batcher for embedding requests.
+Coalesces concurrent single-text embedding calls into batched provider requests.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BatchEmbedFunction = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Collects concurrent embedding requests and flushes them as one batch.
+
+    A batch is flushed when it reaches max_batch_size items or when
+    max_wait_ms has elapsed since its first item arrived, whichever comes
+    first. Identical texts within a batch share a single provider input.
+    """
+
+    def __init__(
+        self,
+        embed_batch: BatchEmbedFunction,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 10.0,
+    ):
+        """
+        Initialize embedding batcher.
+
+        Args:
+            embed_batch: Coroutine that embeds a list of texts, preserving order
+            max_batch_size: Maximum number of unique texts per batch
+            max_wait_ms: Maximum time to wait for a batch to fill in milliseconds
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        # Pending batch: unique text -> futures waiting on it
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+
+    async def submit(self, text: str) -> List[float]:
+        """
+        Queue a text for embedding and wait for its vector.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector for the text
+
+        Raises:
+            Exception: Whatever the batch call raised for this text's batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        waiters = self._pending.get(text)
+        if waiters is not None:
+            waiters.append(future)
+        else:
+            self._pending[text] = [future]
+            if len(self._pending) >= self.max_batch_size:
+                self._flush_now()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(
+                    self.max_wait_ms / 1000.0, self._flush_now
+                )
+
+        return await future
+
+    async def flush(self) -> None:
+        """Flush the pending batch immediately and wait for in-flight batches."""
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of unique texts waiting for the next flush."""
+        return len(self._pending)
+
+    def _flush_now(self) -> None:
+        """Detach the pending batch and schedule its provider call."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = {}
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        """Embed one batch and resolve every waiting future."""
+        texts = list(batch.keys())
+
+        try:
+            embeddings = await self.embed_batch(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(
+                    f"Batch embedding returned {len(embeddings)} vectors for {len(texts)} texts"
+                )
+        except Exception as error:
+            logger.error(
+                "Embedding batch failed",
+                extra={"error": str(error), "batch_size": len(texts)},
+            )
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+
+        requests = 0
+        for text, embedding in zip(texts, embeddings):
+            for index, future in enumerate(batch[text]):
+                requests += 1
+                if not future.done():
+                    # Duplicate waiters get their own copy so callers can't mutate each other's vectors
+                    future.set_result(embedding if index == 0 else list(embedding))
+
+        logger.debug(
+            "Embedding batch flushed",
+            extra={"unique_texts": len(texts), "requests": requests},
+        )
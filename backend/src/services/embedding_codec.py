@@ -0,0 +1,140 @@
+"""
+Compact binary encoding for cached embedding vectors.
+Stores vectors as little-endian float32, float16 or int8-quantized bytes
+behind a small versioned header, and still reads legacy JSON lists.
+"""
+import json
+import struct
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+# Header layout: version (1 byte), dtype code (1 byte), 2 reserved bytes.
+# Four bytes keep the float32 payload 4-byte aligned for zero-copy views.
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+DTYPE_FLOAT32 = "float32"
+DTYPE_FLOAT16 = "float16"
+DTYPE_INT8 = "int8"
+
+_DTYPE_CODES = {
+    DTYPE_FLOAT32: 1,
+    DTYPE_FLOAT16: 2,
+    DTYPE_INT8: 3,
+}
+_CODE_DTYPES = {code: name for name, code in _DTYPE_CODES.items()}
+
+# int8 payloads carry a float32 scale right after the header
+_INT8_SCALE = struct.Struct("<f")
+
+
+def encode_embedding(
+    embedding: Union[Sequence[float], np.ndarray],
+    dtype: str = DTYPE_FLOAT32,
+) -> bytes:
+    """
+    Encode an embedding vector as versioned binary bytes.
+
+    Args:
+        embedding: Embedding vector
+        dtype: Storage type: 'float32' (lossless for API vectors),
+            'float16' (half size) or 'int8' (quarter size, per-vector scale)
+
+    Returns:
+        Encoded bytes suitable for storing in Redis
+
+    Raises:
+        ValueError: If dtype is not supported
+    """
+    if dtype not in _DTYPE_CODES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+    vector = np.asarray(embedding, dtype=np.float32)
+    header = struct.pack("<BBxx", FORMAT_VERSION, _DTYPE_CODES[dtype])
+
+    if dtype == DTYPE_FLOAT32:
+        return header + vector.astype("<f4", copy=False).tobytes()
+
+    if dtype == DTYPE_FLOAT16:
+        return header + vector.astype("<f2").tobytes()
+
+    # Symmetric per-vector int8 quantization
+    max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+    return header + _INT8_SCALE.pack(scale) + quantized.tobytes()
+
+
+def decode_embedding(data: Union[bytes, bytearray, memoryview, str]) -> np.ndarray:
+    """
+    Decode a cached embedding into a float32 NumPy array.
+
+    float32 payloads are returned as a read-only view over the input buffer
+    without copying. Legacy JSON-encoded lists are still accepted.
+
+    Args:
+        data: Bytes produced by encode_embedding, or a legacy JSON list
+
+    Returns:
+        1-D float32 array
+
+    Raises:
+        ValueError: If the data is not a recognized embedding encoding
+    """
+    if isinstance(data, str):
+        return np.asarray(json.loads(data), dtype=np.float32)
+
+    buffer = memoryview(data)
+    if len(buffer) == 0:
+        raise ValueError("Empty embedding payload")
+
+    # Legacy entries were stored as JSON text, which always starts with '['
+    if buffer[0] == ord("["):
+        return np.asarray(json.loads(bytes(buffer)), dtype=np.float32)
+
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError("Truncated embedding header")
+
+    version, dtype_code = struct.unpack_from("<BBxx", buffer)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported embedding format version: {version}")
+
+    dtype = _CODE_DTYPES.get(dtype_code)
+    if dtype == DTYPE_FLOAT32:
+        return np.frombuffer(buffer, dtype="<f4", offset=HEADER_SIZE)
+
+    if dtype == DTYPE_FLOAT16:
+        return np.frombuffer(buffer, dtype="<f2", offset=HEADER_SIZE).astype(np.float32)
+
+    if dtype == DTYPE_INT8:
+        (scale,) = _INT8_SCALE.unpack_from(buffer, HEADER_SIZE)
+        quantized = np.frombuffer(buffer, dtype=np.int8, offset=HEADER_SIZE + _INT8_SCALE.size)
+        return quantized.astype(np.float32) * np.float32(scale)
+
+    raise ValueError(f"Unsupported embedding dtype code: {dtype_code}")
+
+
+def decode_int8_codes(data: Union[bytes, bytearray, memoryview]) -> Tuple[np.ndarray, float]:
+    """
+    Read an int8 payload without dequantizing it.
+
+    Args:
+        data: Bytes produced by encode_embedding(..., dtype='int8')
+
+    Returns:
+        Tuple of (int8 codes view, scale) where codes * scale approximates the vector
+
+    Raises:
+        ValueError: If the data is not an int8 embedding encoding
+    """
+    buffer = memoryview(data)
+    if len(buffer) < HEADER_SIZE + _INT8_SCALE.size:
+        raise ValueError("Truncated int8 embedding payload")
+
+    version, dtype_code = struct.unpack_from("<BBxx", buffer)
+    if version != FORMAT_VERSION or _CODE_DTYPES.get(dtype_code) != DTYPE_INT8:
+        raise ValueError("Not an int8 embedding payload")
+
+    (scale,) = _INT8_SCALE.unpack_from(buffer, HEADER_SIZE)
+    return np.frombuffer(buffer, dtype=np.int8, offset=HEADER_SIZE + _INT8_SCALE.size), scale
@@ -0,0 +1,558 @@
+"""
+Quantized embedding search.
+Compresses embeddings with int8 scalar quantization (4x) or product
+quantization (16x and beyond), searches the compact codes in memory, and
+re-ranks the best candidates against full-precision vectors from Postgres.
+"""
+import json
+import os
+import shutil
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.interaction_log import InteractionLog
+from ..utils.logger import get_logger
+from .embedding_codec import DTYPE_INT8, decode_int8_codes, encode_embedding
+from .embedding_service import EmbeddingService
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+QUANTIZED_INDEX_FORMAT_VERSION = 1
+
+# Rows scored per block, bounding the temporary float32 copy of the codes
+_SCORE_BLOCK_ROWS = 8192
+
+ArrayLike = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+class Int8Quantizer:
+    """
+    Symmetric per-vector int8 scalar quantization.
+
+    Uses the same scheme as the 'int8' embedding codec, so codes can be
+    loaded straight from interaction_logs.embedding_code.
+    """
+
+    kind = "int8"
+
+    def __init__(self, dimension: int):
+        """Initialize quantizer for vectors of the given dimension."""
+        self.dimension = dimension
+
+    def encode(self, vectors: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Quantize L2-normalized vectors.
+
+        Args:
+            vectors: Matrix of shape (n, dimension)
+
+        Returns:
+            Tuple of (int8 codes of shape (n, dimension), float32 scales of shape (n,))
+        """
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        max_abs = np.max(np.abs(matrix), axis=1) if matrix.size else np.empty(0, dtype=np.float32)
+        scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+        """
+        Approximate inner products between float queries and int8 codes.
+
+        Args:
+            queries: Normalized float32 matrix of shape (q, dimension)
+            codes: int8 codes of shape (n, dimension)
+            scales: Per-vector scales of shape (n,)
+
+        Returns:
+            Score matrix of shape (q, n)
+        """
+        result = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], _SCORE_BLOCK_ROWS):
+            block = codes[start:start + _SCORE_BLOCK_ROWS].astype(np.float32)
+            result[:, start:start + block.shape[0]] = (queries @ block.T) * scales[start:start + block.shape[0]]
+        return result
+
+    def save(self, path: str) -> Dict[str, Any]:
+        """Quantizer state is just the dimension; return it for meta.json."""
+        return {"kind": self.kind, "dimension": self.dimension}
+
+    @classmethod
+    def load(cls, path: str, meta: Dict[str, Any]) -> "Int8Quantizer":
+        """Recreate the quantizer from meta.json."""
+        return cls(meta["dimension"])
+
+
+class ProductQuantizer:
+    """
+    Product quantizer with 256 centroids per subspace (one byte per subspace).
+
+    Each vector is split into n_subspaces chunks and every chunk is replaced
+    by the id of its nearest codebook centroid. Queries are scored with
+    asymmetric distance computation: a per-query lookup table of chunk-to-
+    centroid inner products, summed over the code bytes.
+    """
+
+    kind = "pq"
+    n_centroids = 256
+
+    def __init__(self, codebooks: np.ndarray):
+        """
+        Initialize quantizer around trained codebooks.
+
+        Args:
+            codebooks: Array of shape (n_subspaces, 256, subspace_dimension)
+        """
+        self.codebooks = np.ascontiguousarray(codebooks, dtype=np.float32)
+        self.n_subspaces, _, self.subspace_dimension = self.codebooks.shape
+        self.dimension = self.n_subspaces * self.subspace_dimension
+
+    @classmethod
+    def train(
+        cls,
+        vectors: ArrayLike,
+        n_subspaces: Optional[int] = None,
+        iterations: int = 10,
+        sample_size: int = 10000,
+        seed: int = 0,
+    ) -> "ProductQuantizer":
+        """
+        Train per-subspace codebooks with k-means on a sample.
+
+        Args:
+            vectors: Training vectors of shape (n, dimension)
+            n_subspaces: Code bytes per vector (default: dimension // 4, i.e. 16x
+                smaller than float32); must divide the dimension
+            iterations: k-means iterations per subspace
+            sample_size: Maximum vectors used for training
+            seed: Random seed for reproducible training
+
+        Returns:
+            Trained quantizer
+        """
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        count, dimension = matrix.shape
+        if count == 0:
+            raise ValueError("Cannot train a quantizer without vectors")
+
+        n_subspaces = n_subspaces or max(1, dimension // 4)
+        if dimension % n_subspaces:
+            raise ValueError(f"n_subspaces={n_subspaces} does not divide dimension {dimension}")
+        subspace_dimension = dimension // n_subspaces
+
+        rng = np.random.default_rng(seed)
+        sample = matrix[rng.choice(count, size=min(count, sample_size), replace=False)]
+        n_centroids = min(cls.n_centroids, sample.shape[0])
+
+        codebooks = np.zeros((n_subspaces, cls.n_centroids, subspace_dimension), dtype=np.float32)
+        for subspace in range(n_subspaces):
+            chunk = sample[:, subspace * subspace_dimension:(subspace + 1) * subspace_dimension]
+            centroids = chunk[rng.choice(chunk.shape[0], size=n_centroids, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignments = _nearest_centroids(chunk, centroids)
+                counts = np.bincount(assignments, minlength=n_centroids)
+                # Per-column bincount is much faster than np.add.at for narrow subspaces
+                sums = np.stack(
+                    [
+                        np.bincount(assignments, weights=chunk[:, column], minlength=n_centroids)
+                        for column in range(subspace_dimension)
+                    ],
+                    axis=1,
+                ).astype(np.float32)
+
+                # Re-seed empty centroids from random sample points
+                empty = counts == 0
+                if np.any(empty):
+                    sums[empty] = chunk[rng.choice(chunk.shape[0], size=int(empty.sum()))]
+                    counts[empty] = 1
+
+                centroids = sums / counts[:, None].astype(np.float32)
+
+            codebooks[subspace, :n_centroids] = centroids
+            # Tiny samples train fewer than 256 centroids; pad with a real one, never zeros
+            codebooks[subspace, n_centroids:] = centroids[0]
+
+        logger.info(
+            "Product quantizer trained",
+            extra={"vectors": count, "n_subspaces": n_subspaces, "sample_size": sample.shape[0]},
+        )
+
+        return cls(codebooks)
+
+    def encode(self, vectors: ArrayLike) -> Tuple[np.ndarray, None]:
+        """
+        Encode L2-normalized vectors as uint8 codes.
+
+        Args:
+            vectors: Matrix of shape (n, dimension)
+
+        Returns:
+            Tuple of (uint8 codes of shape (n, n_subspaces), None)
+        """
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        codes = np.empty((matrix.shape[0], self.n_subspaces), dtype=np.uint8)
+
+        for start in range(0, matrix.shape[0], _SCORE_BLOCK_ROWS):
+            block = matrix[start:start + _SCORE_BLOCK_ROWS]
+            for subspace in range(self.n_subspaces):
+                chunk = block[:, subspace * self.subspace_dimension:(subspace + 1) * self.subspace_dimension]
+                codes[start:start + block.shape[0], subspace] = _nearest_centroids(chunk, self.codebooks[subspace])
+
+        return codes, None
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate vectors from codes."""
+        parts = self.codebooks[np.arange(self.n_subspaces), codes]
+        return parts.reshape(codes.shape[0], self.dimension)
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Approximate inner products with asymmetric distance computation.
+
+        Args:
+            queries: Normalized float32 matrix of shape (q, dimension)
+            codes: uint8 codes of shape (n, n_subspaces)
+            scales: Unused
+
+        Returns:
+            Score matrix of shape (q, n)
+        """
+        # Lookup tables: (q, n_subspaces, 256) inner products of query chunks with centroids
+        chunks = queries.reshape(queries.shape[0], self.n_subspaces, self.subspace_dimension)
+        tables = np.einsum("qsd,scd->qsc", chunks, self.codebooks)
+
+        result = np.zeros((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for subspace in range(self.n_subspaces):
+            column = codes[:, subspace]
+            for row, table in enumerate(tables):
+                result[row] += table[subspace].take(column)
+        return result
+
+    def save(self, path: str) -> Dict[str, Any]:
+        """Write codebooks next to the index and return meta.json fields."""
+        np.save(os.path.join(path, "codebooks.npy"), self.codebooks)
+        return {"kind": self.kind, "dimension": self.dimension, "n_subspaces": self.n_subspaces}
+
+    @classmethod
+    def load(cls, path: str, meta: Dict[str, Any]) -> "ProductQuantizer":
+        """Load codebooks written by save."""
+        return cls(np.load(os.path.join(path, "codebooks.npy")))
+
+
+Quantizer = Union[Int8Quantizer, ProductQuantizer]
+_QUANTIZERS = {Int8Quantizer.kind: Int8Quantizer, ProductQuantizer.kind: ProductQuantizer}
+
+
+def _nearest_centroids(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid (Euclidean) for each point."""
+    # ||p - c||^2 = ||p||^2 - 2 p.c + ||c||^2; ||p||^2 does not change the argmin
+    distances = np.einsum("cd,cd->c", centroids, centroids) - 2.0 * (points @ centroids.T)
+    return np.argmin(distances, axis=1)
+
+
+class QuantizedIndex:
+    """
+    Flat index over quantized codes with optional exact re-ranking.
+
+    Code storage is 1 byte per dimension for int8 and 1 byte per subspace for
+    PQ, instead of 4 bytes per dimension, so much larger tables fit in RAM.
+    Search scans all codes; callers re-rank the top candidates against
+    full-precision vectors to recover recall.
+    """
+
+    def __init__(
+        self,
+        quantizer: Quantizer,
+        ids: np.ndarray,
+        codes: np.ndarray,
+        scales: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize index.
+
+        Args:
+            quantizer: Quantizer that produced the codes
+            ids: Row ids of shape (n,)
+            codes: Codes of shape (n, code_width)
+            scales: Per-vector scales (int8 only)
+        """
+        if len(ids) != len(codes):
+            raise ValueError("ids and codes must have the same length")
+        self.quantizer = quantizer
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.codes = codes
+        self.scales = scales
+
+    @classmethod
+    def build(cls, quantizer: Quantizer, ids: Sequence[int], vectors: ArrayLike) -> "QuantizedIndex":
+        """Encode full-precision vectors into a new index."""
+        codes, scales = quantizer.encode(vectors)
+        return cls(quantizer, np.asarray(ids), codes, scales)
+
+    def __len__(self) -> int:
+        """Number of indexed vectors."""
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by codes, scales and ids."""
+        total = self.codes.nbytes + self.ids.nbytes
+        if self.scales is not None:
+            total += self.scales.nbytes
+        return total
+
+    def search(self, query: ArrayLike, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k search over the codes.
+
+        Args:
+            query: Query vector of shape (dimension,)
+            k: Number of results
+
+        Returns:
+            Tuple of (ids, approximate scores), best first
+        """
+        queries = EmbeddingService.normalize_embeddings(np.asarray(query, dtype=np.float32).reshape(1, -1))
+        scores = self.quantizer.scores(queries, self.codes, self.scales)[0]
+
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        positions = np.argpartition(-scores, k - 1)[:k]
+        positions = positions[np.argsort(-scores[positions])]
+        return self.ids[positions], scores[positions]
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index to a directory of .npy files, swapped in atomically.
+
+        Args:
+            path: Target directory
+        """
+        temporary_path = f"{path}.tmp"
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+
+        meta = self.quantizer.save(temporary_path)
+        np.save(os.path.join(temporary_path, "codes.npy"), np.asarray(self.codes))
+        np.save(os.path.join(temporary_path, "ids.npy"), self.ids)
+        if self.scales is not None:
+            np.save(os.path.join(temporary_path, "scales.npy"), np.asarray(self.scales))
+        with open(os.path.join(temporary_path, "meta.json"), "w") as meta_file:
+            json.dump({**meta, "version": QUANTIZED_INDEX_FORMAT_VERSION, "count": len(self.ids)}, meta_file)
+
+        previous_path = f"{path}.old"
+        shutil.rmtree(previous_path, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, previous_path)
+        os.rename(temporary_path, path)
+        shutil.rmtree(previous_path, ignore_errors=True)
+
+        logger.info("Quantized index saved", extra={"path": path, "count": len(self.ids), "kind": meta["kind"]})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "QuantizedIndex":
+        """
+        Load a persisted index, memory-mapping codes so workers share pages.
+
+        Args:
+            path: Directory written by save
+            mmap: Memory-map codes and ids read-only
+
+        Returns:
+            Loaded index
+        """
+        with open(os.path.join(path, "meta.json")) as meta_file:
+            meta: Dict[str, Any] = json.load(meta_file)
+        if meta.get("version") != QUANTIZED_INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported quantized index format version: {meta.get('version')}")
+
+        quantizer = _QUANTIZERS[meta["kind"]].load(path, meta)
+        mmap_mode = "r" if mmap else None
+        scales_path = os.path.join(path, "scales.npy")
+
+        return cls(
+            quantizer,
+            np.load(os.path.join(path, "ids.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, "codes.npy"), mmap_mode=mmap_mode),
+            np.load(scales_path) if os.path.exists(scales_path) else None,
+        )
+
+
+def rerank(
+    query: ArrayLike,
+    candidate_ids: Sequence[int],
+    candidate_vectors: ArrayLike,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exactly re-rank candidates with their full-precision vectors.
+
+    Args:
+        query: Query vector
+        candidate_ids: Candidate ids
+        candidate_vectors: Full-precision vectors aligned with candidate_ids
+        k: Number of results
+
+    Returns:
+        Tuple of (ids, cosine similarities), best first
+    """
+    ids = np.asarray(candidate_ids, dtype=np.int64)
+    if len(ids) == 0:
+        return ids, np.empty(0, dtype=np.float32)
+
+    matrix = EmbeddingService.normalize_embeddings(candidate_vectors)
+    positions, scores = EmbeddingService.top_k(query, matrix, k)
+    return ids[positions], scores
+
+
+async def load_interaction_codes(session: AsyncSession, batch_size: int = 5000) -> QuantizedIndex:
+    """
+    Build an int8 index from interaction_logs.embedding_code.
+
+    Reads the compact column only, so loading moves a quarter of the bytes
+    of the vector column and never dequantizes.
+
+    Args:
+        session: Database session
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        Int8 quantized index keyed by interaction id
+    """
+    query = (
+        select(InteractionLog.id, InteractionLog.embedding_code)
+        .where(InteractionLog.embedding_code.is_not(None))
+        .order_by(InteractionLog.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    ids: List[int] = []
+    codes: List[np.ndarray] = []
+    scales: List[float] = []
+    result = await session.stream(query)
+    async for row_id, data in result:
+        code, scale = decode_int8_codes(data)
+        ids.append(row_id)
+        codes.append(code)
+        scales.append(scale)
+
+    dimension = codes[0].shape[0] if codes else 0
+    return QuantizedIndex(
+        Int8Quantizer(dimension),
+        np.asarray(ids, dtype=np.int64),
+        np.stack(codes) if codes else np.empty((0, dimension), dtype=np.int8),
+        np.asarray(scales, dtype=np.float32),
+    )
+
+
+async def search_interactions(
+    session: AsyncSession,
+    index: QuantizedIndex,
+    query_embedding: ArrayLike,
+    k: int = 10,
+    rerank_factor: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Search interactions with the quantized index and re-rank in Postgres data.
+
+    The index yields k * rerank_factor candidates; only their full-precision
+    vectors are read back for exact cosine re-ranking.
+
+    Args:
+        session: Database session
+        index: Quantized index over interaction ids
+        query_embedding: Query vector
+        k: Number of results
+        rerank_factor: Candidates re-ranked per result (1 disables re-ranking)
+
+    Returns:
+        List of dictionaries with interaction id and similarity, best first
+    """
+    candidate_ids, approximate_scores = index.search(query_embedding, k * max(1, rerank_factor))
+    if rerank_factor <= 1 or len(candidate_ids) == 0:
+        return [
+            {"id": int(row_id), "similarity": float(score)}
+            for row_id, score in zip(candidate_ids[:k], approximate_scores[:k])
+        ]
+
+    result = await session.execute(
+        select(InteractionLog.id, InteractionLog.interaction_embedding).where(
+            InteractionLog.id.in_(candidate_ids.tolist()),
+            InteractionLog.interaction_embedding.is_not(None),
+        )
+    )
+    rows = result.all()
+    ids, scores = rerank(
+        query_embedding,
+        [row_id for row_id, _ in rows],
+        np.asarray([embedding for _, embedding in rows], dtype=np.float32),
+        k,
+    )
+
+    return [{"id": int(row_id), "similarity": float(score)} for row_id, score in zip(ids, scores)]
+
+
+async def encode_missing_interaction_codes(session_factory: SessionFactory, batch_size: int = 1000) -> int:
+    """
+    Fill interaction_logs.embedding_code for rows that have an embedding but no code.
+
+    Pages through rows by id and writes each page with one
+    UPDATE ... FROM (VALUES ...) statement in its own transaction.
+
+    Args:
+        session_factory: Callable returning an async session context manager
+            that commits on exit (e.g. DatabaseManager.get_async_session)
+        batch_size: Rows per page
+
+    Returns:
+        Number of rows encoded
+    """
+    last_id = 0
+    encoded = 0
+
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(InteractionLog.id, InteractionLog.interaction_embedding)
+                .where(
+                    InteractionLog.id > last_id,
+                    InteractionLog.interaction_embedding.is_not(None),
+                    InteractionLog.embedding_code.is_(None),
+                )
+                .order_by(InteractionLog.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            values = ", ".join(
+                f"(CAST(:id_{i} AS integer), CAST(:code_{i} AS bytea))" for i in range(len(rows))
+            )
+            parameters: Dict[str, Any] = {}
+            vectors = EmbeddingService.normalize_embeddings([embedding for _, embedding in rows])
+            for i, ((row_id, _), vector) in enumerate(zip(rows, vectors)):
+                parameters[f"id_{i}"] = row_id
+                parameters[f"code_{i}"] = encode_embedding(vector, DTYPE_INT8)
+
+            await session.execute(
+                text(
+                    f"UPDATE interaction_logs AS t SET embedding_code = v.code "
+                    f"FROM (VALUES {values}) AS v(id, code) WHERE t.id = v.id"
+                ),
+                parameters,
+            )
+
+        last_id = rows[-1][0]
+        encoded += len(rows)
+
+    logger.info("Interaction embedding codes encoded", extra={"rows": encoded})
+    return encoded
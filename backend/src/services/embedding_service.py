@@ -1,57 +1,98 @@
 """
 Embedding generation service for creating vector embeddings.
-Uses GROQ LLM service for generating embeddings from text.
+Delegates vector generation to a pluggable embedding provider (OpenAI or local).
 """
-import json
+import asyncio
 import hashlib
 import numpy as np
-from typing import List, Optional, Dict, Any
-from openai import AsyncOpenAI
+from typing import List, Optional, Dict, Any, Tuple, Union
 import redis.asyncio as aioredis
 
 from ..utils.logger import get_logger
-from ..config import settings
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_codec import DTYPE_FLOAT32, decode_embedding, encode_embedding
+from .embedding_store import EmbeddingStore
+from .embeddings import BaseEmbeddingProvider, create_embedding_provider
 
 logger = get_logger(__name__)
 
+# Provider output is a list; cache and store hits are read-only float32 arrays
+# decoded without copying. Convert with list() or .tolist() only where a caller
+# needs plain floats (e.g. JSON responses).
+Embedding = Union[List[float], np.ndarray]
+
 
 class EmbeddingService:
     """
-    Service for generating vector embeddings from text using OpenAI API.
+    Service for generating vector embeddings from text via an embedding provider.
     Provides caching and batch processing capabilities.
     """
 
     def __init__(
         self,
         redis_client: Optional[aioredis.Redis] = None,
-        cache_ttl: int = 86400  # 24 hours
+        cache_ttl: int = 86400,  # 24 hours
+        batch_wait_ms: Optional[float] = None,
+        batch_max_size: int = 64,
+        batch_chunk_size: int = 512,
+        batch_concurrency: int = 4,
+        cache_dtype: str = DTYPE_FLOAT32,
+        embedding_store: Optional[EmbeddingStore] = None,
+        provider: Optional[BaseEmbeddingProvider] = None,
     ):
         """
         Initialize embedding service.
 
         Args:
-            redis_client: Optional Redis client for caching embeddings
+            redis_client: Optional Redis client for caching embeddings. Vectors are
+                cached as binary, so the client must not use decode_responses=True
             cache_ttl: Cache time-to-live in seconds
+            batch_wait_ms: Coalesce concurrent single-text requests for up to this
+                many milliseconds into one API call (None disables micro-batching)
+            batch_max_size: Maximum unique texts per coalesced API call
+            batch_chunk_size: Maximum inputs per API request in batch_generate_embeddings
+            batch_concurrency: Maximum concurrent API requests in batch_generate_embeddings
+            cache_dtype: Binary storage type for cached vectors: 'float32', 'float16' or 'int8'
+            embedding_store: Optional durable store consulted on Redis misses; vectors
+                found there are promoted back into Redis
+            provider: Embedding provider (defaults to the one selected by
+                EMBEDDING_PROVIDER, EMBEDDING_MODEL and EMBEDDING_DIMENSION)
         """
         self.redis = redis_client
+        self.store = embedding_store
         self.cache_ttl = cache_ttl
-        self.embedding_model = "text-embedding-ada-002"
-        self.embedding_dimension = 1536
-
-        # Initialize OpenAI client with API key from settings
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self.batch_chunk_size = batch_chunk_size
+        self.batch_concurrency = batch_concurrency
+        self.cache_dtype = cache_dtype
+        self.provider = provider or create_embedding_provider()
+        self.embedding_model = self.provider.model
+        self.embedding_dimension = self.provider.dimension
+
+        # Micro-batcher for the single-text hot path
+        self.batcher = (
+            EmbeddingBatcher(
+                self._call_embedding_api_batch,
+                max_batch_size=batch_max_size,
+                max_wait_ms=batch_wait_ms,
+            )
+            if batch_wait_ms is not None
+            else None
+        )
 
         logger.info(
             "EmbeddingService initialized",
             extra={
+                "provider": self.provider.provider_name,
                 "model": self.embedding_model,
                 "dimension": self.embedding_dimension,
                 "caching_enabled": self.redis is not None,
-                "api_key_configured": self.client is not None
+                "store_enabled": self.store is not None,
+                "batching_enabled": self.batcher is not None,
+                "provider_available": self.provider.available
             }
         )
 
-    async def generate_text_embedding(self, text: str) -> Optional[List[float]]:
+    async def generate_text_embedding(self, text: str) -> Optional[Embedding]:
         """
         Generate embedding vector from text.
 
@@ -59,7 +100,7 @@ class EmbeddingService:
             text: Input text to embed
 
         Returns:
-            List of floats representing the embedding vector, or None if failed
+            Embedding vector (a float32 array when served from cache), or None if failed
         """
         if not text or text.strip() == "":
             logger.warning("Empty text provided for embedding generation")
@@ -68,17 +109,30 @@ class EmbeddingService:
         # Check cache first
         if self.redis:
             cached = await self._get_cached_embedding(text)
-            if cached:
+            if cached is not None:
                 logger.debug("Retrieved embedding from cache")
                 return cached
 
+        if self.store:
+            stored = await self._get_stored_embeddings([text])
+            if text in stored:
+                logger.debug("Retrieved embedding from store")
+                if self.redis:
+                    await self._cache_embedding(text, stored[text])
+                return stored[text]
+
         try:
-            # Generate embedding using OpenAI API
-            embedding = await self._call_embedding_api(text)
+            # Generate embedding with the provider, coalescing with concurrent callers if enabled
+            if self.batcher:
+                embedding = await self.batcher.submit(text)
+            else:
+                embedding = await self._call_embedding_api(text)
 
             # Cache the result
             if self.redis and embedding:
                 await self._cache_embedding(text, embedding)
+            if self.store and embedding:
+                await self._store_embeddings({text: embedding})
 
             return embedding
 
@@ -90,7 +144,7 @@ class EmbeddingService:
             )
             return None
 
-    async def generate_profile_embedding(self, user_data: Dict[str, Any]) -> Optional[List[float]]:
+    async def generate_profile_embedding(self, user_data: Dict[str, Any]) -> Optional[Embedding]:
         """
         Generate embedding from user profile data.
 
@@ -110,7 +164,7 @@ class EmbeddingService:
 
         return await self.generate_text_embedding(profile_text)
 
-    async def generate_interaction_embedding(self, interaction_data: Dict[str, Any]) -> Optional[List[float]]:
+    async def generate_interaction_embedding(self, interaction_data: Dict[str, Any]) -> Optional[Embedding]:
         """
         Generate embedding from interaction log data.
 
@@ -130,7 +184,7 @@ class EmbeddingService:
 
         return await self.generate_text_embedding(interaction_text)
 
-    async def generate_learning_pattern_embedding(self, learning_history: Dict[str, Any]) -> Optional[List[float]]:
+    async def generate_learning_pattern_embedding(self, learning_history: Dict[str, Any]) -> Optional[Embedding]:
         """
         Generate embedding from learning history and patterns.
 
@@ -150,49 +204,127 @@ class EmbeddingService:
 
         return await self.generate_text_embedding(pattern_text)
 
-    async def batch_generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def batch_generate_embeddings(self, texts: List[str]) -> List[Optional[Embedding]]:
         """
         Generate embeddings for multiple texts efficiently.
 
+        Cached vectors are fetched with a single MGET, Redis misses are looked
+        up in the embedding store, only the remaining misses are sent to the API
+        in chunks of batch_chunk_size (at most batch_concurrency requests in
+        flight), and new vectors are written back in one pipeline and one insert.
+
         Args:
             texts: List of text strings to embed
 
         Returns:
-            List of embedding vectors
+            List aligned with texts: an embedding vector per item, or None for
+            empty texts and texts that could not be embedded
         """
-        if not self.client:
-            logger.error("OpenAI client not configured for batch embedding generation")
-            return []
+        results: List[Optional[Embedding]] = [None] * len(texts)
 
-        try:
-            # Filter out empty texts
-            valid_texts = [t for t in texts if t and t.strip()]
-
-            if not valid_texts:
-                return []
+        # Group input positions by text so duplicates are embedded once
+        positions: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            if text and text.strip():
+                positions.setdefault(text, []).append(index)
 
-            # Call API with batch
-            response = await self.client.embeddings.create(
-                model=self.embedding_model,
-                input=valid_texts
-            )
+        if not positions:
+            return results
 
-            embeddings = [item.embedding for item in response.data]
+        unique_texts = list(positions.keys())
+        embeddings: Dict[str, Embedding] = {}
 
-            logger.info(
-                "Batch embeddings generated",
-                extra={"count": len(embeddings)}
+        # Check cache first
+        if self.redis:
+            cached = await self._get_cached_embeddings(unique_texts)
+            for text, embedding in zip(unique_texts, cached):
+                if embedding is not None:
+                    embeddings[text] = embedding
+
+        store_hits = 0
+        if self.store:
+            stored = await self._get_stored_embeddings(
+                [text for text in unique_texts if text not in embeddings]
             )
+            store_hits = len(stored)
+            embeddings.update(stored)
 
-            return embeddings
+            # Promote warm-tier hits back into Redis
+            if self.redis and stored:
+                await self._cache_embeddings(stored)
 
-        except Exception as error:
+        misses = [text for text in unique_texts if text not in embeddings]
+        generated: Dict[str, List[float]] = {}
+
+        if misses and not self.provider.available:
             logger.error(
-                "Failed to generate batch embeddings",
-                extra={"error": str(error), "count": len(texts)},
-                exc_info=True
+                "Embedding provider not configured for batch embedding generation",
+                extra={"missing": len(misses)}
             )
-            return []
+        elif misses:
+            generated = await self._generate_missing_embeddings(misses)
+            embeddings.update(generated)
+
+            # Cache the results
+            if self.redis and generated:
+                await self._cache_embeddings(generated)
+            if self.store and generated:
+                await self._store_embeddings(generated)
+
+        for text, indexes in positions.items():
+            embedding = embeddings.get(text)
+            if embedding is None:
+                continue
+            for index in indexes:
+                results[index] = embedding
+
+        logger.info(
+            "Batch embeddings generated",
+            extra={
+                "count": len(texts),
+                "unique": len(unique_texts),
+                "cache_hits": len(unique_texts) - len(misses) - store_hits,
+                "store_hits": store_hits,
+                "generated": len(generated),
+            }
+        )
+
+        return results
+
+    async def _generate_missing_embeddings(self, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        Embed texts in provider-sized chunks with bounded concurrency.
+
+        Args:
+            texts: Unique, non-empty texts to embed
+
+        Returns:
+            Mapping of text to embedding for every chunk that succeeded
+        """
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        chunks = [
+            texts[start:start + self.batch_chunk_size]
+            for start in range(0, len(texts), self.batch_chunk_size)
+        ]
+
+        async def embed_chunk(chunk: List[str]) -> Dict[str, List[float]]:
+            async with semaphore:
+                try:
+                    vectors = await self._call_embedding_api_batch(chunk)
+                    return dict(zip(chunk, vectors))
+                except Exception as error:
+                    logger.error(
+                        "Failed to generate batch embeddings",
+                        extra={"error": str(error), "count": len(chunk)},
+                        exc_info=True
+                    )
+                    return {}
+
+        generated: Dict[str, List[float]] = {}
+        for chunk_result in await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks)):
+            generated.update(chunk_result)
+
+        return generated
 
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """
@@ -225,9 +357,91 @@ class EmbeddingService:
         # Ensure result is between 0 and 1
         return float(max(0.0, min(1.0, similarity)))
 
+    @staticmethod
+    def normalize_embeddings(embeddings: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """
+        Build a search matrix of L2-normalized embeddings.
+
+        Args:
+            embeddings: Embedding vectors, one per row
+
+        Returns:
+            C-contiguous float32 matrix of shape (n, dimension) with unit-length
+            rows (all-zero rows stay zero), ready to pass to top_k
+        """
+        matrix = np.array(embeddings, dtype=np.float32, order="C", ndmin=2)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    @staticmethod
+    def top_k(
+        query: Union[List[float], List[List[float]], np.ndarray],
+        matrix: np.ndarray,
+        k: int,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k rows of matrix most similar to the query by cosine similarity.
+
+        Uses a single matrix-vector (or matrix-matrix) product followed by
+        argpartition, so cost is one BLAS call plus O(n) selection.
+
+        Args:
+            query: One embedding of shape (dimension,) or a batch of shape (q, dimension)
+            matrix: Matrix from normalize_embeddings
+            k: Number of results per query (clipped to the number of candidates)
+            mask: Optional candidate filter, either a boolean array of length n
+                or an array of row indices (e.g. one user's rows only)
+
+        Returns:
+            Tuple of (row indices, similarity scores), best first, each of shape
+            (k,) for a single query or (q, k) for a batch
+        """
+        queries = np.asarray(query, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = EmbeddingService.normalize_embeddings(queries)
+
+        if mask is not None:
+            mask = np.asarray(mask)
+            candidates = np.flatnonzero(mask) if mask.dtype == bool else mask.astype(np.intp)
+            scores = queries @ matrix[candidates].T
+        else:
+            candidates = None
+            scores = queries @ matrix.T
+
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            empty_indices = np.empty((queries.shape[0], 0), dtype=np.intp)
+            empty_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+            return (empty_indices[0], empty_scores[0]) if single else (empty_indices, empty_scores)
+
+        # Unordered top-k per row, then sort just those k
+        partition = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        partition_scores = np.take_along_axis(scores, partition, axis=1)
+        order = np.argsort(-partition_scores, axis=1)
+        indices = np.take_along_axis(partition, order, axis=1)
+        top_scores = np.take_along_axis(partition_scores, order, axis=1)
+
+        if candidates is not None:
+            indices = candidates[indices]
+
+        if single:
+            return indices[0], top_scores[0]
+        return indices, top_scores
+
+    @property
+    def client(self):
+        """Underlying OpenAI client when the OpenAI provider is in use, else None."""
+        return getattr(self.provider, "client", None)
+
+    @client.setter
+    def client(self, value) -> None:
+        self.provider.client = value
+
     async def _call_embedding_api(self, text: str) -> List[float]:
         """
-        Call OpenAI API to generate embedding.
+        Generate one embedding with the provider.
 
         Args:
             text: Text to embed
@@ -236,27 +450,34 @@ class EmbeddingService:
             Embedding vector
 
         Raises:
-            Exception: If API call fails
+            Exception: If the provider call fails
         """
-        if not self.client:
-            raise ValueError("OpenAI API key not configured")
+        embeddings = await self.provider.embed([text])
+        return embeddings[0]
 
-        response = await self.client.embeddings.create(
-            model=self.embedding_model,
-            input=text
-        )
+    async def _call_embedding_api_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts in one provider request.
 
-        embedding = response.data[0].embedding
+        Args:
+            texts: Non-empty texts to embed
 
-        logger.debug(
-            "Embedding generated via API",
-            extra={"text_length": len(text), "embedding_dimension": len(embedding)}
-        )
+        Returns:
+            Embedding vectors in the same order as texts
+
+        Raises:
+            Exception: If the provider call fails
+        """
+        return await self.provider.embed(texts)
 
-        return embedding
+    async def close(self) -> None:
+        """Flush any pending micro-batch so no caller is left waiting, then close the provider."""
+        if self.batcher:
+            await self.batcher.flush()
+        await self.provider.close()
 
-    async def _get_cached_embedding(self, text: str) -> Optional[List[float]]:
-        """Get cached embedding from Redis."""
+    async def _get_cached_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Get cached embedding from Redis as a float32 array."""
         if not self.redis:
             return None
 
@@ -265,7 +486,7 @@ class EmbeddingService:
         try:
             cached_data = await self.redis.get(cache_key)
             if cached_data:
-                return json.loads(cached_data)
+                return decode_embedding(cached_data)
         except Exception as error:
             logger.warning(
                 "Failed to retrieve cached embedding",
@@ -274,7 +495,7 @@ class EmbeddingService:
 
         return None
 
-    async def _cache_embedding(self, text: str, embedding: List[float]) -> None:
+    async def _cache_embedding(self, text: str, embedding: Embedding) -> None:
         """Cache embedding in Redis."""
         if not self.redis:
             return
@@ -285,7 +506,7 @@ class EmbeddingService:
             await self.redis.setex(
                 cache_key,
                 self.cache_ttl,
-                json.dumps(embedding)
+                encode_embedding(embedding, self.cache_dtype)
             )
         except Exception as error:
             logger.warning(
@@ -293,10 +514,100 @@ class EmbeddingService:
                 extra={"error": str(error)}
             )
 
+    async def _get_cached_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Get cached embeddings for several texts from Redis with a single MGET."""
+        if not self.redis or not texts:
+            return [None] * len(texts)
+
+        cache_keys = [self._generate_cache_key(text) for text in texts]
+
+        try:
+            cached_values = await self.redis.mget(cache_keys)
+            return [self._decode_cached_embedding(value) for value in cached_values]
+        except Exception as error:
+            logger.warning(
+                "Failed to retrieve cached embeddings",
+                extra={"error": str(error), "count": len(texts)}
+            )
+
+        return [None] * len(texts)
+
+    def _decode_cached_embedding(self, value: Optional[bytes]) -> Optional[np.ndarray]:
+        """Decode one MGET value, treating unreadable entries as misses."""
+        if not value:
+            return None
+
+        try:
+            return decode_embedding(value)
+        except ValueError as error:
+            logger.warning(
+                "Discarding unreadable cached embedding",
+                extra={"error": str(error)}
+            )
+            return None
+
+    async def _cache_embeddings(self, embeddings: Dict[str, Embedding]) -> None:
+        """Cache several embeddings in Redis using one pipeline round trip."""
+        if not self.redis or not embeddings:
+            return
+
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for text, embedding in embeddings.items():
+                pipeline.setex(
+                    self._generate_cache_key(text),
+                    self.cache_ttl,
+                    encode_embedding(embedding, self.cache_dtype)
+                )
+            await pipeline.execute()
+        except Exception as error:
+            logger.warning(
+                "Failed to cache embeddings",
+                extra={"error": str(error), "count": len(embeddings)}
+            )
+
+    async def _get_stored_embeddings(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Look up several texts in the embedding store."""
+        if not self.store or not texts:
+            return {}
+
+        hashes = {self._content_hash(text): text for text in texts}
+
+        try:
+            found = await self.store.get_many(self.embedding_model, list(hashes))
+            return {hashes[content_hash]: vector for content_hash, vector in found.items()}
+        except Exception as error:
+            logger.warning(
+                "Failed to retrieve stored embeddings",
+                extra={"error": str(error), "count": len(texts)}
+            )
+
+        return {}
+
+    async def _store_embeddings(self, embeddings: Dict[str, Embedding]) -> None:
+        """Persist several embeddings in the embedding store."""
+        if not self.store or not embeddings:
+            return
+
+        try:
+            await self.store.put_many(
+                self.embedding_model,
+                {self._content_hash(text): embedding for text, embedding in embeddings.items()}
+            )
+        except Exception as error:
+            logger.warning(
+                "Failed to store embeddings",
+                extra={"error": str(error), "count": len(embeddings)}
+            )
+
+    @staticmethod
+    def _content_hash(text: str) -> str:
+        """SHA-256 hex digest identifying a text in the cache and the store."""
+        return hashlib.sha256(text.encode()).hexdigest()
+
     def _generate_cache_key(self, text: str) -> str:
         """Generate cache key for text."""
-        text_hash = hashlib.sha256(text.encode()).hexdigest()
-        return f"embedding:{self.embedding_model}:{text_hash}"
+        return f"embedding:{self.embedding_model}:{self._content_hash(text)}"
 
     def _user_data_to_text(self, user_data: Dict[str, Any]) -> str:
         """Convert user profile data to structured text."""
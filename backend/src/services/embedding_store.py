@@ -0,0 +1,175 @@
+"""
+Persistent content-addressed embedding store.
+Keeps vectors in Postgres keyed by (model, sha256(text)) as a warm tier
+behind the Redis cache, so stable content is never re-embedded.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable, Dict, List, Sequence, Union
+
+import numpy as np
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.embedding_store import StoredEmbedding
+from ..utils.logger import get_logger
+from .embedding_codec import DTYPE_FLOAT32, decode_embedding, encode_embedding
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# Keep IN lists and multi-row inserts well below the driver's bind parameter limit
+_CHUNK_SIZE = 1000
+
+
+class EmbeddingStore:
+    """
+    Durable embedding store with bulk lookup, bulk insert and GC.
+
+    Reads refresh last_accessed_at, but only for rows not touched within
+    touch_interval, so hot content does not turn every lookup into a write.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        dtype: str = DTYPE_FLOAT32,
+        touch_interval: timedelta = timedelta(days=1),
+    ):
+        """
+        Initialize embedding store.
+
+        Args:
+            session_factory: Callable returning an async session context manager
+                that commits on exit (e.g. DatabaseManager.get_async_session)
+            dtype: Storage type passed to encode_embedding
+            touch_interval: Minimum age of last_accessed_at before a read refreshes it
+        """
+        self.session_factory = session_factory
+        self.dtype = dtype
+        self.touch_interval = touch_interval
+
+    async def get_many(self, model: str, content_hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up stored embeddings.
+
+        Args:
+            model: Embedding model name
+            content_hashes: SHA-256 hex digests of the input texts
+
+        Returns:
+            Mapping of content hash to float32 vector for every hash found
+        """
+        found: Dict[str, np.ndarray] = {}
+        if not content_hashes:
+            return found
+
+        now = datetime.now(timezone.utc)
+        stale: List[str] = []
+
+        async with self.session_factory() as session:
+            for start in range(0, len(content_hashes), _CHUNK_SIZE):
+                chunk = list(content_hashes[start:start + _CHUNK_SIZE])
+                result = await session.execute(
+                    select(
+                        StoredEmbedding.content_hash,
+                        StoredEmbedding.embedding,
+                        StoredEmbedding.last_accessed_at,
+                    ).where(
+                        StoredEmbedding.model == model,
+                        StoredEmbedding.content_hash.in_(chunk),
+                    )
+                )
+                for content_hash, data, last_accessed_at in result:
+                    try:
+                        found[content_hash] = decode_embedding(data)
+                    except ValueError as error:
+                        logger.warning(
+                            "Discarding unreadable stored embedding",
+                            extra={"error": str(error), "content_hash": content_hash}
+                        )
+                        continue
+                    if last_accessed_at < now - self.touch_interval:
+                        stale.append(content_hash)
+
+            for start in range(0, len(stale), _CHUNK_SIZE):
+                await session.execute(
+                    update(StoredEmbedding)
+                    .where(
+                        StoredEmbedding.model == model,
+                        StoredEmbedding.content_hash.in_(stale[start:start + _CHUNK_SIZE]),
+                    )
+                    .values(last_accessed_at=now)
+                )
+
+        return found
+
+    async def put_many(
+        self,
+        model: str,
+        embeddings: Dict[str, Union[Sequence[float], np.ndarray]],
+    ) -> None:
+        """
+        Insert embeddings, leaving existing rows for the same content untouched.
+
+        Args:
+            model: Embedding model name
+            embeddings: Mapping of content hash to vector
+        """
+        if not embeddings:
+            return
+
+        rows = [
+            {
+                "model": model,
+                "content_hash": content_hash,
+                "embedding": encode_embedding(embedding, self.dtype),
+                "dimension": len(embedding),
+            }
+            for content_hash, embedding in embeddings.items()
+        ]
+
+        async with self.session_factory() as session:
+            for start in range(0, len(rows), _CHUNK_SIZE):
+                statement = insert(StoredEmbedding).values(rows[start:start + _CHUNK_SIZE])
+                await session.execute(statement.on_conflict_do_nothing())
+
+    async def collect_garbage(self, max_age: timedelta, batch_size: int = 10000) -> int:
+        """
+        Delete embeddings not accessed within max_age.
+
+        Deletes in batches, each in its own transaction, to keep locks and
+        WAL bursts small on large stores.
+
+        Args:
+            max_age: Rows whose last_accessed_at is older than this are removed
+            batch_size: Rows deleted per transaction
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = datetime.now(timezone.utc) - max_age
+        deleted = 0
+
+        while True:
+            expired = (
+                select(StoredEmbedding.model, StoredEmbedding.content_hash)
+                .where(StoredEmbedding.last_accessed_at < cutoff)
+                .limit(batch_size)
+            )
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    delete(StoredEmbedding).where(
+                        tuple_(StoredEmbedding.model, StoredEmbedding.content_hash).in_(expired)
+                    )
+                )
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+
+        logger.info(
+            "Embedding store garbage collected",
+            extra={"deleted": deleted, "cutoff": cutoff.isoformat()}
+        )
+        return deleted
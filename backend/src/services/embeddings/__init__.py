@@ -0,0 +1,17 @@
+"""
+Embedding providers for CodeMentor.
+Provides remote and local backends behind a common interface.
+"""
+from .base_provider import BaseEmbeddingProvider, EmbeddingProviderError
+from .openai_provider import OpenAIEmbeddingProvider
+from .hashing_provider import HashingEmbeddingProvider
+from .factory import EMBEDDING_PROVIDERS, create_embedding_provider
+
+__all__ = [
+    "BaseEmbeddingProvider",
+    "EmbeddingProviderError",
+    "OpenAIEmbeddingProvider",
+    "HashingEmbeddingProvider",
+    "EMBEDDING_PROVIDERS",
+    "create_embedding_provider",
+]
@@ -0,0 +1,46 @@
+"""
+Base embedding provider abstraction for CodeMentor.
+Defines the interface that all embedding providers must implement.
+"""
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class BaseEmbeddingProvider(ABC):
+    """Abstract base class for embedding providers."""
+
+    def __init__(self, model: str, dimension: int):
+        """Initialize the provider with its model name and output dimension."""
+        self.model = model
+        self.dimension = dimension
+        self.provider_name = self.__class__.__name__
+
+    @property
+    def available(self) -> bool:
+        """Whether the provider is configured and able to embed."""
+        return True
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts.
+
+        Args:
+            texts: Non-empty texts to embed
+
+        Returns:
+            One vector of length dimension per text, in input order
+
+        Raises:
+            EmbeddingProviderError: If the provider cannot embed the texts
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release provider resources."""
+        pass
+
+
+class EmbeddingProviderError(Exception):
+    """Base exception for embedding provider errors."""
+    pass
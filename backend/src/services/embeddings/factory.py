@@ -0,0 +1,39 @@
+"""
+Factory for creating embedding provider instances.
+"""
+from typing import Optional
+
+from src.config import settings
+from .base_provider import BaseEmbeddingProvider
+from .hashing_provider import HashingEmbeddingProvider
+from .openai_provider import OpenAIEmbeddingProvider
+
+EMBEDDING_PROVIDERS = ("openai", "hashing")
+
+
+def create_embedding_provider(name: Optional[str] = None) -> BaseEmbeddingProvider:
+    """
+    Create the configured embedding provider.
+
+    Args:
+        name: Provider name (defaults to settings.embedding_provider)
+
+    Returns:
+        Embedding provider producing settings.embedding_dimension vectors
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    name = name or settings.embedding_provider
+
+    if name == "openai":
+        return OpenAIEmbeddingProvider(
+            api_key=settings.openai_api_key,
+            model=settings.embedding_model,
+            dimension=settings.embedding_dimension,
+        )
+
+    if name == "hashing":
+        return HashingEmbeddingProvider(dimension=settings.embedding_dimension)
+
+    raise ValueError(f"Unknown embedding provider: {name} (expected one of {', '.join(EMBEDDING_PROVIDERS)})")
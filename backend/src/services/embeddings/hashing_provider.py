@@ -0,0 +1,90 @@
+"""
+Local feature-hashing embedding provider.
+Embeds text on the CPU with no model download or network access.
+"""
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+from .base_provider import BaseEmbeddingProvider
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class HashingEmbeddingProvider(BaseEmbeddingProvider):
+    """
+    Signed feature-hashing embeddings over words, word bigrams and character n-grams.
+
+    Features are hashed with CRC32, so vectors are stable across processes and
+    Python versions. Counts are log-scaled and rows L2-normalized, which makes
+    cosine similarity a reasonable lexical-overlap measure. Embedding a short
+    profile or interaction summary takes well under a millisecond.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        char_ngram_sizes: tuple = (3, 4),
+        model: str = "hashing-v1",
+    ):
+        """
+        Initialize feature-hashing provider.
+
+        Args:
+            dimension: Output dimension
+            char_ngram_sizes: Character n-gram lengths hashed in addition to words
+            model: Model name, used to namespace caches and stored vectors
+        """
+        super().__init__(model=f"{model}-{dimension}", dimension=dimension)
+        self.char_ngram_sizes = char_ngram_sizes
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts locally; runs inline since it is cheap and CPU-bound."""
+        return self.embed_matrix(texts).tolist()
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into an (n, dimension) float32 matrix.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Row-normalized embedding matrix (all-zero rows for featureless texts)
+        """
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode()) for feature in features),
+                dtype=np.uint32,
+                count=len(features),
+            )
+            # Low bits pick the bucket, the top bit picks the sign to reduce collision bias
+            signs = np.where(hashes & 0x80000000, 1.0, -1.0)
+            matrix[row] = np.bincount(hashes % self.dimension, weights=signs, minlength=self.dimension)
+
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _features(self, text: str) -> List[str]:
+        """Extract hashed features from text."""
+        words = _WORD_PATTERN.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+
+        for word in words:
+            padded = f"<{word}>"
+            for size in self.char_ngram_sizes:
+                features.extend(
+                    f"c:{padded[start:start + size]}" for start in range(len(padded) - size + 1)
+                )
+
+        return features
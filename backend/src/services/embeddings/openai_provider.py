@@ -0,0 +1,90 @@
+"""
+OpenAI embedding provider implementation.
+"""
+from typing import List, Optional
+
+from openai import AsyncOpenAI
+
+from ...utils.logger import get_logger
+from .base_provider import BaseEmbeddingProvider, EmbeddingProviderError
+
+logger = get_logger(__name__)
+
+# Models whose output dimension cannot be reduced
+FIXED_DIMENSIONS = {"text-embedding-ada-002": 1536}
+
+
+class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
+    """Embedding provider backed by the OpenAI embeddings API."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        model: str = "text-embedding-ada-002",
+        dimension: int = 1536,
+    ):
+        """
+        Initialize OpenAI embedding provider.
+
+        Args:
+            api_key: OpenAI API key (the provider is unavailable without one)
+            model: Embedding model name
+            dimension: Output dimension of the model
+
+        Raises:
+            ValueError: If the model cannot produce vectors of that dimension
+        """
+        fixed = FIXED_DIMENSIONS.get(model)
+        if fixed is not None and dimension != fixed:
+            raise ValueError(f"{model} only produces {fixed}-dimensional embeddings, not {dimension}")
+
+        # Reducible models are namespaced by dimension so caches and stored
+        # vectors of another size are never served after a dimension change
+        super().__init__(model=model if fixed else f"{model}-{dimension}", dimension=dimension)
+        self.model_name = model
+        self.client = AsyncOpenAI(api_key=api_key) if api_key else None
+
+    @property
+    def available(self) -> bool:
+        """Whether an API key is configured."""
+        return self.client is not None
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with one API request.
+
+        Args:
+            texts: Non-empty texts to embed
+
+        Returns:
+            Embedding vectors in the same order as texts
+
+        Raises:
+            EmbeddingProviderError: If no API key is configured
+        """
+        if not self.client:
+            raise EmbeddingProviderError("OpenAI API key not configured")
+
+        # Only the text-embedding-3 models accept a reduced output dimension
+        options = {"dimensions": self.dimension} if self.model_name.startswith("text-embedding-3") else {}
+        response = await self.client.embeddings.create(
+            model=self.model_name,
+            input=texts,
+            **options
+        )
+
+        # The API reports each vector's input position; don't rely on response order
+        ordered = sorted(response.data, key=lambda item: item.index)
+        embeddings = [item.embedding for item in ordered]
+
+        logger.debug(
+            "Embeddings generated via API",
+            extra={"count": len(texts), "embedding_dimension": len(embeddings[0]) if embeddings else 0}
+        )
+
+        return embeddings
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self.client:
+            await self.client.close()
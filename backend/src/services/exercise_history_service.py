@@ -0,0 +1,54 @@
+"""
+Exercise history service.
+Lists a user's exercise attempts with keyset pagination.
+"""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.exercise import ExerciseStatus, UserExercise
+from src.utils.pagination import Page, keyset_page
+
+
+class ExerciseHistoryService:
+    """Service for reading exercise history."""
+
+    @staticmethod
+    async def list_history(
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[ExerciseStatus] = None,
+    ) -> Page:
+        """
+        List a user's exercise attempts, most recently updated first.
+
+        Served by ix_user_exercises_user_updated_id (user_id, updated_at, id);
+        a status filter is applied while walking that index.
+
+        Args:
+            session: Database session
+            user_id: User ID
+            limit: Page size
+            cursor: Cursor returned with the previous page
+            status: Only return attempts with this status
+
+        Returns:
+            Page of UserExercise objects
+        """
+        query = select(UserExercise).where(UserExercise.user_id == user_id)
+        scope = "exercise_history"
+        if status is not None:
+            query = query.where(UserExercise.status == status)
+            scope = f"exercise_history:{status.value}"
+
+        return await keyset_page(
+            session,
+            query,
+            scope=scope,
+            sort_columns=(UserExercise.updated_at, UserExercise.id),
+            limit=limit,
+            cursor=cursor,
+        )
@@ -0,0 +1,339 @@
+"""
+Background dependency health monitor.
+Probes Postgres, Redis and the LLM provider on an interval and caches the
+results, and samples event-loop lag, so health and readiness endpoints
+answer from memory without doing any I/O per request.
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from ..config import settings
+from ..utils.connections import get_pool_stats
+from ..utils.database import get_database
+from ..utils.logger import get_logger
+from ..utils.redis_client import get_redis
+
+logger = get_logger(__name__)
+
+Probe = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+STATUS_UP = "up"
+STATUS_DOWN = "down"
+STATUS_NOT_CONFIGURED = "not_configured"
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of the most recent run of one probe."""
+
+    name: str
+    status: str
+    latency_ms: float
+    checked_at: float = field(default_factory=time.time)
+    error: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the dependency is usable (unconfigured optional ones count as usable)."""
+        return self.status != STATUS_DOWN
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serializable form for API responses."""
+        data = asdict(self)
+        data["checked_at"] = datetime.fromtimestamp(self.checked_at, timezone.utc).isoformat()
+        return {key: value for key, value in data.items() if value is not None}
+
+
+async def probe_database() -> None:
+    """Run a trivial query through the shared async engine."""
+    async with get_database().async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def probe_redis() -> None:
+    """PING through the shared async Redis pool."""
+    await get_redis().async_client.ping()
+
+
+class LLMProbe:
+    """Checks the LLM provider API is reachable and accepts our key, without generating tokens."""
+
+    def __init__(self, api_key: Optional[str], timeout: float):
+        """
+        Initialize LLM probe.
+
+        Args:
+            api_key: Provider API key; the probe reports not_configured without one
+            timeout: Request timeout in seconds
+        """
+        self.api_key = api_key
+        self.timeout = timeout
+        self._client = None
+
+    async def __call__(self) -> Optional[Dict[str, Any]]:
+        """List models, the cheapest authenticated call the provider offers."""
+        if not self.api_key:
+            return {"status": STATUS_NOT_CONFIGURED}
+        if self._client is None:
+            from groq import AsyncGroq
+
+            self._client = AsyncGroq(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+        models = await self._client.models.list()
+        return {"models": len(models.data)}
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class HealthMonitor:
+    """
+    Cached dependency probes and event-loop lag sampling.
+
+    Critical probes (database, Redis) decide readiness; the others are
+    reported but only degrade health. A critical result older than
+    stale_after counts as down, so a stuck probe loop cannot keep an
+    instance in rotation.
+    """
+
+    def __init__(
+        self,
+        probes: Dict[str, Probe],
+        critical: Tuple[str, ...] = ("database", "redis"),
+        interval: float = 10.0,
+        timeout: float = 2.0,
+        max_loop_lag_ms: float = 500.0,
+        max_pool_utilization: float = 1.0,
+        lag_sample_interval: float = 0.5,
+        lag_window: int = 10,
+        pool_stats: Callable[[], Dict[str, Optional[Dict[str, Any]]]] = get_pool_stats,
+    ):
+        """
+        Initialize health monitor.
+
+        Args:
+            probes: Mapping of dependency name to an async probe. A probe fails by
+                raising; it may return details, or {"status": "not_configured"}
+            critical: Probes that must be up for the instance to be ready
+            interval: Seconds between probe rounds
+            timeout: Per-probe timeout in seconds
+            max_loop_lag_ms: Readiness fails while recent event-loop lag exceeds this
+            max_pool_utilization: Readiness fails while a pool is at least this full
+            lag_sample_interval: Seconds between event-loop lag samples
+            lag_window: Number of recent lag samples considered
+            pool_stats: Callable returning current pool statistics
+        """
+        self.probes = probes
+        self.critical = critical
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = 3 * interval + timeout
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_pool_utilization = max_pool_utilization
+        self.lag_sample_interval = lag_sample_interval
+        self.pool_stats = pool_stats
+
+        self.results: Dict[str, ProbeResult] = {}
+        self._lag_samples: Deque[float] = deque(maxlen=lag_window)
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Run a first probe round, then keep probing and sampling in the background."""
+        if self._tasks:
+            return
+        await self.run_probes()
+        self._tasks = [
+            asyncio.ensure_future(self._probe_loop()),
+            asyncio.ensure_future(self._lag_loop()),
+        ]
+        logger.info(
+            "Health monitor started",
+            extra={"probes": list(self.probes), "interval": self.interval},
+        )
+
+    async def stop(self) -> None:
+        """Stop background work and close probe resources."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for probe in self.probes.values():
+            close = getattr(probe, "close", None)
+            if close is not None:
+                await close()
+
+    async def run_probes(self) -> Dict[str, ProbeResult]:
+        """Run every probe concurrently and cache the results."""
+        results = await asyncio.gather(*(self._run_probe(name, probe) for name, probe in self.probes.items()))
+        for result in results:
+            previous = self.results.get(result.name)
+            if previous is not None and previous.status != result.status:
+                log = logger.warning if result.status == STATUS_DOWN else logger.info
+                log(
+                    "Dependency health changed",
+                    extra={"dependency": result.name, "status": result.status, "error": result.error},
+                )
+            self.results[result.name] = result
+        return self.results
+
+    async def _run_probe(self, name: str, probe: Probe) -> ProbeResult:
+        """Run one probe with a timeout, turning any failure into a down result."""
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(probe(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return ProbeResult(name, STATUS_DOWN, self._elapsed_ms(start), error=f"timed out after {self.timeout}s")
+        except Exception as exception:
+            return ProbeResult(name, STATUS_DOWN, self._elapsed_ms(start), error=str(exception) or type(exception).__name__)
+
+        details = dict(details or {})
+        status = details.pop("status", STATUS_UP)
+        return ProbeResult(name, status, self._elapsed_ms(start), details=details or None)
+
+    @staticmethod
+    def _elapsed_ms(start: float) -> float:
+        """Milliseconds since start."""
+        return round((time.perf_counter() - start) * 1000, 3)
+
+    async def _probe_loop(self) -> None:
+        """Re-run probes every interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_probes()
+            except Exception:
+                logger.error("Health probe round failed", exc_info=True)
+
+    async def _lag_loop(self) -> None:
+        """Measure how late the loop wakes a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_sample_interval)
+            self._lag_samples.append(max(loop.time() - start - self.lag_sample_interval, 0.0) * 1000)
+
+    @property
+    def loop_lag_ms(self) -> float:
+        """Worst event-loop lag among recent samples."""
+        return round(max(self._lag_samples), 3) if self._lag_samples else 0.0
+
+    def _critical_result(self, name: str) -> Optional[ProbeResult]:
+        """A critical probe's result, or None if it is missing or stale."""
+        result = self.results.get(name)
+        if result is None or time.time() - result.checked_at > self.stale_after:
+            return None
+        return result
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Cached health report.
+
+        Returns:
+            Overall status ('healthy', 'degraded' or 'unhealthy') and per-dependency results
+        """
+        critical_down = [
+            name for name in self.critical
+            if (result := self._critical_result(name)) is None or not result.healthy
+        ]
+        other_down = [
+            name for name, result in self.results.items()
+            if name not in self.critical and not result.healthy
+        ]
+        if critical_down:
+            status = "unhealthy"
+        elif other_down:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "checks": {name: result.as_dict() for name, result in self.results.items()},
+            "event_loop_lag_ms": self.loop_lag_ms,
+        }
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Decide whether this instance should receive traffic.
+
+        Returns:
+            Tuple of (ready, report with failing reasons, dependencies, pools and lag)
+        """
+        reasons: List[str] = []
+
+        for name in self.critical:
+            result = self._critical_result(name)
+            if result is None:
+                reasons.append(f"{name}: no recent probe result")
+            elif not result.healthy:
+                reasons.append(f"{name}: {result.error or result.status}")
+
+        pools = self.pool_stats()
+        for name, stats in pools.items():
+            utilization = (stats or {}).get("utilization")
+            if utilization is not None and utilization >= self.max_pool_utilization:
+                reasons.append(f"{name} pool exhausted ({utilization:.0%} in use)")
+
+        lag = self.loop_lag_ms
+        if lag > self.max_loop_lag_ms:
+            reasons.append(f"event loop lag {lag:.0f}ms exceeds {self.max_loop_lag_ms:.0f}ms")
+
+        ready = not reasons
+        return ready, {
+            "status": "ready" if ready else "not_ready",
+            "reasons": reasons,
+            "dependencies": {name: result.status for name, result in self.results.items()},
+            "pools": pools,
+            "event_loop_lag_ms": lag,
+        }
+
+
+# Global health monitor instance
+_health_monitor: Optional[HealthMonitor] = None
+
+
+def init_health_monitor() -> HealthMonitor:
+    """
+    Initialize the global health monitor with the standard probes.
+
+    Returns:
+        HealthMonitor instance (not yet started)
+    """
+    global _health_monitor
+    timeout = settings.health_probe_timeout_seconds
+    _health_monitor = HealthMonitor(
+        probes={
+            "database": probe_database,
+            "redis": probe_redis,
+            "llm_service": LLMProbe(settings.groq_api_key, timeout),
+        },
+        interval=settings.health_probe_interval_seconds,
+        timeout=timeout,
+        max_loop_lag_ms=settings.health_max_loop_lag_ms,
+        max_pool_utilization=settings.health_max_pool_utilization,
+    )
+    return _health_monitor
+
+
+def get_health_monitor() -> HealthMonitor:
+    """
+    Get the global health monitor.
+
+    Returns:
+        HealthMonitor instance
+
+    Raises:
+        RuntimeError: If the monitor has not been initialized
+    """
+    if _health_monitor is None:
+        raise RuntimeError("Health monitor not initialized. Call init_health_monitor() first.")
+    return _health_monitor
@@ -0,0 +1,400 @@
+"""
+Monthly partition management for interaction_logs.
+Keeps partitions created ahead of time, and once a month falls out of the
+retention window rolls it up into interaction_daily_rollups and then
+archives or drops it. Detaching a partition is a catalog change, so expiry
+costs no DELETE, no dead tuples and no vacuum on the live months.
+
+Rows for a month without a partition land in the DEFAULT partition rather
+than failing; creating that month's partition moves them out again.
+Every step runs in its own short transaction under a lock_timeout, so
+maintenance never queues behind a long query while holding up the
+reads and inserts that queue behind it in turn.
+"""
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..config import settings
+from ..utils.database import get_database
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PARENT_TABLE = "interaction_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+ROLLUP_TABLE = "interaction_daily_rollups"
+
+# pg_try_advisory_lock key, so only one process runs maintenance at a time
+MAINTENANCE_LOCK_KEY = 0x1A7E_0C5
+
+# Give up on a DDL step rather than wait this long for a lock; it is retried
+# on the next run
+DDL_LOCK_TIMEOUT = "5s"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+LIST_PARTITIONS_SQL = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = :parent"
+)
+
+# Months (UTC) with rows in the default partition, i.e. missing a partition
+DEFAULT_MONTHS_SQL = text(
+    f"SELECT date_trunc('month', created_at AT TIME ZONE 'UTC') AS month, count(*) "
+    f"FROM {DEFAULT_PARTITION} GROUP BY 1"
+)
+
+# A UTC day never spans two partitions, so each rollup row is complete and
+# rerunning it for the same partition is idempotent
+ROLLUP_SQL = """
+    INSERT INTO {rollups} (user_id, day, interaction_type, interaction_count, first_at, last_at)
+    SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, interaction_type,
+           count(*), min(created_at), max(created_at)
+    FROM {partition}
+    GROUP BY 1, 2, 3
+    ON CONFLICT (user_id, day, interaction_type) DO UPDATE SET
+        interaction_count = EXCLUDED.interaction_count,
+        first_at = EXCLUDED.first_at,
+        last_at = EXCLUDED.last_at
+"""
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing moment."""
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One monthly partition of interaction_logs."""
+
+    start: datetime
+
+    @property
+    def end(self) -> datetime:
+        """Exclusive upper bound."""
+        return add_months(self.start, 1)
+
+    @property
+    def name(self) -> str:
+        """Table name, e.g. interaction_logs_p2026_10."""
+        return f"{PARENT_TABLE}_p{self.start.year:04d}_{self.start.month:02d}"
+
+    @classmethod
+    def from_name(cls, name: str) -> Optional["Partition"]:
+        """Parse a partition table name; None for tables not named by this module."""
+        match = _PARTITION_NAME.match(name)
+        if not match:
+            return None
+        return cls(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+
+    @property
+    def bounds(self) -> str:
+        """Partition bound specification."""
+        return f"FOR VALUES FROM ('{self.start.isoformat()}') TO ('{self.end.isoformat()}')"
+
+    def create_sql(self) -> str:
+        """DDL for the table, created standalone so no lock on the parent is needed."""
+        return f"CREATE TABLE IF NOT EXISTS {self.name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"
+
+    def move_from_default_sql(self) -> str:
+        """DML moving this month's rows out of the default partition into the table."""
+        return (
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= '{self.start.isoformat()}' AND created_at < '{self.end.isoformat()}' "
+            f"RETURNING *) INSERT INTO {self.name} SELECT * FROM moved"
+        )
+
+    def attach_sql(self) -> str:
+        """DDL attaching the table to the parent; partitioned indexes are created on it."""
+        return f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {self.name} {self.bounds}"
+
+
+class PartitionManager:
+    """
+    Creates upcoming interaction_logs partitions and expires old ones.
+
+    Maintenance is idempotent and guarded by an advisory lock, so every
+    instance can run the loop.
+    """
+
+    def __init__(
+        self,
+        months_ahead: int = 3,
+        retention_months: int = 12,
+        archive_schema: Optional[str] = None,
+        interval: float = 3600.0,
+    ):
+        """
+        Initialize partition manager.
+
+        Args:
+            months_ahead: Partitions kept created beyond the current month
+            retention_months: Whole months of raw interactions kept before the current one
+            archive_schema: Schema expired partitions are moved to; None drops them
+            interval: Seconds between maintenance runs
+
+        Raises:
+            ValueError: If archive_schema is not a plain identifier or retention is negative
+        """
+        if archive_schema and not _IDENTIFIER.match(archive_schema):
+            raise ValueError(f"Invalid archive schema name: {archive_schema!r}")
+        if retention_months < 0:
+            raise ValueError("retention_months must not be negative")
+
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_schema = archive_schema or None
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def list_partitions(self, connection: AsyncConnection) -> List[Partition]:
+        """
+        List the monthly partitions currently attached, oldest first.
+
+        Args:
+            connection: Database connection
+
+        Returns:
+            List of Partition objects
+        """
+        result = await connection.execute(LIST_PARTITIONS_SQL, {"parent": PARENT_TABLE})
+        partitions = [Partition.from_name(name) for name in result.scalars().all()]
+        return sorted((partition for partition in partitions if partition), key=lambda partition: partition.start)
+
+    async def ensure_partitions(self, connection: AsyncConnection, now: Optional[datetime] = None) -> List[str]:
+        """
+        Create any missing partition from the current month to months_ahead.
+
+        Months whose rows landed in the default partition get a partition
+        too. Each partition is created standalone, filled with its rows from
+        the default partition and attached in its own transaction. ATTACH
+        takes only a SHARE UPDATE EXCLUSIVE lock on the parent, so reads and
+        inserts carry on meanwhile.
+
+        Args:
+            connection: Database connection, with no transaction in progress
+            now: Current time (defaults to now)
+
+        Returns:
+            Names of partitions created
+        """
+        current = month_start(now or datetime.now(timezone.utc))
+        async with connection.begin():
+            existing = {partition.name for partition in await self.list_partitions(connection)}
+            stranded = (await connection.execute(DEFAULT_MONTHS_SQL)).all()
+
+        if stranded:
+            logger.error(
+                "Interaction logs landed in the default partition; partition maintenance is behind",
+                extra={
+                    "rows": sum(count for _, count in stranded),
+                    "months": sorted(month_start(month).strftime("%Y-%m") for month, _ in stranded),
+                },
+            )
+
+        months = {add_months(current, offset) for offset in range(self.months_ahead + 1)}
+        months.update(month_start(month) for month, _ in stranded)
+
+        created = []
+        for month in sorted(months):
+            partition = Partition(month)
+            if partition.name in existing:
+                continue
+            async with connection.begin():
+                await self._set_lock_timeout(connection)
+                # Keeps new rows for this month out of the default partition until it is attached
+                await connection.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE"))
+                await connection.execute(text(partition.create_sql()))
+                await connection.execute(text(partition.move_from_default_sql()))
+                await connection.execute(text(partition.attach_sql()))
+            created.append(partition.name)
+        return created
+
+    async def rollup(self, connection: AsyncConnection, partition: Partition) -> int:
+        """
+        Write per-user daily counts for one partition.
+
+        Args:
+            connection: Database connection
+            partition: Partition to aggregate
+
+        Returns:
+            Number of rollup rows written
+        """
+        result = await connection.execute(
+            text(ROLLUP_SQL.format(rollups=ROLLUP_TABLE, partition=partition.name))
+        )
+        return result.rowcount
+
+    async def expire_partitions(self, connection: AsyncConnection, now: Optional[datetime] = None) -> List[str]:
+        """
+        Roll up, then archive or drop, partitions older than the retention window.
+
+        Each partition's rollup is committed before the partition is
+        removed, so raw rows are never gone without their rollup. The rollup
+        only reads the partition itself. The DETACH or DROP that follows
+        locks the parent exclusively, so it runs in its own brief
+        transaction under DDL_LOCK_TIMEOUT. DETACH ... CONCURRENTLY is not
+        an option while the parent has a default partition.
+
+        Args:
+            connection: Database connection, with no transaction in progress
+            now: Current time (defaults to now)
+
+        Returns:
+            Names of partitions expired
+        """
+        cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -self.retention_months)
+        expired = []
+
+        async with connection.begin():
+            partitions = await self.list_partitions(connection)
+
+        for partition in partitions:
+            if partition.end > cutoff:
+                break
+            # Idempotent, so a removal that times out just reruns it next time
+            async with connection.begin():
+                rows = await self.rollup(connection, partition)
+
+            async with connection.begin():
+                await self._set_lock_timeout(connection)
+                if self.archive_schema:
+                    await connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}"))
+                    await connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}"))
+                    await connection.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {self.archive_schema}"))
+                else:
+                    await connection.execute(text(f"DROP TABLE {partition.name}"))
+
+            logger.info(
+                "Expired interaction log partition",
+                extra={
+                    "partition": partition.name,
+                    "rollup_rows": rows,
+                    "archived_to": self.archive_schema,
+                },
+            )
+            expired.append(partition.name)
+        return expired
+
+    @staticmethod
+    async def _set_lock_timeout(connection: AsyncConnection) -> None:
+        """Bound how long the current transaction waits for locks."""
+        await connection.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Run one maintenance pass, unless another process holds the lock.
+
+        The pass uses one connection, holding a session-level advisory lock
+        across its transactions.
+
+        Args:
+            now: Current time (defaults to now)
+
+        Returns:
+            Partitions created and expired, or {"skipped": True}
+        """
+        async with get_database().async_engine.connect() as connection:
+            async with connection.begin():
+                locked = await connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+                )
+                if not locked.scalar():
+                    return {"skipped": True}
+
+            try:
+                created = await self.ensure_partitions(connection, now)
+                expired = await self.expire_partitions(connection, now)
+            finally:
+                async with connection.begin():
+                    await connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+                    )
+
+        if created or expired:
+            logger.info(
+                "Interaction log partitions maintained",
+                extra={"created": created, "expired": expired},
+            )
+        return {"created": created, "expired": expired}
+
+    async def start(self) -> None:
+        """Run maintenance now, then every interval in the background."""
+        if self._task is not None:
+            return
+        try:
+            await self.run()
+        except Exception:
+            logger.error("Interaction log partition maintenance failed", exc_info=True)
+        self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        """Stop background maintenance."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        """Re-run maintenance every interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run()
+            except Exception:
+                logger.error("Interaction log partition maintenance failed", exc_info=True)
+
+
+# Global partition manager instance
+_partition_manager: Optional[PartitionManager] = None
+
+
+def init_partition_manager() -> PartitionManager:
+    """
+    Initialize the global partition manager from settings.
+
+    Returns:
+        PartitionManager instance (not yet started)
+    """
+    global _partition_manager
+    _partition_manager = PartitionManager(
+        months_ahead=settings.interaction_log_partitions_ahead,
+        retention_months=settings.interaction_log_retention_months,
+        archive_schema=settings.interaction_log_archive_schema,
+        interval=settings.interaction_log_maintenance_seconds,
+    )
+    return _partition_manager
+
+
+def get_partition_manager() -> PartitionManager:
+    """
+    Get the global partition manager.
+
+    Returns:
+        PartitionManager instance
+
+    Raises:
+        RuntimeError: If the manager has not been initialized
+    """
+    if _partition_manager is None:
+        raise RuntimeError("Partition manager not initialized. Call init_partition_manager() first.")
+    return _partition_manager
@@ -0,0 +1,320 @@
+"""
+Incremental learning-pattern embeddings.
+Folds interaction embeddings into user_memory.learning_pattern_embedding as a
+decayed weighted running mean instead of re-embedding the full history.
+"""
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.user_memory import UserMemory
+from ..utils.logger import get_logger
+from .embedding_service import EmbeddingService
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# Key under user_memory.personalization_metadata holding the running-mean state
+STATE_KEY = "learning_pattern"
+
+
+def _topics(value: Any) -> List[str]:
+    """Unwrap strengths/weaknesses stored as {"topics": [...]} or a bare list."""
+    if isinstance(value, dict):
+        return list(value.get("topics") or [])
+    return list(value or [])
+
+
+def learning_history_from_memory(memory: Any) -> Dict[str, Any]:
+    """
+    Build the learning history dict expected by generate_learning_pattern_embedding.
+
+    Args:
+        memory: UserMemory instance or a row with the same attributes
+
+    Returns:
+        Learning history dictionary
+    """
+    history: Dict[str, Any] = {
+        "topic_mastery": memory.topic_mastery,
+        "identified_strengths": _topics(memory.identified_strengths),
+        "identified_weaknesses": _topics(memory.identified_weaknesses),
+        "learning_pace": memory.learning_pace,
+    }
+    if memory.average_completion_time_minutes is not None:
+        history["average_completion_time_minutes"] = memory.average_completion_time_minutes
+    if memory.average_grade is not None:
+        history["average_grade"] = memory.average_grade
+    return history
+
+
+def fold_embeddings(
+    mean: Optional[np.ndarray],
+    weight: float,
+    vectors: Sequence[Sequence[float]],
+    decay: float,
+) -> Tuple[np.ndarray, float]:
+    """
+    Fold new vectors, oldest first, into a decayed weighted running mean.
+
+    Each fold multiplies the existing weight by decay and adds the new vector
+    with weight 1, so the i-th most recent vector contributes decay**i.
+    All vectors are folded with a single matrix-vector product.
+
+    Args:
+        mean: Current running mean, or None if there is none yet
+        weight: Total decayed weight behind mean
+        vectors: New vectors in arrival order
+        decay: Per-update decay factor in (0, 1]
+
+    Returns:
+        Tuple of (new mean, new total weight)
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    count = matrix.shape[0]
+
+    # Weights for the new vectors: most recent gets 1, the one before gets decay, ...
+    new_weights = decay ** np.arange(count - 1, -1, -1, dtype=np.float64)
+    carried_weight = weight * decay ** count if mean is not None else 0.0
+
+    total_weight = carried_weight + float(new_weights.sum())
+    numerator = new_weights.astype(np.float32) @ matrix
+    if carried_weight:
+        numerator += np.float32(carried_weight) * np.asarray(mean, dtype=np.float32)
+
+    return numerator / np.float32(total_weight), total_weight
+
+
+class LearningPatternUpdater:
+    """
+    Debounced, incremental updater for learning-pattern embeddings.
+
+    Interaction embeddings are buffered per user and folded in one
+    transaction after debounce_seconds of quiet per user. Every
+    reanchor_every folded interactions the embedding is regenerated from the
+    full learning history so the running mean cannot drift indefinitely.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        session_factory: SessionFactory,
+        decay: Optional[float] = None,
+        reanchor_every: Optional[int] = None,
+        debounce_seconds: Optional[float] = None,
+        max_buffered: int = 20,
+    ):
+        """
+        Initialize learning pattern updater.
+
+        Args:
+            embedding_service: Service used for full re-anchoring
+            session_factory: Callable returning an async session context manager
+                that commits on exit (e.g. DatabaseManager.get_async_session)
+            decay: Per-interaction decay factor (defaults to settings)
+            reanchor_every: Folded interactions between full re-anchors (defaults to settings)
+            debounce_seconds: Quiet period before a user's buffer is folded (defaults to settings)
+            max_buffered: Fold immediately once a user has this many buffered interactions,
+                so a steady stream of activity cannot postpone the update forever
+        """
+        self.embedding_service = embedding_service
+        self.session_factory = session_factory
+        self.decay = settings.learning_pattern_decay if decay is None else decay
+        self.reanchor_every = (
+            settings.learning_pattern_reanchor_every if reanchor_every is None else reanchor_every
+        )
+        self.debounce_seconds = (
+            settings.learning_pattern_debounce_seconds if debounce_seconds is None else debounce_seconds
+        )
+
+        self.max_buffered = max_buffered
+
+        if not 0 < self.decay <= 1:
+            raise ValueError("decay must be in (0, 1]")
+
+        self._pending: Dict[int, List[List[float]]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._inflight: set = set()
+        # Per-user flush locks and how many flushes hold or await each one
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._lock_users: Dict[int, int] = {}
+
+    @property
+    def anchor_weight(self) -> float:
+        """Weight given to a fully regenerated embedding: the steady-state running weight."""
+        return 1.0 / (1.0 - self.decay) if self.decay < 1 else float(self.reanchor_every)
+
+    def record_interaction(self, user_id: int, interaction_embedding: Sequence[float]) -> None:
+        """
+        Buffer an interaction embedding for a user.
+
+        The user's buffer is folded once no new interaction has arrived for
+        debounce_seconds, or as soon as it holds max_buffered interactions.
+
+        Args:
+            user_id: User ID
+            interaction_embedding: Embedding of the interaction
+        """
+        buffered = self._pending.setdefault(user_id, [])
+        buffered.append(list(interaction_embedding))
+        if len(buffered) >= self.max_buffered:
+            self._schedule_flush(user_id)
+            return
+
+        timer = self._timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        loop = asyncio.get_running_loop()
+        self._timers[user_id] = loop.call_later(self.debounce_seconds, self._schedule_flush, user_id)
+
+    async def flush(self) -> None:
+        """Fold every buffered user now and wait for in-flight updates."""
+        for user_id in list(self._pending):
+            self._schedule_flush(user_id)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flush buffered interactions so none are lost on shutdown."""
+        await self.flush()
+
+    def _schedule_flush(self, user_id: int) -> None:
+        """Start folding a user's buffer in the background."""
+        timer = self._timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        task = asyncio.ensure_future(self.flush_user(user_id))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def flush_user(self, user_id: int) -> None:
+        """
+        Fold a user's buffered interaction embeddings into their learning pattern.
+
+        Args:
+            user_id: User ID
+        """
+        # Flushes for one user run one at a time: a timer flush and a
+        # max_buffered flush can overlap, and a reanchor must not race a fold
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        self._lock_users[user_id] = self._lock_users.get(user_id, 0) + 1
+        try:
+            async with lock:
+                await self._flush_locked(user_id)
+        finally:
+            self._lock_users[user_id] -= 1
+            if not self._lock_users[user_id]:
+                del self._lock_users[user_id]
+                del self._locks[user_id]
+
+    async def _flush_locked(self, user_id: int) -> None:
+        """Fold a user's buffer; the caller holds the user's flush lock."""
+        # Pop under the lock so buffers are folded in the order they filled
+        vectors = self._pending.pop(user_id, None)
+        if not vectors:
+            return
+
+        try:
+            needs_reanchor = await self._fold(user_id, vectors)
+            if needs_reanchor:
+                await self.reanchor(user_id)
+        except Exception as error:
+            logger.error(
+                "Failed to update learning pattern embedding",
+                extra={"user_id": user_id, "error": str(error), "interactions": len(vectors)},
+                exc_info=True
+            )
+
+    async def _fold(self, user_id: int, vectors: List[List[float]]) -> bool:
+        """Apply one folded update under a row lock; return whether to re-anchor."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(UserMemory).where(UserMemory.user_id == user_id).with_for_update()
+            )
+            memory = result.scalar_one_or_none()
+            if memory is None:
+                logger.warning(
+                    "No user memory for learning pattern update",
+                    extra={"user_id": user_id}
+                )
+                return False
+
+            metadata = dict(memory.personalization_metadata or {})
+            state = dict(metadata.get(STATE_KEY) or {})
+
+            current = memory.learning_pattern_embedding
+            # An embedding without state came from a full generation (e.g. the backfill)
+            mean, weight = fold_embeddings(
+                None if current is None else np.asarray(current, dtype=np.float32),
+                float(state.get("weight", self.anchor_weight if current is not None else 0.0)),
+                vectors,
+                self.decay,
+            )
+
+            state["weight"] = weight
+            state["since_anchor"] = int(state.get("since_anchor", 0)) + len(vectors)
+            state["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+            memory.learning_pattern_embedding = mean
+            # JSON columns are not mutation-tracked, so assign a new dict
+            memory.personalization_metadata = {**metadata, STATE_KEY: state}
+
+        logger.debug(
+            "Learning pattern embedding folded",
+            extra={"user_id": user_id, "interactions": len(vectors), "weight": round(weight, 3)}
+        )
+        return state["since_anchor"] >= self.reanchor_every
+
+    async def reanchor(self, user_id: int) -> bool:
+        """
+        Regenerate a user's learning pattern embedding from the full history.
+
+        The embedding call is made outside any transaction; the running-mean
+        weight is kept so subsequent folds blend in at the same rate.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if the embedding was replaced
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(select(UserMemory).where(UserMemory.user_id == user_id))
+            memory = result.scalar_one_or_none()
+            history = learning_history_from_memory(memory) if memory is not None else None
+
+        if history is None:
+            return False
+
+        anchor = await self.embedding_service.generate_learning_pattern_embedding(history)
+        if anchor is None:
+            return False
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(UserMemory).where(UserMemory.user_id == user_id).with_for_update()
+            )
+            memory = result.scalar_one_or_none()
+            if memory is None:
+                return False
+
+            metadata = dict(memory.personalization_metadata or {})
+            state = dict(metadata.get(STATE_KEY) or {})
+            state.setdefault("weight", self.anchor_weight)
+            state["since_anchor"] = 0
+            state["anchored_at"] = datetime.now(timezone.utc).isoformat()
+
+            memory.learning_pattern_embedding = anchor
+            memory.last_analyzed_at = datetime.now(timezone.utc)
+            memory.personalization_metadata = {**metadata, STATE_KEY: state}
+
+        logger.info("Learning pattern embedding re-anchored", extra={"user_id": user_id})
+        return True
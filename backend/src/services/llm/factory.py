@@ -6,6 +6,7 @@ import redis.asyncio as aioredis
 
 from src.config import settings
 from src.utils.logger import get_logger
+from src.utils.redis_client import get_redis
 from .groq_provider import GroqProvider
 from .llm_service import LLMService
 
@@ -19,7 +20,7 @@ async def create_llm_service(
     Create and configure an LLM service instance.
 
     Args:
-        redis_client: Redis client (will create one if not provided)
+        redis_client: Redis client (defaults to the shared RedisManager client)
         enable_caching: Whether to enable response caching
         enable_rate_limiting: Whether to enable rate limiting
 
@@ -35,14 +36,9 @@ async def create_llm_service(
     if not settings.groq_api_key:
         raise ValueError("GROQ_API_KEY is not configured")
 
-    # Create Redis client if not provided
+    # Share the process-wide Redis pool rather than opening another one
     if redis_client is None and (enable_caching or enable_rate_limiting):
-        redis_client = await aioredis.from_url(
-            settings.redis_url,
-            encoding="utf-8",
-            decode_responses=True,
-        )
-        logger.info("Redis client created", extra={"url": settings.redis_url})
+        redis_client = get_redis().async_client
 
     # Create GROQ provider
     groq_provider = GroqProvider(
@@ -20,6 +20,7 @@ from .base_provider import (
     InvalidRequestError,
     TimeoutError,
 )
+from src.utils.request_io import IO_LLM, track_io
 
 
 class GroqProvider(BaseLLMProvider):
@@ -135,12 +136,13 @@ class GroqProvider(BaseLLMProvider):
                 )
 
                 # Make the API call
-                response = await self.client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+                async with track_io(IO_LLM):
+                    response = await self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
 
                 # Calculate response time
                 response_time_ms = (time.time() - start_time) * 1000
@@ -9,6 +9,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import redis.asyncio as aioredis
 
+from src.utils.redis_keys import llm_cache_key, rate_limit_key
 from .base_provider import BaseLLMProvider, LLMRequest, LLMResponse, Message
 from .groq_provider import GroqProvider
 from .prompt_templates import PromptTemplateManager, PromptType
@@ -45,8 +46,8 @@ class RateLimiter:
         Returns:
             Tuple of (allowed, retry_after_seconds)
         """
-        minute_key = f"rate_limit:minute:{user_id}:{int(time.time() // 60)}"
-        day_key = f"rate_limit:day:{user_id}:{datetime.utcnow().strftime('%Y-%m-%d')}"
+        minute_key = rate_limit_key(user_id, "minute", int(time.time() // 60))
+        day_key = rate_limit_key(user_id, "day", datetime.utcnow().strftime('%Y-%m-%d'))
 
         # Check minute limit
         minute_count = await self.redis.incr(minute_key)
@@ -97,8 +98,8 @@ class RateLimiter:
         Returns:
             Dictionary with current minute and day usage
         """
-        minute_key = f"rate_limit:minute:{user_id}:{int(time.time() // 60)}"
-        day_key = f"rate_limit:day:{user_id}:{datetime.utcnow().strftime('%Y-%m-%d')}"
+        minute_key = rate_limit_key(user_id, "minute", int(time.time() // 60))
+        day_key = rate_limit_key(user_id, "day", datetime.utcnow().strftime('%Y-%m-%d'))
 
         minute_count = await self.redis.get(minute_key)
         day_count = await self.redis.get(day_key)
@@ -145,7 +146,7 @@ class ResponseCache:
         }
         request_json = json.dumps(request_data, sort_keys=True)
         cache_hash = hashlib.sha256(request_json.encode()).hexdigest()
-        return f"llm_cache:{cache_hash}"
+        return llm_cache_key(cache_hash)
 
     async def get(self, request: LLMRequest) -> Optional[LLMResponse]:
         """
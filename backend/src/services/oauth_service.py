@@ -10,6 +10,7 @@ from src.config import settings
 from src.logging_config import get_logger
 from src.middleware.error_handler import APIError
 from src.utils.redis_client import get_redis
+from src.utils.request_io import http_trace_config
 
 logger = get_logger(__name__)
 
@@ -145,7 +146,7 @@ class OAuthService:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[http_trace_config()]) as session:
                 async with session.post(
                     OAuthService.GITHUB_TOKEN_URL,
                     json=payload,
@@ -196,7 +197,7 @@ class OAuthService:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[http_trace_config()]) as session:
                 # Get user profile
                 async with session.get(
                     OAuthService.GITHUB_USER_URL,
@@ -295,7 +296,7 @@ class OAuthService:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[http_trace_config()]) as session:
                 async with session.post(
                     OAuthService.GOOGLE_TOKEN_URL,
                     data=payload,
@@ -344,7 +345,7 @@ class OAuthService:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[http_trace_config()]) as session:
                 async with session.get(
                     OAuthService.GOOGLE_USER_URL,
                     headers=headers,
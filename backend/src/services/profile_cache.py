@@ -0,0 +1,166 @@
+"""
+Per-user profile snapshot cache.
+Holds each user's profile views already serialized to JSON, plus the fields
+used to personalize prompts, in one Redis value. Hot profile reads then skip
+both Postgres and response serialization; adding the 'profile:' prefix to
+REDIS_NEAR_CACHE_PREFIXES also keeps snapshots in process memory.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import msgpack
+import orjson
+
+from src.config import settings
+from src.logging_config import get_logger
+from src.models.user import User
+from src.schemas.profile import UserProfileResponse, UserProgressResponse
+from src.utils.database import get_async_db_session
+from src.utils.redis_client import get_redis
+from src.utils.redis_keys import profile_snapshot_key
+
+logger = get_logger(__name__)
+
+# Bump when the snapshot layout or a cached response schema changes
+SNAPSHOT_VERSION = 1
+
+# Written over a snapshot on invalidation; while it lives, snapshots of
+# data read before the write (e.g. from a lagging replica) cannot be stored
+TOMBSTONE = b"\x00"
+
+# Time allowed between invalidation and the writer's commit
+COMMIT_GRACE_SECONDS = 5.0
+
+
+@dataclass
+class ProfileSnapshot:
+    """Serialized views of one user's profile."""
+
+    profile: bytes
+    progress: bytes
+    onboarding_status: bytes
+    preferences: bytes
+    context: Dict[str, Any]
+
+    @classmethod
+    def from_user(cls, user: User) -> "ProfileSnapshot":
+        """
+        Build a snapshot from a loaded user.
+
+        Args:
+            user: User object
+
+        Returns:
+            ProfileSnapshot instance
+        """
+        from src.services.profile_service import ProfileService
+
+        preferences = ProfileService.preferences(user)
+        return cls(
+            profile=UserProfileResponse.model_validate(user).model_dump_json().encode(),
+            progress=UserProgressResponse.model_validate(ProfileService.progress_data(user)).model_dump_json().encode(),
+            onboarding_status=_dumps_json(ProfileService.onboarding_status(user)),
+            preferences=_dumps_json(preferences),
+            context={"user_id": user.id, "name": user.name, **preferences},
+        )
+
+    def dumps(self) -> bytes:
+        """Pack the snapshot for Redis."""
+        return msgpack.packb(
+            [self.profile, self.progress, self.onboarding_status, self.preferences, self.context],
+            use_bin_type=True,
+        )
+
+    @classmethod
+    def loads(cls, data: bytes) -> "ProfileSnapshot":
+        """Unpack a snapshot read from Redis."""
+        profile, progress, onboarding_status, preferences, context = msgpack.unpackb(data, raw=False)
+        return cls(profile, progress, onboarding_status, preferences, context)
+
+
+def _dumps_json(value: Dict[str, Any]) -> bytes:
+    """Serialize a plain response dict."""
+    return orjson.dumps(value)
+
+
+def _tombstone_seconds() -> float:
+    """How long an invalidation blocks re-caching: longer than any replica in use can lag."""
+    return (
+        settings.database_replica_max_lag_seconds
+        + settings.database_replica_lag_check_seconds
+        + COMMIT_GRACE_SECONDS
+    )
+
+
+async def get_profile_snapshot(user_id: int) -> ProfileSnapshot:
+    """
+    Get a user's profile snapshot, loading and caching it on a miss.
+
+    The miss path reads through get_async_db_session, so it follows the
+    caller's read-only routing.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        ProfileSnapshot instance
+
+    Raises:
+        APIError: If user not found
+    """
+    from src.services.profile_service import ProfileService
+
+    redis_manager = get_redis()
+    key = profile_snapshot_key(user_id, SNAPSHOT_VERSION)
+
+    data = await redis_manager.get_bytes(key)
+    if data and data != TOMBSTONE:
+        try:
+            return ProfileSnapshot.loads(data)
+        except Exception as exception:
+            logger.warning(
+                "Discarding unreadable profile snapshot",
+                extra={"user_id": user_id, "exception": str(exception)},
+            )
+
+    async with get_async_db_session() as session:
+        user = await ProfileService.get_user_profile(session, user_id)
+        snapshot = ProfileSnapshot.from_user(user)
+
+    # NX: never overwrite a newer snapshot or an invalidation tombstone
+    await redis_manager.set_bytes(
+        key,
+        snapshot.dumps(),
+        expiration=settings.profile_snapshot_ttl_seconds,
+        only_if_missing=True,
+    )
+    return snapshot
+
+
+async def get_profile_context(user_id: int) -> Dict[str, Any]:
+    """
+    Get the fields used to personalize prompts for a user.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Name, programming language, skill level, goals, learning style and time commitment
+    """
+    return (await get_profile_snapshot(user_id)).context
+
+
+async def invalidate_profile_snapshot(user_id: int) -> None:
+    """
+    Drop a user's snapshot after their row changed.
+
+    Args:
+        user_id: User ID
+    """
+    stored = await get_redis().set_bytes(
+        profile_snapshot_key(user_id, SNAPSHOT_VERSION),
+        TOMBSTONE,
+        expiration=_tombstone_seconds(),
+    )
+    if not stored:
+        logger.warning("Failed to invalidate profile snapshot", extra={"user_id": user_id})
@@ -15,6 +15,7 @@ from src.schemas.profile import (
 )
 from src.middleware.error_handler import APIError
 from src.logging_config import get_logger
+from src.services.profile_cache import invalidate_profile_snapshot
 
 logger = get_logger(__name__)
 
@@ -151,6 +152,7 @@ class ProfileService:
 
         await session.flush()
         await session.refresh(user)
+        await invalidate_profile_snapshot(user_id)
 
         logger.info(
             "User onboarding completed successfully",
@@ -231,6 +233,7 @@ class ProfileService:
 
         await session.flush()
         await session.refresh(user)
+        await invalidate_profile_snapshot(user_id)
 
         logger.info(
             "User profile updated successfully",
@@ -269,6 +272,19 @@ class ProfileService:
             logger.error("User not found", extra={"user_id": user_id})
             raise APIError("User not found", status_code=404)
 
+        return ProfileService.progress_data(user)
+
+    @staticmethod
+    def progress_data(user: User) -> Dict[str, Any]:
+        """
+        Build progress statistics from a loaded user.
+
+        Args:
+            user: User object
+
+        Returns:
+            Dictionary containing progress data
+        """
         return {
             "user_id": user.id,
             "current_streak": user.current_streak,
@@ -307,6 +323,19 @@ class ProfileService:
             logger.error("User not found", extra={"user_id": user_id})
             raise APIError("User not found", status_code=404)
 
+        return ProfileService.onboarding_status(user)
+
+    @staticmethod
+    def onboarding_status(user: User) -> Dict[str, Any]:
+        """
+        Build onboarding status from a loaded user.
+
+        Args:
+            user: User object
+
+        Returns:
+            Dictionary with onboarding status
+        """
         return {
             "onboarding_completed": user.onboarding_completed,
             "can_resume": user.onboarding_completed is False,
@@ -318,3 +347,22 @@ class ProfileService:
                 user.time_commitment
             ])
         }
+
+    @staticmethod
+    def preferences(user: User) -> Dict[str, Any]:
+        """
+        Build learning preferences from a loaded user.
+
+        Args:
+            user: User object
+
+        Returns:
+            Dictionary with preference fields
+        """
+        return {
+            "programming_language": user.programming_language,
+            "skill_level": user.skill_level.value if user.skill_level else None,
+            "career_goals": user.career_goals,
+            "learning_style": user.learning_style,
+            "time_commitment": user.time_commitment,
+        }
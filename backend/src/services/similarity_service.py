@@ -0,0 +1,233 @@
+"""
+Vector similarity service.
+Runs k-nearest-neighbour queries over pgvector embedding columns with
+per-query control of index recall (ivfflat probes / HNSW ef_search).
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config import settings
+from src.models.interaction_log import InteractionLog
+from src.models.user import User
+from src.models.user_memory import UserMemory
+from src.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# HNSW returns at most ef_search candidates, and filters are applied after the
+# index scan, so filtered searches keep this many candidates per requested row
+FILTERED_EF_SEARCH_FACTOR = 4
+
+# pgvector's upper limit for hnsw.ef_search
+MAX_EF_SEARCH = 1000
+
+
+class SimilarityService:
+    """Service for k-NN queries over interaction, memory and profile embeddings."""
+
+    @staticmethod
+    async def apply_search_parameters(
+        session: AsyncSession,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        k: int = 0,
+        filtered: bool = False,
+    ) -> None:
+        """
+        Set ANN recall parameters for the current transaction.
+
+        SET LOCAL keeps the values scoped to this transaction, so pooled
+        connections never leak them to other requests. ef_search is raised to
+        at least k (FILTERED_EF_SEARCH_FACTOR * k when rows are filtered after
+        the index scan), since HNSW never returns more than ef_search rows.
+
+        Args:
+            session: Database session
+            probes: ivfflat lists to scan (default: settings.vector_ivfflat_probes)
+            ef_search: HNSW candidate list size (default: settings.vector_hnsw_ef_search)
+            k: Rows the query needs from the index scan
+            filtered: Whether a WHERE clause discards rows after the index scan
+        """
+        probes = int(probes or settings.vector_ivfflat_probes)
+        ef_search = int(ef_search or settings.vector_hnsw_ef_search)
+        needed = int(k) * (FILTERED_EF_SEARCH_FACTOR if filtered else 1)
+        ef_search = max(ef_search, min(needed, MAX_EF_SEARCH))
+
+        # SET does not accept bind parameters; values are validated as ints above
+        await session.execute(text(f"SET LOCAL ivfflat.probes = {probes}"))
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+    @staticmethod
+    async def find_similar_interactions(
+        session: AsyncSession,
+        query_embedding: Sequence[float],
+        user_id: Optional[int] = None,
+        k: int = 10,
+        interaction_type: Optional[str] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the interactions most similar to a query embedding.
+
+        When user_id is given, the user's rows are selected first through the
+        (user_id, ...) composite indexes and ranked exactly. Letting the planner
+        use the global ANN index with a user filter would rank first and filter
+        afterwards, which silently returns fewer than k rows for most users.
+
+        interaction_logs is partitioned by month, so passing since limits the
+        search to the partitions from that month on.
+
+        Args:
+            session: Database session
+            query_embedding: Query vector
+            user_id: Restrict results to one user's interactions
+            k: Number of results
+            interaction_type: Optional interaction type filter
+            probes: ivfflat probes for global searches
+            ef_search: HNSW ef_search for global searches
+            since: Only consider interactions created at or after this time
+
+        Returns:
+            List of matches with id, user_id, interaction_type, created_at and similarity
+        """
+        filters = [InteractionLog.interaction_embedding.is_not(None)]
+        if interaction_type:
+            filters.append(InteractionLog.interaction_type == interaction_type)
+        if since is not None:
+            filters.append(InteractionLog.created_at >= since)
+
+        if user_id is not None:
+            candidates = (
+                select(
+                    InteractionLog.id,
+                    InteractionLog.user_id,
+                    InteractionLog.interaction_type,
+                    InteractionLog.created_at,
+                    InteractionLog.interaction_embedding,
+                )
+                .where(InteractionLog.user_id == user_id, *filters)
+                .cte("candidates")
+                .prefix_with("MATERIALIZED")
+            )
+            distance = candidates.c.interaction_embedding.cosine_distance(query_embedding)
+            query = (
+                select(
+                    candidates.c.id,
+                    candidates.c.user_id,
+                    candidates.c.interaction_type,
+                    candidates.c.created_at,
+                    (1 - distance).label("similarity"),
+                )
+                .order_by(distance)
+                .limit(k)
+            )
+        else:
+            await SimilarityService.apply_search_parameters(
+                session, probes, ef_search, k=k, filtered=bool(interaction_type) or since is not None
+            )
+            distance = InteractionLog.interaction_embedding.cosine_distance(query_embedding)
+            query = (
+                select(
+                    InteractionLog.id,
+                    InteractionLog.user_id,
+                    InteractionLog.interaction_type,
+                    InteractionLog.created_at,
+                    (1 - distance).label("similarity"),
+                )
+                .where(*filters)
+                .order_by(distance)
+                .limit(k)
+            )
+
+        result = await session.execute(query)
+        matches = [dict(row._mapping) for row in result]
+
+        logger.debug(
+            "Similar interactions retrieved",
+            extra={"user_id": user_id, "k": k, "matches": len(matches)}
+        )
+
+        return matches
+
+    @staticmethod
+    async def find_similar_users(
+        session: AsyncSession,
+        query_embedding: Sequence[float],
+        k: int = 10,
+        exclude_user_id: Optional[int] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find learners whose profile embedding is closest to a query embedding.
+
+        Args:
+            session: Database session
+            query_embedding: Query vector (typically another user's profile embedding)
+            k: Number of results
+            exclude_user_id: User to leave out (usually the requesting user)
+            probes: ivfflat probes
+            ef_search: HNSW ef_search
+
+        Returns:
+            List of matches with user_id and similarity
+        """
+        # Inactive users are filtered out after the index scan
+        await SimilarityService.apply_search_parameters(session, probes, ef_search, k=k, filtered=True)
+
+        distance = User.profile_embedding.cosine_distance(query_embedding)
+        query = (
+            select(User.id.label("user_id"), (1 - distance).label("similarity"))
+            .where(User.profile_embedding.is_not(None), User.is_active.is_(True))
+            .order_by(distance)
+            .limit(k)
+        )
+        if exclude_user_id is not None:
+            query = query.where(User.id != exclude_user_id)
+
+        result = await session.execute(query)
+        return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    async def find_similar_learning_patterns(
+        session: AsyncSession,
+        query_embedding: Sequence[float],
+        k: int = 10,
+        exclude_user_id: Optional[int] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find learners whose aggregated learning pattern is closest to a query embedding.
+
+        Args:
+            session: Database session
+            query_embedding: Query vector (typically another user's learning pattern embedding)
+            k: Number of results
+            exclude_user_id: User to leave out (usually the requesting user)
+            probes: ivfflat probes
+            ef_search: HNSW ef_search
+
+        Returns:
+            List of matches with user_id and similarity
+        """
+        # Excluding one user drops at most one candidate
+        await SimilarityService.apply_search_parameters(
+            session, probes, ef_search, k=k + (exclude_user_id is not None)
+        )
+
+        distance = UserMemory.learning_pattern_embedding.cosine_distance(query_embedding)
+        query = (
+            select(UserMemory.user_id, (1 - distance).label("similarity"))
+            .where(UserMemory.learning_pattern_embedding.is_not(None))
+            .order_by(distance)
+            .limit(k)
+        )
+        if exclude_user_id is not None:
+            query = query.where(UserMemory.user_id != exclude_user_id)
+
+        result = await session.execute(query)
+        return [dict(row._mapping) for row in result]
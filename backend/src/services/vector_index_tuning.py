@@ -0,0 +1,236 @@
+"""
+Vector index tuning.
+Recommends pgvector index parameters from table size and measures the recall
+of ivfflat probes / HNSW ef_search settings against exact scans.
+"""
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Tunable embedding columns: name -> (table, embedding column, key column)
+VECTOR_TABLES = {
+    "interaction_logs": ("interaction_logs", "interaction_embedding", "id"),
+    "users": ("users", "profile_embedding", "id"),
+    "user_memory": ("user_memory", "learning_pattern_embedding", "user_id"),
+}
+
+DEFAULT_PROBES_VALUES = (1, 2, 4, 8, 16, 32, 64)
+DEFAULT_EF_SEARCH_VALUES = (10, 20, 40, 80, 160, 320)
+
+
+def recommend_index_parameters(row_count: int, k: int = 10) -> Dict[str, int]:
+    """
+    Recommend pgvector index parameters for a table size.
+
+    Follows pgvector's guidance: ivfflat lists = rows / 1000 up to 1M rows and
+    sqrt(rows) beyond, with probes starting at sqrt(lists); HNSW m grows with
+    table size and ef_search must be at least k.
+
+    Args:
+        row_count: Number of rows with a non-null embedding
+        k: Typical number of neighbours requested
+
+    Returns:
+        Dictionary with lists, probes, m, ef_construction and ef_search
+    """
+    if row_count <= 1_000_000:
+        lists = max(1, row_count // 1000)
+    else:
+        lists = int(math.sqrt(row_count))
+
+    if row_count < 1_000_000:
+        m = 16
+    elif row_count < 10_000_000:
+        m = 24
+    else:
+        m = 32
+
+    return {
+        "lists": lists,
+        "probes": max(1, int(math.sqrt(lists))),
+        "m": m,
+        "ef_construction": max(64, 4 * m),
+        "ef_search": max(40, 2 * k),
+    }
+
+
+async def get_row_count(session: AsyncSession, table_name: str) -> int:
+    """Count rows with a non-null embedding in a tunable table."""
+    table, column, _ = VECTOR_TABLES[table_name]
+    result = await session.execute(
+        text(f"SELECT count(*) FROM {table} WHERE {column} IS NOT NULL")
+    )
+    return int(result.scalar_one())
+
+
+async def get_index_method(session: AsyncSession, table_name: str) -> Optional[str]:
+    """Return 'hnsw' or 'ivfflat' for the table's vector index, or None if unindexed."""
+    table, column, _ = VECTOR_TABLES[table_name]
+    result = await session.execute(
+        text(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = :table AND indexdef LIKE :pattern"
+        ),
+        {"table": table, "pattern": f"%({column} vector_%"},
+    )
+    for (definition,) in result:
+        lowered = definition.lower()
+        if "using hnsw" in lowered:
+            return "hnsw"
+        if "using ivfflat" in lowered:
+            return "ivfflat"
+    return None
+
+
+async def _sample_queries(session: AsyncSession, table_name: str, sample_size: int) -> List[str]:
+    """Draw query vectors from the table itself, as pgvector text literals."""
+    table, column, _ = VECTOR_TABLES[table_name]
+    result = await session.execute(
+        text(
+            f"SELECT {column}::text FROM {table} WHERE {column} IS NOT NULL "
+            f"ORDER BY random() LIMIT :limit"
+        ),
+        {"limit": sample_size},
+    )
+    return [row[0] for row in result]
+
+
+async def _nearest_keys(
+    session: AsyncSession,
+    table_name: str,
+    queries: Sequence[str],
+    k: int,
+) -> List[set]:
+    """Run one k-NN query per sample vector and return the result keys."""
+    table, column, key = VECTOR_TABLES[table_name]
+    statement = text(
+        f"SELECT {key} FROM {table} WHERE {column} IS NOT NULL "
+        f"ORDER BY {column} <=> CAST(:query AS vector) LIMIT :k"
+    )
+    neighbours = []
+    for query in queries:
+        result = await session.execute(statement, {"query": query, "k": k})
+        neighbours.append({row[0] for row in result})
+    return neighbours
+
+
+async def measure_recall(
+    session: AsyncSession,
+    table_name: str,
+    k: int = 10,
+    sample_size: int = 50,
+    probes_values: Sequence[int] = DEFAULT_PROBES_VALUES,
+    ef_search_values: Sequence[int] = DEFAULT_EF_SEARCH_VALUES,
+) -> Dict[str, Any]:
+    """
+    Measure recall@k and latency of the table's vector index per setting.
+
+    Ground truth comes from the same queries with index scans disabled, which
+    forces an exact sequential scan. All settings use SET LOCAL, so nothing
+    outlives the session's transaction.
+
+    Args:
+        session: Database session
+        table_name: Key of VECTOR_TABLES
+        k: Neighbours per query
+        sample_size: Number of query vectors sampled from the table
+        probes_values: ivfflat probes to try
+        ef_search_values: HNSW ef_search values to try
+
+    Returns:
+        Dictionary with the index method, exact-scan latency and one
+        measurement (setting, recall, ms per query) per tried value
+    """
+    method = await get_index_method(session, table_name)
+    queries = await _sample_queries(session, table_name, sample_size)
+    if not queries:
+        return {"method": method, "queries": 0, "exact_ms": None, "measurements": []}
+
+    await session.execute(text("SET LOCAL enable_indexscan = off"))
+    start = time.perf_counter()
+    exact = await _nearest_keys(session, table_name, queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    await session.execute(text("SET LOCAL enable_indexscan = on"))
+
+    if method == "hnsw":
+        setting, values = "hnsw.ef_search", ef_search_values
+    elif method == "ivfflat":
+        setting, values = "ivfflat.probes", probes_values
+    else:
+        setting, values = None, ()
+
+    measurements = []
+    for value in values:
+        await session.execute(text(f"SET LOCAL {setting} = {int(value)}"))
+        start = time.perf_counter()
+        approximate = await _nearest_keys(session, table_name, queries, k)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        recall = sum(
+            len(found & truth) / max(1, len(truth)) for found, truth in zip(approximate, exact)
+        ) / len(queries)
+        measurements.append({"setting": setting, "value": int(value), "recall": recall, "ms_per_query": elapsed_ms})
+
+    return {
+        "method": method,
+        "queries": len(queries),
+        "exact_ms": exact_ms,
+        "measurements": measurements,
+    }
+
+
+async def tune_vector_index(
+    session: AsyncSession,
+    table_name: str,
+    target_recall: float = 0.95,
+    k: int = 10,
+    sample_size: int = 50,
+) -> Dict[str, Any]:
+    """
+    Recommend index parameters and the cheapest query setting meeting a recall target.
+
+    Args:
+        session: Database session
+        table_name: Key of VECTOR_TABLES
+        target_recall: Minimum acceptable recall@k
+        k: Neighbours per query
+        sample_size: Number of query vectors sampled from the table
+
+    Returns:
+        Report with row count, recommended build parameters, recall
+        measurements and the chosen query-time setting
+    """
+    if table_name not in VECTOR_TABLES:
+        raise ValueError(f"Unknown vector table: {table_name}")
+
+    row_count = await get_row_count(session, table_name)
+    recommendation = recommend_index_parameters(row_count, k)
+    measured = await measure_recall(session, table_name, k=k, sample_size=sample_size)
+
+    chosen = next(
+        (m for m in measured["measurements"] if m["recall"] >= target_recall),
+        measured["measurements"][-1] if measured["measurements"] else None,
+    )
+
+    logger.info(
+        "Vector index tuned",
+        extra={
+            "table": table_name,
+            "row_count": row_count,
+            "method": measured["method"],
+            "chosen": chosen,
+        }
+    )
+
+    return {
+        "table": table_name,
+        "row_count": row_count,
+        "target_recall": target_recall,
+        "recommended_build": recommendation,
+        "chosen_query_setting": chosen,
+        **measured,
+    }
@@ -0,0 +1,101 @@
+"""
+Process-wide connection registry.
+Owns the single database engine and the single Redis pool of the process:
+everything that needs a connection goes through get_database() or
+get_redis(), utilization is reported from one place, and shutdown closes
+both together.
+"""
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from ..utils.logger import get_logger
+from .database import DatabaseManager, get_database, init_database
+from .query_stats import init_query_stats
+from .redis_client import RedisManager, get_redis, init_redis
+
+logger = get_logger(__name__)
+
+
+def _existing(get_manager) -> Optional[Any]:
+    """Return the global manager if it has been initialized."""
+    try:
+        return get_manager()
+    except RuntimeError:
+        return None
+
+
+def init_connections() -> None:
+    """
+    Create the shared database and Redis managers from settings.
+
+    Safe to call more than once: managers that already exist are reused, so
+    secondary entry points (e.g. models.base.init_db) never build a second pool.
+    """
+    if _existing(get_database) is None:
+        # Engines attach the query listeners when created, so configure them first
+        init_query_stats(
+            slow_query_ms=settings.database_slow_query_ms,
+            explain=settings.database_explain_slow_queries,
+            explain_cooldown_seconds=settings.database_explain_cooldown_seconds,
+        )
+        init_database(
+            database_url=settings.database_url,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            replica_urls=settings.database_replica_urls,
+            replica_max_lag_seconds=settings.database_replica_max_lag_seconds,
+            replica_lag_check_seconds=settings.database_replica_lag_check_seconds,
+        )
+
+    if _existing(get_redis) is None:
+        init_redis(
+            redis_url=settings.redis_url,
+            mode=settings.redis_mode,
+            sentinels=settings.redis_sentinels,
+            sentinel_master=settings.redis_sentinel_master,
+            sentinel_password=settings.redis_sentinel_password,
+            serializer=settings.redis_serializer,
+            near_cache_prefixes=settings.redis_near_cache_prefixes,
+        )
+
+    logger.info(
+        "Connection registry initialized",
+        extra={
+            "database_pool_size": settings.database_pool_size,
+            "database_max_overflow": settings.database_max_overflow,
+            "database_replicas": len(settings.database_replica_urls),
+            "redis_mode": settings.redis_mode,
+        },
+    )
+
+
+def get_pool_stats() -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Report utilization and acquisition time for every shared pool.
+
+    Returns:
+        Mapping of pool name to its statistics, or None if not initialized
+    """
+    db_manager: Optional[DatabaseManager] = _existing(get_database)
+    redis_manager: Optional[RedisManager] = _existing(get_redis)
+    return {
+        "database": db_manager.pool_stats() if db_manager else None,
+        "redis": redis_manager.pool_stats() if redis_manager else None,
+    }
+
+
+async def close_connections() -> None:
+    """Close every shared pool; errors closing one do not prevent closing the others."""
+    for name, get_manager in (("database", get_database), ("redis", get_redis)):
+        manager = _existing(get_manager)
+        if manager is None:
+            continue
+        try:
+            await manager.close()
+            logger.info("Connections closed", extra={"pool": name})
+        except Exception as exception:
+            logger.error(
+                "Error closing connections",
+                exc_info=True,
+                extra={"pool": name, "exception": str(exception)},
+            )
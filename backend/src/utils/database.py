@@ -1,10 +1,13 @@
 """
 Database configuration and connection management for CodeMentor backend.
-Provides SQLAlchemy setup with PostgreSQL connection pooling.
+Provides SQLAlchemy setup with PostgreSQL connection pooling and optional
+read-replica routing.
 """
-from typing import Optional
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
 from contextlib import asynccontextmanager
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
@@ -12,12 +15,21 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-import time
 
-from ..utils.logger import get_logger, log_database_query
+from ..utils.logger import get_logger
+from .db_routing import HAS_WRITES, UserId, current_request_user, is_read_only
+from .pool_metrics import MeteredAsyncQueuePool
+from .query_stats import get_query_stats
+from .redis_keys import primary_pin_key
 
 logger = get_logger(__name__)
 
+# Seconds a replica is behind the primary; 0 when it has replayed everything it received
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -26,6 +38,16 @@ class DatabaseManager:
     """
     Database connection and session management.
     Handles both sync and async SQLAlchemy engines.
+
+    The async engine is the process's only pool for request traffic; the
+    sync engine exists for table management utilities and is only created
+    if one of them is used.
+
+    With replica URLs configured, sessions opened in a read-only context
+    (see db_routing.read_only) go to a replica whose measured lag is within
+    replica_max_lag_seconds, and otherwise to the primary. After a user's
+    session writes, that user's reads stay on the primary long enough for
+    every replica still in use to have caught up.
     """
 
     def __init__(
@@ -35,6 +57,9 @@ class DatabaseManager:
         max_overflow: int = 10,
         pool_pre_ping: bool = True,
         echo: bool = False,
+        replica_urls: Sequence[str] = (),
+        replica_max_lag_seconds: float = 5.0,
+        replica_lag_check_seconds: float = 2.0,
     ):
         """
         Initialize database manager.
@@ -45,24 +70,44 @@ class DatabaseManager:
             max_overflow: Maximum overflow connections
             pool_pre_ping: Enable connection health checks
             echo: Enable SQL query echo logging
+            replica_urls: PostgreSQL read replica URLs; each gets its own pool
+            replica_max_lag_seconds: Replicas further behind than this are not used
+            replica_lag_check_seconds: How often each replica's lag is measured
         """
         self.database_url = database_url
         self.pool_size = pool_size
         self.max_overflow = max_overflow
         self.pool_pre_ping = pool_pre_ping
         self.echo = echo
+        self.replica_urls = list(replica_urls)
+        self.replica_max_lag_seconds = replica_max_lag_seconds
+        self.replica_lag_check_seconds = replica_lag_check_seconds
+        # A replica in use can be up to max lag behind, and lag is only known
+        # as of the last check, so pin a writer's reads for both
+        self.primary_pin_seconds = replica_max_lag_seconds + replica_lag_check_seconds
 
         # Initialize engines
         self._sync_engine = None
         self._async_engine = None
         self._session_factory = None
         self._async_session_factory = None
+        self._replica_engines: List[Any] = []
+        self._replica_session_factories: List[async_sessionmaker] = []
+
+        # Last measured lag per replica (None until measured or after a failed check)
+        self._replica_lag: List[Optional[float]] = [None] * len(self.replica_urls)
+        self._replica_checked_at: List[float] = [float("-inf")] * len(self.replica_urls)
+        self._lag_checks: Dict[int, asyncio.Task] = {}
+        self._next_replica = 0
+        # Process-local copy of recent pins, so this process's own writers skip the Redis lookup
+        self._local_pins: Dict[str, float] = {}
 
         logger.info(
             "Database manager initialized",
             extra={
                 "pool_size": pool_size,
                 "max_overflow": max_overflow,
+                "replicas": len(self.replica_urls),
             },
         )
 
@@ -78,7 +123,7 @@ class DatabaseManager:
                 pool_pre_ping=self.pool_pre_ping,
                 echo=self.echo,
             )
-            self._setup_event_listeners(self._sync_engine)
+            get_query_stats().instrument(self._sync_engine)
             logger.info("Synchronous database engine created")
         return self._sync_engine
 
@@ -86,20 +131,43 @@ class DatabaseManager:
     def async_engine(self):
         """Get or create asynchronous SQLAlchemy engine."""
         if self._async_engine is None:
-            # Convert postgresql:// to postgresql+asyncpg://
-            async_url = self.database_url.replace(
-                "postgresql://", "postgresql+asyncpg://"
-            )
-            self._async_engine = create_async_engine(
-                async_url,
-                pool_size=self.pool_size,
-                max_overflow=self.max_overflow,
-                pool_pre_ping=self.pool_pre_ping,
-                echo=self.echo,
-            )
+            self._async_engine = self._create_async_engine(self.database_url)
             logger.info("Asynchronous database engine created")
         return self._async_engine
 
+    def _create_async_engine(self, url: str):
+        """Create an instrumented async engine with a metered pool."""
+        # Convert postgresql:// to postgresql+asyncpg://
+        async_url = url.replace("postgresql://", "postgresql+asyncpg://")
+        engine = create_async_engine(
+            async_url,
+            poolclass=MeteredAsyncQueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=self.pool_pre_ping,
+            echo=self.echo,
+        )
+        get_query_stats().instrument(engine.sync_engine, engine)
+        return engine
+
+    @property
+    def replica_engines(self) -> List[Any]:
+        """Get or create one asynchronous engine per read replica."""
+        if not self._replica_engines and self.replica_urls:
+            self._replica_engines = [self._create_async_engine(url) for url in self.replica_urls]
+            logger.info("Replica database engines created", extra={"replicas": len(self.replica_urls)})
+        return self._replica_engines
+
+    @property
+    def replica_session_factories(self) -> List[async_sessionmaker]:
+        """Get or create one async session factory per read replica."""
+        if not self._replica_session_factories and self.replica_urls:
+            self._replica_session_factories = [
+                async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+                for engine in self.replica_engines
+            ]
+        return self._replica_session_factories
+
     @property
     def session_factory(self):
         """Get or create synchronous session factory."""
@@ -122,26 +190,8 @@ class DatabaseManager:
             )
         return self._async_session_factory
 
-    def _setup_event_listeners(self, engine):
-        """Set up SQLAlchemy event listeners for query logging."""
-
-        @event.listens_for(engine, "before_cursor_execute")
-        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-            """Record query start time."""
-            conn.info.setdefault("query_start_time", []).append(time.time())
-
-        @event.listens_for(engine, "after_cursor_execute")
-        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-            """Log query execution time."""
-            total_time = time.time() - conn.info["query_start_time"].pop()
-            log_database_query(
-                query=statement,
-                duration_ms=total_time * 1000,
-                success=True,
-            )
-
     @asynccontextmanager
-    async def get_async_session(self):
+    async def get_async_session(self, read_only: Optional[bool] = None):
         """
         Get an async database session context manager.
 
@@ -149,7 +199,21 @@ class DatabaseManager:
             async with db_manager.get_async_session() as session:
                 # Use session
                 result = await session.execute(query)
+
+        Args:
+            read_only: Allow a replica to serve the session; defaults to
+                whether the current handler is marked read_only. Replica
+                sessions are never committed
         """
+        if read_only is None:
+            read_only = is_read_only()
+
+        replica = await self._route_read() if read_only else None
+        if replica is not None:
+            async with self.replica_session_factories[replica]() as session:
+                yield session
+            return
+
         async with self.async_session_factory() as session:
             try:
                 yield session
@@ -165,6 +229,175 @@ class DatabaseManager:
             finally:
                 await session.close()
 
+            if session.info.get(HAS_WRITES) and self.replica_urls:
+                user_id = current_request_user()
+                if user_id is not None:
+                    await self.pin_primary(user_id)
+
+    async def _route_read(self) -> Optional[int]:
+        """
+        Pick a replica for a read-only session.
+
+        Returns:
+            Replica index, or None to use the primary
+        """
+        if not self.replica_urls:
+            return None
+
+        now = time.monotonic()
+        for index in range(len(self.replica_urls)):
+            if now - self._replica_checked_at[index] >= self.replica_lag_check_seconds:
+                self._schedule_lag_check(index)
+
+        usable = [
+            index for index, lag in enumerate(self._replica_lag)
+            if lag is not None and lag <= self.replica_max_lag_seconds
+        ]
+        if not usable:
+            return None
+
+        user_id = current_request_user()
+        if user_id is not None and await self.is_primary_pinned(user_id):
+            return None
+
+        self._next_replica = (self._next_replica + 1) % len(usable)
+        return usable[self._next_replica]
+
+    def _schedule_lag_check(self, index: int) -> None:
+        """Measure a replica's lag in the background, so no request waits for it."""
+        task = self._lag_checks.get(index)
+        if task is not None and not task.done():
+            return
+        self._lag_checks[index] = asyncio.ensure_future(self._check_replica_lag(index))
+
+    async def _check_replica_lag(self, index: int) -> None:
+        """Measure one replica's replication lag; a failed check takes it out of use."""
+        self._replica_checked_at[index] = time.monotonic()
+        try:
+            async with self.replica_engines[index].connect() as connection:
+                lag = float((await connection.execute(REPLICA_LAG_QUERY)).scalar() or 0.0)
+        except Exception as exception:
+            if self._replica_lag[index] is not None:
+                logger.warning(
+                    "Replica lag check failed; reading from primary",
+                    extra={"replica": index, "exception": str(exception)},
+                )
+            self._replica_lag[index] = None
+            return
+
+        previous = self._replica_lag[index]
+        self._replica_lag[index] = lag
+        was_usable = previous is not None and previous <= self.replica_max_lag_seconds
+        if was_usable and lag > self.replica_max_lag_seconds:
+            logger.warning(
+                "Replica lagging; reading from primary",
+                extra={"replica": index, "lag_seconds": lag},
+            )
+        elif not was_usable and lag <= self.replica_max_lag_seconds:
+            logger.info("Replica in use", extra={"replica": index, "lag_seconds": lag})
+
+    async def pin_primary(self, user_id: UserId) -> None:
+        """
+        Route a user's reads to the primary until replicas have their write.
+
+        Args:
+            user_id: User who just wrote
+        """
+        now = time.monotonic()
+        self._local_pins[str(user_id)] = now + self.primary_pin_seconds
+        if len(self._local_pins) > 10000:
+            self._local_pins = {user: until for user, until in self._local_pins.items() if until > now}
+        try:
+            from .redis_client import get_redis
+
+            await get_redis().async_client.set(
+                primary_pin_key(user_id), b"1", px=int(self.primary_pin_seconds * 1000)
+            )
+        except Exception as exception:
+            logger.warning(
+                "Failed to pin reads to primary",
+                extra={"user_id": user_id, "exception": str(exception)},
+            )
+
+    async def is_primary_pinned(self, user_id: UserId) -> bool:
+        """
+        Check whether a user wrote recently, in this process or any other.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            True if the user's reads must go to the primary (also if unknown)
+        """
+        if self._local_pins.get(str(user_id), 0.0) > time.monotonic():
+            return True
+        try:
+            from .redis_client import get_redis
+
+            return bool(await get_redis().async_client.exists(primary_pin_key(user_id)))
+        except Exception as exception:
+            logger.warning(
+                "Failed to check primary pin; reading from primary",
+                extra={"user_id": user_id, "exception": str(exception)},
+            )
+            return True
+
+    async def ping(self) -> bool:
+        """
+        Check database connectivity through the shared async pool.
+
+        Returns:
+            True if a trivial query succeeds
+        """
+        try:
+            async with self.async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            return True
+        except Exception as exception:
+            logger.error(
+                "Database ping failed",
+                exc_info=True,
+                extra={"exception": str(exception)},
+            )
+            return False
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Report utilization and acquisition time of the async pool.
+
+        Returns:
+            Pool size, checked-out and overflow counts, utilization and wait statistics
+        """
+        if self._async_engine is None:
+            return {"initialized": False}
+
+        pool = self._async_engine.pool
+        capacity = self.pool_size + max(self.max_overflow, 0)
+        checked_out = pool.checkedout()
+        stats: Dict[str, Any] = {
+            "initialized": True,
+            "pool_size": pool.size(),
+            "max_overflow": self.max_overflow,
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+        }
+        wait_stats = getattr(pool, "wait_stats", None)
+        if wait_stats is not None:
+            stats.update(wait_stats.as_dict())
+        if self.replica_urls:
+            stats["replicas"] = [
+                {
+                    "lag_seconds": lag,
+                    "in_use": lag is not None and lag <= self.replica_max_lag_seconds,
+                }
+                for lag in self._replica_lag
+            ]
+            for replica, engine in zip(stats["replicas"], self._replica_engines):
+                replica["checked_out"] = engine.pool.checkedout()
+        return stats
+
     def get_sync_session(self) -> Session:
         """
         Get a synchronous database session.
@@ -190,11 +423,22 @@ class DatabaseManager:
 
     async def close(self):
         """Close database connections and dispose engines."""
+        for task in self._lag_checks.values():
+            task.cancel()
+        self._lag_checks = {}
+        for engine in self._replica_engines:
+            await engine.dispose()
+        self._replica_engines = []
+        self._replica_session_factories = []
         if self._async_engine:
             await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_factory = None
             logger.info("Async database engine disposed")
         if self._sync_engine:
             self._sync_engine.dispose()
+            self._sync_engine = None
+            self._session_factory = None
             logger.info("Sync database engine disposed")
 
 
@@ -206,6 +450,9 @@ def init_database(
     database_url: str,
     pool_size: int = 20,
     max_overflow: int = 10,
+    replica_urls: Sequence[str] = (),
+    replica_max_lag_seconds: float = 5.0,
+    replica_lag_check_seconds: float = 2.0,
 ) -> DatabaseManager:
     """
     Initialize global database manager.
@@ -214,6 +461,9 @@ def init_database(
         database_url: PostgreSQL connection URL
         pool_size: Connection pool size
         max_overflow: Maximum overflow connections
+        replica_urls: PostgreSQL read replica URLs
+        replica_max_lag_seconds: Replicas further behind than this are not used
+        replica_lag_check_seconds: How often each replica's lag is measured
 
     Returns:
         Initialized DatabaseManager instance
@@ -223,6 +473,9 @@ def init_database(
         database_url=database_url,
         pool_size=pool_size,
         max_overflow=max_overflow,
+        replica_urls=replica_urls,
+        replica_max_lag_seconds=replica_max_lag_seconds,
+        replica_lag_check_seconds=replica_lag_check_seconds,
     )
     logger.info("Global database manager initialized")
     return _db_manager
@@ -246,7 +499,7 @@ def get_database() -> DatabaseManager:
 
 
 @asynccontextmanager
-async def get_async_db_session():
+async def get_async_db_session(read_only: Optional[bool] = None):
     """
     Dependency injection function for Quart routes to get async database session.
 
@@ -255,7 +508,10 @@ async def get_async_db_session():
         async def get_users():
             async with get_async_db_session() as session:
                 # Use session
+
+    Args:
+        read_only: Allow a read replica; defaults to whether the handler is marked read_only
     """
     db_manager = get_database()
-    async with db_manager.get_async_session() as session:
+    async with db_manager.get_async_session(read_only=read_only) as session:
         yield session
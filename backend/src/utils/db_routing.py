@@ -0,0 +1,71 @@
+"""
+Read/write routing context for database sessions.
+Handlers decorated with read_only let their sessions go to a read replica;
+the authenticated user recorded here is what read-your-writes pinning keys on.
+"""
+import contextvars
+from functools import wraps
+from typing import Callable, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+UserId = Union[int, str]
+
+_read_only: contextvars.ContextVar[bool] = contextvars.ContextVar("db_read_only", default=False)
+_request_user: contextvars.ContextVar[Optional[UserId]] = contextvars.ContextVar("db_request_user", default=None)
+
+# Set in Session.info once a session has written anything
+HAS_WRITES = "has_writes"
+
+
+def read_only(function: Callable) -> Callable:
+    """
+    Decorator marking a handler as read-only, so its database sessions may
+    be served by a replica. Must be applied inside @require_auth for
+    read-your-writes pinning to know the user.
+
+    Usage:
+        @users_bp.route("/me", methods=["GET"])
+        @require_auth
+        @read_only
+        async def get_current_user(): ...
+    """
+
+    @wraps(function)
+    async def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return await function(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
+
+
+def is_read_only() -> bool:
+    """Whether the current context was marked read-only."""
+    return _read_only.get()
+
+
+def set_request_user(user_id: Optional[UserId]) -> None:
+    """Record the authenticated user of the current request."""
+    _request_user.set(user_id)
+
+
+def current_request_user() -> Optional[UserId]:
+    """The authenticated user of the current request, if any."""
+    return _request_user.get()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context) -> None:
+    """Remember that ORM changes were flushed."""
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state) -> None:
+    """Remember bulk INSERT/UPDATE/DELETE statements, which bypass the flush."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[HAS_WRITES] = True
@@ -123,13 +123,18 @@ class LoggerMixin:
         return self._logger
 
 
-def log_request(request: Any, response: Optional[Any] = None) -> None:
+def log_request(
+    request: Any,
+    response: Optional[Any] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> None:
     """
     Log HTTP request and optional response details.
 
     Args:
         request: Quart request object
         response: Optional Quart response object
+        context: Optional extra fields (e.g. per-request query counts)
     """
     logger = get_logger("http")
 
@@ -140,6 +145,9 @@ def log_request(request: Any, response: Optional[Any] = None) -> None:
         "user_agent": request.headers.get("User-Agent", ""),
     }
 
+    if context:
+        log_data.update(context)
+
     if response:
         log_data["status_code"] = response.status_code
         logger.info("HTTP request completed", extra=log_data)
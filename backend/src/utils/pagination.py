@@ -0,0 +1,149 @@
+"""
+Keyset (cursor) pagination.
+Pages are selected with a row-value comparison against the last row of the
+previous page, e.g. (updated_at, id) < (:updated_at, :id), so the database
+seeks straight to the page through a composite index instead of reading and
+discarding OFFSET rows. Cursors are opaque, signed tokens.
+"""
+import base64
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..middleware.error_handler import APIError
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+_SIGNATURE_BYTES = 8
+_DATETIME_TAG = "$dt"
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results and the cursor of the next one."""
+
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def _signature(payload: bytes) -> bytes:
+    """Truncated HMAC of a cursor payload."""
+    return hmac.new(settings.secret_key.encode(), payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        scope: What the cursor pages through (e.g. 'conversations'); a cursor
+            is only accepted back for the same scope
+        values: Sort key values, in order (datetimes and ints)
+
+    Returns:
+        URL-safe cursor string
+    """
+    encoded = [{_DATETIME_TAG: value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps([scope, encoded], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(_signature(payload) + payload).rstrip(b"=").decode()
+
+
+def decode_cursor(scope: str, cursor: str) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        scope: Expected scope
+        cursor: Cursor string from a client
+
+    Returns:
+        Sort key values
+
+    Raises:
+        APIError: If the cursor is malformed, tampered with or from another listing
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        signature, payload = raw[:_SIGNATURE_BYTES], raw[_SIGNATURE_BYTES:]
+        if not hmac.compare_digest(signature, _signature(payload)):
+            raise ValueError("bad signature")
+        cursor_scope, values = json.loads(payload)
+        if cursor_scope != scope:
+            raise ValueError("cursor from another listing")
+        return tuple(
+            datetime.fromisoformat(value[_DATETIME_TAG]) if isinstance(value, dict) else value
+            for value in values
+        )
+    except (ValueError, TypeError, KeyError):
+        raise APIError("Invalid pagination cursor", status_code=400)
+
+
+def parse_page_args(args: Mapping[str, str]) -> Tuple[int, Optional[str]]:
+    """
+    Read limit and cursor query parameters.
+
+    Args:
+        args: Request query arguments
+
+    Returns:
+        Tuple of (limit clamped to 1..MAX_PAGE_SIZE, cursor or None)
+
+    Raises:
+        APIError: If limit is not an integer
+    """
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise APIError("limit must be an integer", status_code=400)
+    return max(1, min(limit, MAX_PAGE_SIZE)), args.get("cursor") or None
+
+
+async def keyset_page(
+    session: AsyncSession,
+    query: Select,
+    scope: str,
+    sort_columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Page:
+    """
+    Fetch one page of a query, newest first, by keyset.
+
+    The query's equality filters plus sort_columns should match a composite
+    index (e.g. (user_id, updated_at, id)) so each page is one index seek.
+
+    Args:
+        session: Database session
+        query: Filtered select of ORM entities, without ORDER BY or LIMIT
+        scope: Cursor scope name
+        sort_columns: Descending sort key; the last column must be unique (the id)
+        limit: Page size
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Page of entities and the next cursor (None on the last page)
+    """
+    if cursor is not None:
+        query = query.where(tuple_(*sort_columns) < tuple_(*decode_cursor(scope, cursor)))
+    query = query.order_by(*(column.desc() for column in sort_columns)).limit(limit + 1)
+
+    rows = list((await session.execute(query)).scalars().all())
+    if len(rows) <= limit:
+        return Page(items=rows, next_cursor=None)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(
+        items=rows,
+        next_cursor=encode_cursor(scope, [getattr(last, column.key) for column in sort_columns]),
+    )
@@ -0,0 +1,125 @@
+"""
+Connection pool acquisition metrics.
+Pool subclasses that time every checkout, so pool pressure shows up as
+measured wait time instead of only as eventual timeouts.
+"""
+import threading
+import time
+from typing import Any, Dict
+
+from redis.asyncio.connection import ConnectionPool as AsyncConnectionPool
+from redis.asyncio.sentinel import SentinelConnectionPool as AsyncSentinelConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .request_io import IO_REDIS, record_io
+
+# Acquisitions slower than this are counted separately as a saturation signal
+SLOW_ACQUIRE_SECONDS = 0.1
+
+
+class PoolWaitStats:
+    """Running totals of connection acquisition time for one pool."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.slow_acquisitions = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one acquisition that took the given time."""
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if seconds >= SLOW_ACQUIRE_SECONDS:
+                self.slow_acquisitions += 1
+
+    def record_timeout(self) -> None:
+        """Record an acquisition that gave up waiting."""
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Counters for health and metrics endpoints."""
+        with self._lock:
+            average = self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+            return {
+                "acquisitions": self.acquisitions,
+                "slow_acquisitions": self.slow_acquisitions,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(average * 1000, 3),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """SQLAlchemy async queue pool that times each checkout, including pre-ping."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the pool with empty wait statistics."""
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        """Check out a connection, recording how long it took."""
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.record_timeout()
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class MeteredRedisPoolMixin:
+    """
+    Times get_connection on a redis.asyncio connection pool.
+
+    The client holds a connection for exactly one command or one pipeline
+    execution, so checkout to release is also recorded as one Redis round
+    trip against the current request.
+    """
+
+    wait_stats: PoolWaitStats
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the pool with empty wait statistics."""
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    async def get_connection(self, command_name: Any, *keys: Any, **options: Any):
+        """Get a connection, recording how long it took (including connecting)."""
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError as error:
+            if "Too many connections" in str(error):
+                self.wait_stats.record_timeout()
+            raise
+        acquired = time.perf_counter()
+        self.wait_stats.record(acquired - start)
+        connection._checked_out_at = acquired
+        return connection
+
+    async def release(self, connection: Any) -> None:
+        """Return a connection, recording the round trip it was used for."""
+        acquired = getattr(connection, "_checked_out_at", None)
+        if acquired is not None:
+            connection._checked_out_at = None
+            record_io(IO_REDIS, (time.perf_counter() - acquired) * 1000)
+        await super().release(connection)
+
+
+class MeteredRedisConnectionPool(MeteredRedisPoolMixin, AsyncConnectionPool):
+    """Metered redis.asyncio connection pool."""
+
+
+class MeteredRedisSentinelPool(MeteredRedisPoolMixin, AsyncSentinelConnectionPool):
+    """Metered redis.asyncio Sentinel connection pool."""
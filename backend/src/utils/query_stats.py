@@ -0,0 +1,367 @@
+"""
+Query instrumentation for SQLAlchemy engines.
+Times every statement, aggregates statistics by normalized statement
+fingerprint, counts queries against the current request, and samples slow SELECTs with
+EXPLAIN (ANALYZE, BUFFERS) on a separate connection so the request that hit
+the slow query never waits for the plan.
+"""
+import asyncio
+import contextvars
+import functools
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+
+from ..utils.logger import get_logger, log_database_query
+from .request_io import IO_DB, record_io
+
+logger = get_logger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+\b|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(?:WITH\b.*?\)\s*)?SELECT\b", re.IGNORECASE | re.DOTALL)
+_LOCKING_OR_WRITING = re.compile(
+    r"\bFOR\s+(?:UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE)\b|\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bnextval\s*\(",
+    re.IGNORECASE,
+)
+
+# Set inside the out-of-band EXPLAIN task so its own statements are not recorded
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar("query_stats_explaining", default=False)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals and bind parameters become '?',
+    IN lists and multi-row VALUES collapse to one element, whitespace is folded.
+
+    Cached, since SQLAlchemy sends the same compiled strings over and over.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Normalized statement
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _VALUE_LIST.sub("(?)", normalized)
+    return _VALUES_ROWS.sub(r"\1", normalized)
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Short stable identifier of a statement's normalized shape."""
+    return hashlib.blake2b(normalize_statement(statement).encode(), digest_size=8).hexdigest()
+
+
+def is_explainable(statement: str) -> bool:
+    """Whether EXPLAIN ANALYZE can safely re-run a statement (read-only, non-locking SELECT)."""
+    return bool(_EXPLAINABLE.match(statement)) and not _LOCKING_OR_WRITING.search(statement)
+
+
+@dataclass
+class FingerprintStats:
+    """Aggregated timings of one statement shape."""
+
+    statement: str
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow: int = 0
+    last_plan: Optional[Dict[str, Any]] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serializable summary."""
+        return {
+            "statement": self.statement[:500],
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "slow": self.slow,
+            "last_plan": self.last_plan,
+        }
+
+
+class QueryStats:
+    """
+    Per-fingerprint statement statistics with out-of-band slow query plans.
+
+    The number of fingerprints is bounded; once full, new shapes are counted
+    under a single overflow entry rather than growing memory without limit.
+    """
+
+    OVERFLOW = "overflow"
+
+    def __init__(
+        self,
+        slow_query_ms: float = 200.0,
+        explain: bool = False,
+        explain_cooldown_seconds: float = 300.0,
+        explain_timeout_ms: int = 5000,
+        explain_concurrency: int = 1,
+        max_fingerprints: int = 1000,
+    ):
+        """
+        Initialize query statistics.
+
+        Args:
+            slow_query_ms: Statements slower than this are logged as slow
+            explain: Capture EXPLAIN (ANALYZE, BUFFERS) plans of slow SELECTs.
+                ANALYZE executes the statement again, so this is opt-in
+            explain_cooldown_seconds: Minimum seconds between plans of one fingerprint
+            explain_timeout_ms: statement_timeout applied to the EXPLAIN run
+            explain_concurrency: Maximum EXPLAIN runs in flight, each holding a pool connection
+            max_fingerprints: Maximum distinct statement shapes tracked
+        """
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.explain_cooldown_seconds = explain_cooldown_seconds
+        self.explain_timeout_ms = explain_timeout_ms
+        self.explain_concurrency = explain_concurrency
+        self.max_fingerprints = max_fingerprints
+
+        self.fingerprints: Dict[str, FingerprintStats] = {}
+        self._last_explained: Dict[str, float] = {}
+        self._explain_tasks: "set[asyncio.Task]" = set()
+
+    def record(
+        self,
+        statement: str,
+        duration_ms: float,
+        success: bool = True,
+    ) -> str:
+        """
+        Record one statement execution.
+
+        Args:
+            statement: SQL as sent to the driver
+            duration_ms: Execution time in milliseconds
+            success: Whether the statement succeeded
+
+        Returns:
+            The statement's fingerprint
+        """
+        key = fingerprint(statement)
+        stats = self.fingerprints.get(key)
+        if stats is None:
+            if len(self.fingerprints) >= self.max_fingerprints:
+                key = self.OVERFLOW
+                stats = self.fingerprints.setdefault(key, FingerprintStats(statement="<other statements>"))
+            else:
+                stats = self.fingerprints[key] = FingerprintStats(statement=normalize_statement(statement))
+
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        if not success:
+            stats.errors += 1
+        if duration_ms >= self.slow_query_ms:
+            stats.slow += 1
+
+        record_io(IO_DB, duration_ms, fingerprint=key)
+        return key
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """
+        Statement shapes ranked by a statistic.
+
+        Args:
+            limit: Number of fingerprints returned
+            order_by: 'total_ms', 'max_ms', 'count' or 'slow'
+
+        Returns:
+            Summaries including the fingerprint, highest first
+        """
+        ranked = sorted(self.fingerprints.items(), key=lambda item: getattr(item[1], order_by), reverse=True)
+        return [{"fingerprint": key, **stats.as_dict()} for key, stats in ranked[:limit]]
+
+    def reset(self) -> None:
+        """Drop all statistics."""
+        self.fingerprints.clear()
+        self._last_explained.clear()
+
+    def instrument(self, engine, async_engine=None) -> None:
+        """
+        Attach timing listeners to an engine.
+
+        Args:
+            engine: Sync Engine to listen on (for an AsyncEngine, its sync_engine)
+            async_engine: The AsyncEngine, if any; slow SELECT plans are only
+                captured through an async engine
+        """
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            """Record query start time."""
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            """Record query execution time."""
+            duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+            if _explaining.get():
+                return
+            log_database_query(query=statement, duration_ms=duration_ms, success=True)
+            key = self.record(statement, duration_ms)
+            if duration_ms >= self.slow_query_ms:
+                self._on_slow_query(key, statement, parameters, duration_ms, async_engine, executemany)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            """Record failed queries."""
+            conn = exception_context.connection
+            starts = conn.info.get("query_start_time") if conn is not None else None
+            if not starts or exception_context.statement is None or _explaining.get():
+                return
+            duration_ms = (time.perf_counter() - starts.pop()) * 1000
+            log_database_query(query=exception_context.statement, duration_ms=duration_ms, success=False)
+            self.record(exception_context.statement, duration_ms, success=False)
+
+    def _on_slow_query(
+        self,
+        key: str,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+        async_engine,
+        executemany: bool,
+    ) -> None:
+        """Log a slow query and, if due, schedule an EXPLAIN of it."""
+        logger.warning(
+            "Slow database query",
+            extra={
+                "fingerprint": key,
+                "duration_ms": round(duration_ms, 3),
+                "query": normalize_statement(statement)[:500],
+            },
+        )
+        if not self.explain or async_engine is None or executemany or not is_explainable(statement):
+            return
+
+        if len(self._explain_tasks) >= self.explain_concurrency:
+            return
+        now = time.monotonic()
+        if now - self._last_explained.get(key, float("-inf")) < self.explain_cooldown_seconds:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_explained[key] = now
+        task = loop.create_task(self._explain(key, statement, parameters, async_engine))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, key: str, statement: str, parameters: Any, async_engine) -> None:
+        """Run EXPLAIN (ANALYZE, BUFFERS) in a rolled-back transaction and keep a summary."""
+        _explaining.set(True)
+        try:
+            async with async_engine.connect() as connection:
+                async with connection.begin() as transaction:
+                    await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                    result = await connection.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                        tuple(parameters) if isinstance(parameters, (list, tuple)) else parameters,
+                    )
+                    plan_document = result.scalar()
+                    await transaction.rollback()
+        except Exception as exception:
+            logger.warning(
+                "EXPLAIN of slow query failed",
+                extra={"fingerprint": key, "exception": str(exception)},
+            )
+            return
+
+        summary = summarize_plan(plan_document)
+        stats = self.fingerprints.get(key)
+        if stats is not None:
+            stats.last_plan = summary
+        logger.warning("Slow query plan captured", extra={"fingerprint": key, "plan": summary})
+
+    async def close(self) -> None:
+        """Cancel EXPLAIN runs still in flight."""
+        for task in list(self._explain_tasks):
+            task.cancel()
+        await asyncio.gather(*self._explain_tasks, return_exceptions=True)
+
+
+def summarize_plan(plan_document: Any) -> Dict[str, Any]:
+    """
+    Pull the useful numbers out of an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) result.
+
+    Args:
+        plan_document: JSON plan as returned by Postgres (list with one entry)
+
+    Returns:
+        Execution time, root node, buffer counts and every node scanned sequentially
+    """
+    if isinstance(plan_document, str):
+        plan_document = json.loads(plan_document)
+    entry = plan_document[0] if isinstance(plan_document, Sequence) else plan_document
+    root = entry.get("Plan", {})
+
+    seq_scans: List[Dict[str, Any]] = []
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Node Type") == "Seq Scan":
+            seq_scans.append({"relation": node.get("Relation Name"), "rows": node.get("Actual Rows")})
+        nodes.extend(node.get("Plans", []))
+
+    return {
+        "execution_ms": entry.get("Execution Time"),
+        "planning_ms": entry.get("Planning Time"),
+        "node": root.get("Node Type"),
+        "total_cost": root.get("Total Cost"),
+        "rows": root.get("Actual Rows"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks"),
+        "shared_read_blocks": root.get("Shared Read Blocks"),
+        "seq_scans": seq_scans,
+    }
+
+
+# Global query statistics instance
+_query_stats: Optional[QueryStats] = None
+
+
+def init_query_stats(**kwargs: Any) -> QueryStats:
+    """
+    Initialize the global query statistics.
+
+    Args:
+        **kwargs: QueryStats arguments
+
+    Returns:
+        QueryStats instance
+    """
+    global _query_stats
+    _query_stats = QueryStats(**kwargs)
+    return _query_stats
+
+
+def get_query_stats() -> QueryStats:
+    """
+    Get the global query statistics, creating defaults if not initialized.
+
+    Returns:
+        QueryStats instance
+    """
+    global _query_stats
+    if _query_stats is None:
+        _query_stats = QueryStats()
+    return _query_stats
@@ -1,58 +1,118 @@
 """
 Redis client configuration and management for CodeMentor backend.
-Provides Redis connection pooling for caching and session management.
+Provides Redis connection pooling for caching and session management, against
+a single server, a Sentinel-managed primary or a Redis Cluster.
 """
-from typing import Optional, Any
-import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Sequence, Tuple, Union
 from redis import Redis
 from redis.asyncio import Redis as AsyncRedis
-from redis.connection import ConnectionPool
+from redis.asyncio.client import Pipeline as AsyncPipeline
+from redis.asyncio.cluster import RedisCluster as AsyncRedisCluster
+from redis.asyncio.sentinel import Sentinel as AsyncSentinel
+from redis.cluster import RedisCluster
+from redis.connection import ConnectionPool, parse_url
 from redis.asyncio.connection import ConnectionPool as AsyncConnectionPool
+from redis.sentinel import Sentinel, SentinelConnectionPool
 
 from ..utils.logger import get_logger
+from .pool_metrics import MeteredRedisConnectionPool, MeteredRedisSentinelPool
+from . import redis_serializers
+from .redis_near_cache import NearCache
+from .redis_serializers import RedisSerializer, get_serializer
 
 logger = get_logger(__name__)
 
+MODE_STANDALONE = "standalone"
+MODE_SENTINEL = "sentinel"
+MODE_CLUSTER = "cluster"
+REDIS_MODES = (MODE_STANDALONE, MODE_SENTINEL, MODE_CLUSTER)
+
 
 class RedisManager:
     """
     Redis connection and operation management.
     Handles both sync and async Redis clients.
+
+    Cluster mode has no numbered databases and no cross-slot transactions;
+    keys from src.utils.redis_keys keep each user's keys in one slot so
+    multi-key operations on them still work.
     """
 
     def __init__(
         self,
         redis_url: str,
-        session_db: int = 1,
+        mode: str = MODE_STANDALONE,
+        sentinels: Optional[Sequence[Tuple[str, int]]] = None,
+        sentinel_master: str = "mymaster",
+        sentinel_password: Optional[str] = None,
         decode_responses: bool = True,
         max_connections: int = 50,
+        serializer: str = "orjson",
+        near_cache_prefixes: Optional[Sequence[str]] = None,
+        near_cache_max_entries: int = 10000,
+        near_cache_ttl_seconds: float = 60.0,
     ):
         """
         Initialize Redis manager.
 
         Args:
-            redis_url: Redis connection URL
-            session_db: Database number for session storage
-            decode_responses: Automatically decode responses to strings
+            redis_url: Redis connection URL. In sentinel mode only its database,
+                username and password are used; in cluster mode it is the seed node
+            mode: 'standalone', 'sentinel' or 'cluster'
+            sentinels: (host, port) pairs of Sentinel nodes (sentinel mode)
+            sentinel_master: Name of the monitored primary (sentinel mode)
+            sentinel_password: Password for the Sentinel nodes themselves
+            decode_responses: Automatically decode sync client responses to strings.
+                The async client always returns bytes, since cache values are
+                binary serializer envelopes
             max_connections: Maximum connections in pool
+            serializer: Cache value format: 'json', 'orjson' or 'msgpack'. Values
+                written in any format (or legacy plain JSON) are always readable
+            near_cache_prefixes: Key prefixes to cache in-process with server-side
+                invalidation (e.g. ['access_token:']); None disables the near-cache
+            near_cache_max_entries: Maximum keys held by the near-cache
+            near_cache_ttl_seconds: Maximum age of a near-cache entry
+
+        Raises:
+            ValueError: If the mode is unknown or sentinel mode has no sentinels
         """
+        if mode not in REDIS_MODES:
+            raise ValueError(f"Unknown Redis mode: {mode} (expected one of {', '.join(REDIS_MODES)})")
+        if mode == MODE_SENTINEL and not sentinels:
+            raise ValueError("Sentinel mode requires at least one sentinel address")
+
         self.redis_url = redis_url
-        self.session_db = session_db
+        self.mode = mode
+        self.sentinels = list(sentinels or [])
+        self.sentinel_master = sentinel_master
+        self.sentinel_password = sentinel_password
         self.decode_responses = decode_responses
         self.max_connections = max_connections
+        self.serializer: RedisSerializer = get_serializer(serializer)
+        self.near_cache_prefixes = [prefix for prefix in near_cache_prefixes or [] if prefix]
+        self.near_cache_max_entries = near_cache_max_entries
+        self.near_cache_ttl_seconds = near_cache_ttl_seconds
+
+        if mode == MODE_CLUSTER and self.near_cache_prefixes:
+            # Tracking is per node; a single invalidation connection cannot cover a cluster
+            logger.warning("Near-cache is not supported in cluster mode and is disabled")
+            self.near_cache_prefixes = []
 
         # Initialize connection pools
         self._sync_pool = None
         self._async_pool = None
         self._sync_client = None
         self._async_client = None
-        self._session_client = None
+        self._near_cache: Optional[NearCache] = None
 
         logger.info(
             "Redis manager initialized",
             extra={
                 "redis_url": redis_url,
-                "session_db": session_db,
+                "mode": mode,
+                "serializer": serializer,
+                "near_cache_prefixes": self.near_cache_prefixes,
             },
         )
 
@@ -60,58 +120,100 @@ class RedisManager:
     def sync_pool(self) -> ConnectionPool:
         """Get or create synchronous connection pool."""
         if self._sync_pool is None:
-            self._sync_pool = ConnectionPool.from_url(
-                self.redis_url,
-                decode_responses=self.decode_responses,
-                max_connections=self.max_connections,
-            )
-            logger.info("Synchronous Redis connection pool created")
+            if self.mode == MODE_CLUSTER:
+                raise RuntimeError("Redis Cluster clients manage one pool per node")
+            if self.mode == MODE_SENTINEL:
+                self._sync_pool = SentinelConnectionPool(
+                    self.sentinel_master,
+                    Sentinel(self.sentinels, sentinel_kwargs=self._sentinel_kwargs()),
+                    decode_responses=self.decode_responses,
+                    max_connections=self.max_connections,
+                    **self._sentinel_connection_kwargs(),
+                )
+            else:
+                self._sync_pool = ConnectionPool.from_url(
+                    self.redis_url,
+                    decode_responses=self.decode_responses,
+                    max_connections=self.max_connections,
+                )
+            logger.info("Synchronous Redis connection pool created", extra={"mode": self.mode})
         return self._sync_pool
 
     @property
     def async_pool(self) -> AsyncConnectionPool:
         """Get or create asynchronous connection pool."""
         if self._async_pool is None:
-            self._async_pool = AsyncConnectionPool.from_url(
-                self.redis_url,
-                decode_responses=self.decode_responses,
-                max_connections=self.max_connections,
-            )
-            logger.info("Asynchronous Redis connection pool created")
+            if self.mode == MODE_CLUSTER:
+                raise RuntimeError("Redis Cluster clients manage one pool per node")
+            if self.mode == MODE_SENTINEL:
+                self._async_pool = MeteredRedisSentinelPool(
+                    self.sentinel_master,
+                    AsyncSentinel(self.sentinels, sentinel_kwargs=self._sentinel_kwargs()),
+                    decode_responses=False,
+                    max_connections=self.max_connections,
+                    **self._sentinel_connection_kwargs(),
+                )
+            else:
+                self._async_pool = MeteredRedisConnectionPool.from_url(
+                    self.redis_url,
+                    decode_responses=False,
+                    max_connections=self.max_connections,
+                )
+            logger.info("Asynchronous Redis connection pool created", extra={"mode": self.mode})
         return self._async_pool
 
     @property
-    def client(self) -> Redis:
+    def client(self) -> Union[Redis, RedisCluster]:
         """Get or create synchronous Redis client."""
         if self._sync_client is None:
-            self._sync_client = Redis(connection_pool=self.sync_pool)
-            logger.info("Synchronous Redis client created")
+            if self.mode == MODE_CLUSTER:
+                self._sync_client = RedisCluster.from_url(
+                    self.redis_url,
+                    decode_responses=self.decode_responses,
+                    max_connections=self.max_connections,
+                )
+            else:
+                self._sync_client = Redis(connection_pool=self.sync_pool)
+            logger.info("Synchronous Redis client created", extra={"mode": self.mode})
         return self._sync_client
 
     @property
-    def async_client(self) -> AsyncRedis:
+    def async_client(self) -> Union[AsyncRedis, AsyncRedisCluster]:
         """Get or create asynchronous Redis client."""
         if self._async_client is None:
-            self._async_client = AsyncRedis(connection_pool=self.async_pool)
-            logger.info("Asynchronous Redis client created")
+            if self.mode == MODE_CLUSTER:
+                self._async_client = AsyncRedisCluster.from_url(
+                    self.redis_url,
+                    decode_responses=False,
+                    max_connections=self.max_connections,
+                )
+            else:
+                self._async_client = AsyncRedis(connection_pool=self.async_pool)
+            logger.info("Asynchronous Redis client created", extra={"mode": self.mode})
         return self._async_client
 
+    def _sentinel_kwargs(self) -> Optional[Dict[str, Any]]:
+        """Connection options for the Sentinel nodes."""
+        return {"password": self.sentinel_password} if self.sentinel_password else None
+
+    def _sentinel_connection_kwargs(self) -> Dict[str, Any]:
+        """Database and credentials from redis_url for connections to the Sentinel-managed primary."""
+        kwargs = parse_url(self.redis_url)
+        for option in ("host", "port", "connection_class"):
+            kwargs.pop(option, None)
+        return kwargs
+
     @property
-    def session_client(self) -> Redis:
-        """Get or create synchronous Redis client for session storage."""
-        if self._session_client is None:
-            session_url = self.redis_url.rsplit("/", 1)[0] + f"/{self.session_db}"
-            session_pool = ConnectionPool.from_url(
-                session_url,
-                decode_responses=False,  # Sessions stored as bytes
-                max_connections=self.max_connections,
+    def near_cache(self) -> Optional[NearCache]:
+        """Get or create the near-cache, or None if no prefixes are configured."""
+        if self._near_cache is None and self.near_cache_prefixes:
+            self._near_cache = NearCache(
+                self.async_pool,
+                self.near_cache_prefixes,
+                max_entries=self.near_cache_max_entries,
+                ttl_seconds=self.near_cache_ttl_seconds,
             )
-            self._session_client = Redis(connection_pool=session_pool)
-            logger.info(
-                "Session Redis client created",
-                extra={"db": self.session_db},
-            )
-        return self._session_client
+        return self._near_cache
 
     async def set_cache(
         self,
@@ -124,18 +226,19 @@ class RedisManager:
 
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (serialized with the configured serializer)
             expiration: Expiration time in seconds (None for no expiration)
 
         Returns:
             True if successful
         """
         try:
-            serialized_value = json.dumps(value)
+            serialized_value = self.serialize(value)
             if expiration:
                 await self.async_client.setex(key, expiration, serialized_value)
             else:
                 await self.async_client.set(key, serialized_value)
+            self._invalidate_local([key])
             logger.debug(
                 "Cache set",
                 extra={"key": key, "expiration": expiration},
@@ -160,10 +263,10 @@ class RedisManager:
             Cached value or None if not found
         """
         try:
-            value = await self.async_client.get(key)
+            value = await self._get_raw(key)
             if value:
                 logger.debug("Cache hit", extra={"key": key})
-                return json.loads(value)
+                return self.deserialize(value)
             logger.debug("Cache miss", extra={"key": key})
             return None
         except Exception as exception:
@@ -174,6 +277,62 @@ class RedisManager:
             )
             return None
 
+    async def set_bytes(
+        self,
+        key: str,
+        value: bytes,
+        expiration: Optional[float] = None,
+        only_if_missing: bool = False,
+    ) -> bool:
+        """
+        Store an already-serialized value as is.
+
+        Args:
+            key: Cache key
+            value: Raw bytes
+            expiration: Expiration time in seconds (None for no expiration)
+            only_if_missing: Only store if the key does not exist (SET NX)
+
+        Returns:
+            True if the value was stored
+        """
+        try:
+            stored = await self.async_client.set(
+                key,
+                value,
+                px=int(expiration * 1000) if expiration else None,
+                nx=only_if_missing,
+            )
+            self._invalidate_local([key])
+            return bool(stored)
+        except Exception as exception:
+            logger.error(
+                "Failed to set cache bytes",
+                exc_info=True,
+                extra={"key": key, "exception": str(exception)},
+            )
+            return False
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Get a value without deserializing it (served from the near-cache when enabled).
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Raw bytes, or None if not found or on error
+        """
+        try:
+            return await self._get_raw(key)
+        except Exception as exception:
+            logger.error(
+                "Failed to get cache bytes",
+                exc_info=True,
+                extra={"key": key, "exception": str(exception)},
+            )
+            return None
+
     async def delete_cache(self, key: str) -> bool:
         """
         Delete cache entry by key.
@@ -186,6 +345,7 @@ class RedisManager:
         """
         try:
             result = await self.async_client.delete(key)
+            self._invalidate_local([key])
             logger.debug("Cache deleted", extra={"key": key, "deleted": bool(result)})
             return bool(result)
         except Exception as exception:
@@ -238,6 +398,192 @@ class RedisManager:
             )
             return None
 
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several cache values with a single MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for every key found
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        try:
+            values = await self._get_many_raw(keys)
+            found = {key: self.deserialize(value) for key, value in zip(keys, values) if value}
+            logger.debug("Cache get_many", extra={"keys": len(keys), "hits": len(found)})
+            return found
+        except Exception as exception:
+            logger.error(
+                "Failed to get cache values",
+                exc_info=True,
+                extra={"keys": len(keys), "exception": str(exception)},
+            )
+            return {}
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expiration: Optional[int] = None,
+        expirations: Optional[Dict[str, Optional[int]]] = None,
+    ) -> bool:
+        """
+        Set several cache values in one pipelined round trip.
+
+        Args:
+            items: Mapping of key to value (serialized with the configured serializer)
+            expiration: Default expiration in seconds (None for no expiration)
+            expirations: Per-key expirations overriding the default
+
+        Returns:
+            True if successful
+        """
+        if not items:
+            return True
+
+        expirations = expirations or {}
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in items.items():
+                    key_expiration = expirations.get(key, expiration)
+                    if key_expiration:
+                        pipe.setex(key, key_expiration, self.serialize(value))
+                    else:
+                        pipe.set(key, self.serialize(value))
+            self._invalidate_local(items)
+            logger.debug("Cache set_many", extra={"keys": len(items)})
+            return True
+        except Exception as exception:
+            logger.error(
+                "Failed to set cache values",
+                exc_info=True,
+                extra={"keys": len(items), "exception": str(exception)},
+            )
+            return False
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several cache entries with a single DEL.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of keys deleted
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+
+        try:
+            deleted = await self.async_client.delete(*keys)
+            self._invalidate_local(keys)
+            logger.debug("Cache delete_many", extra={"keys": len(keys), "deleted": deleted})
+            return deleted
+        except Exception as exception:
+            logger.error(
+                "Failed to delete cache values",
+                exc_info=True,
+                extra={"keys": len(keys), "exception": str(exception)},
+            )
+            return 0
+
+    async def _get_raw(self, key: str) -> Optional[bytes]:
+        """Read a raw value, serving near-cached prefixes locally when possible."""
+        near_cache = self.near_cache
+        if near_cache is None or not near_cache.matches(key):
+            return await self.async_client.get(key)
+
+        near_cache.start()
+        value = near_cache.get(key)
+        if value is not None:
+            return value
+
+        token = near_cache.begin(key)
+        value = await self.async_client.get(key)
+        near_cache.complete(key, token, value)
+        return value
+
+    async def _get_many_raw(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Read raw values in key order, fetching only near-cache misses with MGET."""
+        near_cache = self.near_cache
+        if near_cache is None:
+            return await self._mget(keys)
+
+        near_cache.start()
+        values: List[Optional[bytes]] = [
+            near_cache.get(key) if near_cache.matches(key) else None for key in keys
+        ]
+        missing = [index for index, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+
+        tokens = [near_cache.begin(keys[index]) for index in missing]
+        fetched = await self._mget([keys[index] for index in missing])
+        for index, token, value in zip(missing, tokens, fetched):
+            near_cache.complete(keys[index], token, value)
+            values[index] = value
+        return values
+
+    async def _mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        """MGET that also works across cluster slots."""
+        if self.mode == MODE_CLUSTER:
+            return await self.async_client.mget_nonatomic(keys)
+        return await self.async_client.mget(keys)
+
+    def _invalidate_local(self, keys: Iterable[str]) -> None:
+        """Drop keys this process just wrote, without waiting for the server's invalidation."""
+        if self._near_cache is not None:
+            self._near_cache.invalidate(key for key in keys if self._near_cache.matches(key))
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[AsyncPipeline]:
+        """
+        Buffer commands and send them in one round trip on exit.
+
+        Commands queued inside the block are executed when it exits normally
+        and discarded if it raises. With transaction=True they run atomically
+        in MULTI/EXEC (not available in cluster mode). Errors are logged and
+        re-raised.
+
+        Usage:
+            async with redis_manager.pipeline() as pipe:
+                pipe.setex("a", 60, "1")
+                pipe.delete("b")
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC
+
+        Yields:
+            Async pipeline to queue commands on
+        """
+        async with self.async_client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            # Cluster pipelines keep their queue privately
+            commands = len(getattr(pipe, "command_stack", None) or getattr(pipe, "_command_stack", []))
+            try:
+                await pipe.execute()
+            except Exception as exception:
+                logger.error(
+                    "Redis pipeline failed",
+                    exc_info=True,
+                    extra={"commands": commands, "exception": str(exception)},
+                )
+                raise
+
+    def serialize(self, value: Any) -> bytes:
+        """Serialize a cache value into a tagged envelope."""
+        return self.serializer.dumps(value)
+
+    @staticmethod
+    def deserialize(value: Any) -> Any:
+        """Deserialize a cache value in any supported format, including legacy JSON."""
+        return redis_serializers.loads(value)
+
     async def set_expiration(self, key: str, seconds: int) -> bool:
         """
         Set expiration time for key.
@@ -259,6 +605,52 @@ class RedisManager:
             )
             return False
 
+    async def async_ping(self) -> bool:
+        """
+        Check Redis connection health through the shared async pool.
+
+        Returns:
+            True if Redis is reachable
+        """
+        try:
+            return bool(await self.async_client.ping())
+        except Exception as exception:
+            logger.error(
+                "Redis ping failed",
+                exc_info=True,
+                extra={"exception": str(exception)},
+            )
+            return False
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Report utilization and acquisition time of the async pool.
+
+        Returns:
+            Connection counts, utilization and wait statistics
+        """
+        if self.mode == MODE_CLUSTER:
+            if self._async_client is None:
+                return {"initialized": False, "mode": self.mode}
+            return {"initialized": True, "mode": self.mode, "nodes": len(self._async_client.get_nodes())}
+        if self._async_pool is None:
+            return {"initialized": False, "mode": self.mode}
+
+        pool = self._async_pool
+        in_use = len(getattr(pool, "_in_use_connections", ()))
+        stats: Dict[str, Any] = {
+            "initialized": True,
+            "mode": self.mode,
+            "max_connections": pool.max_connections,
+            "in_use": in_use,
+            "idle": len(getattr(pool, "_available_connections", ())),
+            "utilization": round(in_use / pool.max_connections, 3) if pool.max_connections else 0.0,
+        }
+        wait_stats = getattr(pool, "wait_stats", None)
+        if wait_stats is not None:
+            stats.update(wait_stats.as_dict())
+        return stats
+
     def ping(self) -> bool:
         """
         Check Redis connection health.
@@ -278,15 +670,25 @@ class RedisManager:
 
     async def close(self):
         """Close Redis connections."""
+        if self._near_cache:
+            await self._near_cache.close()
+            self._near_cache = None
+            logger.info("Redis near-cache closed")
         if self._async_client:
             await self._async_client.close()
+            self._async_client = None
             logger.info("Async Redis client closed")
+        if self._async_pool:
+            # Clients built on an explicit pool leave it open on close
+            await self._async_pool.disconnect()
+            self._async_pool = None
         if self._sync_client:
             self._sync_client.close()
+            self._sync_client = None
             logger.info("Sync Redis client closed")
-        if self._session_client:
-            self._session_client.close()
-            logger.info("Session Redis client closed")
+        if self._sync_pool:
+            self._sync_pool.disconnect()
+            self._sync_pool = None
 
 
 # Global Redis manager instance
@@ -295,14 +697,24 @@ _redis_manager: Optional[RedisManager] = None
 
 def init_redis(
     redis_url: str,
-    session_db: int = 1,
+    mode: str = MODE_STANDALONE,
+    sentinels: Optional[Sequence[Tuple[str, int]]] = None,
+    sentinel_master: str = "mymaster",
+    sentinel_password: Optional[str] = None,
+    serializer: str = "orjson",
+    near_cache_prefixes: Optional[Sequence[str]] = None,
 ) -> RedisManager:
     """
     Initialize global Redis manager.
 
     Args:
         redis_url: Redis connection URL
-        session_db: Database number for session storage
+        mode: 'standalone', 'sentinel' or 'cluster'
+        sentinels: (host, port) pairs of Sentinel nodes (sentinel mode)
+        sentinel_master: Name of the monitored primary (sentinel mode)
+        sentinel_password: Password for the Sentinel nodes themselves
+        serializer: Cache value format: 'json', 'orjson' or 'msgpack'
+        near_cache_prefixes: Key prefixes to cache in-process with server-side invalidation
 
     Returns:
         Initialized RedisManager instance
@@ -310,7 +722,12 @@ def init_redis(
     global _redis_manager
     _redis_manager = RedisManager(
         redis_url=redis_url,
-        session_db=session_db,
+        mode=mode,
+        sentinels=sentinels,
+        sentinel_master=sentinel_master,
+        sentinel_password=sentinel_password,
+        serializer=serializer,
+        near_cache_prefixes=near_cache_prefixes,
     )
     logger.info("Global Redis manager initialized")
     return _redis_manager
@@ -0,0 +1,99 @@
+"""
+Redis key builders.
+Per-user keys carry a {u:<id>} hash tag so everything belonging to one user
+lands in the same Redis Cluster slot, keeping multi-key commands, pipelines
+and scripts for a user on a single node.
+"""
+from typing import Optional, Union
+
+UserId = Union[int, str]
+
+
+def user_tag(user_id: UserId) -> str:
+    """Hash tag shared by every key belonging to one user."""
+    return f"{{u:{user_id}}}"
+
+
+def session_key(user_id: UserId, jti: str) -> str:
+    """Key holding a refresh-token session."""
+    return f"session:{user_tag(user_id)}:{jti}"
+
+
+def access_token_key(user_id: UserId, jti: str) -> str:
+    """Key marking an access token as valid."""
+    return f"access_token:{user_tag(user_id)}:{jti}"
+
+
+def rate_limit_key(user_id: UserId, window: str, bucket: Union[int, str]) -> str:
+    """
+    Key counting a user's requests in one rate-limit window.
+
+    Args:
+        user_id: User identifier
+        window: Window name, e.g. 'minute' or 'day'
+        bucket: Identifier of the current window, e.g. the minute number or date
+    """
+    return f"rate_limit:{user_tag(user_id)}:{window}:{bucket}"
+
+
+def profile_snapshot_key(user_id: UserId, version: int) -> str:
+    """Key holding a user's serialized profile snapshot (versioned with its layout)."""
+    return f"profile:v{version}:{user_tag(user_id)}"
+
+
+def primary_pin_key(user_id: UserId) -> str:
+    """Key pinning a user's reads to the database primary after their own write."""
+    return f"primary_pin:{user_tag(user_id)}"
+
+
+def llm_cache_key(request_hash: str) -> str:
+    """
+    Key caching an LLM response.
+
+    Responses are shared across users and only read one at a time, so the
+    request hash itself is the tag and entries spread evenly over slots.
+    """
+    return f"llm_cache:{{{request_hash}}}"
+
+
+def bulk_write_spill_key(table: str) -> str:
+    """Stream holding rows the bulk writer could not insert yet, one per table."""
+    return f"bulk_write_spill:{{{table}}}"
+
+
+def bulk_write_dead_letter_key(table: str) -> str:
+    """Stream holding spilled rows that kept failing to insert, one per table."""
+    return f"bulk_write_dead_letter:{{{table}}}"
+
+
+def legacy_session_key(user_id: UserId, jti: str) -> str:
+    """Session key format used before hash tags (legacy fallback and migration only)."""
+    return f"session:{user_id}:{jti}"
+
+
+def legacy_access_token_key(jti: str) -> str:
+    """Access token key format used before hash tags (legacy fallback and migration only)."""
+    return f"access_token:{jti}"
+
+
+def migrated_key(key: str, user_id: Optional[UserId] = None) -> Optional[str]:
+    """
+    Hash-tagged name for a legacy session or access token key.
+
+    Args:
+        key: Existing key name
+        user_id: Owner of the key; required for legacy access token keys,
+            whose names do not contain it
+
+    Returns:
+        New key name, or None if the key is not in a legacy format
+    """
+    prefix, _, rest = key.partition(":")
+    if not rest or "{" in rest:
+        return None
+    if prefix == "session":
+        owner, _, jti = rest.partition(":")
+        return session_key(owner, jti) if jti else None
+    if prefix == "access_token" and ":" not in rest and user_id is not None:
+        return access_token_key(user_id, rest)
+    return None
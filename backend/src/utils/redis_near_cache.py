@@ -0,0 +1,350 @@
+"""
+In-process near-cache for hot, read-mostly Redis keys.
+Keeps raw values for selected key prefixes in memory and drops them when
+Redis reports the key changed, using server-assisted client tracking
+(CLIENT TRACKING ... BCAST, Redis 6+) or keyspace notifications as a fallback.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from redis.asyncio.connection import Connection, ConnectionPool as AsyncConnectionPool
+from redis.exceptions import ResponseError
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INVALIDATE_CHANNEL = b"__redis__:invalidate"
+
+MODE_TRACKING = "tracking"
+MODE_KEYSPACE = "keyspace"
+
+# Keyspace events needed to see every change to a string key: generic (DEL,
+# RENAME, ...), string commands, expirations and evictions
+_KEYSPACE_EVENT_CLASSES = "g$xe"
+
+
+def _keyspace_flags_sufficient(flags: str) -> bool:
+    """Check notify-keyspace-events covers every way a cached key can change."""
+    return "K" in flags and ("A" in flags or all(event in flags for event in _KEYSPACE_EVENT_CLASSES))
+
+
+class NearCache:
+    """
+    Invalidation-tracked local cache in front of a Redis connection pool.
+
+    Reads are only served locally while the invalidation channel is
+    connected; if it drops, the cache is cleared and bypassed until tracking
+    is re-established. Each entry also has a local TTL as a backstop.
+
+    A value read from Redis is only stored if no invalidation for its key
+    arrived while the read was in flight (see begin and complete), so a
+    concurrent write can never leave a stale value behind.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        prefixes: Sequence[str],
+        max_entries: int = 10000,
+        ttl_seconds: float = 60.0,
+        check_interval: float = 5.0,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Initialize near-cache.
+
+        Args:
+            pool: Async connection pool whose settings are used for the
+                dedicated tracking and invalidation connections
+            prefixes: Key prefixes to cache locally (e.g. 'access_token:')
+            max_entries: Maximum cached keys; least recently used are evicted
+            ttl_seconds: Maximum age of a local entry regardless of invalidations
+            check_interval: Seconds between liveness checks of the tracking connection
+            max_backoff: Maximum seconds between reconnect attempts
+        """
+        if not prefixes:
+            raise ValueError("NearCache needs at least one key prefix")
+
+        self.pool = pool
+        self.prefixes = tuple(prefixes)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+
+        self.mode: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._pending: Dict[str, object] = {}
+        self._active = False
+        self._disabled = False
+        self._task: Optional[asyncio.Task] = None
+        self._listener: Optional[Connection] = None
+        self._tracker: Optional[Connection] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether invalidations are being received and reads may be served locally."""
+        return self._active
+
+    def matches(self, key: str) -> bool:
+        """Whether a key falls under one of the cached prefixes."""
+        return key.startswith(self.prefixes)
+
+    def start(self) -> None:
+        """Start the background invalidation listener if it is not running."""
+        if self._disabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """Stop the listener, close its connections and drop all entries."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._disconnect()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a locally cached raw value.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Raw value, or None if it is not cached locally
+        """
+        if not self._active:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def begin(self, key: str) -> Optional[object]:
+        """
+        Mark a key as being read from Redis.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Token to pass to complete, or None if the value must not be cached
+        """
+        if not self._active or not self.matches(key):
+            return None
+        token = object()
+        self._pending[key] = token
+        return token
+
+    def complete(self, key: str, token: Optional[object], value: Optional[bytes]) -> None:
+        """
+        Store a value read from Redis unless its key was invalidated meanwhile.
+
+        Args:
+            key: Redis key
+            token: Token returned by begin
+            value: Raw value read from Redis, or None if the key was missing
+        """
+        if token is None or self._pending.get(key) is not token:
+            return
+        del self._pending[key]
+        if value is None or not self._active:
+            return
+
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """
+        Drop keys from the local cache and cancel in-flight reads of them.
+
+        Args:
+            keys: Redis keys
+        """
+        for key in keys:
+            self._entries.pop(key, None)
+            self._pending.pop(key, None)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every local entry and cancel every in-flight read."""
+        self._entries.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Counters for monitoring."""
+        return {
+            "mode": self.mode,
+            "active": self._active,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+    async def _run(self) -> None:
+        """Keep invalidations flowing, reconnecting with backoff on failure."""
+        backoff = 1.0
+        while True:
+            try:
+                if not await self._connect():
+                    self._disabled = True
+                    await self._disconnect()
+                    return
+                backoff = 1.0
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logger.warning(
+                    "Near-cache invalidation stream lost; bypassing local cache",
+                    extra={"exception": str(exception), "retry_in": backoff},
+                )
+            await self._disconnect()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _connect(self) -> bool:
+        """
+        Open the invalidation connection and enable tracking or keyspace events.
+
+        Returns:
+            False if the server can provide neither, so retrying is pointless
+        """
+        self._listener = await self._open_connection()
+        client_id = await self._command(self._listener, "CLIENT", "ID")
+
+        try:
+            self._tracker = await self._open_connection()
+            prefix_args: List[str] = []
+            for prefix in self.prefixes:
+                prefix_args.extend(("PREFIX", prefix))
+            await self._command(
+                self._tracker,
+                "CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefix_args,
+            )
+            await self._listener.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+            await self._listener.read_response()
+            self.mode = MODE_TRACKING
+        except ResponseError as exception:
+            # Servers older than Redis 6 have no client tracking
+            logger.info(
+                "Client tracking unavailable, falling back to keyspace notifications",
+                extra={"exception": str(exception)},
+            )
+            if not await self._enable_keyspace_notifications():
+                return False
+            self.mode = MODE_KEYSPACE
+
+        # Nothing read before this point was covered by invalidations
+        self.clear()
+        self._active = True
+        logger.info("Near-cache active", extra={"mode": self.mode, "prefixes": list(self.prefixes)})
+        return True
+
+    async def _enable_keyspace_notifications(self) -> bool:
+        """Subscribe to keyspace events for the cached prefixes, if the server emits them."""
+        if self._tracker is not None:
+            await self._tracker.disconnect()
+            self._tracker = None
+
+        try:
+            _, flags = await self._command(self._listener, "CONFIG", "GET", "notify-keyspace-events")
+        except ResponseError as exception:
+            # CONFIG is often disabled on managed Redis
+            logger.error(
+                "Near-cache disabled: cannot verify keyspace notification settings",
+                extra={"exception": str(exception)},
+            )
+            return False
+
+        flags = flags.decode() if isinstance(flags, bytes) else flags or ""
+        if not _keyspace_flags_sufficient(flags):
+            logger.error(
+                "Near-cache disabled: keyspace notifications not enabled",
+                extra={"notify_keyspace_events": flags, "required": f"K{_KEYSPACE_EVENT_CLASSES}"},
+            )
+            return False
+
+        database = self.pool.connection_kwargs.get("db", 0)
+        patterns = [f"__keyspace@{database}__:{prefix}*" for prefix in self.prefixes]
+        await self._listener.send_command("PSUBSCRIBE", *patterns)
+        for _ in patterns:
+            await self._listener.read_response()
+        return True
+
+    async def _listen(self) -> None:
+        """Apply invalidation messages until a connection fails."""
+        while True:
+            message = await self._listener.read_response(timeout=self.check_interval)
+            if message is None:
+                # Quiet period: make sure the tracking connection is still alive,
+                # since its loss would silently stop invalidations
+                if self._tracker is not None:
+                    await self._command(self._tracker, "PING")
+                continue
+            self._handle_message(message)
+
+    def _handle_message(self, message: list) -> None:
+        """Apply one pub/sub message from the invalidation connection."""
+        kind = message[0]
+        if kind == b"message" and message[1] == INVALIDATE_CHANNEL:
+            keys = message[2]
+            if keys is None:
+                # FLUSHDB / FLUSHALL
+                self.clear()
+            else:
+                self.invalidate(key.decode() if isinstance(key, bytes) else key for key in keys)
+        elif kind == b"pmessage":
+            channel = message[2].decode() if isinstance(message[2], bytes) else message[2]
+            self.invalidate([channel.split("__:", 1)[1]])
+
+    async def _open_connection(self) -> Connection:
+        """Open a dedicated connection outside the pool."""
+        connection = self.pool.connection_class(**self.pool.connection_kwargs)
+        await connection.connect()
+        return connection
+
+    @staticmethod
+    async def _command(connection: Connection, *args):
+        """Send one command on a dedicated connection and return its reply."""
+        await connection.send_command(*args)
+        return await connection.read_response()
+
+    async def _disconnect(self) -> None:
+        """Deactivate and close the dedicated connections."""
+        self._active = False
+        self.clear()
+        for connection in (self._tracker, self._listener):
+            if connection is not None:
+                try:
+                    await connection.disconnect()
+                except Exception:
+                    pass
+        self._tracker = None
+        self._listener = None
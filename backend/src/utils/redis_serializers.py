@@ -0,0 +1,122 @@
+"""
+Serializers for values stored through RedisManager.
+Values are written as a one-byte format tag followed by the payload, so the
+format can change without breaking values already in Redis.
+"""
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Union
+
+import msgpack
+import orjson
+
+# Format tags. Neither byte can start a JSON document, so untagged values
+# written before envelopes existed are still recognized as legacy JSON.
+TAG_JSON = 0x01
+TAG_MSGPACK = 0x02
+
+
+class RedisSerializer(ABC):
+    """Abstract base class for Redis value serializers."""
+
+    name: str
+    tag: int
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value into a tagged envelope.
+
+        Args:
+            value: JSON-compatible value
+
+        Returns:
+            Tag byte followed by the encoded payload
+        """
+        return bytes((self.tag,)) + self.encode(value)
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encode a value without the tag."""
+        pass
+
+
+class JsonSerializer(RedisSerializer):
+    """Standard library JSON."""
+
+    name = "json"
+    tag = TAG_JSON
+
+    def encode(self, value: Any) -> bytes:
+        """Encode with json.dumps."""
+        return json.dumps(value).encode()
+
+
+class OrjsonSerializer(RedisSerializer):
+    """orjson: same JSON format as JsonSerializer, several times faster."""
+
+    name = "orjson"
+    tag = TAG_JSON
+
+    def encode(self, value: Any) -> bytes:
+        """Encode with orjson, accepting non-string keys like json.dumps does."""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgpackSerializer(RedisSerializer):
+    """MessagePack: compact binary encoding."""
+
+    name = "msgpack"
+    tag = TAG_MSGPACK
+
+    def encode(self, value: Any) -> bytes:
+        """Encode with msgpack."""
+        return msgpack.packb(value, use_bin_type=True)
+
+
+SERIALIZERS: Dict[str, RedisSerializer] = {
+    serializer.name: serializer
+    for serializer in (JsonSerializer(), OrjsonSerializer(), MsgpackSerializer())
+}
+
+
+def get_serializer(name: str) -> RedisSerializer:
+    """
+    Get a serializer by name.
+
+    Args:
+        name: 'json', 'orjson' or 'msgpack'
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown Redis serializer: {name} (expected one of {', '.join(SERIALIZERS)})")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Deserialize a value written by any serializer, or a legacy untagged JSON value.
+
+    Args:
+        data: Raw Redis value
+
+    Returns:
+        Deserialized value
+
+    Raises:
+        ValueError: If the payload cannot be decoded
+    """
+    if isinstance(data, str):
+        return orjson.loads(data)
+
+    buffer = memoryview(data)
+    if len(buffer) and buffer[0] == TAG_JSON:
+        return orjson.loads(buffer[1:])
+    if len(buffer) and buffer[0] == TAG_MSGPACK:
+        return msgpack.unpackb(buffer[1:], raw=False)
+    return orjson.loads(buffer)
@@ -0,0 +1,231 @@
+"""
+Request-scoped I/O accounting.
+Counts database statements, Redis round trips and outbound HTTP calls made
+while serving one request, for request logs, the Server-Timing header and
+per-endpoint I/O budgets in tests.
+"""
+import contextvars
+import functools
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+IO_DB = "db"
+IO_REDIS = "redis"
+IO_HTTP = "http"
+IO_LLM = "llm"
+
+_request_io: contextvars.ContextVar[Optional["RequestIO"]] = contextvars.ContextVar("request_io", default=None)
+# Lists that every newly begun RequestIO is appended to (used by IOBudget)
+_observers: contextvars.ContextVar[Optional[List["RequestIO"]]] = contextvars.ContextVar(
+    "request_io_observers", default=None
+)
+
+
+@dataclass
+class IOCounter:
+    """Number of calls of one kind and their total time."""
+
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+@dataclass
+class RequestIO:
+    """I/O performed while serving one request."""
+
+    counters: Dict[str, IOCounter] = field(default_factory=dict)
+    # Database statement fingerprints, to spot one shape repeated per row (N+1)
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, kind: str, duration_ms: float) -> None:
+        """Record one call of the given kind."""
+        counter = self.counters.get(kind)
+        if counter is None:
+            counter = self.counters[kind] = IOCounter()
+        counter.count += 1
+        counter.duration_ms += duration_ms
+
+    def count(self, kind: str) -> int:
+        """Number of calls of a kind."""
+        counter = self.counters.get(kind)
+        return counter.count if counter else 0
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Statement fingerprints executed at least threshold times (likely N+1 patterns)."""
+        return {key: count for key, count in self.fingerprints.items() if count >= threshold}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Log fields such as db_calls and db_time_ms for every kind used."""
+        data: Dict[str, Any] = {}
+        for kind, counter in self.counters.items():
+            data[f"{kind}_calls"] = counter.count
+            data[f"{kind}_time_ms"] = round(counter.duration_ms, 3)
+        return data
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value, e.g. 'db;dur=4.2;desc="3 calls", redis;dur=0.8;desc="1 call"'.
+        """
+        return ", ".join(
+            f'{kind};dur={counter.duration_ms:.1f};desc="{counter.count} call{"" if counter.count == 1 else "s"}"'
+            for kind, counter in self.counters.items()
+        )
+
+
+def begin_request_io() -> RequestIO:
+    """Start accounting I/O for the current request context."""
+    request_io = RequestIO()
+    _request_io.set(request_io)
+    observers = _observers.get()
+    if observers is not None:
+        observers.append(request_io)
+    return request_io
+
+
+def current_request_io() -> Optional[RequestIO]:
+    """I/O recorded so far in the current request context, if accounting was started."""
+    return _request_io.get()
+
+
+def record_io(kind: str, duration_ms: float, fingerprint: Optional[str] = None) -> None:
+    """
+    Record one I/O call against the current request, if there is one.
+
+    Args:
+        kind: Call kind (db, redis, http, llm)
+        duration_ms: Call duration in milliseconds
+        fingerprint: Statement fingerprint, for database calls
+    """
+    request_io = _request_io.get()
+    if request_io is None:
+        return
+    request_io.record(kind, duration_ms)
+    if fingerprint is not None:
+        request_io.fingerprints[fingerprint] += 1
+
+
+@asynccontextmanager
+async def track_io(kind: str) -> AsyncIterator[None]:
+    """
+    Time the enclosed call as one I/O call of the given kind.
+
+    Usage:
+        async with track_io(IO_LLM):
+            response = await client.chat.completions.create(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_io(kind, (time.perf_counter() - start) * 1000)
+
+
+def http_trace_config():
+    """
+    aiohttp TraceConfig recording every outbound request as one http call.
+
+    Usage:
+        aiohttp.ClientSession(trace_configs=[http_trace_config()])
+    """
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        context.io_start = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        record_io(IO_HTTP, (time.perf_counter() - context.io_start) * 1000)
+
+    async def on_request_exception(session, context, params):
+        record_io(IO_HTTP, (time.perf_counter() - context.io_start) * 1000)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+class IOBudgetExceeded(AssertionError):
+    """Raised when a request performed more I/O than its budget allows."""
+
+
+class IOBudget:
+    """
+    Assert upper bounds on the I/O calls made by the enclosed code.
+
+    Every request served inside the block is checked separately; I/O made
+    directly by the block (outside any request) is checked as one more unit.
+    Usable as a sync or async context manager, or as a decorator.
+
+    Usage:
+        async with IOBudget(db=1, redis=1):
+            await client.get("/api/v1/users/me")
+
+        @IOBudget(db=2)
+        async def test_something(): ...
+    """
+
+    def __init__(self, **limits: int):
+        """
+        Initialize budget.
+
+        Args:
+            **limits: Maximum calls per kind, e.g. db=1, redis=1, http=0
+        """
+        self.limits = limits
+        self.requests: List[RequestIO] = []
+        self.direct: Optional[RequestIO] = None
+        self._tokens: List[contextvars.Token] = []
+
+    def __enter__(self) -> "IOBudget":
+        self.requests = []
+        self.direct = RequestIO()
+        self._tokens = [_observers.set(self.requests), _request_io.set(self.direct)]
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        _request_io.reset(self._tokens.pop())
+        _observers.reset(self._tokens.pop())
+        if exc_type is None:
+            self.check()
+
+    async def __aenter__(self) -> "IOBudget":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        self.__exit__(exc_type, exc, traceback)
+
+    def __call__(self, function: Callable) -> Callable:
+        """Apply the budget to every call of an async function."""
+
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            async with IOBudget(**self.limits):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    def check(self) -> None:
+        """
+        Raise if any request, or the direct I/O of the block, exceeded a limit.
+
+        Raises:
+            IOBudgetExceeded: Listing every exceeded limit
+        """
+        units = [(f"request {index + 1}", request_io) for index, request_io in enumerate(self.requests)]
+        units.append(("direct calls", self.direct))
+        failures = [
+            f"{name}: {kind} {request_io.count(kind)} > {limit}"
+            for name, request_io in units
+            for kind, limit in self.limits.items()
+            if request_io.count(kind) > limit
+        ]
+        if failures:
+            raise IOBudgetExceeded("I/O budget exceeded: " + "; ".join(failures))
@@ -7,6 +7,7 @@ import asyncio
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.pool import NullPool
+from redis.asyncio.connection import Connection as AsyncRedisConnection
 from src.models.base import Base
 from src.app import create_app
 
@@ -143,3 +144,88 @@ def mock_auth_session():
 
     with patch('src.services.auth_service.AuthService.create_session', new_callable=AsyncMock) as mock_session:
         yield mock_session
+
+
+@pytest.fixture
+def io_budget():
+    """
+    Assert per-request I/O budgets; every request made inside the block is checked.
+
+    Usage:
+        async with io_budget(db=1, redis=1):
+            response = await client.get("/api/v1/users/me")
+    """
+    from src.utils.request_io import IOBudget
+
+    return IOBudget
+
+
+class InMemoryRedisStore:
+    """The few Redis commands the request path uses, answered from a dict."""
+
+    def __init__(self):
+        self.values = {}
+
+    def execute(self, command, *args):
+        """Run one command and return its raw reply."""
+        command = command.upper() if isinstance(command, str) else command.decode().upper()
+        args = [arg.encode() if isinstance(arg, str) else arg for arg in args]
+        if command == "GET":
+            return self.values.get(args[0])
+        if command == "SETEX":
+            self.values[args[0]] = args[2]
+            return b"OK"
+        if command == "SET":
+            key, value, options = args[0], args[1], {arg.upper() for arg in args[2:] if isinstance(arg, bytes)}
+            if b"NX" in options and key in self.values:
+                return None
+            self.values[key] = value
+            return b"OK"
+        if command == "DEL":
+            return sum(self.values.pop(key, None) is not None for key in args)
+        raise NotImplementedError(f"InMemoryRedisStore does not support {command}")
+
+
+class InMemoryRedisConnection(AsyncRedisConnection):
+    """redis.asyncio connection that answers from an InMemoryRedisStore instead of a socket."""
+
+    def __init__(self, *, store: InMemoryRedisStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.replies = []
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self, nowait: bool = False):
+        pass
+
+    async def can_read_destructive(self):
+        return False
+
+    async def send_command(self, *args, **kwargs):
+        self.replies.append(self.store.execute(*args))
+
+    async def read_response(self, *args, **kwargs):
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def metered_redis():
+    """
+    Global RedisManager on the metered async pool, backed by memory.
+
+    Every command is checked out and released through the same pool class
+    production uses, so I/O budgets count real Redis round trips.
+    """
+    from unittest.mock import patch
+    from src.utils import redis_client
+    from src.utils.pool_metrics import MeteredRedisConnectionPool
+
+    manager = redis_client.RedisManager("redis://localhost:6379/0")
+    manager._async_pool = MeteredRedisConnectionPool(
+        connection_class=InMemoryRedisConnection,
+        store=InMemoryRedisStore(),
+    )
+    with patch.object(redis_client, "_redis_manager", manager):
+        yield manager
@@ -0,0 +1,98 @@
+"""
+Tests for the in-process IVF approximate nearest neighbour index.
+"""
+import numpy as np
+import pytest
+
+from src.services.ann_index import IVFIndex
+from src.services.embedding_service import EmbeddingService
+
+
+@pytest.fixture
+def clustered_vectors():
+    """Create clustered embeddings resembling real semantic data."""
+    rng = np.random.default_rng(3)
+    centers = rng.standard_normal((20, 64)).astype(np.float32)
+    labels = rng.integers(0, 20, size=2000)
+    return (centers[labels] + 0.3 * rng.standard_normal((2000, 64))).astype(np.float32)
+
+
+@pytest.fixture
+def index(clustered_vectors):
+    """Build an index keyed by ids offset from row positions."""
+    ids = np.arange(len(clustered_vectors)) + 1000
+    return IVFIndex.build(ids, clustered_vectors, n_lists=20, n_probe=4)
+
+
+def exact_top_ids(vectors, query, k):
+    """Compute exact top-k ids (row + 1000) for comparison."""
+    matrix = EmbeddingService.normalize_embeddings(vectors)
+    rows, _ = EmbeddingService.top_k(query, matrix, k)
+    return set((rows + 1000).tolist())
+
+
+def test_search_finds_the_query_vector_first(index, clustered_vectors):
+    """Test that an indexed vector is its own nearest neighbour."""
+    ids, scores = index.search(clustered_vectors[17], k=5)
+
+    assert ids[0] == 1017
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_search_recall_against_exact(index, clustered_vectors):
+    """Test that probing a few lists recovers most exact neighbours."""
+    queries = clustered_vectors[:50] + 0.05
+    ids, _ = index.search(queries, k=10)
+
+    recall = np.mean([
+        len(set(row.tolist()) & exact_top_ids(clustered_vectors, query, 10)) / 10
+        for row, query in zip(ids, queries)
+    ])
+    assert recall >= 0.9
+
+
+def test_probing_every_list_is_exact(index, clustered_vectors):
+    """Test that n_probe == n_lists matches exact search."""
+    query = clustered_vectors[5] + 0.2
+    ids, _ = index.search(query, k=10, n_probe=index.n_lists)
+
+    assert set(ids.tolist()) == exact_top_ids(clustered_vectors, query, 10)
+
+
+def test_incremental_inserts_are_searchable(index):
+    """Test that vectors added after build are found before compaction."""
+    new_vector = np.ones(64, dtype=np.float32)
+    index.add([99999], [new_vector])
+
+    ids, _ = index.search(new_vector, k=1)
+
+    assert ids.tolist() == [99999]
+    assert len(index) == 2001
+
+
+def test_save_and_load_memory_mapped(index, clustered_vectors, tmp_path):
+    """Test that a saved index reloads memory-mapped with identical results."""
+    index.add([99999], [np.ones(64, dtype=np.float32)])
+    path = str(tmp_path / "interaction_index")
+    index.save(path)
+
+    loaded = IVFIndex.load(path)
+
+    assert isinstance(loaded._vectors, np.memmap)
+    assert len(loaded) == 2001
+    query = clustered_vectors[42]
+    assert loaded.search(query, k=10)[0].tolist() == index.search(query, k=10)[0].tolist()
+
+    # Saving again replaces the directory atomically
+    loaded.add([123456], [clustered_vectors[0]])
+    loaded.save(path)
+    assert len(IVFIndex.load(path)) == 2002
+
+
+def test_add_rejects_mismatched_input(index):
+    """Test that wrong dimensions or id counts raise ValueError."""
+    with pytest.raises(ValueError):
+        index.add([1], np.ones((1, 32)))
+    with pytest.raises(ValueError):
+        index.add([1, 2], np.ones((1, 64)))
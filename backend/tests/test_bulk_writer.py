@@ -0,0 +1,283 @@
+"""
+Tests for the buffered bulk writer.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.models.conversation import Message, MessageRole
+from src.models.interaction_log import InteractionLog
+from src.models.user import User
+from src.services import bulk_writer
+from src.services.bulk_writer import BulkWriter, SPILL_GROUP
+from src.utils.redis_keys import bulk_write_dead_letter_key, bulk_write_spill_key
+
+
+def interaction(user_id=1):
+    """New interaction log row."""
+    return InteractionLog(user_id=user_id, interaction_type="hint_request", interaction_data={"hint": 1})
+
+
+@pytest.fixture
+def session():
+    """Mock session handed out by the patched database manager."""
+    session = MagicMock()
+    session.execute = AsyncMock()
+
+    @asynccontextmanager
+    async def open_session(*args, **kwargs):
+        yield session
+
+    database = MagicMock()
+    database.get_async_session = open_session
+    with patch.object(bulk_writer, "get_database", return_value=database):
+        yield session
+
+
+@pytest.fixture
+def redis():
+    """Mock Redis client with a recording pipeline."""
+    client = MagicMock()
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock()
+    client.pipeline.return_value = pipeline
+    with patch.object(bulk_writer, "get_redis") as get_redis:
+        get_redis.return_value.async_client = client
+        yield client
+
+
+class TestRows:
+    """Tests for turning ORM objects into rows."""
+
+    def test_id_is_left_to_the_database_and_time_is_kept(self):
+        """Test rows omit the serial id and record when they were written."""
+        before = datetime.now(timezone.utc)
+
+        table, row = BulkWriter().row(interaction())
+
+        assert table.name == "interaction_logs"
+        assert "id" not in row
+        assert row["created_at"] >= before
+        assert row["interaction_data"] == {"hint": 1}
+
+    def test_unconfigured_model_is_rejected(self):
+        """Test only configured append-only models are accepted."""
+        with pytest.raises(TypeError):
+            BulkWriter().row(User(email="a@b.c"))
+
+    def test_spilled_row_round_trip(self):
+        """Test rows survive the spill stream encoding, enums by name."""
+        _, row = BulkWriter().row(Message(conversation_id=3, role=MessageRole.ASSISTANT, content="Hi"))
+
+        restored = BulkWriter._unpack(BulkWriter._pack(row))
+
+        assert restored["role"] == "ASSISTANT"
+        assert restored["created_at"] == row["created_at"]
+        assert restored["content"] == "Hi"
+
+
+class TestBatching:
+    """Tests for batch flushing."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_multi_row_batches(self, session):
+        """Test buffered rows are inserted batch_size rows per statement."""
+        writer = BulkWriter(batch_size=2, max_buffer=10)
+        for user_id in range(5):
+            await writer.write(interaction(user_id))
+
+        assert await writer.flush() == 5
+
+        assert session.execute.await_count == 3
+        statement = str(session.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert statement.startswith("INSERT INTO interaction_logs")
+        assert statement.count("now()") == 0
+        assert writer.stats.written == 5
+        assert writer.stats.batches == 3
+
+    @pytest.mark.asyncio
+    async def test_rows_are_flushed_after_max_wait(self, session):
+        """Test a partial batch is written once it is max_wait_ms old."""
+        writer = BulkWriter(batch_size=100, max_wait_ms=10)
+        await writer.start()
+        try:
+            await writer.write(interaction())
+            await asyncio.sleep(0.1)
+            assert writer.stats.written == 1
+        finally:
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_buffered_rows(self, session):
+        """Test shutdown writes what is still buffered."""
+        writer = BulkWriter(batch_size=100, max_wait_ms=60_000)
+        await writer.start()
+        await writer.write(interaction())
+        await writer.write(interaction())
+        await asyncio.sleep(0)
+
+        await writer.stop()
+
+        assert writer.stats.written == 2
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_applies_backpressure(self, session):
+        """Test write() waits while the buffer is full."""
+        writer = BulkWriter(batch_size=1, max_buffer=1)
+        await writer.write(interaction())
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(writer.write(interaction()), timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_is_counted_as_dropped(self, session):
+        """Test a failing batch does not stop the writer."""
+        session.execute.side_effect = ConnectionError("down")
+        writer = BulkWriter(batch_size=2, max_buffer=10)
+        await writer.write(interaction())
+
+        await writer.flush()
+
+        assert writer.stats.dropped == 1
+        assert writer.stats.written == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_retries_rows_individually(self, session):
+        """Test a bad row is retried alone and only that row is dropped."""
+        violation = IntegrityError("INSERT", {}, Exception("foreign key violation"))
+        session.execute.side_effect = [violation, None, violation, None]
+        writer = BulkWriter(batch_size=3, max_buffer=10)
+        for user_id in (1, 2, 3):
+            await writer.write(interaction(user_id))
+
+        await writer.flush()
+
+        assert session.execute.await_count == 4
+        assert writer.stats.written == 2
+        assert writer.stats.dropped == 1
+
+
+class TestSpill:
+    """Tests for the Redis stream spill."""
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_spills(self, session, redis):
+        """Test a full buffer spills instead of blocking when spilling is enabled."""
+        writer = BulkWriter(batch_size=1, max_buffer=1, spill=True)
+        await writer.write(interaction())
+
+        await asyncio.wait_for(writer.write(interaction()), timeout=0.05)
+
+        pipeline = redis.pipeline.return_value
+        assert pipeline.xadd.call_args.args[0] == bulk_write_spill_key("interaction_logs")
+        assert writer.stats.spilled == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_spills(self, session, redis):
+        """Test rows of a failed batch are kept in the stream."""
+        session.execute.side_effect = ConnectionError("down")
+        writer = BulkWriter(batch_size=2, max_buffer=10, spill=True)
+        await writer.write(interaction())
+        await writer.write(interaction())
+
+        await writer.flush()
+
+        assert redis.pipeline.return_value.xadd.call_count == 2
+        assert writer.stats.spilled == 2
+        assert writer.stats.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_only_failing_rows_of_a_batch_spill(self, session, redis):
+        """Test rows that insert on their own are written and only the bad row spills."""
+        violation = IntegrityError("INSERT", {}, Exception("foreign key violation"))
+        session.execute.side_effect = [violation, violation, None]
+        writer = BulkWriter(batch_size=2, max_buffer=10, spill=True)
+        await writer.write(interaction(1))
+        await writer.write(interaction(2))
+
+        await writer.flush()
+
+        assert redis.pipeline.return_value.xadd.call_count == 1
+        assert writer.stats.spilled == 1
+        assert writer.stats.written == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_inserts_then_acknowledges(self, session, redis):
+        """Test spilled rows are deleted from the stream only after they are inserted."""
+        writer = BulkWriter(models=(InteractionLog,), spill=True, consumer="worker-1")
+        _, row = writer.row(interaction())
+        key = bulk_write_spill_key("interaction_logs")
+        redis.xgroup_create = AsyncMock()
+        redis.xautoclaim = AsyncMock(return_value=[b"0-0", [], []])
+        redis.xreadgroup = AsyncMock(side_effect=[[[key, [(b"1-0", {b"row": BulkWriter._pack(row)})]]], []])
+        redis.xack = AsyncMock()
+        redis.xdel = AsyncMock()
+
+        assert await writer.replay_spilled() == 1
+
+        session.execute.assert_awaited_once()
+        redis.xack.assert_awaited_once_with(key, SPILL_GROUP, b"1-0")
+        redis.xdel.assert_awaited_once_with(key, b"1-0")
+
+    def spilled(self, redis, writer, count):
+        """Queue count spilled rows for the next replay read."""
+        _, row = writer.row(interaction())
+        key = bulk_write_spill_key("interaction_logs")
+        entries = [(f"{index}-0".encode(), {b"row": BulkWriter._pack(row)}) for index in range(1, count + 1)]
+        redis.xgroup_create = AsyncMock()
+        redis.xautoclaim = AsyncMock(return_value=[b"0-0", [], []])
+        redis.xreadgroup = AsyncMock(side_effect=[[[key, entries]], []])
+        redis.xack = AsyncMock()
+        redis.xdel = AsyncMock()
+        return key
+
+    @pytest.mark.asyncio
+    async def test_failed_replay_batch_retries_rows_individually(self, session, redis):
+        """Test a bad row is retried alone and stays pending while good rows are inserted."""
+        writer = BulkWriter(models=(InteractionLog,), spill=True, consumer="worker-1")
+        key = self.spilled(redis, writer, 2)
+        violation = IntegrityError("INSERT", {}, Exception("foreign key violation"))
+        session.execute.side_effect = [violation, None, violation]
+        redis.pipeline.return_value.execute.return_value = [[{"times_delivered": 1}]]
+
+        assert await writer.replay_spilled() == 1
+
+        assert session.execute.await_count == 3
+        redis.xack.assert_awaited_once_with(key, SPILL_GROUP, b"1-0")
+        redis.xdel.assert_awaited_once_with(key, b"1-0")
+        assert writer.stats.dead_lettered == 0
+
+    @pytest.mark.asyncio
+    async def test_row_failing_every_attempt_is_dead_lettered(self, session, redis):
+        """Test a row delivered max_replay_attempts times moves to the dead-letter stream."""
+        writer = BulkWriter(models=(InteractionLog,), spill=True, max_replay_attempts=3, consumer="worker-1")
+        key = self.spilled(redis, writer, 1)
+        session.execute.side_effect = IntegrityError("INSERT", {}, Exception("no partition for row"))
+        pipeline = redis.pipeline.return_value
+        pipeline.execute.side_effect = [[[{"times_delivered": 3}]], None]
+
+        assert await writer.replay_spilled() == 0
+
+        dead_letter = pipeline.xadd.call_args
+        assert dead_letter.args[0] == bulk_write_dead_letter_key("interaction_logs")
+        assert dead_letter.args[1]["attempts"] == 3
+        redis.xack.assert_awaited_once_with(key, SPILL_GROUP, b"1-0")
+        assert writer.stats.dead_lettered == 1
+
+    @pytest.mark.asyncio
+    async def test_lost_connection_leaves_rows_pending(self, session, redis):
+        """Test rows are neither split nor dead-lettered while the database is unreachable."""
+        writer = BulkWriter(models=(InteractionLog,), spill=True, max_replay_attempts=1, consumer="worker-1")
+        self.spilled(redis, writer, 2)
+        session.execute.side_effect = OperationalError("INSERT", {}, Exception("connection refused"))
+
+        with pytest.raises(OperationalError):
+            await writer.replay_spilled()
+
+        session.execute.assert_awaited_once()
+        redis.xack.assert_not_called()
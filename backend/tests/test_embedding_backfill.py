@@ -0,0 +1,191 @@
+"""
+Tests for the embedding backfill job.
+"""
+import json
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.embedding_backfill import (
+    BACKFILL_TARGETS,
+    EmbeddingBackfillError,
+    EmbeddingBackfillJob,
+    build_bulk_update,
+)
+from src.services.embedding_service import EmbeddingService
+
+
+def _interaction_row(row_id):
+    return SimpleNamespace(
+        key=row_id,
+        interaction_type="exercise_submission",
+        context_type="exercise",
+        interaction_data={"success": True},
+    )
+
+
+class FakeTable:
+    """In-memory stand-in for a table scanned by keyset pages."""
+
+    def __init__(self, row_ids):
+        self.row_ids = row_ids
+        self.updates = []
+
+    def session_factory(self):
+        table = self
+
+        @asynccontextmanager
+        async def factory():
+            session = Mock()
+            session.execute = AsyncMock(side_effect=table._execute)
+            yield session
+
+        return factory
+
+    async def _execute(self, statement, parameters):
+        self.updates.append(parameters)
+
+
+@pytest.fixture
+def embedding_service():
+    service = EmbeddingService()
+    service.batch_generate_embeddings = AsyncMock(
+        side_effect=lambda texts: [[0.1, 0.2] for _ in texts]
+    )
+    return service
+
+
+def _job(embedding_service, table, **kwargs):
+    job = EmbeddingBackfillJob(
+        embedding_service, table.session_factory(), "interaction_logs", **kwargs
+    )
+
+    async def fetch_page(after_id, limit):
+        return [_interaction_row(i) for i in table.row_ids if i > after_id][:limit]
+
+    job._fetch_page = fetch_page
+    return job
+
+
+class TestEmbeddingBackfill:
+    """Tests for EmbeddingBackfillJob."""
+
+    @pytest.mark.asyncio
+    async def test_run_processes_all_pages(self, embedding_service):
+        """Test every row is embedded and written in batch-sized updates."""
+        table = FakeTable(list(range(1, 8)))
+        job = _job(embedding_service, table, batch_size=3)
+
+        stats = await job.run()
+
+        assert stats.rows_scanned == 7
+        assert stats.rows_updated == 7
+        assert stats.batches == 3
+        assert stats.last_id == 7
+        assert [len(update) // 2 for update in table.updates] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_empty_texts_are_skipped(self, embedding_service):
+        """Test rows with no text are counted as skipped and not written."""
+        embedding_service.batch_generate_embeddings = AsyncMock(return_value=[[0.1], None])
+        table = FakeTable([1, 2])
+        job = _job(embedding_service, table, batch_size=2)
+        job.target = replace(job.target, to_text=lambda service, row: "" if row.key == 2 else "text")
+
+        stats = await job.run()
+
+        assert stats.rows_updated == 1
+        assert stats.rows_skipped == 1
+        assert stats.provider_failures == 0
+        assert stats.last_id == 2
+        assert table.updates == [{"id_0": 1, "embedding_0": "[0.1]"}]
+
+    @pytest.mark.asyncio
+    async def test_provider_failure_is_retried_not_skipped(self, embedding_service, tmp_path):
+        """Test progress stops before a row the provider failed, which is retried."""
+        checkpoint = tmp_path / "backfill.json"
+        embedding_service.batch_generate_embeddings = AsyncMock(
+            side_effect=[[[0.1], None, [0.3]], [[0.2], [0.3]]]
+        )
+        table = FakeTable([1, 2, 3])
+        job = _job(
+            embedding_service, table, batch_size=3, checkpoint_path=str(checkpoint), retry_backoff_seconds=0
+        )
+
+        stats = await job.run()
+
+        assert stats.provider_failures == 1
+        assert stats.rows_skipped == 0
+        assert stats.rows_updated == 3
+        assert stats.last_id == 3
+        written_ids = [value for update in table.updates for key, value in update.items() if key.startswith("id_")]
+        assert written_ids == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_provider_outage_aborts_without_advancing(self, embedding_service, tmp_path):
+        """Test a provider that keeps failing aborts the run with the checkpoint before the failed rows."""
+        checkpoint = tmp_path / "backfill.json"
+        embedding_service.batch_generate_embeddings = AsyncMock(side_effect=lambda texts: [None for _ in texts])
+        table = FakeTable([1, 2, 3])
+        job = _job(
+            embedding_service, table, batch_size=3, checkpoint_path=str(checkpoint),
+            max_retries=2, retry_backoff_seconds=0,
+        )
+
+        with pytest.raises(EmbeddingBackfillError):
+            await job.run()
+
+        assert embedding_service.batch_generate_embeddings.await_count == 3
+        assert table.updates == []
+        assert json.loads(checkpoint.read_text())["last_id"] == 0
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint(self, embedding_service, tmp_path):
+        """Test a second run continues after the checkpointed key."""
+        checkpoint = tmp_path / "backfill.json"
+        table = FakeTable(list(range(1, 6)))
+
+        first = await _job(
+            embedding_service, table, batch_size=2, checkpoint_path=str(checkpoint)
+        ).run(max_rows=2)
+        assert first.last_id == 2
+        assert json.loads(checkpoint.read_text())["last_id"] == 2
+
+        second = await _job(
+            embedding_service, table, batch_size=2, checkpoint_path=str(checkpoint)
+        ).run()
+
+        assert second.rows_scanned == 5
+        assert second.last_id == 5
+        written_ids = [value for update in table.updates for key, value in update.items() if key.startswith("id_")]
+        assert written_ids == [1, 2, 3, 4, 5]
+
+    def test_checkpoint_for_other_target_rejected(self, embedding_service, tmp_path):
+        """Test a checkpoint written for another table is not reused."""
+        checkpoint = tmp_path / "backfill.json"
+        checkpoint.write_text(json.dumps({"target": "users", "last_id": 10}))
+
+        with pytest.raises(ValueError):
+            EmbeddingBackfillJob(
+                embedding_service, Mock(), "interaction_logs", checkpoint_path=str(checkpoint)
+            )
+
+    def test_build_bulk_update(self):
+        """Test the bulk UPDATE joins a VALUES list on the key column."""
+        statement, parameters = build_bulk_update(
+            BACKFILL_TARGETS["user_memory"], [(4, [1.0, 0.5]), (9, [0.0, 0.25])]
+        )
+
+        sql = str(statement)
+        assert "UPDATE user_memory" in sql
+        assert "SET learning_pattern_embedding = v.embedding" in sql
+        assert "WHERE t.id = v.id" in sql
+        assert parameters == {
+            "id_0": 4,
+            "embedding_0": "[1.0,0.5]",
+            "id_1": 9,
+            "embedding_1": "[0.0,0.25]",
+        }
@@ -0,0 +1,74 @@
+"""
+Tests for binary embedding cache encoding.
+"""
+import json
+import numpy as np
+import pytest
+
+from src.services.embedding_codec import (
+    HEADER_SIZE,
+    decode_embedding,
+    encode_embedding,
+)
+
+
+@pytest.fixture
+def embedding():
+    """Create a deterministic 1536-dimensional embedding."""
+    rng = np.random.default_rng(42)
+    return rng.standard_normal(1536).astype(np.float32).tolist()
+
+
+def test_float32_round_trip_is_exact(embedding):
+    """Test that float32 encoding is lossless for float32 vectors."""
+    encoded = encode_embedding(embedding)
+
+    assert len(encoded) == HEADER_SIZE + 1536 * 4
+    decoded = decode_embedding(encoded)
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, np.asarray(embedding, dtype=np.float32))
+
+
+def test_float32_decode_is_zero_copy(embedding):
+    """Test that float32 payloads are viewed, not copied."""
+    decoded = decode_embedding(encode_embedding(embedding))
+
+    assert not decoded.flags.owndata
+    assert not decoded.flags.writeable
+
+
+def test_float16_round_trip_is_close(embedding):
+    """Test that float16 halves the payload with small error."""
+    encoded = encode_embedding(embedding, dtype="float16")
+
+    assert len(encoded) == HEADER_SIZE + 1536 * 2
+    assert np.allclose(decode_embedding(encoded), embedding, atol=1e-2)
+
+
+def test_int8_round_trip_preserves_direction(embedding):
+    """Test that int8 quantization keeps cosine similarity close to 1."""
+    encoded = encode_embedding(embedding, dtype="int8")
+    decoded = decode_embedding(encoded)
+    original = np.asarray(embedding, dtype=np.float32)
+
+    cosine = decoded @ original / (np.linalg.norm(decoded) * np.linalg.norm(original))
+    assert len(encoded) == HEADER_SIZE + 4 + 1536
+    assert cosine > 0.999
+
+
+def test_legacy_json_entries_are_readable(embedding):
+    """Test that JSON lists written by older versions still decode."""
+    legacy = json.dumps(embedding)
+
+    assert np.allclose(decode_embedding(legacy), embedding)
+    assert np.allclose(decode_embedding(legacy.encode()), embedding)
+
+
+def test_unknown_format_is_rejected():
+    """Test that unknown versions and dtypes raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_embedding(b"\x09\x01\x00\x00" + b"\x00" * 8)
+    with pytest.raises(ValueError):
+        decode_embedding(b"\x01\x07\x00\x00" + b"\x00" * 8)
+    with pytest.raises(ValueError):
+        encode_embedding([0.1, 0.2], dtype="bfloat16")
@@ -0,0 +1,121 @@
+"""
+Tests for embedding providers.
+"""
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from src.services.embedding_service import EmbeddingService
+from src.services.embeddings import (
+    EmbeddingProviderError,
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    create_embedding_provider,
+)
+
+
+class TestHashingEmbeddingProvider:
+    """Tests for the local feature-hashing provider."""
+
+    @pytest.mark.asyncio
+    async def test_embed_returns_normalized_vectors_of_configured_dimension(self):
+        """Test vectors have the configured dimension and unit length."""
+        provider = HashingEmbeddingProvider(dimension=256)
+
+        embeddings = await provider.embed(["Python developer", "Rust systems programmer"])
+
+        assert len(embeddings) == 2
+        assert all(len(embedding) == 256 for embedding in embeddings)
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-5)
+
+    def test_embeddings_are_deterministic(self):
+        """Test the same text always maps to the same vector."""
+        first = HashingEmbeddingProvider(dimension=128).embed_matrix(["learning loops"])
+        second = HashingEmbeddingProvider(dimension=128).embed_matrix(["learning loops"])
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_similar_texts_score_higher(self):
+        """Test lexical overlap is reflected in cosine similarity."""
+        provider = HashingEmbeddingProvider(dimension=512)
+        query, close, far = provider.embed_matrix(
+            [
+                "Skill level: beginner | Programming language: python",
+                "Skill level: beginner | Programming language: python | Bio: student",
+                "Exercise: graph traversal in haskell",
+            ]
+        )
+
+        assert query @ close > query @ far
+
+    def test_featureless_text_is_zero_vector(self):
+        """Test text without word characters yields a zero vector."""
+        matrix = HashingEmbeddingProvider(dimension=64).embed_matrix(["!!! ..."])
+
+        assert not matrix.any()
+
+    def test_model_name_includes_dimension(self):
+        """Test caches are namespaced by dimension."""
+        assert HashingEmbeddingProvider(dimension=384).model == "hashing-v1-384"
+
+
+class TestOpenAIEmbeddingProvider:
+    """Tests for the OpenAI provider."""
+
+    @pytest.mark.asyncio
+    async def test_embed_without_api_key_raises(self):
+        """Test an unconfigured provider is unavailable and refuses to embed."""
+        provider = OpenAIEmbeddingProvider(api_key=None)
+
+        assert provider.available is False
+        with pytest.raises(EmbeddingProviderError):
+            await provider.embed(["text"])
+
+    @pytest.mark.asyncio
+    async def test_reduced_dimension_passed_for_v3_models(self):
+        """Test text-embedding-3 models are asked for the configured dimension."""
+        provider = OpenAIEmbeddingProvider(api_key="key", model="text-embedding-3-small", dimension=256)
+        response = Mock(data=[Mock(embedding=[0.5] * 256, index=0)])
+        provider.client = Mock()
+        provider.client.embeddings.create = AsyncMock(return_value=response)
+
+        await provider.embed(["text"])
+
+        assert provider.client.embeddings.create.await_args.kwargs["dimensions"] == 256
+
+        assert provider.client.embeddings.create.await_args.kwargs["model"] == "text-embedding-3-small"
+
+    def test_model_id_includes_reduced_dimension(self):
+        """Test caches and stored vectors are namespaced by dimension for reducible models."""
+        provider = OpenAIEmbeddingProvider(api_key=None, model="text-embedding-3-small", dimension=256)
+
+        assert provider.model == "text-embedding-3-small-256"
+        assert OpenAIEmbeddingProvider(api_key=None).model == "text-embedding-ada-002"
+
+    def test_fixed_dimension_model_rejects_other_dimensions(self):
+        """Test ada-002 cannot be configured for a dimension it does not produce."""
+        with pytest.raises(ValueError):
+            OpenAIEmbeddingProvider(api_key=None, model="text-embedding-ada-002", dimension=768)
+
+
+class TestProviderSelection:
+    """Tests for provider wiring."""
+
+    def test_factory_rejects_unknown_provider(self):
+        """Test unknown provider names fail fast."""
+        with pytest.raises(ValueError):
+            create_embedding_provider("unknown")
+
+    @pytest.mark.asyncio
+    async def test_service_uses_local_provider_without_api_key(self):
+        """Test EmbeddingService embeds through a local provider with no network client."""
+        service = EmbeddingService(provider=HashingEmbeddingProvider(dimension=64))
+
+        embedding = await service.generate_text_embedding("Python developer")
+        batch = await service.batch_generate_embeddings(["Python developer", "Go developer"])
+
+        assert len(embedding) == 64
+        assert batch[0] == pytest.approx(embedding)
+        assert service.embedding_model == "hashing-v1-64"
+        assert service.client is None
@@ -0,0 +1,96 @@
+"""
+Tests for quantized embedding search.
+"""
+import numpy as np
+import pytest
+
+from src.services.embedding_codec import DTYPE_INT8, decode_int8_codes, encode_embedding
+from src.services.embedding_quantization import (
+    Int8Quantizer,
+    ProductQuantizer,
+    QuantizedIndex,
+    rerank,
+)
+from src.services.embedding_service import EmbeddingService
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 32)).astype(np.float32)
+    labels = rng.integers(0, 20, size=2000)
+    return centers[labels] + 0.3 * rng.standard_normal((2000, 32)).astype(np.float32)
+
+
+def _recall(index, vectors, queries, k, rerank_factor=1):
+    matrix = EmbeddingService.normalize_embeddings(vectors)
+    hits = 0
+    for query in queries:
+        truth = set(EmbeddingService.top_k(query, matrix, k)[0].tolist())
+        found, _ = index.search(query, k * rerank_factor)
+        if rerank_factor > 1:
+            found, _ = rerank(query, found, matrix[found], k)
+        hits += len(truth & set(found.tolist()))
+    return hits / (k * len(queries))
+
+
+def test_int8_codes_are_a_quarter_of_float32(vectors):
+    """Test int8 codes use one byte per dimension and keep recall."""
+    index = QuantizedIndex.build(Int8Quantizer(32), np.arange(len(vectors)), vectors)
+
+    assert index.codes.dtype == np.int8
+    assert index.codes.nbytes == vectors.size
+    assert _recall(index, vectors, vectors[:20], k=10) >= 0.9
+
+
+def test_product_quantizer_compresses_and_rerank_recovers_recall(vectors):
+    """Test PQ codes are 16x smaller and exact re-ranking restores recall."""
+    quantizer = ProductQuantizer.train(vectors, n_subspaces=8, iterations=5)
+    index = QuantizedIndex.build(quantizer, np.arange(len(vectors)), vectors)
+
+    assert index.codes.shape == (len(vectors), 8)
+    assert index.codes.nbytes * 16 == vectors.nbytes
+    assert _recall(index, vectors, vectors[:20], k=10, rerank_factor=10) >= 0.95
+
+
+def test_pq_scores_match_decoded_inner_products(vectors):
+    """Test lookup-table scoring equals scoring the reconstructed vectors."""
+    quantizer = ProductQuantizer.train(vectors, n_subspaces=4, iterations=3)
+    codes, _ = quantizer.encode(vectors[:50])
+    query = EmbeddingService.normalize_embeddings(vectors[:1])
+
+    np.testing.assert_allclose(
+        quantizer.scores(query, codes)[0], quantizer.decode(codes) @ query[0], rtol=1e-4, atol=1e-5
+    )
+
+
+def test_save_and_load_round_trip(vectors, tmp_path):
+    """Test a persisted index returns the same results after a memory-mapped load."""
+    quantizer = ProductQuantizer.train(vectors, n_subspaces=8, iterations=3)
+    index = QuantizedIndex.build(quantizer, np.arange(100, 100 + len(vectors)), vectors)
+    index.save(str(tmp_path / "index"))
+
+    loaded = QuantizedIndex.load(str(tmp_path / "index"))
+
+    expected = index.search(vectors[3], 5)
+    actual = loaded.search(vectors[3], 5)
+    np.testing.assert_array_equal(expected[0], actual[0])
+    np.testing.assert_allclose(expected[1], actual[1])
+
+
+def test_int8_codec_codes_match_quantizer(vectors):
+    """Test codes read from the embedding_code column score like quantizer codes."""
+    unit = EmbeddingService.normalize_embeddings(vectors[:1])[0]
+    codes, scale = decode_int8_codes(encode_embedding(unit, DTYPE_INT8))
+    expected_codes, expected_scales = Int8Quantizer(32).encode(vectors[:1])
+
+    np.testing.assert_array_equal(codes, expected_codes[0])
+    assert scale == pytest.approx(expected_scales[0])
+
+
+def test_rerank_orders_by_exact_similarity():
+    """Test re-ranking returns the best candidates by exact cosine similarity."""
+    ids, scores = rerank([1.0, 0.0], [7, 8, 9], [[0.0, 1.0], [1.0, 0.1], [1.0, 0.0]], k=2)
+
+    assert ids.tolist() == [9, 8]
+    assert scores[0] == pytest.approx(1.0)
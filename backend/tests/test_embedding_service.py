@@ -2,9 +2,12 @@
 TDD tests for embedding generation service.
 Following TDD workflow: Write tests first, then implement.
 """
+import asyncio
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from src.services.embedding_service import EmbeddingService
+from src.services.embedding_codec import encode_embedding
 
 
 class TestEmbeddingService:
@@ -142,19 +145,92 @@ class TestEmbeddingService:
         # Mock the client's embeddings.create method
         fake_embeddings = [[0.1 * i] * 1536 for i in range(len(texts))]
         mock_response = Mock()
-        mock_response.data = [Mock(embedding=emb) for emb in fake_embeddings]
+        mock_response.data = [Mock(embedding=emb, index=i) for i, emb in enumerate(fake_embeddings)]
 
-        if embedding_service.client:
-            with patch.object(embedding_service.client.embeddings, 'create', return_value=mock_response):
-                embeddings = await embedding_service.batch_generate_embeddings(texts)
+        embedding_service.client = Mock()
+        embedding_service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
-                assert isinstance(embeddings, list)
-                assert len(embeddings) == len(texts)
-                assert all(len(emb) == 1536 for emb in embeddings)
-        else:
-            # If no client, should return empty list
+        embeddings = await embedding_service.batch_generate_embeddings(texts)
+
+        assert isinstance(embeddings, list)
+        assert len(embeddings) == len(texts)
+        assert all(len(emb) == 1536 for emb in embeddings)
+        assert embeddings == fake_embeddings
+
+    @pytest.mark.asyncio
+    async def test_batch_generate_embeddings_without_client(self, embedding_service):
+        """Test that batch generation without a client yields None per item."""
+        embedding_service.client = None
+
+        embeddings = await embedding_service.batch_generate_embeddings(["a", "b"])
+
+        assert embeddings == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_batch_generate_embeddings_preserves_input_alignment(self, embedding_service):
+        """Test that empty and duplicate texts keep their input positions."""
+        texts = ["first", "", "second", "   ", "first"]
+
+        async def fake_batch(batch_texts):
+            return [[float(len(t))] * 1536 for t in batch_texts]
+
+        embedding_service.client = Mock()
+        with patch.object(embedding_service, '_call_embedding_api_batch', side_effect=fake_batch) as mock_batch:
             embeddings = await embedding_service.batch_generate_embeddings(texts)
-            assert embeddings == []
+
+            assert mock_batch.call_args.args[0] == ["first", "second"]
+            assert embeddings[0] == [5.0] * 1536
+            assert embeddings[1] is None
+            assert embeddings[2] == [6.0] * 1536
+            assert embeddings[3] is None
+            assert embeddings[4] == [5.0] * 1536
+
+    @pytest.mark.asyncio
+    async def test_batch_generate_embeddings_chunks_misses(self, embedding_service):
+        """Test that misses are sent in provider-sized chunks and failed chunks yield None."""
+        embedding_service.batch_chunk_size = 2
+        texts = [f"text {i}" for i in range(5)]
+
+        async def fake_batch(batch_texts):
+            if "text 2" in batch_texts:
+                raise Exception("API Error")
+            return [[0.5] * 1536 for _ in batch_texts]
+
+        embedding_service.client = Mock()
+        with patch.object(embedding_service, '_call_embedding_api_batch', side_effect=fake_batch) as mock_batch:
+            embeddings = await embedding_service.batch_generate_embeddings(texts)
+
+            assert mock_batch.call_count == 3
+            assert all(len(call.args[0]) <= 2 for call in mock_batch.call_args_list)
+            assert embeddings[2] is None and embeddings[3] is None
+            assert embeddings[0] == embeddings[1] == embeddings[4] == [0.5] * 1536
+
+    @pytest.mark.asyncio
+    async def test_batch_generate_embeddings_uses_cache(self):
+        """Test that cached vectors come from one MGET and new ones are written in one pipeline."""
+        redis_client = Mock()
+        redis_client.mget = AsyncMock(return_value=[encode_embedding([0.5] * 1536), None])
+        pipeline = Mock()
+        pipeline.execute = AsyncMock(return_value=[True])
+        redis_client.pipeline = Mock(return_value=pipeline)
+
+        service = EmbeddingService(redis_client=redis_client)
+        service.client = Mock()
+
+        async def fake_batch(batch_texts):
+            return [[0.1] * 1536 for _ in batch_texts]
+
+        with patch.object(service, '_call_embedding_api_batch', side_effect=fake_batch) as mock_batch:
+            embeddings = await service.batch_generate_embeddings(["cached", "fresh"])
+
+            redis_client.mget.assert_awaited_once()
+            assert mock_batch.call_args.args[0] == ["fresh"]
+            assert pipeline.setex.call_count == 1
+            pipeline.execute.assert_awaited_once()
+            # Cache hits stay the decoded float32 array; fresh vectors are the provider's lists
+            assert isinstance(embeddings[0], np.ndarray) and embeddings[0].dtype == np.float32
+            assert embeddings[0].tolist() == [0.5] * 1536
+            assert embeddings[1] == [0.1] * 1536
 
     @pytest.mark.asyncio
     async def test_similarity_score_between_embeddings(self, embedding_service):
@@ -172,3 +248,145 @@ class TestEmbeddingService:
         assert 0 <= similarity_high <= 1
         assert 0 <= similarity_low <= 1
         assert similarity_high > similarity_low  # Related terms more similar
+
+
+class TestEmbeddingMicroBatching:
+    """Test suite for coalescing concurrent single-text embedding requests."""
+
+    @pytest.fixture
+    async def batching_service(self):
+        """Create an embedding service with micro-batching enabled."""
+        return EmbeddingService(batch_wait_ms=20, batch_max_size=8)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_api_call(self, batching_service):
+        """Test that concurrent calls are sent to the API as a single batch."""
+        texts = [f"interaction {i}" for i in range(5)]
+
+        async def fake_batch(batch_texts):
+            return [[float(len(t))] * 1536 for t in batch_texts]
+
+        with patch.object(batching_service.batcher, 'embed_batch', side_effect=fake_batch) as mock_batch:
+            embeddings = await asyncio.gather(
+                *(batching_service.generate_text_embedding(t) for t in texts)
+            )
+
+            assert mock_batch.call_count == 1
+            assert mock_batch.call_args.args[0] == texts
+            assert all(len(emb) == 1536 for emb in embeddings)
+
+    @pytest.mark.asyncio
+    async def test_identical_texts_are_deduplicated(self, batching_service):
+        """Test that identical texts within a batch are embedded once."""
+        async def fake_batch(batch_texts):
+            return [[0.1] * 1536 for _ in batch_texts]
+
+        with patch.object(batching_service.batcher, 'embed_batch', side_effect=fake_batch) as mock_batch:
+            embeddings = await asyncio.gather(
+                *(batching_service.generate_text_embedding("same text") for _ in range(4))
+            )
+
+            assert mock_batch.call_args.args[0] == ["same text"]
+            assert all(emb == [0.1] * 1536 for emb in embeddings)
+            # Each caller gets its own list
+            assert len({id(emb) for emb in embeddings}) == 4
+
+    @pytest.mark.asyncio
+    async def test_batch_flushes_when_full(self, batching_service):
+        """Test that reaching batch_max_size flushes without waiting for the timer."""
+        batching_service.batcher.max_wait_ms = 10_000
+        texts = [f"text {i}" for i in range(8)]
+
+        async def fake_batch(batch_texts):
+            return [[0.2] * 1536 for _ in batch_texts]
+
+        with patch.object(batching_service.batcher, 'embed_batch', side_effect=fake_batch):
+            embeddings = await asyncio.wait_for(
+                asyncio.gather(*(batching_service.generate_text_embedding(t) for t in texts)),
+                timeout=1.0,
+            )
+
+            assert len(embeddings) == 8
+
+    @pytest.mark.asyncio
+    async def test_batch_errors_are_handled_per_caller(self, batching_service):
+        """Test that a failed batch resolves every caller to None."""
+        with patch.object(batching_service.batcher, 'embed_batch', side_effect=Exception("API Error")):
+            embeddings = await asyncio.gather(
+                batching_service.generate_text_embedding("first"),
+                batching_service.generate_text_embedding("second"),
+            )
+
+            assert embeddings == [None, None]
+
+
+class TestTopKSimilarity:
+    """Test suite for vectorized top-k similarity search."""
+
+    @pytest.fixture
+    def vectors(self):
+        """Create deterministic random embeddings."""
+        rng = np.random.default_rng(7)
+        return rng.standard_normal((200, 64)).astype(np.float32)
+
+    def test_normalize_embeddings_produces_unit_rows(self, vectors):
+        """Test that the search matrix is contiguous float32 with unit-length rows."""
+        vectors[3] = 0.0
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+
+        assert matrix.dtype == np.float32
+        assert matrix.flags.c_contiguous
+        norms = np.linalg.norm(matrix, axis=1)
+        assert np.allclose(np.delete(norms, 3), 1.0, atol=1e-5)
+        assert norms[3] == 0.0
+
+    def test_top_k_matches_pairwise_cosine_similarity(self, vectors):
+        """Test that top_k ranks rows the same way as the per-pair function."""
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        query = vectors[10] + 0.1
+
+        indices, scores = EmbeddingService.top_k(query, matrix, k=5)
+
+        pairwise = np.array([
+            float(np.dot(query, v) / (np.linalg.norm(query) * np.linalg.norm(v))) for v in vectors
+        ])
+        expected = np.argsort(-pairwise)[:5]
+        assert indices.tolist() == expected.tolist()
+        assert np.allclose(scores, pairwise[expected], atol=1e-5)
+        assert indices[0] == 10
+
+    def test_top_k_supports_batch_queries(self, vectors):
+        """Test that a batch of queries returns one ranked row per query."""
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+
+        indices, scores = EmbeddingService.top_k(vectors[[1, 2, 3]], matrix, k=4)
+
+        assert indices.shape == (3, 4)
+        assert scores.shape == (3, 4)
+        assert indices[:, 0].tolist() == [1, 2, 3]
+        assert np.all(np.diff(scores, axis=1) <= 0)
+
+    def test_top_k_respects_candidate_masks(self, vectors):
+        """Test that boolean masks and index arrays restrict the candidates."""
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+        mask = np.zeros(len(vectors), dtype=bool)
+        mask[100:110] = True
+
+        indices, _ = EmbeddingService.top_k(vectors[5], matrix, k=3, mask=mask)
+        assert all(100 <= i < 110 for i in indices)
+
+        rows = np.array([7, 42, 5])
+        indices, _ = EmbeddingService.top_k(vectors[5], matrix, k=10, mask=rows)
+        assert indices.tolist()[0] == 5
+        assert sorted(indices.tolist()) == [5, 7, 42]
+
+    def test_top_k_with_no_candidates(self, vectors):
+        """Test that an empty candidate set returns empty results."""
+        matrix = EmbeddingService.normalize_embeddings(vectors)
+
+        indices, scores = EmbeddingService.top_k(
+            vectors[0], matrix, k=5, mask=np.zeros(len(vectors), dtype=bool)
+        )
+
+        assert indices.size == 0
+        assert scores.size == 0
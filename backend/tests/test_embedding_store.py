@@ -0,0 +1,147 @@
+"""
+Tests for the persistent embedding store and its use as a warm tier.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services.embedding_codec import encode_embedding
+from src.services.embedding_service import EmbeddingService
+from src.services.embedding_store import EmbeddingStore
+
+
+def _session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+class TestEmbeddingStore:
+    """Tests for EmbeddingStore."""
+
+    @pytest.mark.asyncio
+    async def test_get_many_decodes_and_touches_stale_rows(self):
+        """Test hits are decoded and only stale rows get a last_accessed_at update."""
+        now = datetime.now(timezone.utc)
+        session = Mock()
+        session.execute = AsyncMock(
+            side_effect=[
+                [
+                    ("fresh", encode_embedding([0.5, 0.25]), now),
+                    ("stale", encode_embedding([1.0, 0.0]), now - timedelta(days=3)),
+                ],
+                Mock(),
+            ]
+        )
+        store = EmbeddingStore(_session_factory(session), touch_interval=timedelta(days=1))
+
+        found = await store.get_many("model", ["fresh", "stale", "missing"])
+
+        assert set(found) == {"fresh", "stale"}
+        np.testing.assert_array_equal(found["fresh"], np.array([0.5, 0.25], dtype=np.float32))
+        assert session.execute.await_count == 2
+        update_sql = str(session.execute.await_args_list[1].args[0])
+        assert update_sql.startswith("UPDATE embedding_store")
+
+    @pytest.mark.asyncio
+    async def test_get_many_skips_update_when_all_fresh(self):
+        """Test recently read rows are not rewritten."""
+        session = Mock()
+        session.execute = AsyncMock(
+            return_value=[("a", encode_embedding([0.5]), datetime.now(timezone.utc))]
+        )
+        store = EmbeddingStore(_session_factory(session))
+
+        await store.get_many("model", ["a"])
+
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_put_many_inserts_on_conflict_do_nothing(self):
+        """Test embeddings are inserted in one statement that ignores existing rows."""
+        session = Mock()
+        session.execute = AsyncMock()
+        store = EmbeddingStore(_session_factory(session))
+
+        await store.put_many("model", {"a": [0.5], "b": [0.25]})
+
+        session.execute.assert_awaited_once()
+        assert "ON CONFLICT DO NOTHING" in str(
+            session.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+        )
+
+
+class TestEmbeddingServiceWarmTier:
+    """Tests for EmbeddingService reading through Redis and the store."""
+
+    @pytest.fixture
+    def store(self):
+        store = Mock()
+        store.get_many = AsyncMock(return_value={})
+        store.put_many = AsyncMock()
+        return store
+
+    @pytest.mark.asyncio
+    async def test_store_hit_skips_api_and_promotes_to_redis(self, store):
+        """Test a store hit is returned without an API call and cached in Redis."""
+        redis = AsyncMock()
+        redis.get.return_value = None
+        service = EmbeddingService(redis_client=redis, embedding_store=store)
+        store.get_many.return_value = {
+            service._content_hash("text"): np.array([0.5, 0.25], dtype=np.float32)
+        }
+        service._call_embedding_api = AsyncMock()
+
+        embedding = await service.generate_text_embedding("text")
+
+        assert isinstance(embedding, np.ndarray)
+        assert embedding.tolist() == [0.5, 0.25]
+        service._call_embedding_api.assert_not_awaited()
+        redis.setex.assert_awaited_once()
+        store.put_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_generated_embedding_is_persisted(self, store):
+        """Test a full miss is embedded and written to the store."""
+        service = EmbeddingService(embedding_store=store)
+        service._call_embedding_api = AsyncMock(return_value=[0.5])
+
+        await service.generate_text_embedding("text")
+
+        store.put_many.assert_awaited_once_with(
+            service.embedding_model, {service._content_hash("text"): [0.5]}
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_only_embeds_store_misses(self, store):
+        """Test batch generation sends only texts missing from both tiers to the API."""
+        service = EmbeddingService(embedding_store=store)
+        service.client = Mock()
+        store.get_many.return_value = {
+            service._content_hash("known"): np.array([0.5], dtype=np.float32)
+        }
+        service._call_embedding_api_batch = AsyncMock(return_value=[[0.25]])
+
+        results = await service.batch_generate_embeddings(["known", "new"])
+
+        assert results == [[0.5], [0.25]]
+        service._call_embedding_api_batch.assert_awaited_once_with(["new"])
+        store.put_many.assert_awaited_once_with(
+            service.embedding_model, {service._content_hash("new"): [0.25]}
+        )
+
+    @pytest.mark.asyncio
+    async def test_store_errors_fall_back_to_api(self, store):
+        """Test a failing store does not fail embedding generation."""
+        store.get_many.side_effect = RuntimeError("database unavailable")
+        store.put_many.side_effect = RuntimeError("database unavailable")
+        service = EmbeddingService(embedding_store=store)
+        service._call_embedding_api = AsyncMock(return_value=[0.5])
+
+        assert await service.generate_text_embedding("text") == [0.5]
@@ -4,9 +4,24 @@ Tests for health check API endpoints.
 import pytest
 from quart import Quart
 
+from src.services.health_monitor import STATUS_DOWN, STATUS_UP, ProbeResult, get_health_monitor
+
+
+@pytest.fixture
+def probed():
+    """Populate the health monitor's cache as if a probe round had run."""
+    monitor = get_health_monitor()
+    monitor.pool_stats = lambda: {"database": {"utilization": 0.1}, "redis": {"utilization": 0.0}}
+    monitor.results = {
+        "database": ProbeResult("database", STATUS_UP, 1.0),
+        "redis": ProbeResult("redis", STATUS_UP, 0.5),
+        "llm_service": ProbeResult("llm_service", STATUS_UP, 80.0),
+    }
+    return monitor
+
 
 @pytest.mark.asyncio
-async def test_health_check(client):
+async def test_health_check(client, probed):
     """
     Test GET /api/v1/health/ returns healthy status.
     """
@@ -22,7 +37,7 @@ async def test_health_check(client):
 
 
 @pytest.mark.asyncio
-async def test_readiness_check(client):
+async def test_readiness_check(client, probed):
     """
     Test GET /api/v1/health/ready returns ready status.
     """
@@ -36,6 +51,21 @@ async def test_readiness_check(client):
     assert "redis" in data["dependencies"]
 
 
+@pytest.mark.asyncio
+async def test_readiness_check_fails_when_database_down(client, probed):
+    """
+    Test GET /api/v1/health/ready returns 503 when a critical dependency is down.
+    """
+    probed.results["database"] = ProbeResult("database", STATUS_DOWN, 2000.0, error="timed out")
+
+    response = await client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+
+    data = await response.get_json()
+    assert data["status"] == "not_ready"
+    assert data["reasons"]
+
+
 @pytest.mark.asyncio
 async def test_liveness_check(client):
     """
@@ -0,0 +1,146 @@
+"""
+Tests for the background health monitor.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.health_monitor import (
+    STATUS_DOWN,
+    STATUS_NOT_CONFIGURED,
+    STATUS_UP,
+    HealthMonitor,
+    LLMProbe,
+    ProbeResult,
+)
+
+HEALTHY_POOLS = {"database": {"utilization": 0.2}, "redis": {"utilization": 0.1}}
+
+
+def up():
+    """A probe that succeeds without details."""
+    return AsyncMock(return_value=None)
+
+
+def make_monitor(**probes):
+    probes = probes or {"database": up(), "redis": up()}
+    return HealthMonitor(probes, timeout=0.05, pool_stats=lambda: HEALTHY_POOLS)
+
+
+class TestProbes:
+    """Tests for running and caching probes."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached(self):
+        """Test probes run once per round, not per health request."""
+        database = up()
+        monitor = make_monitor(database=database, redis=up())
+
+        await monitor.run_probes()
+        monitor.health()
+        monitor.readiness()
+
+        database.assert_awaited_once()
+        assert monitor.results["database"].status == STATUS_UP
+
+    @pytest.mark.asyncio
+    async def test_failure_and_timeout_mark_down(self):
+        """Test raising and hanging probes are both reported down with a reason."""
+        async def hang():
+            await asyncio.sleep(1)
+
+        monitor = make_monitor(database=AsyncMock(side_effect=OSError("refused")), redis=hang)
+
+        await monitor.run_probes()
+
+        assert monitor.results["database"].status == STATUS_DOWN
+        assert monitor.results["database"].error == "refused"
+        assert "timed out" in monitor.results["redis"].error
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_llm_is_not_a_failure(self):
+        """Test a missing LLM key is reported without degrading health."""
+        monitor = make_monitor(database=up(), redis=up(), llm_service=LLMProbe(None, 1.0))
+
+        await monitor.run_probes()
+
+        assert monitor.results["llm_service"].status == STATUS_NOT_CONFIGURED
+        assert monitor.health()["status"] == "healthy"
+
+    @pytest.mark.asyncio
+    async def test_optional_dependency_down_degrades_but_stays_ready(self):
+        """Test a down LLM provider degrades health but keeps the instance in rotation."""
+        monitor = make_monitor(
+            database=up(), redis=up(), llm_service=AsyncMock(side_effect=OSError("503"))
+        )
+
+        await monitor.run_probes()
+
+        assert monitor.health()["status"] == "degraded"
+        assert monitor.readiness()[0] is True
+
+
+class TestReadiness:
+    """Tests for readiness decisions."""
+
+    @pytest.fixture
+    def monitor(self):
+        monitor = make_monitor()
+        monitor.results = {
+            "database": ProbeResult("database", STATUS_UP, 1.0),
+            "redis": ProbeResult("redis", STATUS_UP, 1.0),
+        }
+        return monitor
+
+    def test_ready_when_everything_is_fine(self, monitor):
+        """Test a healthy instance is ready."""
+        ready, report = monitor.readiness()
+
+        assert ready is True
+        assert report["reasons"] == []
+
+    def test_not_ready_before_first_probe(self):
+        """Test an instance that has not probed yet is not ready."""
+        ready, report = make_monitor().readiness()
+
+        assert ready is False
+        assert any("no recent probe result" in reason for reason in report["reasons"])
+
+    def test_stale_results_are_not_trusted(self, monitor):
+        """Test a stuck probe loop takes the instance out of rotation."""
+        monitor.results["database"].checked_at = time.time() - monitor.stale_after - 1
+
+        assert monitor.readiness()[0] is False
+        assert monitor.health()["status"] == "unhealthy"
+
+    def test_exhausted_pool_fails_readiness(self, monitor):
+        """Test a fully checked-out pool fails readiness."""
+        monitor.pool_stats = lambda: {"database": {"utilization": 1.0}, "redis": {"utilization": 0.1}}
+
+        ready, report = monitor.readiness()
+
+        assert ready is False
+        assert report["reasons"] == ["database pool exhausted (100% in use)"]
+
+    def test_event_loop_lag_fails_readiness(self, monitor):
+        """Test high recent event-loop lag fails readiness."""
+        monitor._lag_samples.extend([5.0, monitor.max_loop_lag_ms + 100, 3.0])
+
+        ready, report = monitor.readiness()
+
+        assert ready is False
+        assert "event loop lag" in report["reasons"][0]
+
+    @pytest.mark.asyncio
+    async def test_lag_sampler_detects_blocked_loop(self, monitor):
+        """Test a blocking call shows up as loop lag."""
+        monitor.lag_sample_interval = 0.01
+        task = asyncio.ensure_future(monitor._lag_loop())
+        await asyncio.sleep(0)
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        task.cancel()
+
+        assert monitor.loop_lag_ms >= 50
@@ -0,0 +1,178 @@
+"""
+Tests for interaction_logs partition maintenance.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services import interaction_partitions
+from src.services.interaction_partitions import Partition, PartitionManager, add_months, month_start
+
+NOW = datetime(2026, 10, 19, 15, 30, tzinfo=timezone.utc)
+
+
+def month(year, number):
+    """UTC start of a month."""
+    return datetime(year, number, 1, tzinfo=timezone.utc)
+
+
+def connection_with_partitions(*names, locked=True, stranded=()):
+    """Mock connection whose catalog lists the given partition tables.
+
+    stranded holds (month, count) rows found in the default partition. The
+    log records every statement, with transaction boundaries as BEGIN/COMMIT.
+    """
+    connection = MagicMock()
+    connection.log = []
+
+    async def execute(statement, params=None):
+        result = MagicMock()
+        sql = str(statement)
+        connection.log.append(sql)
+        if "pg_inherits" in sql:
+            result.scalars.return_value.all.return_value = list(names)
+        elif "interaction_logs_default GROUP BY" in sql:
+            result.all.return_value = list(stranded)
+        elif "pg_try_advisory_lock" in sql:
+            result.scalar.return_value = locked
+        else:
+            result.rowcount = 5
+        return result
+
+    @asynccontextmanager
+    async def begin():
+        connection.log.append("BEGIN")
+        yield
+        connection.log.append("COMMIT")
+
+    connection.execute = AsyncMock(side_effect=execute)
+    connection.begin = begin
+    return connection
+
+
+def executed(connection):
+    """Statements and transaction boundaries, catalog lookups and locks excluded."""
+    skipped = ("pg_inherits", "advisory", "interaction_logs_default GROUP BY", "lock_timeout", "LOCK TABLE")
+    return [sql for sql in connection.log if not any(marker in sql for marker in skipped)]
+
+
+class TestPartitionNaming:
+    """Tests for month arithmetic and partition names."""
+
+    def test_month_arithmetic(self):
+        """Test month starts and offsets across year boundaries."""
+        assert month_start(NOW) == month(2026, 10)
+        assert month_start(datetime(2026, 10, 1, 1, tzinfo=timezone(timedelta(hours=3)))) == month(2026, 9)
+        assert add_months(month(2026, 11), 3) == month(2027, 2)
+        assert add_months(month(2026, 1), -1) == month(2025, 12)
+
+    def test_name_round_trip(self):
+        """Test partitions are named by month and parsed back."""
+        partition = Partition(month(2026, 10))
+
+        assert partition.name == "interaction_logs_p2026_10"
+        assert partition.end == month(2026, 11)
+        assert Partition.from_name(partition.name) == partition
+        assert Partition.from_name("interaction_logs_legacy") is None
+
+    def test_partition_ddl_bounds(self):
+        """Test a partition is created standalone and attached for exactly its month."""
+        partition = Partition(month(2026, 12))
+
+        assert "PARTITION OF" not in partition.create_sql()
+        assert partition.attach_sql() == (
+            "ALTER TABLE interaction_logs ATTACH PARTITION interaction_logs_p2026_12 "
+            "FOR VALUES FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')"
+        )
+        assert "DELETE FROM interaction_logs_default" in partition.move_from_default_sql()
+        assert "created_at < '2027-01-01T00:00:00+00:00'" in partition.move_from_default_sql()
+
+    def test_invalid_archive_schema(self):
+        """Test the archive schema is interpolated only if it is a plain identifier."""
+        with pytest.raises(ValueError):
+            PartitionManager(archive_schema="archive; DROP TABLE users")
+
+
+class TestPartitionMaintenance:
+    """Tests for creating and expiring partitions."""
+
+    @pytest.mark.asyncio
+    async def test_creates_only_missing_partitions(self):
+        """Test the current month and months_ahead are created when absent, each in its own transaction."""
+        connection = connection_with_partitions("interaction_logs_p2026_10", "interaction_logs_p2026_11")
+
+        created = await PartitionManager(months_ahead=3).ensure_partitions(connection, NOW)
+
+        assert created == ["interaction_logs_p2026_12", "interaction_logs_p2027_01"]
+        for name in created:
+            partition = Partition.from_name(name)
+            begin = executed(connection).index(partition.create_sql()) - 1
+            assert executed(connection)[begin:begin + 5] == [
+                "BEGIN", partition.create_sql(), partition.move_from_default_sql(), partition.attach_sql(), "COMMIT",
+            ]
+        locks = [index for index, sql in enumerate(connection.log) if sql.startswith("LOCK TABLE")]
+        assert len(locks) == 2
+        assert all("lock_timeout" in connection.log[index - 1] for index in locks)
+
+    @pytest.mark.asyncio
+    async def test_rows_in_default_partition_get_their_month(self):
+        """Test a month that landed in the default partition gets a partition and is reported."""
+        connection = connection_with_partitions(
+            "interaction_logs_p2026_10", "interaction_logs_p2026_11",
+            stranded=[(datetime(2026, 8, 1), 40)],
+        )
+
+        with patch.object(interaction_partitions.logger, "error") as error:
+            created = await PartitionManager(months_ahead=1).ensure_partitions(connection, NOW)
+
+        assert created == ["interaction_logs_p2026_08"]
+        assert Partition(month(2026, 8)).move_from_default_sql() in connection.log
+        assert error.call_args.kwargs["extra"] == {"rows": 40, "months": ["2026-08"]}
+
+    @pytest.mark.asyncio
+    async def test_expired_partition_is_rolled_up_then_dropped(self):
+        """Test the rollup commits before the partition is dropped in a separate transaction."""
+        connection = connection_with_partitions(
+            "interaction_logs_p2025_10", "interaction_logs_p2025_09", "interaction_logs_p2026_10"
+        )
+
+        expired = await PartitionManager(retention_months=12).expire_partitions(connection, NOW)
+
+        assert expired == ["interaction_logs_p2025_09"]
+        _, _, rollup_begin, rollup, rollup_commit, drop_begin, drop, drop_commit = executed(connection)
+        assert "INSERT INTO interaction_daily_rollups" in rollup
+        assert "FROM interaction_logs_p2025_09" in rollup
+        assert (rollup_begin, rollup_commit, drop_begin, drop_commit) == ("BEGIN", "COMMIT", "BEGIN", "COMMIT")
+        assert drop == "DROP TABLE interaction_logs_p2025_09"
+        assert "SET LOCAL lock_timeout" in connection.log[connection.log.index(drop) - 1]
+
+    @pytest.mark.asyncio
+    async def test_expired_partition_is_archived(self):
+        """Test an archive schema keeps expired partitions, detached from the parent."""
+        connection = connection_with_partitions("interaction_logs_p2025_01")
+
+        await PartitionManager(retention_months=12, archive_schema="archive").expire_partitions(connection, NOW)
+
+        statements = executed(connection)
+        assert "ALTER TABLE interaction_logs DETACH PARTITION interaction_logs_p2025_01" in statements
+        assert "ALTER TABLE interaction_logs_p2025_01 SET SCHEMA archive" in statements
+        assert not any(sql.startswith("DROP") for sql in statements)
+
+    @pytest.mark.asyncio
+    async def test_run_skips_when_another_process_holds_the_lock(self):
+        """Test concurrent instances do not run maintenance twice."""
+        connection = connection_with_partitions(locked=False)
+
+        @asynccontextmanager
+        async def connect(*args, **kwargs):
+            yield connection
+
+        database = MagicMock()
+        database.async_engine.connect = connect
+        with patch.object(interaction_partitions, "get_database", return_value=database):
+            report = await PartitionManager().run(NOW)
+
+        assert report == {"skipped": True}
+        assert executed(connection) == ["BEGIN", "COMMIT"]
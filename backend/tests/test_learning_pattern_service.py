@@ -0,0 +1,173 @@
+"""
+Tests for incremental learning-pattern embedding updates.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from src.services.learning_pattern_service import (
+    STATE_KEY,
+    LearningPatternUpdater,
+    fold_embeddings,
+)
+
+
+def _memory(embedding=None, metadata=None):
+    return SimpleNamespace(
+        learning_pattern_embedding=embedding,
+        personalization_metadata=metadata,
+        topic_mastery={"loops": 0.5},
+        identified_strengths={"topics": ["loops"]},
+        identified_weaknesses=None,
+        learning_pace="steady",
+        average_completion_time_minutes=None,
+        average_grade=None,
+        last_analyzed_at=None,
+    )
+
+
+def _session_factory(memory):
+    @asynccontextmanager
+    async def factory():
+        session = Mock()
+        result = Mock()
+        result.scalar_one_or_none.return_value = memory
+        session.execute = AsyncMock(return_value=result)
+        yield session
+
+    return factory
+
+
+class TestFoldEmbeddings:
+    """Tests for the decayed running mean."""
+
+    def test_first_vector_becomes_mean(self):
+        """Test folding into an empty state yields the vector itself."""
+        mean, weight = fold_embeddings(None, 0.0, [[1.0, 2.0]], decay=0.9)
+
+        np.testing.assert_allclose(mean, [1.0, 2.0])
+        assert weight == pytest.approx(1.0)
+
+    def test_batch_fold_matches_sequential_folds(self):
+        """Test folding several vectors at once equals folding them one by one."""
+        rng = np.random.default_rng(0)
+        start = rng.standard_normal(8).astype(np.float32)
+        vectors = rng.standard_normal((5, 8)).astype(np.float32)
+
+        batch_mean, batch_weight = fold_embeddings(start, 3.0, vectors, decay=0.8)
+
+        mean, weight = start, 3.0
+        for vector in vectors:
+            mean, weight = fold_embeddings(mean, weight, [vector], decay=0.8)
+
+        np.testing.assert_allclose(batch_mean, mean, rtol=1e-5)
+        assert batch_weight == pytest.approx(weight)
+
+    def test_recent_vectors_dominate(self):
+        """Test older contributions decay geometrically."""
+        mean, _ = fold_embeddings(np.array([1.0, 0.0]), 1.0, [[0.0, 1.0]], decay=0.5)
+
+        # Old weight 1 * 0.5 against new weight 1
+        np.testing.assert_allclose(mean, [1 / 3, 2 / 3], rtol=1e-6)
+
+
+class TestLearningPatternUpdater:
+    """Tests for LearningPatternUpdater."""
+
+    @pytest.mark.asyncio
+    async def test_flush_folds_buffered_interactions(self):
+        """Test buffered interactions are folded and state is recorded."""
+        memory = _memory()
+        updater = LearningPatternUpdater(
+            Mock(), _session_factory(memory), decay=0.9, reanchor_every=10, debounce_seconds=60
+        )
+
+        updater.record_interaction(1, [1.0, 0.0])
+        updater.record_interaction(1, [0.0, 1.0])
+        await updater.flush()
+
+        state = memory.personalization_metadata[STATE_KEY]
+        assert state["since_anchor"] == 2
+        assert state["weight"] == pytest.approx(1.9)
+        np.testing.assert_allclose(memory.learning_pattern_embedding, [0.9 / 1.9, 1 / 1.9], rtol=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_debounce_coalesces_updates(self):
+        """Test interactions within the debounce window produce one fold."""
+        updater = LearningPatternUpdater(
+            Mock(), _session_factory(_memory()), decay=0.9, debounce_seconds=0.01
+        )
+        updater._fold = AsyncMock(return_value=False)
+
+        for _ in range(3):
+            updater.record_interaction(1, [1.0])
+        await asyncio.sleep(0.05)
+
+        updater._fold.assert_awaited_once_with(1, [[1.0], [1.0], [1.0]])
+
+    @pytest.mark.asyncio
+    async def test_max_buffered_flushes_without_waiting(self):
+        """Test a full buffer is folded without waiting for the debounce."""
+        updater = LearningPatternUpdater(
+            Mock(), _session_factory(_memory()), debounce_seconds=60, max_buffered=2
+        )
+        updater._fold = AsyncMock(return_value=False)
+
+        updater.record_interaction(1, [1.0])
+        updater.record_interaction(1, [1.0])
+        await asyncio.sleep(0)
+
+        updater._fold.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_overlapping_flushes_for_a_user_are_serialized(self):
+        """Test a second flush for a user waits for the first and folds later vectors."""
+        updater = LearningPatternUpdater(
+            Mock(), _session_factory(_memory()), debounce_seconds=60
+        )
+        release = asyncio.Event()
+        folds = []
+
+        async def fold(user_id, vectors):
+            folds.append(vectors)
+            if len(folds) == 1:
+                await release.wait()
+            return False
+
+        updater._fold = fold
+
+        updater.record_interaction(1, [1.0])
+        first = asyncio.ensure_future(updater.flush_user(1))
+        await asyncio.sleep(0)
+        updater.record_interaction(1, [2.0])
+        second = asyncio.ensure_future(updater.flush_user(1))
+        await asyncio.sleep(0)
+
+        assert folds == [[[1.0]]]
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert folds == [[[1.0]], [[2.0]]]
+        assert updater._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_reanchor_after_threshold(self):
+        """Test reaching reanchor_every regenerates the embedding from history."""
+        memory = _memory(metadata={STATE_KEY: {"weight": 5.0, "since_anchor": 1}})
+        embedding_service = Mock()
+        embedding_service.generate_learning_pattern_embedding = AsyncMock(return_value=[0.25, 0.5])
+        updater = LearningPatternUpdater(
+            embedding_service, _session_factory(memory), decay=0.9, reanchor_every=2
+        )
+
+        updater.record_interaction(1, [1.0, 0.0])
+        await updater.flush()
+
+        history = embedding_service.generate_learning_pattern_embedding.await_args.args[0]
+        assert history["identified_strengths"] == ["loops"]
+        assert memory.learning_pattern_embedding == [0.25, 0.5]
+        assert memory.personalization_metadata[STATE_KEY]["since_anchor"] == 0
@@ -0,0 +1,132 @@
+"""
+Tests for keyset pagination and cursors.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import DateTime, Integer, create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from src.middleware.error_handler import APIError
+from src.utils.pagination import (
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    parse_page_args,
+)
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(Integer)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+@pytest.fixture
+def session():
+    """Async-looking session over an in-memory SQLite database of 25 items."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    sync_session = Session(engine)
+    # Pairs of items share a timestamp so the id tie-breaker is exercised
+    sync_session.add_all(
+        Item(id=index, owner_id=1, updated_at=START + timedelta(minutes=index // 2))
+        for index in range(1, 26)
+    )
+    sync_session.add(Item(id=100, owner_id=2, updated_at=START))
+    sync_session.commit()
+
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=sync_session.execute)
+    yield session
+    sync_session.close()
+
+
+class TestCursors:
+    """Tests for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test sort keys, including datetimes, survive a round trip."""
+        cursor = encode_cursor("conversations", [START, 42])
+
+        assert decode_cursor("conversations", cursor) == (START, 42)
+
+    def test_tampered_cursor_is_rejected(self):
+        """Test clients cannot forge sort keys."""
+        cursor = encode_cursor("conversations", [START, 42])
+        tampered = cursor[:-2] + ("AA" if cursor[-2:] != "AA" else "BB")
+
+        with pytest.raises(APIError) as error:
+            decode_cursor("conversations", tampered)
+        assert error.value.status_code == 400
+
+    def test_cursor_from_another_listing_is_rejected(self):
+        """Test a cursor only pages through the listing that issued it."""
+        cursor = encode_cursor("messages:1", [START, 42])
+
+        with pytest.raises(APIError):
+            decode_cursor("messages:2", cursor)
+
+    def test_garbage_is_rejected(self):
+        """Test malformed cursors are a client error."""
+        with pytest.raises(APIError):
+            decode_cursor("conversations", "not a cursor")
+
+
+class TestPageArgs:
+    """Tests for query parameter parsing."""
+
+    def test_defaults(self):
+        """Test the first page is requested with no arguments."""
+        assert parse_page_args({}) == (20, None)
+
+    def test_limit_is_clamped(self):
+        """Test limits are kept between 1 and MAX_PAGE_SIZE."""
+        assert parse_page_args({"limit": "100000"})[0] == MAX_PAGE_SIZE
+        assert parse_page_args({"limit": "0"})[0] == 1
+
+    def test_invalid_limit(self):
+        """Test a non-numeric limit is a client error."""
+        with pytest.raises(APIError):
+            parse_page_args({"limit": "ten"})
+
+
+class TestKeysetPage:
+    """Tests for keyset_page."""
+
+    @pytest.mark.asyncio
+    async def test_walks_all_pages_in_order(self, session):
+        """Test following cursors visits every row once, newest first."""
+        query = select(Item).where(Item.owner_id == 1)
+        columns = (Item.updated_at, Item.id)
+        seen, cursor = [], None
+
+        while True:
+            page = await keyset_page(session, query, "items", columns, limit=9, cursor=cursor)
+            seen.extend(item.id for item in page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert session.execute.await_count == 3
+        assert seen == list(range(25, 0, -1))
+
+    @pytest.mark.asyncio
+    async def test_exact_last_page_has_no_cursor(self, session):
+        """Test a page that ends exactly at the last row reports no next page."""
+        page = await keyset_page(
+            session, select(Item).where(Item.owner_id == 1), "items", (Item.updated_at, Item.id), limit=25
+        )
+
+        assert len(page.items) == 25
+        assert page.next_cursor is None
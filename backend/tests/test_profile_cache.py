@@ -0,0 +1,155 @@
+"""
+Tests for the per-user profile snapshot cache.
+"""
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.user import SkillLevel, User, UserRole
+from src.services import profile_cache
+from src.services.profile_cache import (
+    TOMBSTONE,
+    ProfileSnapshot,
+    get_profile_snapshot,
+    invalidate_profile_snapshot,
+)
+from src.utils.redis_keys import profile_snapshot_key
+
+KEY = profile_snapshot_key(1, profile_cache.SNAPSHOT_VERSION)
+
+
+@pytest.fixture
+def user():
+    """Onboarded user row."""
+    user = MagicMock(spec=User)
+    user.id = 1
+    user.email = "test@example.com"
+    user.name = "Test User"
+    user.avatar_url = None
+    user.bio = None
+    user.role = UserRole.STUDENT
+    user.is_active = True
+    user.is_mentor = False
+    user.programming_language = "python"
+    user.skill_level = SkillLevel.INTERMEDIATE
+    user.career_goals = "Become a full-stack developer"
+    user.learning_style = "hands-on"
+    user.time_commitment = "1-2 hours/day"
+    user.onboarding_completed = True
+    user.current_streak = 3
+    user.longest_streak = 5
+    user.exercises_completed = 12
+    user.last_exercise_date = None
+    user.created_at = datetime(2024, 1, 1)
+    user.updated_at = datetime(2024, 1, 2)
+    user.last_login = None
+    return user
+
+
+@pytest.fixture
+def redis():
+    """Mocked Redis manager."""
+    manager = MagicMock()
+    manager.get_bytes = AsyncMock(return_value=None)
+    manager.set_bytes = AsyncMock(return_value=True)
+    with patch.object(profile_cache, "get_redis", return_value=manager):
+        yield manager
+
+
+@pytest.fixture
+def database(user):
+    """Mocked database returning the user."""
+    @asynccontextmanager
+    async def session():
+        yield AsyncMock()
+
+    with patch.object(profile_cache, "get_async_db_session", side_effect=session) as get_session, \
+         patch("src.services.profile_service.ProfileService.get_user_profile", AsyncMock(return_value=user)):
+        yield get_session
+
+
+class TestProfileSnapshot:
+    """Tests for snapshot contents."""
+
+    def test_views_are_serialized(self, user):
+        """Test every cached view is ready-to-send JSON."""
+        snapshot = ProfileSnapshot.from_user(user)
+
+        assert json.loads(snapshot.profile)["skill_level"] == "intermediate"
+        assert json.loads(snapshot.progress)["exercises_completed"] == 12
+        assert json.loads(snapshot.onboarding_status) == {
+            "onboarding_completed": True,
+            "can_resume": False,
+            "profile_complete": True,
+        }
+        assert json.loads(snapshot.preferences)["learning_style"] == "hands-on"
+        assert snapshot.context["name"] == "Test User"
+
+    def test_round_trip(self, user):
+        """Test a packed snapshot unpacks unchanged."""
+        snapshot = ProfileSnapshot.from_user(user)
+
+        assert ProfileSnapshot.loads(snapshot.dumps()) == snapshot
+
+
+class TestSnapshotCache:
+    """Tests for read-through caching and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_database(self, user, redis, database):
+        """Test a cached snapshot is served without touching Postgres."""
+        redis.get_bytes.return_value = ProfileSnapshot.from_user(user).dumps()
+
+        snapshot = await get_profile_snapshot(1)
+
+        assert json.loads(snapshot.profile)["id"] == 1
+        database.assert_not_called()
+        redis.set_bytes.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_and_stores_without_overwriting(self, redis, database):
+        """Test a miss loads the row and stores it only if nothing newer is there."""
+        snapshot = await get_profile_snapshot(1)
+
+        database.assert_called_once()
+        redis.set_bytes.assert_awaited_once()
+        args, kwargs = redis.set_bytes.call_args
+        assert args == (KEY, snapshot.dumps())
+        assert kwargs["only_if_missing"] is True
+
+    @pytest.mark.asyncio
+    async def test_tombstone_is_a_miss(self, redis, database):
+        """Test a recently invalidated snapshot is reloaded."""
+        redis.get_bytes.return_value = TOMBSTONE
+
+        await get_profile_snapshot(1)
+
+        database.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_writes_tombstone(self, redis):
+        """Test invalidation blocks re-caching for longer than replicas can lag."""
+        await invalidate_profile_snapshot(1)
+
+        args, kwargs = redis.set_bytes.call_args
+        assert args == (KEY, TOMBSTONE)
+        assert kwargs["expiration"] > profile_cache.settings.database_replica_max_lag_seconds
+
+    @pytest.mark.asyncio
+    async def test_profile_update_invalidates(self, user):
+        """Test ProfileService.update_user_profile drops the snapshot."""
+        from src.schemas.profile import ProfileUpdateRequest
+        from src.services.profile_service import ProfileService
+
+        session = AsyncMock()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = user
+        session.execute.return_value = result
+
+        with patch("src.services.profile_service.invalidate_profile_snapshot", AsyncMock()) as invalidate:
+            await ProfileService.update_user_profile(session, 1, ProfileUpdateRequest(bio="Hello"))
+
+        invalidate.assert_awaited_once_with(1)
@@ -2,9 +2,14 @@
 Integration tests for profile and onboarding API endpoints.
 """
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.models.user import User, SkillLevel, UserRole
+from src.services.auth_service import AuthService
 from src.services.profile_service import ProfileService
+from src.utils.query_stats import QueryStats
+from src.utils.redis_keys import access_token_key
+from src.utils.request_io import IO_DB, IO_REDIS
 from datetime import datetime
 
 
@@ -332,6 +337,51 @@ class TestUserProfile:
             assert data["email"] == "test@example.com"
             assert data["programming_language"] == "python"
 
+    @pytest.mark.asyncio
+    async def test_get_user_profile_io_budget(self, client, test_engine, db_session, metered_redis, io_budget):
+        """
+        Test the I/O of /users/me as counted by the query listeners and the metered Redis pool.
+
+        A cold read costs 1 query and 3 Redis round trips: the access token
+        GET, the snapshot GET and the snapshot SET NX. A warm read costs no
+        query and the 2 GETs. With 'access_token:' and 'profile:' in
+        REDIS_NEAR_CACHE_PREFIXES both GETs are served from process memory.
+        """
+        QueryStats().instrument(test_engine.sync_engine, test_engine)
+
+        user = User(
+            email="budget@example.com",
+            name="Budget User",
+            email_verified=True,
+            programming_language="python",
+            skill_level=SkillLevel.INTERMEDIATE,
+            onboarding_completed=True,
+        )
+        db_session.add(user)
+        await db_session.flush()
+        await db_session.refresh(user)
+
+        token = AuthService.generate_jwt_token(user.id, user.email, "student")
+        jti = AuthService.verify_jwt_token(token, token_type="access")["jti"]
+        await metered_redis.set_cache(access_token_key(user.id, jti), {"user_id": user.id, "valid": True})
+
+        @asynccontextmanager
+        async def test_session(*args, **kwargs):
+            yield db_session
+
+        with patch('src.services.profile_cache.get_async_db_session', side_effect=test_session):
+            async with io_budget(db=1, redis=3) as cold:
+                response = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+            assert (await response.get_json())["email"] == "budget@example.com"
+
+            async with io_budget(db=0, redis=2) as warm:
+                response = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+
+        assert (cold.requests[0].count(IO_DB), cold.requests[0].count(IO_REDIS)) == (1, 3)
+        assert (warm.requests[0].count(IO_DB), warm.requests[0].count(IO_REDIS)) == (0, 2)
+
     @pytest.mark.asyncio
     async def test_update_user_profile_success(self, client, onboarded_user):
         """Test successful profile update."""
@@ -0,0 +1,171 @@
+"""
+Tests for query instrumentation and the slow-query log.
+"""
+import asyncio
+import contextvars
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.utils.query_stats import (
+    QueryStats,
+    fingerprint,
+    is_explainable,
+    normalize_statement,
+    summarize_plan,
+)
+from src.utils.request_io import IO_DB, begin_request_io, current_request_io
+
+
+class TestNormalization:
+    """Tests for statement fingerprints."""
+
+    def test_literals_and_parameters_are_replaced(self):
+        """Test values do not change a statement's shape."""
+        assert normalize_statement(
+            "SELECT * FROM users WHERE id = $1 AND email = 'a@b.c' AND score > 0.5"
+        ) == "SELECT * FROM users WHERE id = ? AND email = ? AND score > ?"
+
+    def test_in_lists_collapse(self):
+        """Test IN lists of any length share one fingerprint."""
+        assert fingerprint("SELECT id FROM t WHERE id IN ($1, $2)") == fingerprint(
+            "SELECT id FROM t WHERE id IN ($1, $2, $3, $4)"
+        )
+
+    def test_casts_and_identifiers_are_kept(self):
+        """Test casts and digits inside identifiers are not mistaken for values."""
+        assert normalize_statement("SELECT users_1.id, $1::vector FROM users AS users_1") == (
+            "SELECT users_1.id, ?::vector FROM users AS users_1"
+        )
+
+    def test_multi_row_values_collapse(self):
+        """Test batch inserts of different sizes share one fingerprint."""
+        assert fingerprint("INSERT INTO t (a) VALUES ($1), ($2)") == fingerprint(
+            "INSERT INTO t (a) VALUES ($1), ($2), ($3)"
+        )
+
+    def test_is_explainable(self):
+        """Test only read-only, non-locking statements are re-run by EXPLAIN ANALYZE."""
+        assert is_explainable("SELECT * FROM users WHERE id = $1")
+        assert is_explainable("WITH recent AS (SELECT 1) SELECT * FROM recent")
+        assert not is_explainable("SELECT * FROM users WHERE id = $1 FOR UPDATE")
+        assert not is_explainable("UPDATE users SET updated_at = now()")
+        assert not is_explainable("WITH moved AS (DELETE FROM t RETURNING *) SELECT * FROM moved")
+
+
+class TestQueryStats:
+    """Tests for aggregation and per-request counts."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine("sqlite://")
+        stats = QueryStats(slow_query_ms=10000)
+        stats.instrument(engine)
+        yield engine, stats
+        engine.dispose()
+
+    def test_statements_aggregate_by_fingerprint(self, engine):
+        """Test repeated shapes accumulate into one entry."""
+        engine, stats = engine
+        with engine.connect() as connection:
+            for value in range(3):
+                connection.execute(text(f"SELECT {value}"))
+
+        top = stats.top()
+
+        assert len(top) == 1
+        assert top[0]["count"] == 3
+        assert top[0]["statement"] == "SELECT ?"
+
+    def test_failed_statements_are_counted(self, engine):
+        """Test errors are recorded against their fingerprint."""
+        engine, stats = engine
+        with engine.connect() as connection:
+            with pytest.raises(Exception):
+                connection.execute(text("SELECT * FROM missing_table"))
+
+        assert stats.top()[0]["errors"] == 1
+
+    def test_request_counts_are_isolated(self, engine):
+        """Test each request context counts only its own queries."""
+        engine, stats = engine
+
+        def serve(queries_run):
+            queries = begin_request_io()
+            with engine.connect() as connection:
+                for _ in range(queries_run):
+                    connection.execute(text("SELECT 1"))
+            return queries
+
+        first = contextvars.copy_context().run(serve, 2)
+        second = contextvars.copy_context().run(serve, 5)
+
+        assert (first.count(IO_DB), second.count(IO_DB)) == (2, 5)
+        assert second.repeated(5) == {fingerprint("SELECT 1"): 5}
+        assert current_request_io() is None
+
+    def test_fingerprints_are_bounded(self):
+        """Test new shapes beyond the limit go to the overflow entry."""
+        stats = QueryStats(max_fingerprints=2)
+        for table in ("a", "b", "c", "d"):
+            stats.record(f"SELECT * FROM {table}", 1.0)
+
+        assert set(stats.fingerprints) == {fingerprint("SELECT * FROM a"), fingerprint("SELECT * FROM b"), "overflow"}
+        assert stats.fingerprints["overflow"].count == 2
+
+
+class TestSlowQueryExplain:
+    """Tests for out-of-band plan capture."""
+
+    @pytest.mark.asyncio
+    async def test_explain_is_scheduled_once_per_cooldown(self):
+        """Test a slow SELECT schedules one background EXPLAIN and not one per occurrence."""
+        stats = QueryStats(slow_query_ms=1, explain=True, explain_concurrency=5)
+        key = stats.record("SELECT * FROM users", 50.0)
+
+        with patch.object(stats, "_explain", Mock(side_effect=lambda *args: asyncio.sleep(0))) as explain:
+            stats._on_slow_query(key, "SELECT * FROM users", (), 50.0, Mock(), False)
+            stats._on_slow_query(key, "SELECT * FROM users", (), 50.0, Mock(), False)
+            await asyncio.sleep(0)
+
+        explain.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_writes_and_disabled_explain_are_not_scheduled(self):
+        """Test EXPLAIN never re-runs writes and stays off unless enabled."""
+        enabled = QueryStats(slow_query_ms=1, explain=True)
+        disabled = QueryStats(slow_query_ms=1)
+
+        with patch.object(enabled, "_explain") as enabled_explain, patch.object(disabled, "_explain") as disabled_explain:
+            enabled._on_slow_query("k", "DELETE FROM users", (), 50.0, Mock(), False)
+            disabled._on_slow_query("k", "SELECT 1", (), 50.0, Mock(), False)
+
+        enabled_explain.assert_not_called()
+        disabled_explain.assert_not_called()
+
+    def test_summarize_plan(self):
+        """Test execution time, buffers and sequential scans are extracted."""
+        plan = [
+            {
+                "Plan": {
+                    "Node Type": "Hash Join",
+                    "Total Cost": 120.5,
+                    "Actual Rows": 10,
+                    "Shared Hit Blocks": 40,
+                    "Shared Read Blocks": 3,
+                    "Plans": [
+                        {"Node Type": "Seq Scan", "Relation Name": "interaction_logs", "Actual Rows": 50000},
+                        {"Node Type": "Index Scan", "Relation Name": "users", "Actual Rows": 1},
+                    ],
+                },
+                "Planning Time": 0.2,
+                "Execution Time": 48.1,
+            }
+        ]
+
+        summary = summarize_plan(plan)
+
+        assert summary["execution_ms"] == 48.1
+        assert summary["shared_read_blocks"] == 3
+        assert summary["seq_scans"] == [{"relation": "interaction_logs", "rows": 50000}]
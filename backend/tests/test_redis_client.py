@@ -0,0 +1,149 @@
+"""
+Tests for RedisManager multi-key operations and value serializers.
+"""
+import json
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import jwt
+import pytest
+
+from src.config import settings
+from src.services.auth_service import AuthService
+from src.utils import redis_serializers
+from src.utils.redis_client import RedisManager
+
+
+@pytest.fixture
+def pipe():
+    pipe = MagicMock()
+    pipe.command_stack = []
+    pipe.execute = AsyncMock(return_value=[True, True])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    return pipe
+
+
+@pytest.fixture
+def redis_manager(pipe):
+    manager = RedisManager("redis://localhost:6379/0")
+    manager._async_client = Mock()
+    manager._async_client.pipeline = Mock(return_value=pipe)
+    return manager
+
+
+class TestRedisManagerBatchOperations:
+    """Tests for get_many, set_many, delete_many and pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_get_many_uses_one_mget(self, redis_manager):
+        """Test several keys are read with one MGET and misses are omitted."""
+        redis_manager._async_client.mget = AsyncMock(return_value=[redis_manager.serialize({"a": 1}), None])
+
+        result = await redis_manager.get_many(["first", "second"])
+
+        assert result == {"first": {"a": 1}}
+        redis_manager._async_client.mget.assert_awaited_once_with(["first", "second"])
+
+    @pytest.mark.asyncio
+    async def test_set_many_applies_individual_ttls_in_one_pipeline(self, redis_manager, pipe):
+        """Test per-key expirations override the default in a single execute."""
+        stored = await redis_manager.set_many(
+            {"short": 1, "long": 2, "forever": 3},
+            expiration=None,
+            expirations={"short": 60, "long": 3600},
+        )
+
+        assert stored is True
+        pipe.setex.assert_any_call("short", 60, redis_manager.serialize(1))
+        pipe.setex.assert_any_call("long", 3600, redis_manager.serialize(2))
+        pipe.set.assert_called_once_with("forever", redis_manager.serialize(3))
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_set_many_returns_false_on_error(self, redis_manager, pipe):
+        """Test pipeline failures are logged and reported, not raised."""
+        pipe.execute.side_effect = ConnectionError("down")
+
+        assert await redis_manager.set_many({"key": 1}, expiration=10) is False
+
+    @pytest.mark.asyncio
+    async def test_delete_many_uses_one_del(self, redis_manager):
+        """Test several keys are deleted with one DEL."""
+        redis_manager._async_client.delete = AsyncMock(return_value=2)
+
+        assert await redis_manager.delete_many(["a", "b"]) == 2
+        redis_manager._async_client.delete.assert_awaited_once_with("a", "b")
+
+    @pytest.mark.asyncio
+    async def test_pipeline_discards_commands_when_block_raises(self, redis_manager, pipe):
+        """Test nothing is sent if the caller's block fails."""
+        with pytest.raises(RuntimeError):
+            async with redis_manager.pipeline() as queued:
+                queued.set("a", "1")
+                raise RuntimeError("abort")
+
+        pipe.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_transaction_flag(self, redis_manager):
+        """Test transaction=True requests a MULTI/EXEC pipeline."""
+        async with redis_manager.pipeline(transaction=True):
+            pass
+
+        redis_manager._async_client.pipeline.assert_called_once_with(transaction=True)
+
+
+class TestRedisSerializers:
+    """Tests for tagged value envelopes."""
+
+    VALUE = {"user_id": 7, "created_at": "2024-01-01T00:00:00", "scores": [1.5, None, True]}
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    def test_round_trip(self, name):
+        """Test every serializer reads back what it wrote."""
+        data = redis_serializers.get_serializer(name).dumps(self.VALUE)
+
+        assert redis_serializers.loads(data) == self.VALUE
+
+    def test_values_written_in_any_format_are_readable(self):
+        """Test a manager reads values written with a different serializer."""
+        writer = RedisManager("redis://localhost:6379/0", serializer="msgpack")
+        reader = RedisManager("redis://localhost:6379/0", serializer="orjson")
+
+        assert reader.deserialize(writer.serialize(self.VALUE)) == self.VALUE
+
+    def test_legacy_untagged_json_is_readable(self):
+        """Test values written before envelopes existed still decode."""
+        legacy = json.dumps(self.VALUE)
+
+        assert redis_serializers.loads(legacy) == self.VALUE
+        assert redis_serializers.loads(legacy.encode()) == self.VALUE
+
+    def test_json_and_orjson_share_a_format(self):
+        """Test switching between json and orjson does not change stored bytes."""
+        assert redis_serializers.loads(redis_serializers.get_serializer("json").dumps(self.VALUE)) == \
+            redis_serializers.loads(redis_serializers.get_serializer("orjson").dumps(self.VALUE))
+        assert redis_serializers.get_serializer("json").tag == redis_serializers.get_serializer("orjson").tag
+
+    def test_unknown_serializer_raises(self):
+        """Test an unknown serializer name is rejected at construction."""
+        with pytest.raises(ValueError):
+            RedisManager("redis://localhost:6379/0", serializer="pickle")
+
+
+@pytest.mark.asyncio
+async def test_create_session_writes_both_keys_in_one_call(redis_manager):
+    """Test session creation writes the session and access keys with their own TTLs."""
+    access_token = jwt.encode({"jti": "access-jti", "user_id": 7}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    refresh_token = jwt.encode({"jti": "refresh-jti"}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    redis_manager.set_many = AsyncMock(return_value=True)
+
+    with patch("src.services.auth_service.get_redis", return_value=redis_manager):
+        assert await AuthService.create_session(7, access_token, refresh_token) is True
+
+    redis_manager.set_many.assert_awaited_once()
+    items = redis_manager.set_many.await_args.args[0]
+    expirations = redis_manager.set_many.await_args.kwargs["expirations"]
+    assert set(items) == {"session:{u:7}:refresh-jti", "access_token:{u:7}:access-jti"}
+    assert expirations["session:{u:7}:refresh-jti"] == settings.jwt_refresh_token_expire_days * 24 * 3600
+    assert expirations["access_token:{u:7}:access-jti"] == settings.jwt_access_token_expire_hours * 3600
@@ -0,0 +1,113 @@
+"""
+Tests for hash-tagged Redis keys and Redis topology modes.
+"""
+from unittest.mock import AsyncMock, patch
+
+import jwt
+import pytest
+from redis.cluster import key_slot
+
+from src.config import settings
+from src.services.auth_service import AuthService
+from src.utils import redis_keys
+from src.utils.redis_client import RedisManager
+
+
+class TestRedisKeys:
+    """Tests for key builders."""
+
+    def test_user_keys_share_a_cluster_slot(self):
+        """Test every per-user key hashes to the same slot."""
+        keys = [
+            redis_keys.session_key(7, "refresh-jti"),
+            redis_keys.access_token_key(7, "access-jti"),
+            redis_keys.rate_limit_key(7, "minute", 123),
+            redis_keys.rate_limit_key("7", "day", "2024-01-01"),
+        ]
+
+        assert len({key_slot(key.encode()) for key in keys}) == 1
+
+    def test_different_users_are_spread(self):
+        """Test users are not all pinned to one slot."""
+        slots = {key_slot(redis_keys.session_key(user_id, "jti").encode()) for user_id in range(100)}
+
+        assert len(slots) > 50
+
+    def test_prefixes_are_preserved(self):
+        """Test keys keep their prefixes for SCAN patterns and near-cache prefixes."""
+        assert redis_keys.access_token_key(7, "jti") == "access_token:{u:7}:jti"
+        assert redis_keys.llm_cache_key("abc") == "llm_cache:{abc}"
+
+    @pytest.mark.parametrize("key,user_id,expected", [
+        ("session:7:jti", None, "session:{u:7}:jti"),
+        ("access_token:jti", 7, "access_token:{u:7}:jti"),
+        ("access_token:jti", None, None),
+        ("session:{u:7}:jti", None, None),
+        ("access_token:{u:7}:jti", 7, None),
+        ("email_verification:token", 7, None),
+    ])
+    def test_migrated_key(self, key, user_id, expected):
+        """Test only legacy session and access token keys are renamed."""
+        assert redis_keys.migrated_key(key, user_id) == expected
+
+
+class TestRedisModes:
+    """Tests for connection mode selection."""
+
+    def test_unknown_mode_raises(self):
+        """Test an unknown mode is rejected."""
+        with pytest.raises(ValueError):
+            RedisManager("redis://localhost:6379/0", mode="replicated")
+
+    def test_sentinel_mode_requires_sentinels(self):
+        """Test sentinel mode needs at least one sentinel."""
+        with pytest.raises(ValueError):
+            RedisManager("redis://localhost:6379/0", mode="sentinel")
+
+    def test_sentinel_connections_use_url_credentials(self):
+        """Test the primary is reached with the database and password from the URL."""
+        manager = RedisManager("redis://:secret@ignored:6379/3", mode="sentinel", sentinels=[("s1", 26379)])
+
+        assert manager._sentinel_connection_kwargs() == {"password": "secret", "db": 3}
+
+    @pytest.mark.asyncio
+    async def test_cluster_get_many_is_split_across_slots(self):
+        """Test MGET in cluster mode does not require keys to share a slot."""
+        manager = RedisManager("redis://localhost:7000/0", mode="cluster")
+        manager._async_client = AsyncMock()
+        manager._async_client.mget_nonatomic = AsyncMock(return_value=[manager.serialize(1), None])
+
+        assert await manager.get_many(["a", "b"]) == {"a": 1}
+        manager._async_client.mget.assert_not_called()
+
+
+class TestLegacyKeyFallback:
+    """Tests for reading tokens issued before keys were hash-tagged."""
+
+    @pytest.fixture
+    def access_token(self):
+        return jwt.encode({"jti": "jti", "user_id": 7}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+
+    @pytest.mark.asyncio
+    async def test_legacy_access_token_is_still_valid(self, access_token):
+        """Test a token stored under the old key name still validates."""
+        redis_manager = RedisManager("redis://localhost:6379/0")
+        redis_manager.get_cache = AsyncMock(side_effect=[None, {"user_id": 7, "valid": True}])
+
+        with patch("src.services.auth_service.get_redis", return_value=redis_manager):
+            assert await AuthService.validate_session(access_token) is True
+
+        assert [call.args[0] for call in redis_manager.get_cache.await_args_list] == [
+            "access_token:{u:7}:jti", "access_token:jti",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalidation_removes_both_key_names(self, access_token):
+        """Test revocation deletes the token under both names."""
+        redis_manager = RedisManager("redis://localhost:6379/0")
+        redis_manager.delete_many = AsyncMock(return_value=1)
+
+        with patch("src.services.auth_service.get_redis", return_value=redis_manager):
+            assert await AuthService.invalidate_session(7, access_token) is True
+
+        assert set(redis_manager.delete_many.await_args.args[0]) == {"access_token:{u:7}:jti", "access_token:jti"}
@@ -0,0 +1,197 @@
+"""
+Tests for the invalidation-tracked Redis near-cache.
+"""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from redis.exceptions import ResponseError
+
+from src.utils.redis_client import RedisManager
+from src.utils.redis_near_cache import INVALIDATE_CHANNEL, NearCache, _keyspace_flags_sufficient
+
+
+@pytest.fixture
+def near_cache():
+    cache = NearCache(Mock(), ["access_token:"], max_entries=2, ttl_seconds=60)
+    cache._active = True
+    return cache
+
+
+@pytest.fixture
+def redis_manager():
+    manager = RedisManager("redis://localhost:6379/0", near_cache_prefixes=["access_token:"])
+    manager._async_client = Mock()
+    manager.near_cache._active = True
+    return manager
+
+
+class TestNearCache:
+    """Tests for local storage and invalidation."""
+
+    def test_completed_read_is_served_locally(self, near_cache):
+        """Test a value read from Redis is cached for later reads."""
+        token = near_cache.begin("access_token:a")
+        near_cache.complete("access_token:a", token, b"value")
+
+        assert near_cache.get("access_token:a") == b"value"
+        assert near_cache.hits == 1
+
+    def test_invalidation_during_read_prevents_caching(self, near_cache):
+        """Test a read racing with a write never stores the old value."""
+        token = near_cache.begin("access_token:a")
+        near_cache.invalidate(["access_token:a"])
+        near_cache.complete("access_token:a", token, b"stale")
+
+        assert near_cache.get("access_token:a") is None
+
+    def test_inactive_cache_is_bypassed(self, near_cache):
+        """Test nothing is served or stored while invalidations are not flowing."""
+        near_cache.complete("access_token:a", near_cache.begin("access_token:a"), b"value")
+        near_cache._active = False
+
+        assert near_cache.get("access_token:a") is None
+        assert near_cache.begin("access_token:b") is None
+
+    def test_entries_expire_after_local_ttl(self, near_cache):
+        """Test the local TTL bounds staleness if an invalidation is missed."""
+        with patch("src.utils.redis_near_cache.time.monotonic", return_value=100.0):
+            near_cache.complete("access_token:a", near_cache.begin("access_token:a"), b"value")
+        with patch("src.utils.redis_near_cache.time.monotonic", return_value=161.0):
+            assert near_cache.get("access_token:a") is None
+
+    def test_least_recently_used_entry_is_evicted(self, near_cache):
+        """Test the cache stays within max_entries."""
+        for key in ("access_token:a", "access_token:b"):
+            near_cache.complete(key, near_cache.begin(key), b"value")
+        near_cache.get("access_token:a")
+        near_cache.complete("access_token:c", near_cache.begin("access_token:c"), b"value")
+
+        assert near_cache.get("access_token:b") is None
+        assert near_cache.get("access_token:a") == b"value"
+
+    def test_tracking_message_invalidates_keys(self, near_cache):
+        """Test __redis__:invalidate messages drop the listed keys."""
+        near_cache.complete("access_token:a", near_cache.begin("access_token:a"), b"value")
+
+        near_cache._handle_message([b"message", INVALIDATE_CHANNEL, [b"access_token:a"]])
+
+        assert near_cache.get("access_token:a") is None
+
+    def test_tracking_flush_message_clears_everything(self, near_cache):
+        """Test a null invalidation (FLUSHALL) clears the cache."""
+        near_cache.complete("access_token:a", near_cache.begin("access_token:a"), b"value")
+
+        near_cache._handle_message([b"message", INVALIDATE_CHANNEL, None])
+
+        assert near_cache.stats()["entries"] == 0
+
+    def test_keyspace_message_invalidates_key(self, near_cache):
+        """Test keyspace notifications drop the key named in the channel."""
+        near_cache.complete("access_token:a", near_cache.begin("access_token:a"), b"value")
+
+        near_cache._handle_message([
+            b"pmessage", b"__keyspace@0__:access_token:*", b"__keyspace@0__:access_token:a", b"del",
+        ])
+
+        assert near_cache.get("access_token:a") is None
+
+    @pytest.mark.parametrize("flags,expected", [("", False), ("Kg$", False), ("Kg$xe", True), ("KA", True), ("AE", False)])
+    def test_keyspace_flags(self, flags, expected):
+        """Test the fallback requires keyspace events for every kind of change."""
+        assert _keyspace_flags_sufficient(flags) is expected
+
+
+def fake_connection(*replies):
+    connection = Mock()
+    connection.send_command = AsyncMock()
+    connection.read_response = AsyncMock(side_effect=list(replies))
+    connection.disconnect = AsyncMock()
+    return connection
+
+
+class TestNearCacheConnect:
+    """Tests for establishing the invalidation stream."""
+
+    @pytest.mark.asyncio
+    async def test_tracking_redirects_to_listener(self):
+        """Test BCAST tracking is enabled for the prefixes and redirected to the listener."""
+        cache = NearCache(Mock(), ["access_token:", "profile:"])
+        listener = fake_connection(42, [b"subscribe", INVALIDATE_CHANNEL, 1])
+        tracker = fake_connection(b"OK")
+        cache._open_connection = AsyncMock(side_effect=[listener, tracker])
+
+        assert await cache._connect() is True
+
+        tracker.send_command.assert_awaited_once_with(
+            "CLIENT", "TRACKING", "ON", "REDIRECT", 42, "BCAST",
+            "PREFIX", "access_token:", "PREFIX", "profile:",
+        )
+        listener.send_command.assert_any_await("SUBSCRIBE", INVALIDATE_CHANNEL)
+        assert cache.active and cache.mode == "tracking"
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_tracking_or_keyspace_events(self):
+        """Test the cache stays off when the server cannot report changes."""
+        cache = NearCache(Mock(), ["access_token:"])
+        listener = fake_connection(42, [b"notify-keyspace-events", b""])
+        tracker = fake_connection(ResponseError("unknown command 'CLIENT|TRACKING'"))
+        cache._open_connection = AsyncMock(side_effect=[listener, tracker])
+
+        assert await cache._connect() is False
+        assert not cache.active
+
+
+class TestRedisManagerNearCache:
+    """Tests for near-cache integration in RedisManager."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_skips_network(self, redis_manager):
+        """Test a near-cached key is fetched from Redis once."""
+        redis_manager._async_client.get = AsyncMock(return_value=redis_manager.serialize("7"))
+
+        with patch.object(NearCache, "start"):
+            assert await redis_manager.get_cache("access_token:a") == "7"
+            assert await redis_manager.get_cache("access_token:a") == "7"
+
+        redis_manager._async_client.get.assert_awaited_once_with("access_token:a")
+
+    @pytest.mark.asyncio
+    async def test_other_prefixes_always_hit_redis(self, redis_manager):
+        """Test keys outside the configured prefixes are never cached locally."""
+        redis_manager._async_client.get = AsyncMock(return_value=redis_manager.serialize("x"))
+
+        await redis_manager.get_cache("session:1:a")
+        await redis_manager.get_cache("session:1:a")
+
+        assert redis_manager._async_client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_local_delete_is_visible_immediately(self, redis_manager):
+        """Test a process sees its own revocation without waiting for the server."""
+        redis_manager._async_client.get = AsyncMock(return_value=redis_manager.serialize("7"))
+        redis_manager._async_client.delete = AsyncMock(return_value=1)
+
+        with patch.object(NearCache, "start"):
+            await redis_manager.get_cache("access_token:a")
+            await redis_manager.delete_many(["access_token:a"])
+            redis_manager._async_client.get.return_value = None
+
+            assert await redis_manager.get_cache("access_token:a") is None
+
+    @pytest.mark.asyncio
+    async def test_get_many_fetches_only_misses(self, redis_manager):
+        """Test MGET is only sent for keys not held locally."""
+        redis_manager._async_client.get = AsyncMock(return_value=redis_manager.serialize("7"))
+        redis_manager._async_client.mget = AsyncMock(return_value=[redis_manager.serialize("8")])
+
+        with patch.object(NearCache, "start"):
+            await redis_manager.get_cache("access_token:a")
+            result = await redis_manager.get_many(["access_token:a", "access_token:b"])
+
+        assert result == {"access_token:a": "7", "access_token:b": "8"}
+        redis_manager._async_client.mget.assert_awaited_once_with(["access_token:b"])
+
+    def test_near_cache_is_opt_in(self):
+        """Test no near-cache exists unless prefixes are configured."""
+        assert RedisManager("redis://localhost:6379/0").near_cache is None
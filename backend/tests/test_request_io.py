@@ -0,0 +1,156 @@
+"""
+Tests for request-scoped I/O accounting and I/O budgets.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.asyncio.connection import ConnectionPool as AsyncConnectionPool
+
+from src.services.auth_service import AuthService
+from src.services.profile_cache import SNAPSHOT_VERSION, ProfileSnapshot, get_profile_snapshot
+from src.utils.pool_metrics import MeteredRedisConnectionPool
+from src.utils.redis_keys import access_token_key, profile_snapshot_key
+from src.utils.request_io import (
+    IO_DB,
+    IO_HTTP,
+    IO_REDIS,
+    IOBudget,
+    IOBudgetExceeded,
+    RequestIO,
+    begin_request_io,
+    current_request_io,
+    record_io,
+    track_io,
+)
+
+
+class TestRequestIO:
+    """Tests for per-request counters."""
+
+    def test_record_and_report(self):
+        """Test counts and times feed the log fields and Server-Timing header."""
+        request_io = RequestIO()
+        request_io.record(IO_DB, 2.0)
+        request_io.record(IO_DB, 1.5)
+        request_io.record(IO_REDIS, 0.25)
+
+        assert request_io.as_dict() == {
+            "db_calls": 2,
+            "db_time_ms": 3.5,
+            "redis_calls": 1,
+            "redis_time_ms": 0.25,
+        }
+        assert request_io.server_timing() == 'db;dur=3.5;desc="2 calls", redis;dur=0.2;desc="1 call"'
+
+    def test_record_without_request_is_ignored(self):
+        """Test I/O outside any request is not attributed anywhere."""
+        record_io(IO_DB, 1.0)
+
+        assert current_request_io() is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_isolated(self):
+        """Test concurrent requests each count only their own calls."""
+        async def serve(calls):
+            request_io = begin_request_io()
+            for _ in range(calls):
+                await asyncio.sleep(0)
+                record_io(IO_REDIS, 1.0)
+            return request_io
+
+        first, second = await asyncio.gather(serve(1), serve(3))
+
+        assert (first.count(IO_REDIS), second.count(IO_REDIS)) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_track_io_records_failed_calls(self):
+        """Test a call that raises is still counted."""
+        request_io = begin_request_io()
+
+        with pytest.raises(OSError):
+            async with track_io(IO_HTTP):
+                raise OSError("reset")
+
+        assert request_io.count(IO_HTTP) == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_round_trips_are_counted_at_the_pool(self):
+        """Test each checkout/release of a metered Redis pool is one round trip."""
+        pool = MeteredRedisConnectionPool()
+        connection = AsyncMock()
+        request_io = begin_request_io()
+
+        with patch.object(AsyncConnectionPool, "get_connection", AsyncMock(return_value=connection)), \
+             patch.object(AsyncConnectionPool, "release", AsyncMock()):
+            for _ in range(2):
+                held = await pool.get_connection("GET")
+                await pool.release(held)
+
+        assert request_io.count(IO_REDIS) == 2
+
+
+class TestIOBudget:
+    """Tests for budget assertions."""
+
+    @pytest.mark.asyncio
+    async def test_within_budget(self):
+        """Test a request within its limits passes."""
+        async with IOBudget(db=1, redis=1) as budget:
+            await asyncio.ensure_future(self._request(db=1, redis=1))
+
+        assert len(budget.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_each_request_is_checked_separately(self):
+        """Test an over-budget request fails even if others are under."""
+        with pytest.raises(IOBudgetExceeded, match="request 2: db 3 > 1"):
+            async with IOBudget(db=1):
+                await asyncio.ensure_future(self._request(db=1))
+                await asyncio.ensure_future(self._request(db=3))
+
+    @pytest.mark.asyncio
+    async def test_direct_calls_are_checked(self):
+        """Test I/O made outside any request counts against the budget."""
+        with pytest.raises(IOBudgetExceeded, match="direct calls: redis 2 > 1"):
+            async with IOBudget(redis=1):
+                record_io(IO_REDIS, 1.0)
+                record_io(IO_REDIS, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_decorator(self):
+        """Test the budget can wrap an async function."""
+        @IOBudget(http=0)
+        async def calls_out():
+            record_io(IO_HTTP, 10.0)
+
+        with pytest.raises(IOBudgetExceeded):
+            await calls_out()
+
+    @pytest.mark.asyncio
+    async def test_warm_profile_read_redis_round_trips(self, metered_redis):
+        """Test a warm authenticated profile read costs the access token GET and the snapshot GET."""
+        token = AuthService.generate_jwt_token(7, "learner@example.com", "student")
+        payload = AuthService.verify_jwt_token(token, token_type="access")
+        await metered_redis.set_cache(access_token_key(7, payload["jti"]), {"user_id": 7, "valid": True})
+        await metered_redis.set_bytes(
+            profile_snapshot_key(7, SNAPSHOT_VERSION), ProfileSnapshot(b"{}", b"{}", b"{}", b"{}", {}).dumps()
+        )
+
+        async with IOBudget(db=0, redis=2) as budget:
+            assert await AuthService.validate_session(token)
+            await get_profile_snapshot(7)
+
+        assert budget.direct.count(IO_REDIS) == 2
+        with pytest.raises(IOBudgetExceeded, match="redis 2 > 1"):
+            async with IOBudget(redis=1):
+                await AuthService.validate_session(token)
+                await get_profile_snapshot(7)
+
+    @staticmethod
+    async def _request(**calls):
+        """Simulate a request task performing the given I/O."""
+        begin_request_io()
+        for kind, count in calls.items():
+            for _ in range(count):
+                record_io(kind, 1.0)
@@ -0,0 +1,110 @@
+"""
+Tests for pgvector similarity queries and index tuning recommendations.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+
+from src.services.similarity_service import FILTERED_EF_SEARCH_FACTOR, MAX_EF_SEARCH, SimilarityService
+from src.services.vector_index_tuning import recommend_index_parameters
+
+
+def compiled_statements(session):
+    """Render every statement passed to session.execute as PostgreSQL SQL."""
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list
+    ]
+
+
+@pytest.fixture
+def session():
+    """Create a mock async session returning no rows."""
+    mock_session = MagicMock()
+    mock_session.execute = AsyncMock(return_value=[])
+    return mock_session
+
+
+class TestSimilarityService:
+    """Tests for SimilarityService query construction."""
+
+    @pytest.mark.asyncio
+    async def test_user_scoped_search_filters_before_ranking(self, session):
+        """Test that per-user searches materialize the user's rows before ordering."""
+        await SimilarityService.find_similar_interactions(
+            session, [0.1] * 1536, user_id=7, k=5
+        )
+
+        statements = compiled_statements(session)
+        assert len(statements) == 1
+        assert "AS MATERIALIZED" in statements[0]
+        assert "interaction_logs.user_id = " in statements[0]
+        assert "ORDER BY candidates.interaction_embedding <=>" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_since_bounds_created_at(self, session):
+        """Test that recent-only searches filter on the partition key."""
+        await SimilarityService.find_similar_interactions(
+            session, [0.1] * 1536, user_id=7, k=5, since=datetime(2026, 9, 1, tzinfo=timezone.utc)
+        )
+
+        assert "interaction_logs.created_at >= " in compiled_statements(session)[0]
+
+    @pytest.mark.asyncio
+    async def test_global_search_sets_recall_parameters(self, session):
+        """Test that global searches set probes and ef_search for the transaction."""
+        await SimilarityService.find_similar_interactions(
+            session, [0.1] * 1536, k=5, probes=12, ef_search=80
+        )
+
+        statements = compiled_statements(session)
+        assert statements[0] == "SET LOCAL ivfflat.probes = 12"
+        assert statements[1] == "SET LOCAL hnsw.ef_search = 80"
+        assert "ORDER BY interaction_logs.interaction_embedding <=>" in statements[2]
+
+    @pytest.mark.asyncio
+    async def test_ef_search_covers_k(self, session):
+        """Test ef_search is raised to k, since HNSW never returns more than ef_search rows."""
+        await SimilarityService.find_similar_interactions(session, [0.1] * 1536, k=100, ef_search=40)
+
+        assert compiled_statements(session)[1] == "SET LOCAL hnsw.ef_search = 100"
+
+    @pytest.mark.asyncio
+    async def test_filtered_search_keeps_extra_candidates(self, session):
+        """Test filters applied after the index scan get headroom, capped at pgvector's maximum."""
+        await SimilarityService.find_similar_interactions(
+            session, [0.1] * 1536, k=20, ef_search=40, interaction_type="hint_request"
+        )
+        await SimilarityService.find_similar_users(session, [0.1] * 1536, k=500)
+
+        statements = compiled_statements(session)
+        assert statements[1] == f"SET LOCAL hnsw.ef_search = {20 * FILTERED_EF_SEARCH_FACTOR}"
+        assert statements[4] == f"SET LOCAL hnsw.ef_search = {MAX_EF_SEARCH}"
+
+    @pytest.mark.asyncio
+    async def test_similar_users_excludes_requesting_user(self, session):
+        """Test that similar-learner search leaves out the requesting user."""
+        await SimilarityService.find_similar_users(session, [0.1] * 1536, exclude_user_id=3)
+
+        query = compiled_statements(session)[-1]
+        assert "users.id != " in query
+        assert "users.profile_embedding IS NOT NULL" in query
+
+
+class TestIndexRecommendations:
+    """Tests for size-based pgvector index parameter recommendations."""
+
+    @pytest.mark.parametrize(
+        "row_count,expected_lists",
+        [(0, 1), (50_000, 50), (1_000_000, 1000), (4_000_000, 2000)],
+    )
+    def test_lists_follow_table_size(self, row_count, expected_lists):
+        """Test that ivfflat lists scale with rows / 1000, then sqrt(rows)."""
+        assert recommend_index_parameters(row_count)["lists"] == expected_lists
+
+    def test_ef_search_covers_k(self):
+        """Test that ef_search is never below the requested k."""
+        assert recommend_index_parameters(10_000, k=100)["ef_search"] >= 100
+        assert recommend_index_parameters(20_000_000)["m"] == 32